@@ -192,7 +192,9 @@ def analyze_player_prediction(
 
         if detailed:
             # Add feature analysis
-            analysis["feature_analysis"] = analyze_prediction_features(player_data, prediction)
+            analysis["feature_analysis"] = analyze_prediction_features(
+                player_data, prediction, player_name, season, usage_level
+            )
 
             # Add similar players
             analysis["similar_players"] = find_similar_players(player_data, season)
@@ -204,26 +206,29 @@ def analyze_player_prediction(
     return analysis
 
 
-def analyze_prediction_features(player_data: dict, prediction: dict) -> Dict[str, Any]:
+def analyze_prediction_features(player_data: dict, prediction: dict, player_name: Optional[str] = None,
+                                season: Optional[str] = None, usage_level: Optional[float] = None) -> Dict[str, Any]:
     """Analyze which features drove the prediction."""
     analysis = {}
 
     try:
-        # Load model to get feature importance
-        import joblib
-        model_path = "models/production/resilience_xgb_rfe_10.pkl"
-        if not Path(model_path).exists():
-            model_path = "models/resilience_xgb_rfe_10.pkl"
-
-        if Path(model_path).exists():
-            model = joblib.load(model_path)
-
-            # Get feature importance
-            if hasattr(model, 'feature_importances_'):
-                # Load feature names (this would need to be stored during training)
-                analysis["feature_importance"] = {
-                    f"feature_{i}": imp for i, imp in enumerate(model.feature_importances_)
-                }
+        # Per-feature contributions are precomputed for every player-season and
+        # usage level by src/nba_data/scripts/build_attributions.py
+        from src.model.attribution import explain, read_attributions
+        from src.model.registry import resolve
+        from src.model.training_tables import TrainingTableError
+
+        player = player_name or player_data.get("player_name") or player_data.get("PLAYER_NAME")
+        season = season or player_data.get("season") or player_data.get("SEASON")
+        try:
+            table = read_attributions(resolve("production"))
+            explanation = explain(table, player, season, usage=usage_level, top_n=10)
+        except TrainingTableError as e:
+            explanation = None
+            analysis["attribution_error"] = str(e)
+        if explanation is not None:
+            analysis["feature_contributions"] = explanation.pop("contributions").to_dict("records")
+            analysis["attribution"] = explanation
 
         # Analyze key stress vectors
         stress_vectors = {
@@ -149,18 +149,15 @@ def calculate_league_average_shot_quality(
         
         if all(col in rs_df.columns for col in efg_cols + fga_cols):
             rs_df['TOTAL_FGA'] = sum(rs_df[f'FGA_{cat}'].fillna(0) for cat in categories)
-            rs_df['WEIGHTED_EFG'] = np.nan
-            
-            for idx in rs_df.index:
-                row = rs_df.loc[idx]
-                total_fga = row['TOTAL_FGA']
-                if total_fga > 10:  # Minimum volume
-                    weighted_sum = sum(
-                        row[f'EFG_{cat}'] * row[f'FGA_{cat}'] 
-                        for cat in categories 
-                        if pd.notna(row[f'EFG_{cat}']) and pd.notna(row[f'FGA_{cat}'])
-                    )
-                    rs_df.loc[idx, 'WEIGHTED_EFG'] = weighted_sum / total_fga
+            # Sum EFG * FGA over the categories where both are present
+            weighted_sum = 0
+            for cat in categories:
+                weighted_sum = weighted_sum + (rs_df[f'EFG_{cat}'] * rs_df[f'FGA_{cat}']).fillna(0)
+            rs_df['WEIGHTED_EFG'] = np.where(
+                rs_df['TOTAL_FGA'] > 10,  # Minimum volume
+                weighted_sum / rs_df['TOTAL_FGA'],
+                np.nan
+            )
             
             valid_overall = rs_df[rs_df['WEIGHTED_EFG'].notna()]
             if len(valid_overall) > 0:
@@ -170,122 +167,85 @@ def calculate_league_average_shot_quality(
     return league_averages
 
 
+def join_regular_season_shot_quality(
+    players: pd.DataFrame,
+    shot_quality_data: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Attach each player's Regular Season shot quality row (keyed on PLAYER_ID, SEASON).
+    
+    Uses the first RS row per player-season. Players without a match (or with a
+    missing PLAYER_ID / SEASON) get NaN shot quality columns.
+    
+    Returns:
+        Shot quality columns aligned to `players.index`
+    """
+    rs_sq = shot_quality_data[
+        shot_quality_data['SEASON_TYPE'].isin(['RS', 'Regular Season']) &
+        shot_quality_data['PLAYER_ID'].notna() &
+        shot_quality_data['SEASON'].notna()
+    ].drop_duplicates(subset=['PLAYER_ID', 'SEASON'], keep='first')
+    sq_cols = [col for col in rs_sq.columns if col not in ('PLAYER_ID', 'SEASON')]
+    
+    keys = players[['PLAYER_ID', 'SEASON']]
+    joined = keys.merge(rs_sq[['PLAYER_ID', 'SEASON'] + sq_cols], on=['PLAYER_ID', 'SEASON'], how='left')
+    joined.index = players.index
+    return joined[sq_cols]
+
+
 def calculate_player_shot_quality_generated(
-    player_data: pd.Series,
-    shot_quality_data: pd.DataFrame,
-    league_averages: Dict[str, float]
-) -> Dict[str, float]:
+    players: pd.DataFrame,
+    shot_quality_data: pd.DataFrame
+) -> pd.DataFrame:
     """
-    Calculate shot quality generated by player (self + assisted).
+    Calculate shot quality generated by each player (self + assisted).
     
-    Prefers EFG_ISO_WEIGHTED and EFG_PCT_0_DRIBBLE from player_data if available,
+    Prefers EFG_ISO_WEIGHTED and EFG_PCT_0_DRIBBLE from `players` if available,
     otherwise falls back to shot quality data.
     
-    Returns:
+    Returns (one row per player, aligned to `players.index`):
     - self_created_quality: Player's isolation shot quality
     - assisted_quality: Quality of shots player creates for teammates
     - overall_quality: Weighted average of self + assisted
     """
-    results = {}
+    sq = join_regular_season_shot_quality(players, shot_quality_data)
+    results = pd.DataFrame(index=players.index)
     
     # 1. Self-Created Shot Quality
-    # Prefer EFG_ISO_WEIGHTED from player_data (more accurate)
-    if 'EFG_ISO_WEIGHTED' in player_data.index and pd.notna(player_data['EFG_ISO_WEIGHTED']):
-        results['self_created_quality'] = player_data['EFG_ISO_WEIGHTED']
+    # Fallback: Use tight defense from shot quality data
+    if all(col in sq.columns for col in ['EFG_0_2', 'EFG_2_4', 'FGA_0_2', 'FGA_2_4']):
+        tight_fga = sq['FGA_0_2'] + sq['FGA_2_4']
+        tight_efg = (sq['EFG_0_2'] * sq['FGA_0_2'] + sq['EFG_2_4'] * sq['FGA_2_4']) / tight_fga
+        fallback = tight_efg.where(tight_fga > 0)
     else:
-        # Fallback: Use tight defense from shot quality data
-        player_id = player_data.get('PLAYER_ID')
-        season = player_data.get('SEASON')
-        
-        if pd.notna(player_id) and pd.notna(season):
-            player_sq = shot_quality_data[
-                (shot_quality_data['PLAYER_ID'] == player_id) & 
-                (shot_quality_data['SEASON'] == season) &
-                (shot_quality_data['SEASON_TYPE'].isin(['RS', 'Regular Season']))
-            ]
-            
-            if not player_sq.empty:
-                player_sq = player_sq.iloc[0]
-                if all(col in player_sq.index for col in ['EFG_0_2', 'EFG_2_4', 'FGA_0_2', 'FGA_2_4']):
-                    tight_fga = (player_sq.get('FGA_0_2', 0) or 0) + (player_sq.get('FGA_2_4', 0) or 0)
-                    if tight_fga > 0:
-                        tight_efg = (
-                            (player_sq.get('EFG_0_2', 0) or 0) * (player_sq.get('FGA_0_2', 0) or 0) +
-                            (player_sq.get('EFG_2_4', 0) or 0) * (player_sq.get('FGA_2_4', 0) or 0)
-                        ) / tight_fga
-                        results['self_created_quality'] = tight_efg
-                    else:
-                        results['self_created_quality'] = np.nan
-                else:
-                    results['self_created_quality'] = np.nan
-            else:
-                results['self_created_quality'] = np.nan
-        else:
-            results['self_created_quality'] = np.nan
+        fallback = pd.Series(np.nan, index=players.index)
+    # Prefer EFG_ISO_WEIGHTED from players (more accurate)
+    if 'EFG_ISO_WEIGHTED' in players.columns:
+        results['self_created_quality'] = players['EFG_ISO_WEIGHTED'].where(players['EFG_ISO_WEIGHTED'].notna(), fallback)
+    else:
+        results['self_created_quality'] = fallback
     
     # 2. Assisted Shot Quality
-    # Prefer EFG_PCT_0_DRIBBLE from player_data (catch-and-shoot)
-    if 'EFG_PCT_0_DRIBBLE' in player_data.index and pd.notna(player_data['EFG_PCT_0_DRIBBLE']):
-        results['assisted_quality'] = player_data['EFG_PCT_0_DRIBBLE']
+    # Fallback: Use wide open shots from shot quality data
+    if 'EFG_6_PLUS' in sq.columns and 'FGA_6_PLUS' in sq.columns:
+        fallback = sq['EFG_6_PLUS'].where(sq['FGA_6_PLUS'] > 0)
     else:
-        # Fallback: Use wide open shots from shot quality data
-        player_id = player_data.get('PLAYER_ID')
-        season = player_data.get('SEASON')
-        
-        if pd.notna(player_id) and pd.notna(season):
-            player_sq = shot_quality_data[
-                (shot_quality_data['PLAYER_ID'] == player_id) & 
-                (shot_quality_data['SEASON'] == season) &
-                (shot_quality_data['SEASON_TYPE'].isin(['RS', 'Regular Season']))
-            ]
-            
-            if not player_sq.empty:
-                player_sq = player_sq.iloc[0]
-                if 'EFG_6_PLUS' in player_sq.index and 'FGA_6_PLUS' in player_sq.index:
-                    open_fga = player_sq.get('FGA_6_PLUS', 0) or 0
-                    if open_fga > 0:
-                        results['assisted_quality'] = player_sq.get('EFG_6_PLUS', 0) or 0
-                    else:
-                        results['assisted_quality'] = np.nan
-                else:
-                    results['assisted_quality'] = np.nan
-            else:
-                results['assisted_quality'] = np.nan
-        else:
-            results['assisted_quality'] = np.nan
+        fallback = pd.Series(np.nan, index=players.index)
+    # Prefer EFG_PCT_0_DRIBBLE from players (catch-and-shoot)
+    if 'EFG_PCT_0_DRIBBLE' in players.columns:
+        results['assisted_quality'] = players['EFG_PCT_0_DRIBBLE'].where(players['EFG_PCT_0_DRIBBLE'].notna(), fallback)
+    else:
+        results['assisted_quality'] = fallback
     
     # 3. Overall Shot Quality (weighted average)
-    # Calculate from shot quality data if available
-    player_id = player_data.get('PLAYER_ID')
-    season = player_data.get('SEASON')
-    
-    if pd.notna(player_id) and pd.notna(season):
-        player_sq = shot_quality_data[
-            (shot_quality_data['PLAYER_ID'] == player_id) & 
-            (shot_quality_data['SEASON'] == season) &
-            (shot_quality_data['SEASON_TYPE'].isin(['RS', 'Regular Season']))
-        ]
-        
-        if not player_sq.empty:
-            player_sq = player_sq.iloc[0]
-            categories = ['6_PLUS', '4_6', '2_4', '0_2']
-            efg_cols = [f'EFG_{cat}' for cat in categories]
-            fga_cols = [f'FGA_{cat}' for cat in categories]
-            
-            if all(col in player_sq.index for col in efg_cols + fga_cols):
-                total_fga = sum(player_sq.get(f'FGA_{cat}', 0) or 0 for cat in categories)
-                if total_fga > 10:  # Minimum volume
-                    weighted_sum = sum(
-                        (player_sq.get(f'EFG_{cat}', 0) or 0) * (player_sq.get(f'FGA_{cat}', 0) or 0)
-                        for cat in categories
-                    )
-                    results['overall_quality'] = weighted_sum / total_fga
-                else:
-                    results['overall_quality'] = np.nan
-            else:
-                results['overall_quality'] = np.nan
-        else:
-            results['overall_quality'] = np.nan
+    categories = ['6_PLUS', '4_6', '2_4', '0_2']
+    if all(col in sq.columns for cat in categories for col in (f'EFG_{cat}', f'FGA_{cat}')):
+        total_fga = 0
+        weighted_sum = 0
+        for cat in categories:
+            total_fga = total_fga + sq[f'FGA_{cat}']
+            weighted_sum = weighted_sum + sq[f'EFG_{cat}'] * sq[f'FGA_{cat}']
+        results['overall_quality'] = (weighted_sum / total_fga).where(total_fga > 10)  # Minimum volume
     else:
         results['overall_quality'] = np.nan
     
@@ -293,13 +253,12 @@ def calculate_player_shot_quality_generated(
 
 
 def calculate_shot_quality_generation_delta(
-    player_data: pd.Series,
+    players: pd.DataFrame,
     shot_quality_data: pd.DataFrame,
-    league_averages: Dict[str, float],
-    predictive_features: Optional[pd.DataFrame] = None
-) -> float:
+    league_averages: Dict[str, float]
+) -> pd.Series:
     """
-    Calculate SHOT_QUALITY_GENERATION_DELTA.
+    Calculate SHOT_QUALITY_GENERATION_DELTA for every player.
     
     Formula: Actual Shot Quality Generated - Expected Shot Quality (Replacement Player)
     
@@ -309,59 +268,39 @@ def calculate_shot_quality_generation_delta(
     
     Future enhancement: Include assisted shot quality and playtype context
     """
-    player_qualities = calculate_player_shot_quality_generated(
-        player_data, shot_quality_data, league_averages
-    )
-    
-    if not player_qualities:
-        return np.nan
+    player_qualities = calculate_player_shot_quality_generated(players, shot_quality_data)
     
     # Get creation volume ratio (how much of their offense is self-created)
-    creation_vol_ratio = player_data.get('CREATION_VOLUME_RATIO', 0.5)  # Default to 50% if missing
+    if 'CREATION_VOLUME_RATIO' in players.columns:
+        creation_vol_ratio = players['CREATION_VOLUME_RATIO'].fillna(0.5)  # Default to 50% if missing
+    else:
+        creation_vol_ratio = pd.Series(0.5, index=players.index)
     
-    if pd.isna(creation_vol_ratio):
-        creation_vol_ratio = 0.5
+    def quality_delta(quality_col, league_key):
+        league_quality = league_averages.get(league_key, np.nan)
+        if pd.isna(league_quality):
+            return pd.Series(np.nan, index=players.index)
+        return player_qualities[quality_col] - league_quality
     
-    # Calculate delta for self-created shots
-    self_created_delta = np.nan
-    if 'self_created_quality' in player_qualities and 'self_created' in league_averages:
-        player_self_quality = player_qualities['self_created_quality']
-        league_self_quality = league_averages['self_created']
-        
-        if pd.notna(player_self_quality) and pd.notna(league_self_quality):
-            self_created_delta = player_self_quality - league_self_quality
-    
-    # Calculate delta for assisted shots
-    assisted_delta = np.nan
-    if 'assisted_quality' in player_qualities and 'assisted' in league_averages:
-        player_assisted_quality = player_qualities['assisted_quality']
-        league_assisted_quality = league_averages['assisted']
-        
-        if pd.notna(player_assisted_quality) and pd.notna(league_assisted_quality):
-            assisted_delta = player_assisted_quality - league_assisted_quality
+    # Calculate delta for self-created and assisted shots
+    self_created_delta = quality_delta('self_created_quality', 'self_created')
+    assisted_delta = quality_delta('assisted_quality', 'assisted')
+    has_self = self_created_delta.notna()
+    has_assisted = assisted_delta.notna()
     
     # Weighted delta: More weight on self-created if player creates more
     # This captures the "Empty Calories" problem: players who create a lot but create low-quality shots
-    if pd.notna(self_created_delta) and pd.notna(assisted_delta):
-        # Weight by creation volume: high creators' self-created quality matters more
-        weighted_delta = (self_created_delta * creation_vol_ratio) + (assisted_delta * (1 - creation_vol_ratio))
-    elif pd.notna(self_created_delta):
-        # Only self-created available
-        weighted_delta = self_created_delta * creation_vol_ratio
-    elif pd.notna(assisted_delta):
-        # Only assisted available
-        weighted_delta = assisted_delta * (1 - creation_vol_ratio)
-    else:
-        # Fallback: Use overall quality delta
-        if 'overall_quality' in player_qualities and 'overall' in league_averages:
-            player_overall = player_qualities['overall_quality']
-            league_overall = league_averages['overall']
-            if pd.notna(player_overall) and pd.notna(league_overall):
-                weighted_delta = player_overall - league_overall
-            else:
-                weighted_delta = np.nan
-        else:
-            weighted_delta = np.nan
+    # Fallback (neither available): Use overall quality delta
+    weighted_delta = quality_delta('overall_quality', 'overall')
+    # Only assisted available
+    weighted_delta = weighted_delta.mask(has_assisted, assisted_delta * (1 - creation_vol_ratio))
+    # Only self-created available
+    weighted_delta = weighted_delta.mask(has_self, self_created_delta * creation_vol_ratio)
+    # Both: weight by creation volume, high creators' self-created quality matters more
+    weighted_delta = weighted_delta.mask(
+        has_self & has_assisted,
+        (self_created_delta * creation_vol_ratio) + (assisted_delta * (1 - creation_vol_ratio))
+    )
     
     return weighted_delta
 
@@ -409,18 +348,12 @@ def process_season(season: str) -> pd.DataFrame:
     
     logger.info(f"Calculating shot quality generation delta for {len(season_df)} players...")
     
-    # Calculate delta for each player
-    deltas = []
-    for idx, player_row in season_df.iterrows():
-        delta = calculate_shot_quality_generation_delta(
-            player_row,
-            shot_quality_df,
-            league_averages,
-            predictive_features_df
-        )
-        deltas.append(delta)
-    
-    season_df['SHOT_QUALITY_GENERATION_DELTA'] = deltas
+    # One keyed join against the shot quality data, then column arithmetic
+    season_df['SHOT_QUALITY_GENERATION_DELTA'] = calculate_shot_quality_generation_delta(
+        season_df,
+        shot_quality_df,
+        league_averages
+    )
     
     # Select output columns
     output_cols = ['PLAYER_ID', 'PLAYER_NAME', 'SEASON', 'SHOT_QUALITY_GENERATION_DELTA']
@@ -21,7 +21,8 @@ def project_features_to_usage(
     Project player features to different usage level.
 
     Uses empirical distributions to scale features together,
-    solving the "Static Avatar Fallacy".
+    solving the "Static Avatar Fallacy". For whole frames and curves fitted
+    from the data, use src/nba_data/utils/usage_projection.py.
 
     Args:
         player_data: Current player data
@@ -66,7 +67,7 @@ def project_features_to_usage(
         usage_factor = (target_usage - current_usage) * 0.1
         projected_data['leverage_usg_delta'] = player_data['leverage_usg_delta'] + usage_factor
 
-    logger.info(f"Projected {player_data.get('player_name', 'Unknown')} from {current_usage:.1%} to {target_usage:.1%} usage")
+    logger.debug(f"Projected {player_data.get('player_name', 'Unknown')} from {current_usage:.1%} to {target_usage:.1%} usage")
 
     return projected_data
 
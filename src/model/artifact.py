@@ -0,0 +1,254 @@
+"""
+Portable model artifacts.
+
+The trained models are joblib pickles of full XGBClassifier/XGBRegressor
+objects plus a separately pickled LabelEncoder. Unpickling imports sklearn
+and xgboost.sklearn and breaks across library versions. A model artifact
+bundles everything inference needs into one file:
+
+    b"RSLMODEL"                   magic
+    uint32 (little-endian)        header length
+    header (UTF-8 JSON)           name, kind, objective, classes, features,
+                                  calibration, metadata, payload format/SHA-256
+    payload                       the booster in XGBoost's native UBJSON
+                                  (JSON for XGBoost < 1.7)
+    32 bytes                      SHA-256 of everything above
+
+models/predictive_resilience_model.json is the bare-booster version of this
+(native JSON, feature names only); the artifact adds the label classes,
+feature order, calibration (probability calibration and risk thresholds)
+and a checksum.
+
+ModelArtifact predicts with Booster.inplace_predict (no DMatrix, no sklearn)
+and exposes the parts of the sklearn API the predictors use
+(predict_proba, predict, classes_, feature_names_in_), with
+ArtifactEncoder standing in for the LabelEncoder. predict_proba applies the
+header's probability calibration, if any.
+
+Example:
+    export_artifact(model, "models/resilience_xgb_rfe_10.xgbm", name="resilience_xgb_rfe_10", encoder=encoder)
+    artifact = load_artifact("models/resilience_xgb_rfe_10.xgbm")
+    artifact.predict_proba(df)             # columns selected by artifact.features
+"""
+
+import hashlib
+import json
+import logging
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.model.calibration import apply_calibration
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RSLMODEL"
+FORMAT_VERSION = 1
+ARTIFACT_SUFFIX = ".xgbm"
+_DIGEST_SIZE = 32
+
+PathLike = Union[str, Path]
+
+
+class ArtifactFormatError(ValueError):
+    """Raised when a file is not a valid model artifact or fails its checksum."""
+
+
+class ArtifactEncoder:
+    """The subset of LabelEncoder the predictors use, backed by the artifact's classes."""
+
+    def __init__(self, classes: Sequence[str]):
+        self.classes_ = np.asarray(list(classes), dtype=object)
+        self._index = {c: i for i, c in enumerate(self.classes_)}
+
+    def transform(self, labels) -> np.ndarray:
+        return np.array([self._index[label] for label in labels], dtype=np.int64)
+
+    def inverse_transform(self, codes) -> np.ndarray:
+        return self.classes_[np.asarray(codes, dtype=np.int64)]
+
+
+class ModelArtifact:
+    """A booster with its classes, feature order, calibration and metadata."""
+
+    def __init__(self, booster, header: Dict[str, Any]):
+        self.booster = booster
+        self.header = header
+        self.name: str = header['name']
+        self.kind: str = header['kind']
+        self.objective: str = header['objective']
+        self.classes: List[str] = header.get('classes') or []
+        self.features: List[str] = header['features']
+        self.calibration: Dict[str, Any] = header.get('calibration') or {}
+        self.metadata: Dict[str, Any] = header.get('metadata') or {}
+        self.encoder = ArtifactEncoder(self.classes) if self.classes else None
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.encoder.classes_
+
+    @property
+    def feature_names_in_(self) -> np.ndarray:
+        return np.asarray(self.features, dtype=object)
+
+    @property
+    def n_features_in_(self) -> int:
+        return len(self.features)
+
+    def _matrix(self, X) -> np.ndarray:
+        """X as a float32 array in the artifact's feature order."""
+        if hasattr(X, 'columns'):
+            missing = [f for f in self.features if f not in X.columns]
+            if missing:
+                raise KeyError(f"{self.name}: missing features {missing}")
+            X = X[self.features].to_numpy(dtype=np.float32, na_value=np.nan)
+        else:
+            X = np.asarray(X, dtype=np.float32)
+            if X.ndim == 1:
+                X = X.reshape(1, -1)
+            if X.shape[1] != len(self.features):
+                raise ValueError(f"{self.name}: expected {len(self.features)} features, got {X.shape[1]}")
+        return X
+
+    def _raw(self, X) -> np.ndarray:
+        return np.asarray(self.booster.inplace_predict(self._matrix(X)))
+
+    def predict_proba(self, X, calibrated: bool = True) -> np.ndarray:
+        """
+        Class probabilities (rows x classes), in `classes` order; calibrated
+        if the artifact carries a probability calibration (src/model/calibration.py).
+        """
+        if self.kind != 'classifier':
+            raise TypeError(f"{self.name} is a {self.kind}; use predict()")
+        proba = self._raw(X)
+        if proba.ndim == 1:  # binary:logistic returns P(class 1)
+            proba = np.column_stack([1.0 - proba, proba])
+        if calibrated and self.calibration.get('probability'):
+            proba = apply_calibration(proba, self.calibration['probability'], self.classes)
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        """Encoded class (classifiers, like XGBClassifier.predict) or predicted value (regressors)."""
+        if self.kind == 'classifier':
+            return self.predict_proba(X).argmax(axis=1)
+        return self._raw(X)
+
+    def predict_labels(self, X) -> np.ndarray:
+        """Class names of the most likely class."""
+        return self.encoder.inverse_transform(self.predict(X))
+
+
+def _booster_objective(booster) -> str:
+    return json.loads(booster.save_config())['learner']['objective']['name']
+
+
+def export_artifact(model, path: PathLike, name: str, encoder=None, features: Optional[Sequence[str]] = None,
+                    calibration: Optional[Dict[str, Any]] = None,
+                    metadata: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Write `model` (an XGBoost sklearn model or Booster) as a model artifact.
+
+    Args:
+        model: Fitted XGBClassifier/XGBRegressor or xgboost.Booster
+        path: Output file
+        name: Model name (registry name)
+        encoder: LabelEncoder (or anything with classes_) for classifiers
+        features: Feature order; defaults to the model's feature names
+        calibration: Thresholds/calibration data stored with the model
+        metadata: Extra JSON-serializable metadata
+
+    Returns:
+        The written path
+    """
+    import xgboost as xgb
+
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    if features is None:
+        if hasattr(model, 'feature_names_in_'):
+            features = list(model.feature_names_in_)
+        elif booster.feature_names:
+            features = list(booster.feature_names)
+        else:
+            raise ValueError(f"{name}: feature names unknown; pass features=")
+
+    try:
+        payload, payload_format = bytes(booster.save_raw(raw_format='ubj')), 'ubj'
+    except TypeError:  # XGBoost < 1.7
+        payload, payload_format = bytes(booster.save_raw(raw_format='json')), 'json'
+
+    objective = _booster_objective(booster)
+    classes = [str(c) for c in encoder.classes_] if encoder is not None else []
+    header = {
+        'format_version': FORMAT_VERSION,
+        'name': name,
+        'kind': 'classifier' if objective.startswith(('multi:', 'binary:')) else 'regressor',
+        'objective': objective,
+        'classes': classes,
+        'features': [str(f) for f in features],
+        'calibration': calibration or {},
+        'metadata': metadata or {},
+        'payload_format': payload_format,
+        'payload_sha256': hashlib.sha256(payload).hexdigest(),
+        'xgboost_version': xgb.__version__,
+        'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+    }
+    header_bytes = json.dumps(header, sort_keys=True).encode('utf-8')
+    body = MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + payload
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+        f.write(hashlib.sha256(body).digest())
+    tmp_path.replace(path)
+    logger.info(f"Exported {name} ({header['kind']}, {len(features)} features) -> {path}")
+    return path
+
+
+def _split(data: bytes, path: PathLike, verify: bool):
+    if len(data) < len(MAGIC) + 4 + _DIGEST_SIZE or not data.startswith(MAGIC):
+        raise ArtifactFormatError(f"{path} is not a model artifact")
+    body, digest = data[:-_DIGEST_SIZE], data[-_DIGEST_SIZE:]
+    if verify and hashlib.sha256(body).digest() != digest:
+        raise ArtifactFormatError(f"{path}: checksum mismatch (file is corrupt or truncated)")
+    (header_len,) = struct.unpack_from('<I', body, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(body[start:start + header_len].decode('utf-8'))
+    if header.get('format_version', 0) > FORMAT_VERSION:
+        raise ArtifactFormatError(f"{path}: format version {header['format_version']} is newer than "
+                                  f"supported ({FORMAT_VERSION})")
+    return header, body[start + header_len:]
+
+
+def read_header(path: PathLike) -> Dict[str, Any]:
+    """The artifact's header (classes, features, calibration, metadata) without loading the booster."""
+    with open(path, 'rb') as f:
+        return _split(f.read(), path, verify=False)[0]
+
+
+def load_artifact(path: PathLike, verify: bool = True, nthread: Optional[int] = None) -> ModelArtifact:
+    """
+    Load a model artifact.
+
+    Args:
+        path: Artifact file
+        verify: Check the file checksum
+        nthread: Prediction threads (default: XGBoost's)
+
+    Raises:
+        ArtifactFormatError: Not an artifact, corrupt, or from a newer format
+    """
+    import xgboost as xgb
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    header, payload = _split(data, path, verify)
+    booster = xgb.Booster()
+    booster.load_model(bytearray(payload))
+    if nthread:
+        booster.set_param({'nthread': nthread})
+    return ModelArtifact(booster, header)
@@ -0,0 +1,248 @@
+"""
+Batched feature attributions (TreeSHAP) for model predictions.
+
+Explaining a prediction used to mean re-projecting one player, re-running
+the model and reading global feature importances. Instead, the booster's
+native contribution output (Booster.predict(..., pred_contribs=True), exact
+TreeSHAP) is computed for every row of a feature matrix in a few large
+chunks, and stored with the predictions as a columnar table (see
+src/model/training_tables.py) under results/.cache/attributions/<model>/.
+An explanation is then a row lookup.
+
+Table columns:
+    the caller's id columns (player, season, USAGE_LEVEL, ...)
+    <feature>                   model input values
+    PROB__<class>               class probabilities (classifiers), from the
+                                model's predict_proba: calibrated when the
+                                model is (registry.load_model)
+    PREDICTION                  predicted archetype, or predicted value
+    STAR_LEVEL_POTENTIAL        sum of the star-class probabilities
+    SHAP__<class>__<feature>    contribution to the class margin (log-odds);
+    SHAP__<class>__BIAS         the margin is the sum of the class's columns
+                                (regressors: SHAP__<feature>, SHAP__BIAS)
+
+The contributions explain the booster's raw margin. Calibration is a
+monotone map applied after the softmax, so a calibrated PROB__ is not the
+softmax of the summed SHAP__ columns; the stored metadata records whether
+the probabilities are calibrated.
+
+Example:
+    frame = attribution_frame(model, X, encoder=encoder, ids=ids)
+    table = read_attributions(spec)                 # stored by build_attributions.py
+    explanation = explain(table, "Jalen Brunson", "2022-23", usage=0.30, top_n=5)
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.model.evaluation import STAR_CLASSES, model_features
+from src.model.training_tables import TrainingTable, TrainingTableError, read_table
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTIONS_DIR = Path("results/.cache/attributions")
+
+# The usage simulator's slider: 10% to 40% in 1% steps
+USAGE_GRID = tuple(round(0.10 + 0.01 * i, 2) for i in range(31))
+
+CONTRIBUTION_PREFIX = 'SHAP__'
+PROBABILITY_PREFIX = 'PROB__'
+BIAS = 'BIAS'
+CHUNK_ROWS = 100_000
+
+
+def contribution_column(feature: str, target: Optional[str] = None) -> str:
+    """Column holding `feature`'s contribution to `target` (None for regressors)."""
+    return f"{CONTRIBUTION_PREFIX}{target}__{feature}" if target is not None else f"{CONTRIBUTION_PREFIX}{feature}"
+
+
+def _booster(model):
+    # XGBModel.booster is the 'gbtree' parameter, so ask for get_booster() first
+    if hasattr(model, 'get_booster'):
+        return model.get_booster()
+    return model.booster  # ModelArtifact
+
+
+def tree_contributions(model, X, features: Optional[Sequence[str]] = None, chunk_rows: int = CHUNK_ROWS,
+                       nthread: Optional[int] = None) -> np.ndarray:
+    """
+    Exact TreeSHAP contributions of every row of X.
+
+    Args:
+        model: Fitted XGBoost sklearn model or ModelArtifact
+        X: DataFrame (columns selected by feature name) or array in feature order
+        features: Feature order (default: the model's)
+        chunk_rows: Rows per DMatrix
+        nthread: Threads (default: all cores)
+
+    Returns:
+        float32 array (rows, outputs, features + 1): one output per class for
+        multi-class models, a single output otherwise; the last column is the
+        bias, and each output's row sum is its margin
+    """
+    import xgboost as xgb
+
+    booster = _booster(model)
+    features = list(booster.feature_names or features or model_features(model) or [])
+    if hasattr(X, 'columns'):
+        missing = [f for f in features if f not in X.columns]
+        if missing:
+            raise KeyError(f"Missing features {missing}")
+        matrix = X[features].to_numpy(dtype=np.float32, na_value=np.nan)
+    else:
+        matrix = np.asarray(X, dtype=np.float32)
+    names = features if booster.feature_names else None
+
+    parts = []
+    for start in range(0, len(matrix), chunk_rows):
+        dmatrix = xgb.DMatrix(matrix[start:start + chunk_rows], feature_names=names, nthread=nthread or -1)
+        parts.append(booster.predict(dmatrix, pred_contribs=True).astype(np.float32))
+    if not parts:
+        return np.empty((0, 1, matrix.shape[1] + 1), dtype=np.float32)
+    contribs = np.concatenate(parts)
+    return contribs if contribs.ndim == 3 else contribs[:, None, :]
+
+
+def attribution_frame(model, X: pd.DataFrame, encoder=None, features: Optional[Sequence[str]] = None,
+                      ids: Optional[pd.DataFrame] = None, star_classes: Sequence[str] = STAR_CLASSES,
+                      chunk_rows: int = CHUNK_ROWS, nthread: Optional[int] = None) -> pd.DataFrame:
+    """
+    Predictions and per-feature contributions of every row of X, as one frame.
+
+    Args:
+        model: Fitted XGBoost sklearn model or ModelArtifact
+        X: Prepared features
+        encoder: LabelEncoder (or ArtifactEncoder) of a classifier
+        features: Feature order (default: the model's)
+        ids: Identifier columns to put first (same row order as X)
+        star_classes: Classes summed into STAR_LEVEL_POTENTIAL
+        chunk_rows, nthread: See tree_contributions()
+
+    Returns:
+        The attribution table (see module docstring), indexed 0..n-1
+    """
+    features = list(features or model_features(model) or X.columns)
+    X = X[features]
+    contribs = tree_contributions(model, X, features, chunk_rows=chunk_rows, nthread=nthread)
+
+    columns: Dict[str, Any] = {}
+    if ids is not None:
+        columns.update({col: ids[col].to_numpy() for col in ids.columns})
+    columns.update({f: X[f].to_numpy(dtype=np.float32, na_value=np.nan) for f in features})
+
+    if encoder is not None or hasattr(model, 'classes_'):
+        classes = [str(c) for c in (encoder.classes_ if encoder is not None else model.classes_)]
+        proba = np.asarray(model.predict_proba(X))
+        for i, c in enumerate(classes):
+            columns[PROBABILITY_PREFIX + c] = proba[:, i].astype(np.float32)
+        columns['PREDICTION'] = np.asarray(classes, dtype=object)[proba.argmax(axis=1)]
+        stars = [classes.index(c) for c in star_classes if c in classes]
+        if stars:
+            columns['STAR_LEVEL_POTENTIAL'] = proba[:, stars].sum(axis=1).astype(np.float32)
+        # Binary models explain the positive class only
+        targets = classes if contribs.shape[1] == len(classes) else classes[-1:]
+    else:
+        columns['PREDICTION'] = np.asarray(model.predict(X), dtype=np.float32)
+        targets = [None]
+
+    for k, target in enumerate(targets):
+        for j, feature in enumerate(features + [BIAS]):
+            columns[contribution_column(feature, target)] = contribs[:, k, j]
+    return pd.DataFrame(columns)
+
+
+def read_attributions(spec, root: Union[str, Path] = ATTRIBUTIONS_DIR) -> TrainingTable:
+    """
+    The stored attributions of a registered model.
+
+    Args:
+        spec: The model's registry entry (src.model.registry.ModelSpec)
+        root: Directory holding the attribution tables
+
+    Raises:
+        TrainingTableError: No stored table, or one computed for other
+            model files (re-run build_attributions.py)
+    """
+    table = read_table(spec.name, root)
+    built_for = table.manifest.get('metadata', {}).get('checksums')
+    if built_for != spec.checksums:
+        raise TrainingTableError(f"Attributions for {spec.name} were computed for different model files; "
+                                 f"re-run build_attributions.py --model {spec.name}")
+    return table
+
+
+def _matching_rows(frame: pd.DataFrame, player: Union[str, int], season: str, usage: Optional[float]) -> pd.DataFrame:
+    key = str(player).strip()
+    by_id = frame['PLAYER_ID'].astype(str) == key if 'PLAYER_ID' in frame else False
+    by_name = frame['PLAYER_NAME'].astype(str).str.casefold() == key.casefold() if 'PLAYER_NAME' in frame else False
+    rows = frame[(by_id | by_name) & (frame['SEASON'].astype(str) == str(season))]
+    if usage is None:
+        return rows[~rows['PROJECTED'].astype(bool)]
+    usage = usage / 100.0 if usage > 1.0 else usage
+    rows = rows[rows['PROJECTED'].astype(bool)]
+    if rows.empty:
+        return rows
+    nearest = (rows['USAGE_LEVEL'] - usage).abs()
+    return rows[nearest == nearest.min()]
+
+
+def explain(table: TrainingTable, player: Union[str, int], season: str, usage: Optional[float] = None,
+            target: Optional[str] = None, top_n: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Look up why the model predicted what it did for one player-season.
+
+    Args:
+        table: Stored attributions (read_attributions())
+        player: Player name (case-insensitive) or PLAYER_ID
+        season: Season, e.g. '2022-23'
+        usage: Projected usage (fraction or percent; nearest grid level), or
+            None for the player's observed season
+        target: Class to explain (default: the predicted class)
+        top_n: Keep the n largest contributions by magnitude
+
+    Returns:
+        None if the player-season is not in the table, else a dict with the
+        row's usage level, prediction, probability of `target`, whether the
+        probabilities are calibrated, bias and a 'contributions' frame
+        (feature, value, contribution) sorted by |contribution|
+    """
+    rows = _matching_rows(table.frame, player, season, usage)
+    if rows.empty:
+        return None
+    row = rows.iloc[0]
+    metadata = table.manifest.get('metadata', {})
+    features: List[str] = metadata['features']
+    classes: List[str] = metadata.get('classes') or []
+
+    if classes:
+        target = target or str(row['PREDICTION'])
+        if contribution_column(BIAS, target) not in row.index:
+            raise KeyError(f"No attributions stored for class '{target}'")
+        probability = float(row[PROBABILITY_PREFIX + target])
+    else:
+        target, probability = None, None
+
+    contributions = pd.DataFrame({
+        'feature': features,
+        'value': [row[f] for f in features],
+        'contribution': [float(row[contribution_column(f, target)]) for f in features],
+    })
+    contributions = contributions.reindex(contributions['contribution'].abs().sort_values(ascending=False).index)
+    if top_n is not None:
+        contributions = contributions.head(top_n)
+    return {
+        'player': player,
+        'season': season,
+        'usage_level': float(row['USAGE_LEVEL']),
+        'projected': bool(row['PROJECTED']),
+        'prediction': row['PREDICTION'],
+        'target': target,
+        'probability': probability,
+        'calibrated': bool(metadata.get('calibrated_probabilities', False)),
+        'bias': float(row[contribution_column(BIAS, target)]),
+        'contributions': contributions.reset_index(drop=True),
+    }
@@ -0,0 +1,240 @@
+"""
+Probability calibration for the archetype models.
+
+XGBoost class probabilities are not calibrated. star_level_potential (the
+King + Bulldozer probability) was read as if it were one, and the risk
+quadrants were cut at a fixed 0.30/0.70. A calibration is fitted once, on
+the walk-forward out-of-fold predictions (season_cv.out_of_fold_predictions):
+one-vs-rest per class, isotonic (default) or Platt. It is stored as plain
+JSON in the model artifact's header:
+
+    calibration['probability']      {'method', 'classes', 'per_class': {class: {'x', 'y'} | {'a', 'b'}}}
+    calibration['risk_thresholds']  performance_high/low (derived below), dependence_low/high
+
+Applying it is a lookup: np.interp over the isotonic breakpoints (or a
+sigmoid for Platt) per class column, then the rows are renormalized. The
+same vectorized call serves one row or the whole league. It is applied in
+predict_proba of whatever registry.load_model() returns, so every caller of
+a registered model gets calibrated probabilities: ModelArtifact reads the
+calibration from its header, and pickled classifiers with a calibration
+file (results/calibration_<model>.json) are wrapped in CalibratedModel.
+Models loaded some other way (joblib.load) are not calibrated.
+
+The performance thresholds are derived on the calibrated scale. They are
+the lowest calibrated star-level scores at which the observed star rate of
+the out-of-fold rows (a monotone fit of "is a star" on the score) reaches
+70% (performance_high) and 30% (performance_low).
+
+Example:
+    proba, y, _, classes = out_of_fold_predictions(folds_path, features, model_factory, jobs=4)
+    fitted = fit_calibration(proba, y, classes, method='isotonic')
+    calibrated = apply_calibration(model.predict_proba(X), fitted['probability'], encoder.classes_)
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+from src.model.evaluation import STAR_CLASSES
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('isotonic', 'platt')
+CALIBRATION_DIR = Path("results")
+DEPENDENCE_THRESHOLDS_PATH = Path("results/dependence_thresholds.json")
+DEFAULT_RISK_THRESHOLDS = {'performance_high': 0.70, 'performance_low': 0.30,
+                           'dependence_low': 0.3570, 'dependence_high': 0.4482}
+STAR_RATE_TARGETS = {'performance_high': 0.70, 'performance_low': 0.30}
+
+_EPS = 1e-6
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, _EPS, 1 - _EPS)
+    return np.log(p / (1 - p))
+
+
+def _fit_isotonic(p: np.ndarray, y: np.ndarray) -> Dict[str, list]:
+    iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(p, y)
+    return {'x': iso.X_thresholds_.tolist(), 'y': iso.y_thresholds_.tolist()}
+
+
+def _fit_platt(p: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    lr = LogisticRegression(C=1e6).fit(_logit(p).reshape(-1, 1), y)
+    return {'a': float(lr.coef_[0, 0]), 'b': float(lr.intercept_[0])}
+
+
+def _transform(p: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+    if 'x' in params:
+        return np.interp(p, params['x'], params['y'])
+    return 1.0 / (1.0 + np.exp(-(params['a'] * _logit(p) + params['b'])))
+
+
+def apply_calibration(proba, calibration: Optional[Dict[str, Any]],
+                      classes: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    Calibrated class probabilities.
+
+    Args:
+        proba: Raw probabilities (rows x classes), or one row
+        calibration: fit_calibration() output (None/empty: returned unchanged)
+        classes: Class order of proba's columns (default: the calibration's)
+
+    Returns:
+        Probabilities of the same shape; each row sums to 1
+    """
+    proba = np.asarray(proba, dtype=np.float64)
+    if not calibration:
+        return proba
+    single = proba.ndim == 1
+    out = np.atleast_2d(proba).copy()
+    classes = [str(c) for c in (classes if classes is not None else calibration['classes'])]
+    for i, c in enumerate(classes):
+        params = calibration['per_class'].get(c)
+        if params is not None:
+            out[:, i] = _transform(out[:, i], params)
+    totals = out.sum(axis=1, keepdims=True)
+    out = np.where(totals > 0, out / np.where(totals > 0, totals, 1.0), np.atleast_2d(proba))
+    return out[0] if single else out
+
+
+class CalibratedModel:
+    """
+    A fitted classifier whose predict_proba/predict apply its calibration;
+    everything else (get_booster, feature_names_in_, ...) is the model's.
+    Same interface as ModelArtifact: .calibration and predict_proba(X, calibrated=True).
+    """
+
+    def __init__(self, model, calibration: Dict[str, Any], classes: Optional[Sequence[str]] = None):
+        self.model = model
+        self.calibration = calibration
+        self.classes = [str(c) for c in classes] if classes is not None else None
+
+    def __getattr__(self, name):
+        if name == 'model':  # not set yet (unpickling)
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def predict_proba(self, X, calibrated: bool = True) -> np.ndarray:
+        proba = self.model.predict_proba(X)
+        if calibrated and self.calibration.get('probability'):
+            proba = apply_calibration(proba, self.calibration['probability'], self.classes)
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        """Encoded class with the highest calibrated probability."""
+        return self.predict_proba(X).argmax(axis=1)
+
+
+def probability_metrics(proba: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    """Multi-class Brier score and log loss of probabilities against encoded labels."""
+    onehot = np.zeros_like(proba)
+    onehot[np.arange(len(y)), y] = 1.0
+    picked = np.clip(proba[np.arange(len(y)), y], 1e-15, 1.0)
+    return {'brier': float(np.mean(np.sum((proba - onehot) ** 2, axis=1))),
+            'log_loss': float(-np.mean(np.log(picked)))}
+
+
+def derive_performance_thresholds(star_score: np.ndarray, is_star: np.ndarray,
+                                  targets: Dict[str, float] = STAR_RATE_TARGETS) -> Dict[str, float]:
+    """
+    For each target star rate, the lowest score at which the observed star
+    rate (isotonic in the score) reaches it. Targets no score reaches are left out.
+    """
+    order = np.argsort(star_score)
+    scores = np.asarray(star_score, dtype=np.float64)[order]
+    rate = IsotonicRegression(y_min=0.0, y_max=1.0).fit_transform(scores, np.asarray(is_star, dtype=np.float64)[order])
+    thresholds = {}
+    for name, target in targets.items():
+        reached = np.flatnonzero(rate >= target)
+        if len(reached):
+            thresholds[name] = round(float(scores[reached[0]]), 4)
+        else:
+            logger.warning(f"No calibrated star score reaches a {target:.0%} star rate; keeping the default {name}")
+    return thresholds
+
+
+def fit_calibration(proba: np.ndarray, y: np.ndarray, classes: Sequence[str], method: str = 'isotonic',
+                    star_classes: Sequence[str] = STAR_CLASSES) -> Dict[str, Any]:
+    """
+    Fit per-class calibration on out-of-fold probabilities.
+
+    Args:
+        proba: Out-of-fold probabilities (rows x classes)
+        y: Encoded labels
+        classes: Class names, in proba's column order
+        method: 'isotonic' or 'platt'
+        star_classes: Classes summed into the star-level score
+
+    Returns:
+        {'probability': calibration for apply_calibration(),
+         'risk_thresholds': derived performance thresholds,
+         'metrics': Brier/log loss before and after}
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got '{method}'")
+    proba = np.asarray(proba, dtype=np.float64)
+    y = np.asarray(y, dtype=np.int64)
+    classes = [str(c) for c in classes]
+    fit = _fit_isotonic if method == 'isotonic' else _fit_platt
+
+    per_class = {}
+    for i, c in enumerate(classes):
+        target = (y == i).astype(np.float64)
+        if target.min() == target.max():
+            logger.warning(f"Class {c} is {'always' if target[0] else 'never'} observed; left uncalibrated")
+            continue
+        per_class[c] = fit(proba[:, i], target)
+    probability = {'method': method, 'classes': classes, 'per_class': per_class, 'n_samples': int(len(y))}
+
+    calibrated = apply_calibration(proba, probability)
+    stars = [classes.index(c) for c in star_classes if c in classes]
+    thresholds = {}
+    if stars:
+        thresholds = derive_performance_thresholds(calibrated[:, stars].sum(axis=1), np.isin(y, stars))
+    metrics = {f'raw_{k}': v for k, v in probability_metrics(proba, y).items()}
+    metrics.update({f'calibrated_{k}': v for k, v in probability_metrics(calibrated, y).items()})
+    return {'probability': probability, 'risk_thresholds': thresholds, 'metrics': metrics}
+
+
+def calibration_path(model_name: str, root: Path = CALIBRATION_DIR) -> Path:
+    return Path(root) / f"calibration_{model_name}.json"
+
+
+def read_calibration(model_name: str, features: Optional[Sequence[str]] = None,
+                     root: Path = CALIBRATION_DIR) -> Optional[Dict[str, Any]]:
+    """
+    The calibration fitted for `model_name` (calibrate_models.py), or None if
+    there is none or it was fitted on a different set of features (order
+    does not matter: the file lists the fold matrix's columns, the model its
+    fitted ones).
+    """
+    path = calibration_path(model_name, root)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        data = json.load(f)
+    if features is not None and data.get('features') and set(features) != set(data['features']):
+        logger.warning(f"{path} was fitted for different features than {model_name} has; ignoring it")
+        return None
+    return data
+
+
+def risk_thresholds(calibration: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Risk-quadrant cut points: the defaults, the dependence thresholds from
+    results/dependence_thresholds.json, then the model calibration's.
+    """
+    thresholds = dict(DEFAULT_RISK_THRESHOLDS)
+    if DEPENDENCE_THRESHOLDS_PATH.exists():
+        with open(DEPENDENCE_THRESHOLDS_PATH) as f:
+            data = json.load(f)
+        thresholds['dependence_low'] = data.get('low_threshold', thresholds['dependence_low'])
+        thresholds['dependence_high'] = data.get('high_threshold', thresholds['dependence_high'])
+    thresholds.update((calibration or {}).get('risk_thresholds') or {})
+    return thresholds
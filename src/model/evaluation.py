@@ -5,8 +5,9 @@ Handles model validation, metrics calculation, and performance analysis.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, List
+from typing import Any, Dict, Tuple, List, Optional
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -20,6 +21,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+STAR_CLASSES = ('King (Resilient Star)', 'Bulldozer (Fragile Star)')
+
 
 def evaluate_model_performance(
     model,
@@ -146,6 +149,7 @@ def analyze_model_errors(
 def compare_models(model1, model2, X_test, y_test, model1_name="Model 1", model2_name="Model 2") -> Dict:
     """
     Compare two models on the same test set.
+    (compare_model_set() scores any number of models in one pass.)
 
     Args:
         model1: First model
@@ -171,3 +175,172 @@ def compare_models(model1, model2, X_test, y_test, model1_name="Model 1", model2
     }
 
     return comparison
+
+
+def model_features(model) -> Optional[List[str]]:
+    """Column order a fitted model expects (sklearn feature_names_in_ or the booster's feature names)."""
+    if hasattr(model, 'feature_names_in_'):
+        return [str(f) for f in model.feature_names_in_]
+    if hasattr(model, 'get_booster') and model.get_booster().feature_names:
+        return list(model.get_booster().feature_names)
+    return None
+
+
+def _class_labels(model, encoder) -> List[str]:
+    classes = encoder.classes_ if encoder is not None else model.classes_
+    return [str(c) for c in classes]
+
+
+def _score_one(name: str, model, X: pd.DataFrame, features: Optional[List[str]], encoder,
+               star_classes) -> pd.DataFrame:
+    """One model's columns of the wide score frame."""
+    if features is None:
+        features = model_features(model) or list(X.columns)
+    missing = [f for f in features if f not in X.columns]
+    if missing:
+        # A model fed all-NaN columns still predicts; its outputs would be meaningless, not missing
+        logger.warning(f"{name}: {len(missing)} features missing from the shared matrix, not scored: {missing}")
+    X_model = X.reindex(columns=features)
+
+    if not hasattr(model, 'predict_proba'):
+        pred = np.full(len(X), np.nan) if missing else np.asarray(model.predict(X_model), dtype=np.float64)
+        return pd.DataFrame({f'{name}__pred': pred}, index=X.index)
+
+    labels = _class_labels(model, encoder)
+    if missing:
+        proba = np.full((len(X), len(labels)), np.nan)
+        pred = np.full(len(X), np.nan, dtype=object)
+    else:
+        proba = np.asarray(model.predict_proba(X_model))
+        pred = np.asarray(labels, dtype=object)[proba.argmax(axis=1)]
+    out = {f'{name}__p_{label}': proba[:, i] for i, label in enumerate(labels)}
+    out[f'{name}__pred'] = pred
+    star = [i for i, label in enumerate(labels) if label in star_classes]
+    if star:
+        out[f'{name}__star'] = proba[:, star].sum(axis=1)
+    return pd.DataFrame(out, index=X.index)
+
+
+def score_models(
+    models: Dict[str, Any],
+    X: pd.DataFrame,
+    encoders: Optional[Dict[str, Any]] = None,
+    features: Optional[Dict[str, List[str]]] = None,
+    jobs: Optional[int] = None,
+    star_classes=STAR_CLASSES
+) -> pd.DataFrame:
+    """
+    Score every model on one shared feature matrix.
+
+    Each model takes its own columns from X (by name, in its fitted order).
+    A model needing features X lacks is not run: its outputs are NaN, with
+    a warning.
+    Models are scored in parallel threads: they are already loaded and
+    XGBoost releases the GIL while predicting.
+
+    Args:
+        models: Model name -> fitted model (classifier or regressor)
+        X: Union feature matrix, one row per player-season
+        encoders: Model name -> label encoder (default: the model's classes_)
+        features: Model name -> feature order (default: the model's own)
+        jobs: Scoring threads (default: one per model)
+        star_classes: Classes whose probabilities sum to a model's star score
+
+    Returns:
+        Wide frame indexed like X: classifiers get <name>__p_<class>,
+        <name>__pred (class label) and <name>__star; regressors get <name>__pred
+    """
+    encoders = encoders or {}
+    features = features or {}
+    with ThreadPoolExecutor(max_workers=jobs or max(len(models), 1)) as pool:
+        futures = {
+            name: pool.submit(_score_one, name, model, X, features.get(name), encoders.get(name), star_classes)
+            for name, model in models.items()
+        }
+        frames = [futures[name].result() for name in models]
+    return pd.concat(frames, axis=1) if frames else pd.DataFrame(index=X.index)
+
+
+def _kappa(a: np.ndarray, b: np.ndarray) -> float:
+    """Cohen's kappa of two label arrays."""
+    observed = np.mean(a == b)
+    labels = np.union1d(a, b)
+    expected = sum(np.mean(a == label) * np.mean(b == label) for label in labels)
+    return float((observed - expected) / (1 - expected)) if expected < 1 else 1.0
+
+
+def agreement_statistics(scores: pd.DataFrame, names: List[str], y_true: Optional[pd.Series] = None) -> Dict:
+    """
+    Agreement between the classifiers `names` in a score_models() frame.
+    Models without predictions (features missing from the matrix) are left out.
+
+    Returns:
+        Dictionary with 'rows' (per player-season consensus label, share of
+        models agreeing with it, distinct labels, star-score mean and spread),
+        'pairwise' (agreement rate and Cohen's kappa per model pair) and
+        'accuracy' (per model, if y_true is given)
+    """
+    names = [n for n in names if scores[f'{n}__pred'].notna().any()]
+    preds = scores[[f'{n}__pred' for n in names]].astype(str).to_numpy()
+    rows = pd.DataFrame(index=scores.index)
+    if len(names):
+        consensus = pd.DataFrame(preds).mode(axis=1)[0].to_numpy()
+        rows['consensus_pred'] = consensus
+        rows['consensus_share'] = (preds == consensus[:, None]).mean(axis=1)
+        rows['n_distinct_preds'] = pd.DataFrame(preds).nunique(axis=1).to_numpy()
+        rows['unanimous'] = rows['n_distinct_preds'] == 1
+
+    star_cols = [f'{n}__star' for n in names if f'{n}__star' in scores.columns]
+    if star_cols:
+        star = scores[star_cols].to_numpy()
+        rows['star_mean'] = star.mean(axis=1)
+        rows['star_spread'] = star.max(axis=1) - star.min(axis=1)
+
+    pairwise = []
+    for i, a in enumerate(names):
+        for j in range(i + 1, len(names)):
+            pairwise.append({
+                'model_a': a, 'model_b': names[j],
+                'agreement': float(np.mean(preds[:, i] == preds[:, j])),
+                'kappa': _kappa(preds[:, i], preds[:, j]),
+            })
+
+    accuracy = {}
+    if y_true is not None:
+        truth = y_true.astype(str).to_numpy()
+        accuracy = {n: float(np.mean(preds[:, i] == truth)) for i, n in enumerate(names)}
+        if len(names):
+            accuracy['consensus'] = float(np.mean(rows['consensus_pred'].to_numpy() == truth))
+
+    return {'rows': rows, 'pairwise': pd.DataFrame(pairwise, columns=['model_a', 'model_b', 'agreement', 'kappa']),
+            'accuracy': accuracy}
+
+
+def compare_model_set(
+    models: Dict[str, Any],
+    X: pd.DataFrame,
+    y_true: Optional[pd.Series] = None,
+    encoders: Optional[Dict[str, Any]] = None,
+    features: Optional[Dict[str, List[str]]] = None,
+    jobs: Optional[int] = None
+) -> Dict:
+    """
+    compare_models() for any number of models: score them all in one pass
+    over the shared matrix X and summarize where they agree.
+
+    Returns:
+        Dictionary with 'scores' (wide frame: every model's outputs plus the
+        per-row agreement columns), 'pairwise', 'accuracy', 'classifiers',
+        'regressors' and 'unscored' (models missing features, NaN outputs)
+    """
+    scores = score_models(models, X, encoders=encoders, features=features, jobs=jobs)
+    classifiers = [n for n, m in models.items() if hasattr(m, 'predict_proba')]
+    stats = agreement_statistics(scores, classifiers, y_true)
+    return {
+        'scores': pd.concat([scores, stats['rows']], axis=1),
+        'pairwise': stats['pairwise'],
+        'accuracy': stats['accuracy'],
+        'classifiers': classifiers,
+        'regressors': [n for n in models if n not in classifiers],
+        'unscored': [n for n in models if scores[f'{n}__pred'].isna().all()],
+    }
@@ -0,0 +1,384 @@
+"""
+Budgeted hyperparameter search for the XGBoost models.
+
+Configurations are sampled from SEARCH_SPACE and scored on the walk-forward
+season folds (season_cv.FoldMatrices): each trial trains one configuration
+on one fold with the `hist` tree method. Early stopping watches a
+validation slice carved from the fold's training window (its latest
+season); the booster is trained on the earlier training seasons, and the
+trial's score is its metric on the untouched test season at the iteration
+early stopping picked (mlogloss for classifiers, rmse for regressors;
+lower is better). A configuration's score is its mean over the folds, so
+neither the score nor n_estimators has seen the test seasons.
+
+Successive halving spends the budget on promising configurations: every
+configuration gets the smallest boosting budget (rung 0), the best 1/eta
+advance to eta times more rounds, and so on up to max_rounds. Hyperband
+runs several such brackets, from many configurations on few rounds to few
+configurations on the full budget. The search stops early when the
+wall-clock budget runs out; the best configuration is taken from the
+highest rung with complete results.
+
+Trials run in worker processes that load the fold matrices once and build
+each fold's DMatrix once. Every finished trial is appended to a JSONL log
+keyed by the study (folds, features, search settings), so an interrupted
+or over-budget search resumes where it stopped.
+
+Example:
+    result = run_search("results/.cache/season_cv_folds.npz", features,
+                        "results/.cache/hpo/resilience_xgb_rfe_15.jsonl",
+                        mode='hyperband', budget_seconds=1800, jobs=4)
+    result.best['params'], result.best['n_estimators']
+"""
+
+import hashlib
+import json
+import logging
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+from .season_cv import FoldMatrices
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# name -> (distribution, low, high); sklearn parameter names (the native API accepts them as aliases)
+SEARCH_SPACE = {
+    'max_depth': ('int', 2, 8),
+    'learning_rate': ('log', 0.01, 0.3),
+    'min_child_weight': ('log', 0.5, 10.0),
+    'subsample': ('uniform', 0.5, 1.0),
+    'colsample_bytree': ('uniform', 0.5, 1.0),
+    'reg_lambda': ('log', 0.1, 10.0),
+    'gamma': ('uniform', 0.0, 2.0),
+}
+
+
+def sample_configs(n: int, space: Dict[str, tuple] = SEARCH_SPACE, seed: int = 42) -> List[Dict]:
+    """`n` random configurations from `space` (deterministic for a given seed)."""
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for name, (kind, low, high) in space.items():
+            if kind == 'int':
+                config[name] = int(rng.integers(low, high + 1))
+            elif kind == 'log':
+                config[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                config[name] = float(rng.uniform(low, high))
+        configs.append(config)
+    return configs
+
+
+def rung_rounds(min_rounds: int, max_rounds: int, eta: int) -> List[int]:
+    """Boosting rounds per rung: max_rounds, max_rounds/eta, ... down to about min_rounds."""
+    n_rungs = int(math.floor(math.log(max_rounds / min_rounds, eta) + 1e-9)) + 1
+    return [int(round(max_rounds / eta ** (n_rungs - 1 - r))) for r in range(n_rungs)]
+
+
+def hyperband_brackets(n_rungs: int, eta: int) -> List[Tuple[int, int]]:
+    """(configurations, starting rung) for each Hyperband bracket, most exploratory first."""
+    s_max = n_rungs - 1
+    return [(int(math.ceil((s_max + 1) * eta ** s / (s + 1))), s_max - s) for s in range(s_max, -1, -1)]
+
+
+class TrialLog:
+    """Append-only JSONL record of finished trials for one study."""
+
+    def __init__(self, path: PathLike, study_key: str):
+        self.path = Path(path)
+        self.study_key = study_key
+        self.records: Dict[tuple, Dict] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            if lines and lines[0].get('study_key') == study_key:
+                for record in lines[1:]:
+                    self.records[self._key(record)] = record
+                logger.info(f"Resuming study from {self.path}: {len(self.records)} finished trials")
+                return
+            logger.warning(f"Trial log {self.path} belongs to a different study; starting over")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'study_key': study_key}) + '\n')
+
+    @staticmethod
+    def _key(record: Dict) -> tuple:
+        return record['config_id'], record['rounds'], record['fold']
+
+    def get(self, task: Dict) -> Optional[Dict]:
+        return self.records.get(self._key(task))
+
+    def append(self, record: Dict):
+        self.records[self._key(record)] = record
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+_WORKER = {}
+
+
+def _init_search_worker(path: str, features: Sequence[str], threads: int):
+    """Process-pool initializer: load the fold matrices once per worker; boosters get `threads` as nthread."""
+    folds = FoldMatrices.load(path)
+    idx = [folds.columns.index(f) for f in features if f in folds.columns]
+    _WORKER.update(folds=folds, idx=idx, threads=threads, dmatrices={})
+
+
+def validation_split(folds: FoldMatrices, fold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions (within the fold's training rows) of the fit and the
+    early-stopping validation rows: the validation slice is the latest
+    training season.
+    """
+    train_years = folds.season_year[folds.train_rows[fold]]
+    last = train_years.max()
+    if (train_years == last).all():
+        raise ValueError(f"Fold {folds.test_years[fold]} has a single training season; "
+                         f"early stopping needs at least two (raise min_train_seasons)")
+    return np.flatnonzero(train_years != last), np.flatnonzero(train_years == last)
+
+
+def _fold_dmatrices(fold: int):
+    """Fit/validation/test DMatrix for `fold`, built once per worker."""
+    cache = _WORKER['dmatrices']
+    if fold not in cache:
+        folds, idx = _WORKER['folds'], _WORKER['idx']
+        train, test = folds.train_rows[fold], folds.test_rows[fold]
+        fit, valid = validation_split(folds, fold)
+        dfit = xgb.DMatrix(folds.X[np.ix_(train[fit], idx)], label=folds.y[train[fit]],
+                           weight=folds.weights[fold][fit])
+        dvalid = xgb.DMatrix(folds.X[np.ix_(train[valid], idx)], label=folds.y[train[valid]],
+                             weight=folds.weights[fold][valid])
+        dtest = xgb.DMatrix(folds.X[np.ix_(test, idx)], label=folds.y[test])
+        cache[fold] = (dfit, dvalid, dtest)
+    return cache[fold]
+
+
+def score_predictions(metric: str, predictions: np.ndarray, labels: np.ndarray) -> float:
+    """mlogloss (softprob predictions) or rmse, as XGBoost's eval metrics compute them."""
+    if metric == 'mlogloss':
+        picked = predictions[np.arange(len(labels)), labels.astype(np.int64)]
+        return float(-np.mean(np.log(np.clip(picked, 1e-15, 1.0))))
+    return float(np.sqrt(np.mean((predictions - labels) ** 2)))
+
+
+def booster_params(params: Dict, n_classes: int, threads: Optional[int] = None) -> Dict:
+    """Native XGBoost parameters for a searched configuration."""
+    base = {'tree_method': 'hist', 'seed': 42, 'verbosity': 0}
+    if n_classes:
+        base.update(objective='multi:softprob', num_class=n_classes, eval_metric='mlogloss')
+    else:
+        base.update(objective='reg:squarederror', eval_metric='rmse')
+    if threads:
+        base['nthread'] = threads
+    return {**base, **params}
+
+
+def _fit_trial(task: Dict) -> Dict:
+    """
+    Train one configuration on one fold, early-stopping on the training
+    window's validation slice, and score it on the fold's test season.
+    """
+    folds = _WORKER['folds']
+    dfit, dvalid, dtest = _fold_dmatrices(task['fold'])
+    params = booster_params(task['params'], len(folds.classes), _WORKER['threads'])
+
+    start = time.perf_counter()
+    booster = xgb.train(params, dfit, num_boost_round=task['rounds'], evals=[(dvalid, 'valid')],
+                        early_stopping_rounds=task['early_stopping_rounds'], verbose_eval=False)
+    best_iteration = int(booster.best_iteration)
+    predictions = booster.predict(dtest, iteration_range=(0, best_iteration + 1))
+    return {
+        **{k: task[k] for k in ('config_id', 'rung', 'rounds', 'fold', 'params')},
+        'test_season': folds.test_years[task['fold']],
+        'metric': params['eval_metric'],
+        'score': score_predictions(params['eval_metric'], predictions, dtest.get_label()),
+        'valid_score': float(booster.best_score),
+        'best_iteration': best_iteration,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _run_trials(tasks: List[Dict], pool, deadline: float, log: TrialLog) -> Tuple[List[Dict], bool]:
+    """Finished records for `tasks` (from the log or newly run) and whether the budget ran out."""
+    records = [log.get(t) for t in tasks if log.get(t) is not None]
+    pending = [t for t in tasks if log.get(t) is None]
+
+    if pool is None:
+        for task in pending:
+            if time.monotonic() > deadline:
+                return records, True
+            record = _fit_trial(task)
+            log.append(record)
+            records.append(record)
+        return records, False
+
+    futures = [pool.submit(_fit_trial, task) for task in pending]
+    timeout = None if math.isinf(deadline) else max(0.0, deadline - time.monotonic())
+    finished = set()
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            record = future.result()
+            log.append(record)
+            records.append(record)
+            finished.add(future)
+        return records, False
+    except FuturesTimeoutError:
+        # Out of budget: drop queued trials, keep the ones already running
+        running = [f for f in futures if f not in finished and not f.cancel()]
+        for future in running:
+            record = future.result()
+            log.append(record)
+            records.append(record)
+        return records, True
+
+
+def _rank(records: List[Dict], n_folds: int) -> pd.DataFrame:
+    """Configurations with results on every fold at a rung, best (lowest mean score) first."""
+    if not records:
+        return pd.DataFrame(columns=['config_id', 'score', 'n_estimators'])
+    df = pd.DataFrame(records)
+    grouped = df.groupby('config_id')
+    ranked = pd.DataFrame({
+        'folds': grouped.size(),
+        'score': grouped['score'].mean(),
+        'score_std': grouped['score'].std(ddof=1),
+        'n_estimators': grouped['best_iteration'].median().round().astype(int) + 1,
+        'params': grouped['params'].first(),
+    })
+    ranked = ranked[ranked['folds'] == n_folds]
+    return ranked.sort_values('score').reset_index()
+
+
+def successive_halving(configs: List[Tuple[str, Dict]], rounds: List[int], start_rung: int, n_folds: int,
+                       pool, deadline: float, log: TrialLog, eta: int = 3,
+                       early_stopping_rounds: int = 25) -> Tuple[Optional[pd.Series], int, bool]:
+    """
+    One successive-halving bracket.
+
+    Returns:
+        (best configuration at the highest completed rung or None, that rung, out of budget)
+    """
+    alive = configs
+    best, best_rung = None, -1
+    for rung in range(start_rung, len(rounds)):
+        tasks = [
+            {'config_id': config_id, 'params': params, 'rung': rung, 'rounds': rounds[rung],
+             'fold': fold, 'early_stopping_rounds': early_stopping_rounds}
+            for config_id, params in alive for fold in range(n_folds)
+        ]
+        records, out_of_budget = _run_trials(tasks, pool, deadline, log)
+        ranked = _rank(records, n_folds)
+        if not ranked.empty:
+            best, best_rung = ranked.iloc[0], rung
+            logger.info(f"Rung {rung} ({rounds[rung]} rounds): {len(ranked)}/{len(alive)} configs, "
+                        f"best {best['config_id']} = {best['score']:.4f}")
+        if out_of_budget:
+            return best, best_rung, True
+        keep = set(ranked['config_id'].head(max(1, math.ceil(len(alive) / eta))))
+        alive = [(config_id, params) for config_id, params in alive if config_id in keep]
+    return best, best_rung, False
+
+
+@dataclass
+class SearchResult:
+    """Outcome of run_search: the best configuration and every finished trial."""
+    best: Optional[Dict]
+    trials: pd.DataFrame
+    out_of_budget: bool
+    seconds: float
+
+
+def study_key(folds_key: str, features: Sequence[str], settings: Dict) -> str:
+    payload = {'folds': folds_key, 'features': sorted(features), 'space': SEARCH_SPACE, **settings}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def run_search(folds_path: PathLike, features: Sequence[str], log_path: PathLike, mode: str = 'hyperband',
+               n_configs: int = 27, min_rounds: int = 50, max_rounds: int = 800, eta: int = 3,
+               early_stopping_rounds: int = 25, budget_seconds: Optional[float] = None,
+               jobs: int = 1, threads: int = 1, seed: int = 42) -> SearchResult:
+    """
+    Search SEARCH_SPACE on the walk-forward folds.
+
+    Args:
+        folds_path: Saved FoldMatrices (.npz); classifiers if it has classes, regressors otherwise
+        features: Columns of the fold matrices to train on
+        log_path: Trial log (JSONL) used to resume the study
+        mode: 'halving' (one bracket of n_configs) or 'hyperband'
+        n_configs: Configurations in the successive-halving bracket
+        min_rounds, max_rounds: Boosting rounds at the lowest and highest rung
+        eta: Halving rate (keep 1/eta per rung, eta x more rounds)
+        early_stopping_rounds: Rounds without validation improvement before a trial stops
+        budget_seconds: Wall-clock budget of this run (None for no limit)
+        jobs: Worker processes
+        threads: XGBoost threads per worker
+        seed: Sampling seed
+
+    Returns:
+        SearchResult; best has config_id, params, n_estimators, score, rung
+    """
+    if xgb is None:
+        raise ImportError("XGBoost not available. Install with: pip install xgboost")
+    if mode not in ('halving', 'hyperband'):
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    start = time.monotonic()
+    deadline = start + budget_seconds if budget_seconds else math.inf
+    rounds = rung_rounds(min_rounds, max_rounds, eta)
+    with np.load(folds_path, allow_pickle=False) as data:
+        n_folds = len(data['test_years'])
+        folds_key = str(data['key'])
+    settings = {'mode': mode, 'n_configs': n_configs, 'rounds': rounds, 'eta': eta,
+                'early_stopping_rounds': early_stopping_rounds, 'seed': seed,
+                'early_stopping_on': 'last_train_season'}
+    log = TrialLog(log_path, study_key(folds_key, features, settings))
+
+    if mode == 'halving':
+        brackets = [(n_configs, 0)]
+    else:
+        brackets = hyperband_brackets(len(rounds), eta)
+    logger.info(f"{mode} search: rungs {rounds} rounds, brackets {brackets}, {n_folds} folds, "
+                f"{jobs} processes x {threads} threads")
+
+    pool = None
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_search_worker,
+                                   initargs=(str(folds_path), list(features), threads))
+    else:
+        _init_search_worker(str(folds_path), list(features), threads)
+
+    candidates, out_of_budget = [], False
+    try:
+        for b, (n, start_rung) in enumerate(brackets):
+            configs = [(f"b{b}_c{i}", params) for i, params in enumerate(sample_configs(n, seed=seed + b))]
+            best, rung, out_of_budget = successive_halving(
+                configs, rounds, start_rung, n_folds, pool, deadline, log, eta, early_stopping_rounds)
+            if best is not None:
+                candidates.append({**best.to_dict(), 'rung': rung, 'rounds': rounds[rung]})
+            if out_of_budget:
+                logger.warning(f"Wall-clock budget of {budget_seconds}s reached in bracket {b}")
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    # Prefer configurations that survived to more rounds, then the better score
+    best = min(candidates, key=lambda c: (-c['rung'], c['score'])) if candidates else None
+    return SearchResult(best=best, trials=pd.DataFrame(list(log.records.values())),
+                        out_of_budget=out_of_budget, seconds=time.monotonic() - start)
@@ -28,11 +28,14 @@ Phase 3.8 Enhancements (Reference Class Calibration Fixes):
 
 import pandas as pd
 import numpy as np
-import joblib
 import logging
 from pathlib import Path
 from typing import Dict, Optional, Tuple, Any
 
+from src.model.calibration import risk_thresholds
+from src.model.registry import load_model
+from src.nba_data.utils.feature_dtypes import apply_feature_dtypes, frame_memory_mb
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -71,41 +74,32 @@ def predict_with_risk_matrix(player_data: dict, usage_level: Optional[float] = N
 class ConditionalArchetypePredictor:
     """Predict archetype at different usage levels using usage-aware model."""
     
-    def __init__(self, use_rfe_model: bool = True):
+    def __init__(self, use_rfe_model: bool = True, model_ref: Optional[str] = None):
         """
-        Initialize predictor with RFE-simplified model or full model.
+        Initialize predictor with the registry's production model or the full model.
         
         Args:
-            use_rfe_model: If True, use RFE-selected 10-feature model (default: True)
+            use_rfe_model: If True, use the production RFE model (default: True);
+                otherwise the full model 'resilience_xgb'
+            model_ref: Registry reference ('production', a model name or
+                'name@version'); overrides use_rfe_model
         """
         self.results_dir = Path("results")
         self.models_dir = Path("models")
-        self.use_rfe_model = use_rfe_model
-        
-        # Load model and encoder
-        if use_rfe_model:
-            model_path = self.models_dir / "resilience_xgb_rfe_10.pkl"
-            encoder_path = self.models_dir / "archetype_encoder_rfe_10.pkl"
-            
-            if not model_path.exists():
-                logger.warning(f"RFE model not found at {model_path}, falling back to full model")
-                model_path = self.models_dir / "resilience_xgb.pkl"
-                encoder_path = self.models_dir / "archetype_encoder.pkl"
-                self.use_rfe_model = False
-        else:
-            model_path = self.models_dir / "resilience_xgb.pkl"
-            encoder_path = self.models_dir / "archetype_encoder.pkl"
         
-        self.model = joblib.load(model_path)
-        self.encoder = joblib.load(encoder_path)
+        # Load model and encoder through the registry (checksum-verified, loaded once per process)
+        self.loaded_model = load_model(model_ref or ('production' if use_rfe_model else 'resilience_xgb'))
+        self.model = self.loaded_model.model
+        self.encoder = self.loaded_model.encoder
+        self.use_rfe_model = self.loaded_model.name.startswith('resilience_xgb_rfe')
         
         # Load RFE features if using RFE model
         if self.use_rfe_model:
-            self.rfe_features = self._load_rfe_features()
-            logger.info(f"Using RFE model with {len(self.rfe_features)} features")
+            self.rfe_features = self.loaded_model.features or self._load_rfe_features()
+            logger.info(f"Using RFE model {self.loaded_model.name} with {len(self.rfe_features)} features")
         else:
             self.rfe_features = None
-            logger.info("Using full model")
+            logger.info(f"Using model {self.loaded_model.name}")
         
         # Load feature data to get feature names and defaults
         self.df_features = self._load_features()
@@ -120,6 +114,10 @@ class ConditionalArchetypePredictor:
             else:
                 self.feature_names = self._get_expected_features()
         
+        # Risk-quadrant thresholds (src/model/calibration.py); load_model() returns
+        # models whose predict_proba is already calibrated
+        self.risk_thresholds = risk_thresholds(getattr(self.model, 'calibration', None))
+        
         # Calculate feature distributions for Phase 3 fixes
         self._calculate_feature_distributions()
         
@@ -252,6 +250,10 @@ class ConditionalArchetypePredictor:
                 df_features['USG_PCT'] = df_features['USG_PCT'] / 100.0
                 logger.info(f"Normalized USG_PCT from percentage to decimal format in feature dataset")
         
+        # Compact dtypes (float32 metrics, categorical names/seasons): this frame lives as long as the predictor
+        df_features = apply_feature_dtypes(df_features)
+        logger.info(f"Feature dataset: {len(df_features)} rows, {frame_memory_mb(df_features):.1f} MB")
+        
         return df_features
     
     def _get_qualified_players(self, min_fga: int = 200, min_pressure_shots: int = 50) -> pd.DataFrame:
@@ -1124,9 +1126,9 @@ class ConditionalArchetypePredictor:
         flash_multiplier_applied = phase3_metadata.get('flash_multiplier_applied', False)
         player_data['_FLASH_MULTIPLIER_ACTIVE'] = flash_multiplier_applied
         
-        # Predict
+        # Predict (calibrated probabilities; the prediction is their argmax)
         probs = self.model.predict_proba(features)[0]
-        pred_class = self.model.predict(features)[0]
+        pred_class = int(np.argmax(probs))
         pred_archetype = self.encoder.inverse_transform([pred_class])[0]
         
         # Get probabilities for each archetype
@@ -2062,15 +2064,18 @@ class ConditionalArchetypePredictor:
         """
         Categorize player into risk quadrant based on Performance and Dependence scores.
         
-        Uses data-driven thresholds calculated from star-level players (USG_PCT > 25%):
-        - Low Dependence: < 0.3570 (33rd percentile)
-        - High Dependence: ≥ 0.4482 (66th percentile)
+        Thresholds come from self.risk_thresholds (src/model/calibration.py):
+        - Performance: the calibrated star-level scores at which the observed
+          star rate reaches 70% (high) and 30% (low); 0.70/0.30 until a
+          calibration is fitted
+        - Dependence: data-driven from star-level players (USG_PCT > 25%),
+          33rd percentile (low, default 0.3570) and 66th (high, default 0.4482)
         
         Quadrants:
-        - Franchise Cornerstone: High Performance (≥70%) + Low Dependence (<0.3570)
-        - Luxury Component: High Performance (≥70%) + High Dependence (≥0.4482)
-        - Depth: Low Performance (<30%) + Low Dependence (<0.3570)
-        - Avoid: Low Performance (<30%) + High Dependence (≥0.4482)
+        - Franchise Cornerstone: High Performance + Low Dependence
+        - Luxury Component: High Performance + High Dependence
+        - Depth: Low Performance + Low Dependence
+        - Avoid: Low Performance + High Dependence
         
         Args:
             performance_score: Star-level potential (0-1)
@@ -2079,33 +2084,25 @@ class ConditionalArchetypePredictor:
         Returns:
             Risk category string
         """
-        # Load data-driven thresholds
-        import json
-        thresholds_path = self.results_dir / "dependence_thresholds.json"
-        if thresholds_path.exists():
-            with open(thresholds_path, 'r') as f:
-                thresholds = json.load(f)
-                low_dep_threshold = thresholds.get('low_threshold', 0.3570)  # 33rd percentile
-                high_dep_threshold = thresholds.get('high_threshold', 0.4482)  # 66th percentile
-        else:
-            # Fallback to calculated values if file doesn't exist
-            low_dep_threshold = 0.3570  # 33rd percentile
-            high_dep_threshold = 0.4482  # 66th percentile
+        high_perf_threshold = self.risk_thresholds['performance_high']
+        low_perf_threshold = self.risk_thresholds['performance_low']
+        low_dep_threshold = self.risk_thresholds['dependence_low']
+        high_dep_threshold = self.risk_thresholds['dependence_high']
         
         if dependence_score is None:
             # If dependence score unavailable, categorize based on performance only
-            if performance_score >= 0.70:
+            if performance_score >= high_perf_threshold:
                 return "High Performance (Dependence Unknown)"
-            elif performance_score < 0.30:
+            elif performance_score < low_perf_threshold:
                 return "Low Performance (Dependence Unknown)"
             else:
                 return "Moderate Performance (Dependence Unknown)"
         
         # Categorize into quadrants using data-driven thresholds
-        high_performance = performance_score >= 0.70
-        low_performance = performance_score < 0.30
-        high_dependence = dependence_score >= high_dep_threshold  # ≥ 0.4482 (66th percentile)
-        low_dependence = dependence_score < low_dep_threshold  # < 0.3570 (33rd percentile)
+        high_performance = performance_score >= high_perf_threshold
+        low_performance = performance_score < low_perf_threshold
+        high_dependence = dependence_score >= high_dep_threshold  # 66th percentile
+        low_dependence = dependence_score < low_dep_threshold  # 33rd percentile
         
         if high_performance and low_dependence:
             return "Franchise Cornerstone"
@@ -2117,20 +2114,20 @@ class ConditionalArchetypePredictor:
             return "Avoid"
         else:
             # Moderate scores - use more nuanced categorization with data-driven thresholds
-            if performance_score >= 0.70:
+            if high_performance:
                 # High performance, moderate dependence
                 if dependence_score >= high_dep_threshold:
                     return "Luxury Component (Moderate Dependence)"
                 else:
                     return "Franchise Cornerstone (Moderate Dependence)"
-            elif performance_score < 0.30:
+            elif low_performance:
                 # Low performance, moderate dependence
                 if dependence_score >= high_dep_threshold:
                     return "Avoid (Moderate Dependence)"
                 else:
                     return "Depth (Moderate Dependence)"
             else:
-                # Moderate performance (30% <= performance < 70%)
+                # Moderate performance (between the low and high thresholds)
                 # PHASE 4.4 FIX: Allow "Luxury Component" for moderate performance + high dependence
                 # Principle: A player with 30% performance + 60% dependence is a high-value dependent piece (system merchant),
                 # not "moderate performance". This is correct 2D thinking: Performance and Dependence are orthogonal.
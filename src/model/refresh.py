@@ -0,0 +1,158 @@
+"""
+Incremental (warm-start) model refresh.
+
+Retraining a model from scratch over every season each time a new season of
+labels lands repeats all of the boosting the production model has already
+done. continue_boosting() instead adds a few rounds to the existing booster,
+fitted on the updated training set, so a refresh costs `extra_rounds` trees
+instead of the full ensemble.
+
+Whether that is good enough is checked on the walk-forward harness
+(src/model/season_cv.py): for every fold, the model trained on the previous
+fold's seasons stands in for production, and is both refreshed
+(continue_boosting on the fold's training seasons) and replaced by a full
+retrain. Both are scored on the fold's test season, with the unrefreshed
+("stale") model as a reference, and the fit times are compared.
+
+Example:
+    results = warm_start_parity("results/.cache/season_cv_folds.npz", features, trainer.build_model,
+                                extra_rounds=25, jobs=4)
+    summary = summarize_parity(results)   # time saved, metric deltas
+    refreshed = continue_boosting(production_model, X, y, sample_weight=w, extra_rounds=25)
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, log_loss
+
+from src.model.season_cv import PathLike, fold_worker, map_folds
+
+logger = logging.getLogger(__name__)
+
+
+def continue_boosting(model, X, y, sample_weight=None, extra_rounds: int = 25, n_jobs: Optional[int] = None):
+    """
+    A copy of a fitted XGBoost sklearn model with `extra_rounds` more boosting
+    rounds fitted on (X, y), starting from the model's booster.
+
+    Args:
+        model: Fitted XGBClassifier/XGBRegressor (not modified)
+        X, y, sample_weight: Updated training set (labels encoded like the model's)
+        extra_rounds: Boosting rounds to add
+        n_jobs: Training threads (default: the model's)
+
+    Returns:
+        The refreshed model; its n_estimators is the total round count
+    """
+    params = model.get_params()
+    params['n_estimators'] = extra_rounds
+    if n_jobs is not None:
+        params['n_jobs'] = n_jobs
+    refreshed = type(model)(**params)
+    refreshed.fit(X, y, sample_weight=sample_weight, xgb_model=model.get_booster())
+    refreshed.set_params(n_estimators=refreshed.get_booster().num_boosted_rounds())
+    return refreshed
+
+
+def _fold_metrics(model, X_test: np.ndarray, y_test: np.ndarray, n_classes: int, prefix: str) -> Dict:
+    if n_classes:
+        proba = model.predict_proba(X_test)
+        labels = np.arange(n_classes)
+        return {f'{prefix}_accuracy': accuracy_score(y_test, proba.argmax(axis=1)),
+                f'{prefix}_log_loss': log_loss(y_test, proba, labels=labels)}
+    pred = model.predict(X_test)
+    return {f'{prefix}_rmse': float(np.sqrt(np.mean((pred - y_test) ** 2)))}
+
+
+def _parity_fold(task: tuple) -> Dict:
+    """Previous-fold model vs its warm-start refresh vs a full retrain, on one fold."""
+    fold, features, extra_rounds = task
+    worker = fold_worker()
+    folds = worker['folds']
+    idx = [folds.columns.index(f) for f in features if f in folds.columns]
+    previous_train, train, test = folds.train_rows[fold - 1], folds.train_rows[fold], folds.test_rows[fold]
+    X_train, y_train = folds.X[np.ix_(train, idx)], folds.y[train]
+    X_test, y_test = folds.X[np.ix_(test, idx)], folds.y[test]
+    factory, threads = worker['model_factory'], worker['threads']
+
+    previous = factory(n_jobs=threads)
+    previous.fit(folds.X[np.ix_(previous_train, idx)], folds.y[previous_train], sample_weight=folds.weights[fold - 1])
+
+    start = time.perf_counter()
+    full = factory(n_jobs=threads)
+    full.fit(X_train, y_train, sample_weight=folds.weights[fold])
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = continue_boosting(previous, X_train, y_train, folds.weights[fold], extra_rounds, n_jobs=threads)
+    warm_seconds = time.perf_counter() - start
+
+    row = {
+        'test_season': folds.test_years[fold],
+        'previous_test_season': folds.test_years[fold - 1],
+        'n_train': len(train),
+        'n_new': len(train) - len(previous_train),
+        'n_test': len(test),
+        'full_seconds': full_seconds,
+        'warm_seconds': warm_seconds,
+    }
+    n_classes = len(folds.classes)
+    for prefix, model in (('stale', previous), ('full', full), ('warm', warm)):
+        row.update(_fold_metrics(model, X_test, y_test, n_classes, prefix))
+    return row
+
+
+def warm_start_parity(path: PathLike, features: Sequence[str], model_factory: Callable, extra_rounds: int = 25,
+                      jobs: int = 1, threads: int = 1) -> pd.DataFrame:
+    """
+    Warm-start refresh vs full retrain on every fold after the first.
+
+    Args:
+        path: Saved FoldMatrices (.npz); regression folds have no classes
+        features: Feature list
+        model_factory: Picklable callable model_factory(n_jobs=...) -> unfitted XGBoost model
+        extra_rounds: Rounds the refresh adds
+        jobs: Worker processes
+        threads: Model threads per worker
+
+    Returns:
+        One row per fold: fit seconds and test metrics of the stale,
+        full-retrain and warm-start models
+    """
+    with np.load(path, allow_pickle=False) as data:
+        n_folds = len(data['test_years'])
+    tasks = [(fold, list(features), extra_rounds) for fold in range(1, n_folds)]
+    if not tasks:
+        raise ValueError(f"{path} has {n_folds} fold(s); the parity check needs at least two")
+    jobs = max(1, min(jobs, len(tasks)))
+    logger.info(f"Warm-start parity: {len(tasks)} folds, +{extra_rounds} rounds, {jobs} processes x {threads} threads")
+    return pd.DataFrame(map_folds(_parity_fold, tasks, path, model_factory, jobs=jobs, threads=threads))
+
+
+def summarize_parity(results: pd.DataFrame) -> Dict:
+    """
+    Time saved and metric deltas (warm minus full, and warm minus stale) over the folds.
+
+    Positive accuracy deltas and negative log-loss/RMSE deltas favour the warm start.
+    """
+    full_seconds = float(results['full_seconds'].sum())
+    warm_seconds = float(results['warm_seconds'].sum())
+    summary = {
+        'folds': int(len(results)),
+        'full_seconds': round(full_seconds, 3),
+        'warm_seconds': round(warm_seconds, 3),
+        'time_saved_seconds': round(full_seconds - warm_seconds, 3),
+        'speedup': round(full_seconds / warm_seconds, 2) if warm_seconds else float('nan'),
+    }
+    for metric in ('accuracy', 'log_loss', 'rmse'):
+        if f'full_{metric}' in results:
+            summary[f'full_{metric}'] = float(results[f'full_{metric}'].mean())
+            summary[f'warm_{metric}'] = float(results[f'warm_{metric}'].mean())
+            summary[f'{metric}_delta'] = float((results[f'warm_{metric}'] - results[f'full_{metric}']).mean())
+            summary[f'{metric}_delta_vs_stale'] = float(
+                (results[f'warm_{metric}'] - results[f'stale_{metric}']).mean())
+    return summary
@@ -0,0 +1,376 @@
+"""
+Model registry (models/registry.json).
+
+The registry is the single source of truth for which model artifacts to
+load. Each entry describes one trained model: its role (archetype,
+telescope, crucible), status, artifact paths (model, encoder, feature list,
+metadata) and the SHA-256 of every artifact. The `production` map names the
+production model of each role.
+
+load_model() resolves "production" (for a role) or a model name, optionally
+pinned to a version ("resilience_xgb_rfe_15@1.0.0"), verifies the artifact
+checksums and loads the artifacts on first use: the portable model artifact
+(src/model/artifact.py) if one is registered, the pickles otherwise. Either
+way the returned classifier's predict_proba is calibrated if a calibration
+was fitted for it (src/model/calibration.py). Loaded models are
+memoized per process, keyed by name and checksum, so every caller gets the
+same instance and a model is never loaded twice; preload_models() warms the
+cache on a background thread. Trainers call register_model() after saving
+artifacts so the checksums always describe the files on disk.
+
+The registry also records tuned hyperparameters per model name, written by
+the hyperparameter search and read back by the trainers, so a retrain picks
+up the searched configuration instead of hard-coded values.
+
+Example:
+    loaded = load_model("production")            # archetype production model
+    loaded.model.predict_proba(X[loaded.features])
+    telescope = load_model("production", role="telescope")
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from src.model.artifact import load_artifact
+from src.model.calibration import CalibratedModel, read_calibration
+from src.nba_data.utils.hashing import file_digest
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_PATH = Path("models/registry.json")
+ARTIFACT_FIELDS = ('path', 'encoder_path', 'features_path', 'metadata_path', 'artifact_path')
+STATUSES = ('production', 'staging', 'archive')
+
+PathLike = Union[str, Path]
+
+
+class ModelRegistryError(RuntimeError):
+    """Raised when a model cannot be resolved or its artifacts do not match the registry."""
+
+
+def load_registry(path: PathLike = REGISTRY_PATH) -> Dict[str, Any]:
+    """Registry contents, or an empty registry if the file does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return {'registry_version': '1.0.0', 'models': {}, 'production': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_registry(registry: Dict[str, Any], path: PathLike = REGISTRY_PATH) -> Path:
+    """Write the registry atomically and stamp last_updated."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    registry['last_updated'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(registry, f, indent=2)
+        f.write('\n')
+    tmp_path.replace(path)
+    return path
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """A resolved registry entry."""
+    name: str
+    version: str
+    role: str
+    status: str
+    path: str
+    encoder_path: Optional[str] = None
+    features_path: Optional[str] = None
+    metadata_path: Optional[str] = None
+    artifact_path: Optional[str] = None
+    checksums: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_entry(cls, name: str, entry: Dict[str, Any]) -> 'ModelSpec':
+        return cls(
+            name=name, version=entry.get('version', ''), role=entry.get('role', ''),
+            status=entry.get('status', ''), path=entry['path'],
+            encoder_path=entry.get('encoder_path'), features_path=entry.get('features_path'),
+            metadata_path=entry.get('metadata_path'), artifact_path=entry.get('artifact_path'),
+            checksums=entry.get('checksums') or {},
+        )
+
+    def artifacts(self) -> Dict[str, str]:
+        """Artifact field -> path, for the artifacts this model has."""
+        return {f: getattr(self, f) for f in ARTIFACT_FIELDS if getattr(self, f)}
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """A model and its companion artifacts, loaded once per process."""
+    spec: ModelSpec
+    model: Any
+    encoder: Any = None
+    features: Optional[List[str]] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+
+def resolve(ref: str = 'production', role: str = 'archetype', path: PathLike = REGISTRY_PATH) -> ModelSpec:
+    """
+    Registry entry for `ref`.
+
+    Args:
+        ref: 'production' (the production model of `role`), a model name, or
+            'name@version' to also require a version
+        role: Role whose production model 'production' refers to
+        path: Registry file
+
+    Raises:
+        ModelRegistryError: Unknown name or role, version mismatch, or a
+            production map that disagrees with the entries' status
+    """
+    registry = load_registry(path)
+    models = registry.get('models', {})
+
+    if ref == 'production':
+        name = registry.get('production', {}).get(role)
+        if name is None:
+            raise ModelRegistryError(f"No production model registered for role '{role}' in {path}")
+        others = [n for n, e in models.items()
+                  if e.get('role') == role and e.get('status') == 'production' and n != name]
+        if others:
+            raise ModelRegistryError(f"Role '{role}' has production model {name} but {others} are also "
+                                     f"marked production in {path}")
+        version = None
+    else:
+        name, _, version = ref.partition('@')
+
+    if name not in models:
+        raise ModelRegistryError(f"Model '{name}' is not in the registry {path}")
+    spec = ModelSpec.from_entry(name, models[name])
+    if version and spec.version != version:
+        raise ModelRegistryError(f"Model '{name}' is version {spec.version} in {path}, not {version}")
+    if ref == 'production' and spec.status != 'production':
+        raise ModelRegistryError(f"Production model {name} for role '{role}' has status '{spec.status}'")
+    return spec
+
+
+def verify_artifacts(spec: ModelSpec):
+    """Raise ModelRegistryError if an artifact is missing or differs from its registered checksum."""
+    for field, artifact in spec.artifacts().items():
+        if not Path(artifact).exists():
+            raise ModelRegistryError(f"{spec.name}: {field} {artifact} does not exist")
+        expected = spec.checksums.get(field)
+        if expected is None:
+            raise ModelRegistryError(f"{spec.name}: no checksum registered for {artifact}; re-register the model")
+        actual = file_digest(artifact)
+        if actual != expected:
+            raise ModelRegistryError(f"{spec.name}: checksum mismatch for {artifact} "
+                                     f"(registry {expected[:12]}, file {actual[:12]}); re-register the model")
+
+
+def _read_features(path: str) -> List[str]:
+    """Feature list from a JSON list or a training-results file with a 'features' key."""
+    with open(path) as f:
+        data = json.load(f)
+    return list(data['features'] if isinstance(data, dict) else data)
+
+
+def _load(spec: ModelSpec, verify: bool) -> LoadedModel:
+    if verify:
+        verify_artifacts(spec)
+    if spec.artifact_path:
+        return _load_artifact(spec)
+
+    import joblib
+
+    model = joblib.load(spec.path)
+    encoder = joblib.load(spec.encoder_path) if spec.encoder_path else None
+    # The fitted column order is authoritative; the feature file covers models fitted on arrays
+    if hasattr(model, 'feature_names_in_'):
+        features = list(model.feature_names_in_)
+    else:
+        features = _read_features(spec.features_path) if spec.features_path else None
+    metadata = None
+    if spec.metadata_path:
+        with open(spec.metadata_path) as f:
+            metadata = json.load(f)
+    # Artifacts carry their calibration; pickled classifiers get it from the calibration file
+    calibration = read_calibration(spec.name, features) if hasattr(model, 'predict_proba') else None
+    if calibration:
+        classes = encoder.classes_ if encoder is not None else getattr(model, 'classes_', None)
+        model = CalibratedModel(model, calibration, classes)
+    logger.info(f"Loaded model {spec.name} v{spec.version} ({spec.status}) from {spec.path}")
+    return LoadedModel(spec=spec, model=model, encoder=encoder, features=features, metadata=metadata)
+
+
+def _load_artifact(spec: ModelSpec) -> LoadedModel:
+    """Load from the portable artifact: no pickles, no sklearn."""
+    artifact = load_artifact(spec.artifact_path, verify=False)  # file checksum verified above
+    metadata = artifact.metadata or None
+    if spec.metadata_path:
+        with open(spec.metadata_path) as f:
+            metadata = json.load(f)
+    logger.info(f"Loaded model {spec.name} v{spec.version} ({spec.status}) from {spec.artifact_path}")
+    return LoadedModel(spec=spec, model=artifact, encoder=artifact.encoder, features=artifact.features,
+                       metadata=metadata)
+
+
+_CACHE: Dict[tuple, LoadedModel] = {}
+_LOCKS: Dict[tuple, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def load_model(ref: str = 'production', role: str = 'archetype', verify: bool = True,
+               path: PathLike = REGISTRY_PATH) -> LoadedModel:
+    """
+    Resolve `ref` and load its artifacts, memoized per process.
+
+    Concurrent calls for the same model (e.g. a background preload and a
+    request) wait for one load instead of loading twice.
+
+    Raises:
+        ModelRegistryError: see resolve() and verify_artifacts()
+    """
+    spec = resolve(ref, role=role, path=path)
+    key = (spec.name, spec.version, tuple(sorted(spec.checksums.items())))
+    with _LOCKS_GUARD:
+        lock = _LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _CACHE:
+            _CACHE[key] = _load(spec, verify)
+        return _CACHE[key]
+
+
+def preload_models(refs: Iterable[Union[str, tuple]] = ('production',),
+                   path: PathLike = REGISTRY_PATH) -> threading.Thread:
+    """
+    Load models on a daemon thread so the first request does not pay for unpickling.
+
+    Args:
+        refs: References for load_model(); (ref, role) tuples select a role
+
+    Returns:
+        The started thread (join() it to wait)
+    """
+    refs = [(r, 'archetype') if isinstance(r, str) else tuple(r) for r in refs]
+
+    def _preload():
+        for ref, role in refs:
+            try:
+                load_model(ref, role=role, path=path)
+            except (ModelRegistryError, OSError) as e:
+                logger.warning(f"Preloading {ref} ({role}) failed: {e}")
+
+    thread = threading.Thread(target=_preload, name='model-preload', daemon=True)
+    thread.start()
+    return thread
+
+
+def clear_cache():
+    """Forget loaded models (e.g. after re-registering artifacts in a long-running process)."""
+    with _LOCKS_GUARD:
+        _CACHE.clear()
+        _LOCKS.clear()
+
+
+def register_model(name: str, path: PathLike, role: str, encoder_path: Optional[PathLike] = None,
+                   features_path: Optional[PathLike] = None, metadata_path: Optional[PathLike] = None,
+                   artifact_path: Optional[PathLike] = None, status: Optional[str] = None,
+                   registry_path: PathLike = REGISTRY_PATH, **fields) -> ModelSpec:
+    """
+    Add or update a registry entry with the checksums of its artifacts.
+
+    Called after a trainer saves its artifacts. An existing entry keeps its
+    status (and other fields) unless given; a new entry starts as 'staging'.
+    status='production' makes it the production model of its role and moves
+    the previous one to 'staging'.
+
+    Args:
+        name: Model name (e.g. 'resilience_xgb_rfe_15')
+        path, encoder_path, features_path, metadata_path: Artifact files
+        artifact_path: Portable model artifact (src/model/artifact.py); when
+            registered, load_model() loads it instead of the pickles
+        role: 'archetype', 'telescope', 'crucible', ...
+        status: 'production', 'staging' or 'archive'
+        fields: Other entry fields (version, accuracy, training_date, description, ...)
+    """
+    if status is not None and status not in STATUSES:
+        raise ValueError(f"Unknown status '{status}'; expected one of {STATUSES}")
+    registry = load_registry(registry_path)
+    models = registry.setdefault('models', {})
+    entry = models.setdefault(name, {'status': 'staging'})
+    entry.update(fields)
+    entry['role'] = role
+    artifacts = {'path': path, 'encoder_path': encoder_path, 'features_path': features_path,
+                 'metadata_path': metadata_path, 'artifact_path': artifact_path}
+    for field, artifact in artifacts.items():
+        if artifact is not None:
+            if not Path(artifact).exists():
+                raise ModelRegistryError(f"Cannot register {name}: {field} {artifact} does not exist")
+            entry[field] = str(artifact)
+    previous_model_checksum = entry.get('checksums', {}).get('path')
+    if artifact_path is None and entry.get('artifact_path') and previous_model_checksum != file_digest(path):
+        # The model was retrained; its old portable artifact no longer matches
+        logger.warning(f"{name}: dropping stale artifact {entry.pop('artifact_path')}; re-export it")
+    entry['checksums'] = {f: file_digest(entry[f]) for f in ARTIFACT_FIELDS if entry.get(f)}
+
+    if status is not None:
+        entry['status'] = status
+    if entry['status'] == 'production':
+        previous = registry.setdefault('production', {}).get(role)
+        if previous and previous != name and previous in models:
+            models[previous]['status'] = 'staging'
+        registry['production'][role] = name
+
+    save_registry(registry, registry_path)
+    logger.info(f"Registered {name} ({entry['status']}, role {role}) in {registry_path}")
+    return ModelSpec.from_entry(name, entry)
+
+
+def registered_hyperparameters(model_name: str, path: PathLike = REGISTRY_PATH) -> Dict[str, Any]:
+    """
+    Tuned XGBoost keyword arguments for `model_name` ({} if none are registered).
+
+    Includes n_estimators (the early-stopped round count) alongside the
+    searched parameters, so the result can be passed straight to
+    XGBClassifier/XGBRegressor.
+    """
+    try:
+        entry = load_registry(path).get('hyperparameters', {}).get(model_name)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read model registry {path}: {e}")
+        return {}
+    if not entry:
+        return {}
+    return {**entry['params'], 'n_estimators': entry['n_estimators']}
+
+
+def register_hyperparameters(model_name: str, params: Dict[str, Any], n_estimators: int,
+                             cv_score: float, metric: str, study: Optional[Dict[str, Any]] = None,
+                             path: PathLike = REGISTRY_PATH) -> Path:
+    """
+    Record the best configuration found for `model_name`.
+
+    Args:
+        model_name: Registry model name (e.g. 'resilience_xgb_rfe_15')
+        params: XGBoost parameters (sklearn names) excluding n_estimators
+        n_estimators: Boosting rounds to train with
+        cv_score: Mean walk-forward CV score of the configuration
+        metric: Name of cv_score's metric (lower is better)
+        study: Search details (trial count, budget, fold seasons, ...)
+    """
+    registry = load_registry(path)
+    registry.setdefault('hyperparameters', {})[model_name] = {
+        'params': params,
+        'n_estimators': int(n_estimators),
+        'cv_score': float(cv_score),
+        'metric': metric,
+        'tuned_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'study': study or {},
+    }
+    logger.info(f"Registered hyperparameters for {model_name} ({metric}={cv_score:.4f}) in {path}")
+    return save_registry(registry, path)
@@ -0,0 +1,368 @@
+"""
+Season-rolling (walk-forward) cross-validation for the resilience models.
+
+A single temporal holdout (train <= 2020, test 2021+) gives one accuracy
+number per model, too noisy to tell two feature sets apart. Walk-forward CV
+trains on every season up to k and tests on season k+1, for each k, so every
+model variant is scored on several seasons and variants can be compared
+fold by fold (paired).
+
+Fold matrices are materialized once: the feature matrix, labels and, for
+every fold, the train/test rows and the sample weights computed from that
+fold's training rows (weights normalized within the training set must not
+see the test season). They are saved as one .npz file that each worker
+process loads once, and (fold, variant) pairs are fitted in parallel.
+
+Example:
+    folds = build_fold_matrices(X, y, season_year, columns, classes,
+                                weight_fn=lambda rows: weights_for(rows))
+    folds.save("results/.cache/season_cv_folds.npz")
+    results = evaluate_folds("results/.cache/season_cv_folds.npz", variants, model_factory, jobs=4)
+    summary = summarize_folds(results, baseline="rfe_15")
+"""
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score, log_loss
+
+try:
+    from scipy import stats
+except ImportError:
+    stats = None
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+def walk_forward_folds(season_year: np.ndarray, min_train_seasons: int = 3,
+                       test_years: Optional[Sequence[int]] = None) -> List[tuple]:
+    """
+    Walk-forward splits: train on seasons <= k, test on season k+1.
+
+    Args:
+        season_year: Starting year of each row's season (2019 for '2019-20')
+        min_train_seasons: Seasons required in the first training window
+        test_years: Restrict the folds to these test seasons
+
+    Returns:
+        List of (test_year, train_rows, test_rows) with integer row positions
+    """
+    season_year = np.asarray(season_year)
+    years = np.unique(season_year)
+    folds = []
+    for i in range(min_train_seasons, len(years)):
+        test_year = int(years[i])
+        if test_years is not None and test_year not in test_years:
+            continue
+        train_rows = np.flatnonzero(season_year < test_year)
+        test_rows = np.flatnonzero(season_year == test_year)
+        folds.append((test_year, train_rows, test_rows))
+    return folds
+
+
+@dataclass
+class FoldMatrices:
+    """Feature matrix, labels and per-fold rows/weights for walk-forward CV."""
+    X: np.ndarray
+    y: np.ndarray
+    columns: List[str]
+    classes: List[str]
+    season_year: np.ndarray
+    test_years: List[int]
+    train_rows: List[np.ndarray]
+    test_rows: List[np.ndarray]
+    weights: List[np.ndarray]
+    key: str = ""
+
+    @property
+    def n_folds(self) -> int:
+        return len(self.test_years)
+
+    def save(self, path: PathLike) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            'X': self.X, 'y': self.y,
+            'columns': np.array(self.columns, dtype=str),
+            'classes': np.array(self.classes, dtype=str),
+            'season_year': self.season_year,
+            'test_years': np.array(self.test_years, dtype=np.int64),
+            'key': np.array(self.key),
+        }
+        for i in range(self.n_folds):
+            arrays[f'train_{i}'] = self.train_rows[i]
+            arrays[f'test_{i}'] = self.test_rows[i]
+            arrays[f'weights_{i}'] = self.weights[i]
+        tmp_path = path.with_name(path.stem + '.tmp.npz')
+        np.savez(tmp_path, **arrays)
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: PathLike) -> 'FoldMatrices':
+        with np.load(path, allow_pickle=False) as data:
+            test_years = data['test_years'].tolist()
+            return cls(
+                X=data['X'], y=data['y'],
+                columns=data['columns'].tolist(), classes=data['classes'].tolist(),
+                season_year=data['season_year'], test_years=test_years,
+                train_rows=[data[f'train_{i}'] for i in range(len(test_years))],
+                test_rows=[data[f'test_{i}'] for i in range(len(test_years))],
+                weights=[data[f'weights_{i}'] for i in range(len(test_years))],
+                key=str(data['key']),
+            )
+
+    @staticmethod
+    def cached_key(path: PathLike) -> Optional[str]:
+        """Key stored with a saved matrix, or None if there is no readable file."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return str(data['key'])
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def build_fold_matrices(X: np.ndarray, y: np.ndarray, season_year: np.ndarray,
+                        columns: Sequence[str], classes: Sequence[str],
+                        weight_fn: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                        min_train_seasons: int = 3, test_years: Optional[Sequence[int]] = None,
+                        key: str = "") -> FoldMatrices:
+    """
+    Materialize the walk-forward folds.
+
+    Args:
+        X: Feature matrix (rows x columns); stored as float32
+        y: Encoded labels (0..n_classes-1), or regression targets when
+            `classes` is empty
+        season_year: Starting year of each row's season
+        columns: Feature names of X's columns
+        classes: Label names, indexed by y
+        weight_fn: Training-row positions -> sample weights for those rows
+            (computed from the fold's training rows only); None for unit weights
+        min_train_seasons: Seasons required in the first training window
+        test_years: Restrict the folds to these test seasons
+        key: Fingerprint of the inputs, stored for cache validation
+
+    Returns:
+        FoldMatrices
+    """
+    y = np.asarray(y)
+    test_years_out, train_rows, test_rows, weights = [], [], [], []
+    for test_year, train, test in walk_forward_folds(season_year, min_train_seasons, test_years):
+        missing = sorted(set(range(len(classes))) - set(np.unique(y[train]).tolist()))
+        if missing:
+            logger.warning(f"Skipping fold {test_year}: no training rows for {[classes[i] for i in missing]}")
+            continue
+        fold_weights = np.ones(len(train)) if weight_fn is None else np.asarray(weight_fn(train), dtype=np.float64)
+        test_years_out.append(test_year)
+        train_rows.append(train)
+        test_rows.append(test)
+        weights.append(fold_weights)
+        logger.info(f"Fold {test_year}: {len(train)} train / {len(test)} test rows")
+
+    return FoldMatrices(
+        X=np.asarray(X, dtype=np.float32), y=y.astype(np.int32 if len(classes) else np.float64),
+        columns=list(columns),
+        classes=list(classes), season_year=np.asarray(season_year, dtype=np.int64),
+        test_years=test_years_out, train_rows=train_rows, test_rows=test_rows, weights=weights, key=key,
+    )
+
+
+_WORKER = {}
+
+
+def _init_cv_worker(path: str, model_factory: Callable, threads: int):
+    """Process-pool initializer: load the fold matrices once per worker; models get `threads` as n_jobs."""
+    _WORKER['folds'] = FoldMatrices.load(path)
+    _WORKER['model_factory'] = model_factory
+    _WORKER['threads'] = threads
+
+
+def fold_worker() -> Dict:
+    """
+    The calling worker's state inside map_folds(): 'folds' (FoldMatrices),
+    'model_factory' and 'threads' (pass as the models' n_jobs).
+    """
+    return _WORKER
+
+
+def map_folds(fn: Callable, tasks: Sequence, path: PathLike, model_factory: Callable,
+              jobs: int = 1, threads: int = 1) -> List:
+    """
+    [fn(task) for task in tasks], in `jobs` worker processes that each load
+    the fold matrices at `path` once (in this process if jobs == 1).
+
+    Args:
+        fn: Picklable (module-level) function of one task; reads the folds
+            through fold_worker()
+        tasks: Picklable task tuples
+        path: Saved FoldMatrices (.npz)
+        model_factory: Picklable callable model_factory(n_jobs=...) -> unfitted model
+        jobs: Worker processes
+        threads: Model threads per worker
+    """
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_cv_worker,
+                                 initargs=(str(path), model_factory, threads)) as pool:
+            return list(pool.map(fn, tasks))
+    _init_cv_worker(str(path), model_factory, threads)
+    return [fn(task) for task in tasks]
+
+
+def _fit_fold(task: tuple) -> Dict:
+    """Fit one variant on one fold and score it on the fold's test season."""
+    fold, variant, features = task
+    folds = _WORKER['folds']
+    missing = [f for f in features if f not in folds.columns]
+    features = [f for f in features if f in folds.columns]
+    idx = [folds.columns.index(f) for f in features]
+    train, test = folds.train_rows[fold], folds.test_rows[fold]
+    X_train = folds.X[np.ix_(train, idx)]
+    X_test = folds.X[np.ix_(test, idx)]
+
+    start = time.perf_counter()
+    model = _WORKER['model_factory'](n_jobs=_WORKER['threads'])
+    model.fit(X_train, folds.y[train], sample_weight=folds.weights[fold])
+    fit_seconds = time.perf_counter() - start
+
+    proba = model.predict_proba(X_test)
+    y_test = folds.y[test]
+    y_pred = proba.argmax(axis=1)
+    labels = np.arange(len(folds.classes))
+    return {
+        'variant': variant,
+        'test_season': folds.test_years[fold],
+        'n_train': len(train),
+        'n_test': len(test),
+        'n_features': len(features),
+        'accuracy': accuracy_score(y_test, y_pred),
+        'correct': int((y_pred == y_test).sum()),
+        'macro_f1': f1_score(y_test, y_pred, labels=labels, average='macro', zero_division=0),
+        'log_loss': log_loss(y_test, proba, labels=labels),
+        'fit_seconds': fit_seconds,
+        'eval_seconds': time.perf_counter() - start,
+        'missing_features': missing,
+    }
+
+
+def evaluate_folds(path: PathLike, variants: Dict[str, Sequence[str]], model_factory: Callable,
+                   jobs: int = 1, threads: int = 1) -> pd.DataFrame:
+    """
+    Fit every variant on every fold.
+
+    Args:
+        path: Saved FoldMatrices (.npz)
+        variants: Variant name -> feature list
+        model_factory: Picklable callable model_factory(n_jobs=...) -> unfitted classifier
+        jobs: Worker processes
+        threads: Model threads per worker
+
+    Returns:
+        One row per (variant, test season)
+    """
+    with np.load(path, allow_pickle=False) as data:
+        n_folds = len(data['test_years'])
+    tasks = [(fold, name, list(features)) for name, features in variants.items() for fold in range(n_folds)]
+    jobs = max(1, min(jobs, len(tasks)))
+    logger.info(f"Evaluating {len(variants)} variants x {n_folds} folds on {jobs} processes x {threads} threads...")
+    return pd.DataFrame(map_folds(_fit_fold, tasks, path, model_factory, jobs=jobs, threads=threads))
+
+
+def _predict_fold(task: tuple) -> tuple:
+    """Fit on one fold's training seasons; (test rows, test-season probabilities)."""
+    fold, features = task
+    folds = _WORKER['folds']
+    idx = [folds.columns.index(f) for f in features if f in folds.columns]
+    train, test = folds.train_rows[fold], folds.test_rows[fold]
+    model = _WORKER['model_factory'](n_jobs=_WORKER['threads'])
+    model.fit(folds.X[np.ix_(train, idx)], folds.y[train], sample_weight=folds.weights[fold])
+    return test, model.predict_proba(folds.X[np.ix_(test, idx)])
+
+
+def out_of_fold_predictions(path: PathLike, features: Sequence[str], model_factory: Callable,
+                            jobs: int = 1, threads: int = 1) -> tuple:
+    """
+    Walk-forward out-of-fold class probabilities: every test season is
+    predicted by a model that never saw it.
+
+    Args:
+        path: Saved FoldMatrices (.npz) of a classifier
+        features: Feature list
+        model_factory: Picklable callable model_factory(n_jobs=...) -> unfitted classifier
+        jobs: Worker processes
+        threads: Model threads per worker
+
+    Returns:
+        (proba, y, rows, classes): probabilities (n x classes), encoded labels
+        and matrix rows of every test-season row, in fold order, and the
+        class names
+    """
+    with np.load(path, allow_pickle=False) as data:
+        n_folds = len(data['test_years'])
+        y_all, classes = data['y'], data['classes'].tolist()
+    if not classes:
+        raise ValueError(f"{path} holds regression folds; out-of-fold probabilities need classes")
+    tasks = [(fold, list(features)) for fold in range(n_folds)]
+    jobs = max(1, min(jobs, len(tasks)))
+    logger.info(f"Out-of-fold predictions: {n_folds} folds on {jobs} processes x {threads} threads...")
+    parts = map_folds(_predict_fold, tasks, path, model_factory, jobs=jobs, threads=threads)
+    rows = np.concatenate([test for test, _ in parts])
+    proba = np.concatenate([p for _, p in parts])
+    return proba, y_all[rows].astype(np.int64), rows, classes
+
+
+def summarize_folds(results: pd.DataFrame, baseline: Optional[str] = None) -> pd.DataFrame:
+    """
+    Aggregate fold metrics per variant, with a paired comparison to `baseline`.
+
+    Accuracy is reported as the mean over folds (with its standard error) and
+    pooled over all test rows. Against the baseline, the per-fold accuracy
+    differences give the mean difference, wins/losses and a paired t-test
+    p-value (NaN without scipy or with fewer than two folds).
+
+    Returns:
+        One row per variant, sorted by mean accuracy
+    """
+    grouped = results.groupby('variant', sort=False)
+    summary = pd.DataFrame({
+        'folds': grouped.size(),
+        'mean_accuracy': grouped['accuracy'].mean(),
+        'std_accuracy': grouped['accuracy'].std(ddof=1),
+        'sem_accuracy': grouped['accuracy'].std(ddof=1) / np.sqrt(grouped.size()),
+        'pooled_accuracy': grouped['correct'].sum() / grouped['n_test'].sum(),
+        'mean_macro_f1': grouped['macro_f1'].mean(),
+        'mean_log_loss': grouped['log_loss'].mean(),
+        'fit_seconds': grouped['fit_seconds'].sum(),
+    })
+
+    if baseline is not None and baseline in summary.index:
+        by_fold = results.pivot(index='test_season', columns='variant', values='accuracy')
+        loss_by_fold = results.pivot(index='test_season', columns='variant', values='log_loss')
+        base = by_fold[baseline]
+        diff = by_fold.sub(base, axis=0)
+        summary['delta_vs_baseline'] = diff.mean()
+        summary['wins_vs_baseline'] = (diff > 0).sum()
+        summary['losses_vs_baseline'] = (diff < 0).sum()
+        summary['log_loss_delta_vs_baseline'] = loss_by_fold.sub(loss_by_fold[baseline], axis=0).mean()
+        summary['p_value_vs_baseline'] = [
+            _paired_p_value(by_fold[variant], base) if variant != baseline else np.nan
+            for variant in summary.index
+        ]
+
+    return summary.sort_values('mean_accuracy', ascending=False).rename_axis('variant').reset_index()
+
+
+def _paired_p_value(a: pd.Series, b: pd.Series) -> float:
+    """Two-sided paired t-test p-value over the folds both variants were scored on."""
+    pairs = pd.concat([a, b], axis=1).dropna()
+    if stats is None or len(pairs) < 2 or np.allclose(pairs.iloc[:, 0], pairs.iloc[:, 1]):
+        return np.nan
+    return float(stats.ttest_rel(pairs.iloc[:, 0], pairs.iloc[:, 1]).pvalue)
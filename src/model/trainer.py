@@ -17,18 +17,25 @@ try:
 except ImportError:
     XGBClassifier = None
 
+from .registry import registered_hyperparameters
+
 logger = logging.getLogger(__name__)
 
 
 class ResilienceModelTrainer:
     """Trainer for resilience prediction models."""
 
-    def __init__(self, config: Optional[Dict] = None):
-        self.config = config or self._get_default_config()
+    def __init__(self, config: Optional[Dict] = None, model_name: Optional[str] = None):
+        self.config = config or self._get_default_config(model_name)
+
+    def _get_default_config(self, model_name: Optional[str] = None) -> Dict:
+        """
+        Get default training configuration.
 
-    def _get_default_config(self) -> Dict:
-        """Get default training configuration."""
-        return {
+        Hyperparameters registered for `model_name` in models/registry.json
+        (by the hyperparameter search) override the defaults.
+        """
+        config = {
             'model_type': 'xgboost',
             'n_estimators': 100,
             'max_depth': 6,
@@ -39,6 +46,9 @@ class ResilienceModelTrainer:
             'num_class': 4,
             'random_state': 42
         }
+        if model_name:
+            config.update(registered_hyperparameters(model_name))
+        return config
 
     def train_full_model(
         self,
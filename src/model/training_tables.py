@@ -0,0 +1,268 @@
+"""
+Training Tables
+
+The RFE, Telescope and Crucible trainers (and build_crucible_dataset.py)
+each re-read and re-merge overlapping CSVs from results/ and data/ and
+recompute derived columns such as the Crucible sample weights on every run.
+A training table is the output of one of those assembly steps, stored once
+as a named, versioned table with its label and weight columns:
+
+    results/.cache/training_tables/<name>/manifest.json
+    results/.cache/training_tables/<name>/<i>.npy      one file per column
+
+The manifest records the table's fingerprint: the SHA-256 of the table
+version, the input files, the code that assembles it and its parameters.
+load_or_build() reuses the stored table while the fingerprint matches and
+rebuilds it otherwise. Columns are stored as plain .npy arrays (categoricals
+and strings as integer codes, nullable integers with a mask) and loaded
+memory-mapped copy-on-write, so a repeated training run skips the merge
+phase and the CSV parsing, and changes to the loaded frame never reach the
+stored table.
+
+Example:
+    table = load_or_build("archetype", build=merge_features_and_labels, version=1,
+                          inputs=["results/predictive_dataset_with_friction.csv",
+                                  "results/resilience_archetypes.csv"],
+                          code=[__file__], label="ARCHETYPE", weight="CRUCIBLE_WEIGHT")
+    df, y, w = table.frame, table.labels, table.weights
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.nba_data.utils.hashing import file_digest
+
+logger = logging.getLogger(__name__)
+
+TABLES_DIR = Path("results/.cache/training_tables")
+MANIFEST_NAME = "manifest.json"
+
+PathLike = Union[str, Path]
+
+_MASKED_ARRAYS = {
+    'IntegerArray': pd.arrays.IntegerArray,
+    'FloatingArray': pd.arrays.FloatingArray,
+    'BooleanArray': pd.arrays.BooleanArray,
+}
+
+
+class TrainingTableError(RuntimeError):
+    """Raised when a training table cannot be stored or read back."""
+
+
+@dataclass(frozen=True)
+class TrainingTable:
+    """A stored training table and its manifest."""
+    name: str
+    version: int
+    fingerprint: str
+    frame: pd.DataFrame
+    label: Optional[str] = None
+    weight: Optional[str] = None
+    rebuilt: bool = False
+    manifest: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def labels(self) -> Optional[pd.Series]:
+        return self.frame[self.label] if self.label else None
+
+    @property
+    def weights(self) -> Optional[pd.Series]:
+        return self.frame[self.weight] if self.weight else None
+
+
+def table_fingerprint(name: str, version: int, inputs: Iterable[PathLike] = (), code: Iterable[PathLike] = (),
+                      params: Optional[dict] = None) -> str:
+    """SHA-256 of a table's version, input files, assembly code and parameters."""
+    payload = {
+        'name': name,
+        'version': version,
+        'inputs': [[Path(p).as_posix(), file_digest(p)] for p in inputs],
+        'code': [[Path(p).name, file_digest(p)] for p in code],
+        'params': params or {},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _json_values(values) -> List[Any]:
+    return [v.item() if hasattr(v, 'item') else v for v in values]
+
+
+def _write_column(values: pd.Series, path: Path) -> Dict[str, Any]:
+    """Store one column as .npy file(s); returns its manifest entry."""
+    entry: Dict[str, Any] = {'dtype': str(values.dtype)}
+    array = values.array
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        entry.update(kind='category', categories=_json_values(values.cat.categories),
+                     ordered=bool(values.cat.ordered))
+        np.save(path, values.cat.codes.to_numpy())
+    elif type(array).__name__ in _MASKED_ARRAYS:
+        entry.update(kind='masked', array=type(array).__name__)
+        np.save(path, array._data)
+        np.save(path.with_suffix('.mask.npy'), array._mask)
+    elif values.dtype.kind in 'biuf':
+        entry['kind'] = 'numeric'
+        np.save(path, values.to_numpy())
+    else:
+        codes, uniques = pd.factorize(values)  # missing values get code -1
+        entry.update(kind='object', categories=_json_values(uniques))
+        np.save(path, codes.astype(np.int32))
+    return entry
+
+
+def _read_column(entry: Dict[str, Any], path: Path, mmap_mode: Optional[str]):
+    data = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+    kind = entry['kind']
+    if kind == 'numeric':
+        # A plain ndarray view of the mapping: still zero-copy, but frames
+        # built on it behave like any other (pandas keeps np.memmap as-is)
+        return data.view(np.ndarray) if isinstance(data, np.memmap) else data
+    if kind == 'masked':
+        mask = np.load(path.with_suffix('.mask.npy'), allow_pickle=False)
+        return _MASKED_ARRAYS[entry['array']](np.asarray(data), mask)
+    if kind == 'category':
+        dtype = pd.CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+        return pd.Categorical.from_codes(np.asarray(data), dtype=dtype)
+    values = np.empty(len(entry['categories']) + 1, dtype=object)
+    values[:-1] = entry['categories']
+    values[-1] = np.nan
+    return values[np.asarray(data)]  # code -1 (missing) picks the trailing NaN
+
+
+def write_table(name: str, df: pd.DataFrame, fingerprint: str, version: int = 1, label: Optional[str] = None,
+                weight: Optional[str] = None, inputs: Iterable[PathLike] = (),
+                root: PathLike = TABLES_DIR, metadata: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Store `df` as the training table `name` (replacing any previous version).
+
+    `metadata` (JSON-serializable) is kept in the manifest as-is.
+
+    Raises:
+        TrainingTableError: Missing label/weight column, duplicate column
+            names, or values that cannot be stored
+    """
+    for role, column in (('label', label), ('weight', weight)):
+        if column is not None and column not in df.columns:
+            raise TrainingTableError(f"Training table {name}: {role} column '{column}' not in the frame")
+    if df.columns.duplicated().any():
+        raise TrainingTableError(f"Training table {name}: duplicate columns "
+                                 f"{list(df.columns[df.columns.duplicated()])}")
+
+    table_dir = Path(root) / name
+    tmp_dir = table_dir.with_name(name + '.tmp')
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    columns = []
+    try:
+        for i, col in enumerate(df.columns):
+            entry = _write_column(df[col], tmp_dir / f'{i}.npy')
+            columns.append({'name': str(col), **entry})
+        manifest = {
+            'name': name,
+            'version': version,
+            'fingerprint': fingerprint,
+            'label': label,
+            'weight': weight,
+            'rows': len(df),
+            'inputs': [Path(p).as_posix() for p in inputs],
+            'columns': columns,
+            'metadata': metadata or {},
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1))
+    except (TypeError, ValueError) as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise TrainingTableError(f"Training table {name}: cannot store column '{col}': {e}") from e
+
+    shutil.rmtree(table_dir, ignore_errors=True)
+    tmp_dir.replace(table_dir)
+    logger.info(f"Stored training table {name} v{version} ({len(df)} rows x {len(columns)} columns) -> {table_dir}")
+    return table_dir
+
+
+def read_manifest(name: str, root: PathLike = TABLES_DIR) -> Optional[Dict[str, Any]]:
+    """A stored table's manifest, or None if there is no readable table."""
+    path = Path(root) / name / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def read_table(name: str, root: PathLike = TABLES_DIR, mmap: bool = True) -> TrainingTable:
+    """
+    Load a stored training table.
+
+    Args:
+        name: Table name
+        root: Directory holding the tables
+        mmap: Memory-map the numeric columns (copy-on-write)
+
+    Raises:
+        TrainingTableError: No readable table `name`
+    """
+    manifest = read_manifest(name, root)
+    if manifest is None:
+        raise TrainingTableError(f"No training table {name} in {root}")
+    table_dir = Path(root) / name
+    mmap_mode = 'c' if mmap else None
+    try:
+        data = {c['name']: _read_column(c, table_dir / f'{i}.npy', mmap_mode)
+                for i, c in enumerate(manifest['columns'])}
+    except (OSError, ValueError, KeyError) as e:
+        raise TrainingTableError(f"Training table {name} is unreadable: {e}") from e
+    frame = pd.DataFrame(data, copy=False)
+    return TrainingTable(name=name, version=manifest['version'], fingerprint=manifest['fingerprint'],
+                         frame=frame, label=manifest['label'], weight=manifest['weight'], manifest=manifest)
+
+
+def load_or_build(name: str, build: Callable[[], pd.DataFrame], version: int = 1,
+                  inputs: Iterable[PathLike] = (), code: Iterable[PathLike] = (), params: Optional[dict] = None,
+                  label: Optional[str] = None, weight: Optional[str] = None, rebuild: bool = False,
+                  root: PathLike = TABLES_DIR, metadata: Optional[Dict[str, Any]] = None) -> TrainingTable:
+    """
+    The training table `name`, rebuilt only if its fingerprint changed.
+
+    Args:
+        name: Table name
+        build: Assembles the table (the trainer's merge step)
+        version: Bump to invalidate stored tables when the assembly changes
+            in a way the code digest does not capture
+        inputs: Files the table is assembled from
+        code: Source files of the assembly step
+        params: JSON-serializable settings that change the table
+        label: Label column
+        weight: Sample weight column
+        rebuild: Rebuild even if the stored table is current
+        root: Directory holding the tables
+        metadata: Stored in the manifest when the table is (re)built
+
+    Returns:
+        The table, loaded memory-mapped from its stored columns
+    """
+    inputs = list(inputs)
+    fingerprint = table_fingerprint(name, version, inputs, code, params)
+    manifest = read_manifest(name, root)
+    if not rebuild and manifest is not None and manifest.get('fingerprint') == fingerprint:
+        try:
+            table = read_table(name, root)
+            logger.info(f"⚡ Reusing training table {name} v{version} ({len(table.frame)} rows, "
+                        f"built {manifest.get('built_at')})")
+            return table
+        except TrainingTableError as e:
+            logger.warning(f"{e}; rebuilding")
+
+    logger.info(f"Building training table {name} v{version}...")
+    write_table(name, build(), fingerprint, version=version, label=label, weight=weight, inputs=inputs, root=root,
+                metadata=metadata)
+    table = read_table(name, root)
+    return replace(table, rebuilt=True)
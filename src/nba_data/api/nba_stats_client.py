@@ -11,6 +11,7 @@ from urllib3.util.retry import Retry
 import hashlib
 import json
 import os
+import tempfile
 from pathlib import Path
 
 # Add tenacity for advanced retry logic
@@ -115,10 +116,19 @@ class NBAStatsClient:
         return None
 
     def _write_to_cache(self, cache_path: Path, data: Dict):
-        """Write data to the cache."""
+        """Write data to the cache (atomically, so concurrent readers never see partial files)."""
         logger.info(f"Writing to cache: {cache_path}")
-        with open(cache_path, 'w') as f:
-            json.dump(data, f)
+        # A unique temp file per writer: threads of one process share the PID
+        with tempfile.NamedTemporaryFile('w', dir=cache_path.parent, prefix=f".{cache_path.name}.",
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = Path(f.name)
+            try:
+                json.dump(data, f)
+            except BaseException:
+                f.close()
+                tmp_path.unlink(missing_ok=True)
+                raise
+        os.replace(tmp_path, cache_path)
 
     def _wait_for_rate_limit(self):
         """Ensure we don't exceed rate limits by waiting between requests."""
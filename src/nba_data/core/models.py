@@ -8,6 +8,9 @@ Principles:
 1.  Fail Fast: If data doesn't match the schema, crash immediately.
 2.  No Magic Numbers: Field constraints are defined here.
 3.  Typed Interfaces: Functions should pass these objects, not loose Dicts.
+
+Whole DataFrames are checked against the same constraints with
+core/validation.FrameSchema instead of one model per row.
 """
 
 from pydantic import BaseModel, Field, field_validator
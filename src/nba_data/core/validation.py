@@ -0,0 +1,251 @@
+"""
+Vectorized Frame Validation
+
+Validates whole DataFrames against the constraints declared on the Pydantic
+models in core/models.py, without building a model per row. A FrameSchema
+compiles each model field into a FieldRule (type, required, ge/gt/le/lt
+bounds) and evaluates every rule as a boolean mask over the column.
+
+The masks reproduce Pydantic's (lax mode) outcome for the values that occur
+in our frames:
+
+- int fields accept integral numbers and numeric strings; NaN/inf and
+  fractional values fail
+- float fields accept numbers and numeric strings; NaN passes an
+  unconstrained field but fails any bound (NaN >= 0 is False)
+- str fields accept only strings
+- Optional fields accept None (a missing optional column becomes None;
+  in float columns None is returned as NaN)
+- a missing required column fails every row
+
+Custom validators (field_validator / model_validator, e.g.
+ShootingStats.check_valid_pct) are arbitrary Python and cannot be compiled
+into masks. For models that declare them, the rows that pass the masks are
+validated once more with the model itself, row by row, and the validated
+fields take the validators' output. Only those models pay the per-row cost.
+
+Pydantic models remain the schema for single records (e.g. API input);
+use FrameSchema for frames.
+
+Example:
+    result = FrameSchema.from_model(PlayerSeason).validate(df)
+    result.valid      # model columns only, rows that passed, coerced types
+    result.errors     # one row per (row, field) failure: row, field, error, value
+"""
+
+import math
+import types
+import typing
+from dataclasses import dataclass
+from typing import List, Optional, Type, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ValidationError
+
+FIELD_KINDS = {int: "int", float: "float", str: "str"}
+BOUNDS = (("ge", np.greater_equal, "greater than or equal to"),
+          ("gt", np.greater, "greater than"),
+          ("le", np.less_equal, "less than or equal to"),
+          ("lt", np.less, "less than"))
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """Compiled constraints for one column."""
+    name: str
+    kind: str  # "int", "float" or "str"
+    required: bool = True
+    nullable: bool = False
+    ge: Optional[float] = None
+    gt: Optional[float] = None
+    le: Optional[float] = None
+    lt: Optional[float] = None
+
+
+@dataclass
+class FrameValidationResult:
+    """Outcome of FrameSchema.validate."""
+    valid: pd.DataFrame
+    errors: pd.DataFrame
+    total_rows: int
+
+    @property
+    def invalid_rows(self) -> int:
+        return self.errors['row'].nunique() if not self.errors.empty else 0
+
+
+def _unwrap_optional(annotation):
+    """(inner type, accepts None) for X / Optional[X] / X | None."""
+    if typing.get_origin(annotation) in (Union, getattr(types, "UnionType", Union)):
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _none_mask(series: pd.Series) -> np.ndarray:
+    """True where the value is None (not NaN), which Optional fields accept."""
+    if series.dtype != object:
+        return np.zeros(len(series), dtype=bool)
+    return np.fromiter((v is None for v in series), dtype=bool, count=len(series))
+
+
+def _validated_fields(model: Type[BaseModel]) -> List[str]:
+    """Fields whose values custom validators can reject or change (all of them for a model validator)."""
+    decorators = model.__pydantic_decorators__
+    if decorators.model_validators:
+        return list(model.model_fields)
+    fields = {f for d in decorators.field_validators.values() for f in d.info.fields}
+    return [f for f in model.model_fields if f in fields or ('*' in fields)]
+
+
+class FrameSchema:
+    """
+    A set of FieldRules evaluated as vectorized masks, plus, for models with
+    custom validators, a row-wise pass of the model over the rows that passed.
+    """
+
+    def __init__(self, rules: List[FieldRule], row_model: Optional[Type[BaseModel]] = None):
+        self.rules = list(rules)
+        self.row_model = row_model
+
+    @classmethod
+    def from_model(cls, model: Type[BaseModel]) -> "FrameSchema":
+        """
+        Compile a Pydantic model's fields (type, required, numeric bounds) into
+        rules. A model with custom validators is kept as the row model.
+        """
+        row_model = model if _validated_fields(model) else None
+        rules = []
+        for name, field in model.model_fields.items():
+            inner, nullable = _unwrap_optional(field.annotation)
+            if inner not in FIELD_KINDS:
+                raise TypeError(f"Unsupported type {field.annotation!r} for field '{name}'")
+            bounds = {}
+            for constraint in field.metadata:
+                for bound, _, _ in BOUNDS:
+                    if getattr(constraint, bound, None) is not None:
+                        bounds[bound] = getattr(constraint, bound)
+            rules.append(FieldRule(name, FIELD_KINDS[inner], field.is_required(), nullable, **bounds))
+        return cls(rules, row_model)
+
+    def validate(self, df: pd.DataFrame) -> FrameValidationResult:
+        """
+        Validate every row of `df`.
+
+        Args:
+            df: Frame whose columns are named like the schema fields; extra
+                columns are ignored
+
+        Returns:
+            FrameValidationResult with the passing rows (schema columns only,
+            fresh index) and a row-level error report keyed by df's index
+        """
+        # Duplicate column names: the last one wins, as when a row is turned into a dict
+        df = df.loc[:, ~df.columns.duplicated(keep='last')]
+        n = len(df)
+        invalid = np.zeros(n, dtype=bool)
+        errors = []
+        columns = {}
+
+        def fail(mask, rule, message, values):
+            nonlocal invalid
+            if mask.any():
+                invalid |= mask
+                errors.append(pd.DataFrame({
+                    'row': df.index[mask],
+                    'field': rule.name,
+                    'error': message,
+                    'value': values[mask] if values is not None else None,
+                }))
+
+        for rule in self.rules:
+            if rule.name not in df.columns:
+                if rule.required:
+                    fail(np.ones(n, dtype=bool), rule, "Field required", None)
+                columns[rule.name] = pd.Series([None] * n, dtype=object)
+                continue
+
+            raw = df[rule.name]
+            is_none = _none_mask(raw) if rule.nullable else np.zeros(n, dtype=bool)
+            raw_values = raw.to_numpy(dtype=object)
+
+            if rule.kind == "str":
+                if raw.dtype == object:
+                    ok = np.fromiter((isinstance(v, str) for v in raw_values), dtype=bool, count=n)
+                elif pd.api.types.is_string_dtype(raw.dtype):
+                    ok = raw.notna().to_numpy()
+                else:
+                    ok = np.zeros(n, dtype=bool)
+                fail(~ok & ~is_none, rule, "Input should be a valid string", raw_values)
+                columns[rule.name] = raw.where(~is_none, None).reset_index(drop=True)
+                continue
+
+            values = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=float)
+            if raw.dtype == object:
+                nan_input = np.fromiter((isinstance(v, float) and math.isnan(v) for v in raw_values),
+                                        dtype=bool, count=n)
+            else:
+                nan_input = np.isnan(values)
+            # Text that is not a number (or None in a required field) fails parsing
+            unparseable = np.isnan(values) & ~nan_input & ~is_none
+            number = "integer" if rule.kind == "int" else "number"
+            fail(unparseable, rule, f"Input should be a valid {number}", raw_values)
+
+            if rule.kind == "int":
+                fail(nan_input | np.isinf(values), rule, "Input should be a finite number", raw_values)
+                with np.errstate(invalid='ignore'):
+                    fractional = np.isfinite(values) & (np.floor(values) != values)
+                fail(fractional, rule, "Input should be a valid integer, got a number with a fractional part",
+                     raw_values)
+            else:
+                # None in an Optional field skips the bounds; NaN satisfies no bound
+                for bound, compare, text in BOUNDS:
+                    limit = getattr(rule, bound)
+                    if limit is not None:
+                        with np.errstate(invalid='ignore'):
+                            out_of_range = ~compare(values, limit) & ~is_none & ~unparseable
+                        fail(out_of_range, rule, f"Input should be {text} {limit}", raw_values)
+
+            if rule.kind == "int":
+                columns[rule.name] = pd.Series(np.where(np.isfinite(values), values, 0).astype(np.int64))
+            else:
+                # None becomes NaN, as in a frame built from the validated records
+                columns[rule.name] = pd.Series(values)
+
+        frame = pd.DataFrame(columns)
+        if self.row_model is not None and n:
+            invalid |= self._run_row_model(frame, ~invalid, df.index, errors)
+
+        valid = frame[~invalid].reset_index(drop=True) if n else frame
+        report = pd.concat(errors, ignore_index=True) if errors else \
+            pd.DataFrame(columns=['row', 'field', 'error', 'value'])
+        return FrameValidationResult(valid=valid, errors=report, total_rows=n)
+
+    def _run_row_model(self, frame: pd.DataFrame, passed: np.ndarray, index: pd.Index,
+                       errors: List[pd.DataFrame]) -> np.ndarray:
+        """
+        Validate the rows that passed the masks with the row model, so its
+        custom validators run. Validated values replace the frame's (in
+        place); returns the rows the validators rejected.
+        """
+        rejected = np.zeros(len(frame), dtype=bool)
+        failures = []
+        fields = _validated_fields(self.row_model)
+        positions = np.flatnonzero(passed)
+        for position, record in zip(positions, frame.iloc[positions].to_dict('records')):
+            try:
+                validated = self.row_model.model_validate(record).model_dump()
+            except ValidationError as e:
+                rejected[position] = True
+                for error in e.errors():
+                    field = error['loc'][0] if error['loc'] else None
+                    failures.append({'row': index[position], 'field': field, 'error': error['msg'],
+                                     'value': record.get(field)})
+                continue
+            for name in fields:
+                frame.at[position, name] = validated[name]
+        if failures:
+            errors.append(pd.DataFrame(failures))
+        return rejected
@@ -0,0 +1,459 @@
+"""
+Columnar Play-by-Play Store
+
+Mirrors the row-oriented possession tables in SQLite (`possessions`,
+`possession_events`, `possession_lineups`, `possession_matchups`) into a
+season/game-partitioned Parquet dataset for analytical reads.
+
+Layout:
+    data/columnar/possessions/<table>/season=2023-24/game_id=22300001/part-0.parquet
+
+Design notes:
+- TEXT keys are replaced with the integer `possession_key` / `event_key`
+  encoding from possession_store, so keys sort in game order, never need a
+  lookup table, and match the integer-key SQLite layout when it is in use.
+- Bookkeeping columns (`created_at`, `updated_at`) are dropped.
+- Low-cardinality strings (event_type, shot_type, ...) are stored dictionary
+  encoded.
+- A manifest records a fingerprint per game so `export()` only rewrites games
+  whose rows changed since the last run. The fingerprint covers all four
+  tables: row counts plus a content checksum (the sum of a per-row hash of
+  every exported column), so in-place edits are picked up even when they
+  leave the row count and `updated_at` untouched.
+
+Aggregate queries (clutch usage, late-clock efficiency, lineup splits) should
+go through `read_possession_table()`, which prunes partitions by season/game
+and only materializes the requested columns.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from .possession_store import EVENT_STRIDE, encode_possession_keys, uses_integer_keys
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = "data/columnar/possessions"
+MANIFEST_FILE = "_manifest.json"
+
+TABLES = ("possessions", "possession_events", "possession_lineups", "possession_matchups")
+
+# Columns that are repeated strings and compress well as dictionaries.
+CATEGORICAL_COLUMNS = {
+    "possessions": ["season_type", "possession_type", "start_reason", "end_reason"],
+    "possession_events": [
+        "event_type", "event_subtype", "shot_type", "shot_result",
+        "turnover_type", "foul_type", "rebound_type",
+    ],
+    "possession_lineups": ["position"],
+    "possession_matchups": [],
+}
+
+DROPPED_COLUMNS = {"created_at", "updated_at"}
+
+# Per-game content checksums: row count and the sum of row_checksum() over the
+# exported columns of one table. {source} joins the table to its game; {where}
+# restricts it to the games in temp.export_games when only some seasons export.
+CHECKSUM_QUERY = """
+    SELECT p.game_id, COUNT(*) AS n_rows, SUM(row_checksum({columns})) AS checksum
+    FROM {source}
+    {where}
+    GROUP BY p.game_id
+"""
+
+# Per-game extraction queries. Child tables are reached through
+# idx_possessions_game_id so a single game never scans the whole table.
+# {key} is possession_id (TEXT layout) or possession_key (integer layout).
+GAME_QUERIES = {
+    "possessions": """
+        SELECT p.*, COALESCE(g.season_type, '') AS season_type
+        FROM possessions p
+        LEFT JOIN games g ON g.game_id = p.game_id
+        WHERE p.game_id = ?
+    """,
+    "possession_events": """
+        SELECT e.*
+        FROM possession_events e
+        JOIN possessions p ON p.{key} = e.{key}
+        WHERE p.game_id = ?
+    """,
+    "possession_lineups": """
+        SELECT l.*
+        FROM possession_lineups l
+        JOIN possessions p ON p.{key} = l.{key}
+        WHERE p.game_id = ?
+    """,
+    "possession_matchups": """
+        SELECT m.*
+        FROM possession_matchups m
+        JOIN possessions p ON p.{key} = m.{key}
+        WHERE p.game_id = ?
+    """,
+}
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for the columnar store (pip install pyarrow)")
+
+
+def season_from_game_id(game_id: str) -> str:
+    """
+    Derive the season string from an NBA game ID.
+
+    Game IDs look like 0022300001: characters 3-4 are the season start year.
+    """
+    game_id = str(game_id).zfill(10)
+    start_year = 2000 + int(game_id[3:5])
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def _row_checksum(*values: Any) -> int:
+    """32-bit hash of one row's values; summed per game it stays within SQLite's int64."""
+    digest = hashlib.blake2b(repr(values).encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "little")
+
+
+def register_checksum_function(conn: sqlite3.Connection) -> None:
+    """Expose row_checksum() to SQL on this connection."""
+    conn.create_function("row_checksum", -1, _row_checksum, deterministic=True)
+
+
+def _partition_schema():
+    return pa.schema([("season", pa.string()), ("game_id", pa.int64())])
+
+
+class PossessionColumnarStore:
+    """Exports and maintains the season/game-partitioned possession dataset."""
+
+    def __init__(self, db_path: str = "data/nba_stats.db", store_dir: str = DEFAULT_STORE_DIR):
+        """Initialize with database path and output directory."""
+        self.db_path = Path(db_path)
+        self.store_dir = Path(store_dir)
+        self.manifest_path = self.store_dir / MANIFEST_FILE
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save_manifest(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        tmp_path.replace(self.manifest_path)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def _game_fingerprints(self, conn: sqlite3.Connection, seasons: Optional[Sequence[str]], key: str) -> pd.DataFrame:
+        """
+        One row per game with possession data: season, the row count and
+        content checksum of every possession table, and the latest
+        modification timestamp. A game is re-exported when any of these change.
+        """
+        df = pd.read_sql_query(
+            """
+            SELECT p.game_id,
+                   g.season,
+                   MAX(COALESCE(p.updated_at, p.created_at)) AS last_modified
+            FROM possessions p
+            LEFT JOIN games g ON g.game_id = p.game_id
+            GROUP BY p.game_id
+            """,
+            conn,
+        )
+        if df.empty:
+            return df
+
+        missing = df["season"].isna()
+        if missing.any():
+            df.loc[missing, "season"] = df.loc[missing, "game_id"].map(season_from_game_id)
+
+        if seasons:
+            df = df[df["season"].isin(list(seasons))]
+
+        df = df.reset_index(drop=True)
+        df["fingerprint"] = df["last_modified"].astype(str)
+        game_ids = df["game_id"].tolist() if seasons else None
+        for content in self._content_checksums(conn, key, game_ids).values():
+            content = df[["game_id"]].merge(content, on="game_id", how="left").fillna(0)
+            df["fingerprint"] += (
+                "|" + content["n_rows"].astype("int64").astype(str) + ":" + content["checksum"].astype("int64").astype(str)
+            )
+        return df
+
+    def _content_checksums(
+        self, conn: sqlite3.Connection, key: str, game_ids: Optional[Sequence[Any]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Per table: game_id, n_rows, checksum over the columns the export keeps.
+
+        row_checksum() runs in Python once per row, so with `game_ids` only
+        those games' rows are hashed rather than every table in full.
+        """
+        register_checksum_function(conn)
+        where = ""
+        if game_ids is not None:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS export_games (game_id PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.export_games")
+            conn.executemany("INSERT OR IGNORE INTO temp.export_games VALUES (?)", [(g,) for g in game_ids])
+            where = "WHERE p.game_id IN (SELECT game_id FROM temp.export_games)"
+        checksums = {}
+        for table in TABLES:
+            columns = [
+                row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] not in DROPPED_COLUMNS
+            ]
+            if table == "possessions":
+                source = "possessions p"
+                prefix = "p"
+            else:
+                source = f"{table} c JOIN possessions p ON p.{key} = c.{key}"
+                prefix = "c"
+            query = CHECKSUM_QUERY.format(
+                columns=", ".join(f"{prefix}.{c}" for c in columns), source=source, where=where
+            )
+            checksums[table] = pd.read_sql_query(query, conn)
+        if game_ids is not None:
+            conn.execute("DROP TABLE temp.export_games")
+        return checksums
+
+    def _encode_game(self, frames: Dict[str, pd.DataFrame], game_id: str, season: str) -> Dict[str, pd.DataFrame]:
+        """Replace TEXT keys with integer codes and tighten dtypes for one game."""
+        game_int = int(game_id)
+
+        encoded = {}
+        for table, df in frames.items():
+            df = df.drop(columns=[c for c in DROPPED_COLUMNS if c in df.columns])
+            if "possession_key" not in df.columns:
+                df["possession_key"] = encode_possession_keys(df["possession_id"])
+            df["possession_key"] = df["possession_key"].astype("int64")
+
+            if table == "possession_events" and "event_key" not in df.columns:
+                df["event_key"] = df["possession_key"] * EVENT_STRIDE + df["event_number"].astype("int64")
+            if table == "possession_events":
+                df = df.drop(columns=["event_id"], errors="ignore")
+
+            df = df.drop(columns=["possession_id", "game_id"], errors="ignore")
+            df["season"] = season
+            df["game_id"] = game_int
+
+            for col in CATEGORICAL_COLUMNS[table]:
+                if col in df.columns:
+                    df[col] = df[col].astype("category")
+
+            sort_cols = ["event_key"] if table == "possession_events" else ["possession_key"]
+            encoded[table] = df.sort_values(sort_cols).reset_index(drop=True)
+
+        return encoded
+
+    def _write_game(self, encoded: Dict[str, pd.DataFrame], season: str, game_int: int) -> None:
+        for table, df in encoded.items():
+            part_dir = self.store_dir / table / f"season={season}" / f"game_id={game_int}"
+            if part_dir.exists():
+                shutil.rmtree(part_dir)
+            part_dir.mkdir(parents=True, exist_ok=True)
+
+            # Partition values live in the directory names, not in the file.
+            body = df.drop(columns=["season", "game_id"])
+            table_pa = pa.Table.from_pandas(body, preserve_index=False)
+            pq.write_table(table_pa, part_dir / "part-0.parquet", compression="zstd")
+
+    def export(self, seasons: Optional[Sequence[str]] = None, full_refresh: bool = False) -> Dict[str, int]:
+        """
+        Export possession tables to the columnar store.
+
+        Args:
+            seasons: Restrict to these seasons (e.g., ['2023-24']); None = all
+            full_refresh: Ignore the manifest and rewrite every game (in `seasons`)
+
+        Returns:
+            Summary counts: games_written, games_skipped, games_removed, rows_written
+        """
+        _require_pyarrow()
+        manifest = self._load_manifest()
+        if full_refresh:
+            manifest = {k: v for k, v in manifest.items() if seasons and k.split("/", 1)[0] not in seasons}
+        summary = {"games_written": 0, "games_skipped": 0, "games_removed": 0, "rows_written": 0}
+
+        with sqlite3.connect(self.db_path) as conn:
+            key = "possession_key" if uses_integer_keys(conn) else "possession_id"
+            queries = {table: query.format(key=key) for table, query in GAME_QUERIES.items()}
+            games = self._game_fingerprints(conn, seasons, key)
+            logger.info(f"Found {len(games)} games with possession data")
+
+            for row in games.itertuples(index=False):
+                manifest_key = f"{row.season}/{row.game_id}"
+                if manifest.get(manifest_key, {}).get("fingerprint") == row.fingerprint:
+                    summary["games_skipped"] += 1
+                    continue
+
+                frames = {
+                    table: pd.read_sql_query(query, conn, params=(row.game_id,))
+                    for table, query in queries.items()
+                }
+                encoded = self._encode_game(frames, row.game_id, row.season)
+                self._write_game(encoded, row.season, int(row.game_id))
+
+                rows = {table: len(df) for table, df in encoded.items()}
+                manifest[manifest_key] = {"fingerprint": row.fingerprint, "rows": rows}
+                summary["games_written"] += 1
+                summary["rows_written"] += sum(rows.values())
+
+                # Checkpoint regularly so an interrupted export resumes where it stopped.
+                if summary["games_written"] % 100 == 0:
+                    self._save_manifest(manifest)
+                    logger.info(f"  Exported {summary['games_written']} games...")
+
+            summary["games_removed"] = self._prune_deleted_games(manifest, games, seasons)
+
+        self._save_manifest(manifest)
+        logger.info(
+            f"✅ Columnar export complete: {summary['games_written']} written, "
+            f"{summary['games_skipped']} unchanged, {summary['games_removed']} removed"
+        )
+        return summary
+
+    def _stored_games(self) -> set:
+        """(season, game_id) of every game partition on disk, in any table."""
+        stored = set()
+        for table in TABLES:
+            for part_dir in self.store_dir.glob(f"{table}/season=*/game_id=*"):
+                stored.add((part_dir.parent.name.split("=", 1)[1], int(part_dir.name.split("=", 1)[1])))
+        return stored
+
+    def _prune_deleted_games(
+        self, manifest: Dict[str, Dict[str, Any]], games: pd.DataFrame, seasons: Optional[Sequence[str]]
+    ) -> int:
+        """
+        Drop partitions for games that no longer exist in SQLite. Partitions
+        on disk count as well as manifest entries, so games the manifest has
+        lost track of (a full refresh starts it over) are still removed.
+        """
+        live = {(s, int(g)) for s, g in zip(games.get("season", []), games.get("game_id", []))}
+        manifest_keys = {}
+        for manifest_key in manifest:
+            season, game_id = manifest_key.split("/", 1)
+            manifest_keys[(season, int(game_id))] = manifest_key
+
+        removed = 0
+        for season, game_int in sorted(self._stored_games() | set(manifest_keys)):
+            if (seasons and season not in seasons) or (season, game_int) in live:
+                continue
+            for table in TABLES:
+                part_dir = self.store_dir / table / f"season={season}" / f"game_id={game_int}"
+                if part_dir.exists():
+                    shutil.rmtree(part_dir)
+            manifest.pop(manifest_keys.get((season, game_int)), None)
+            removed += 1
+        return removed
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+    def dataset(self, table: str):
+        """Open one table as a pyarrow dataset with hive partitioning."""
+        _require_pyarrow()
+        if table not in TABLES:
+            raise ValueError(f"Unknown table '{table}'. Expected one of {TABLES}")
+        return ds.dataset(
+            self.store_dir / table,
+            format="parquet",
+            partitioning=ds.partitioning(_partition_schema(), flavor="hive"),
+        )
+
+    def read(
+        self,
+        table: str,
+        columns: Optional[List[str]] = None,
+        seasons: Optional[Iterable[str]] = None,
+        game_ids: Optional[Iterable[Any]] = None,
+        filter_expression: Optional[Any] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a table with partition and column pruning.
+
+        Args:
+            table: One of TABLES
+            columns: Columns to materialize (None = all)
+            seasons: Season partitions to read (None = all)
+            game_ids: Game partitions to read; accepts '0022300001' or 22300001
+            filter_expression: Extra pyarrow.dataset expression pushed into the scan
+                (e.g., ds.field('period') >= 4)
+
+        Returns:
+            DataFrame with only the requested rows and columns
+        """
+        dataset = self.dataset(table)
+
+        expression = None
+        if seasons is not None:
+            expression = ds.field("season").isin(list(seasons))
+        if game_ids is not None:
+            game_filter = ds.field("game_id").isin([int(g) for g in game_ids])
+            expression = game_filter if expression is None else expression & game_filter
+        if filter_expression is not None:
+            expression = filter_expression if expression is None else expression & filter_expression
+
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def read_possession_table(
+    table: str,
+    columns: Optional[List[str]] = None,
+    seasons: Optional[Iterable[str]] = None,
+    game_ids: Optional[Iterable[Any]] = None,
+    filter_expression: Optional[Any] = None,
+    store_dir: str = DEFAULT_STORE_DIR,
+) -> pd.DataFrame:
+    """Convenience wrapper around PossessionColumnarStore.read for feature scripts."""
+    return PossessionColumnarStore(store_dir=store_dir).read(
+        table, columns=columns, seasons=seasons, game_ids=game_ids, filter_expression=filter_expression
+    )
+
+
+def main():
+    """Export or refresh the columnar possession store."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mirror possession tables into a partitioned columnar store")
+    parser.add_argument("--db-path", default="data/nba_stats.db", help="Database path")
+    parser.add_argument("--store-dir", default=DEFAULT_STORE_DIR, help="Output directory")
+    parser.add_argument("--seasons", nargs="+", help="Seasons to export (default: all)")
+    parser.add_argument("--full-refresh", action="store_true", help="Rewrite every game, ignoring the manifest")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    store = PossessionColumnarStore(args.db_path, args.store_dir)
+    summary = store.export(seasons=args.seasons, full_refresh=args.full_refresh)
+
+    print("\n🎯 Columnar Export Summary")
+    print("=" * 40)
+    for key, value in summary.items():
+        print(f"{key}: {value:,}")
+
+
+if __name__ == "__main__":
+    main()
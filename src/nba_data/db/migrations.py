@@ -0,0 +1,529 @@
+"""
+Versioned Schema Migrations for data/nba_stats.db
+
+`NBADatabaseSchema.create_all_tables` only runs CREATE TABLE IF NOT EXISTS,
+so index, key and column changes never reach an existing database. This
+module tracks the applied schema version in a `schema_version` table and
+applies ordered, idempotent migration steps on top of it.
+
+Two helpers keep long-running steps from blocking the pipeline:
+
+- create_index_online(): builds an index in its own short transaction.
+  Under WAL readers keep running; writers wait only for the build itself.
+- rebuild_tables(): copies one or more tables into shadow tables in rowid
+  chunks, committing between chunks, and swaps them in with a single short
+  transaction at the end. Rows changed by other connections during the copy
+  are captured by change-log triggers and replayed at swap time. The
+  triggers have to be persistent (a TEMP trigger only fires for its own
+  connection), so they are dropped in a `finally` block, and if the process
+  dies mid-rebuild the next write connection (schema.connect) removes them.
+
+`--dry-run` opens the database read-only and writes nothing.
+
+Usage:
+    python -m src.nba_data.db.migrations --dry-run     # print plan + rewrite size
+    python -m src.nba_data.db.migrations               # upgrade to latest
+    python -m src.nba_data.db.migrations --target 2    # upgrade to a version
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .schema import (
+    REBUILD_CHANGELOG_TABLE, REBUILD_OWNER_TABLE, REBUILD_SHADOW_SUFFIX, NBADatabaseSchema, connect
+)
+from . import possession_store
+
+logger = logging.getLogger(__name__)
+
+CHANGELOG_TABLE = REBUILD_CHANGELOG_TABLE
+SHADOW_SUFFIX = REBUILD_SHADOW_SUFFIX
+
+
+class MigrationError(RuntimeError):
+    """Raised when a migration cannot be applied safely."""
+
+
+@dataclass
+class PlanStep:
+    """One unit of work in a migration plan, with its estimated cost."""
+    action: str
+    target: str
+    rows: int = 0
+    estimated_bytes: int = 0
+
+
+@dataclass
+class RebuildSpec:
+    """
+    How to rebuild one table.
+
+    Attributes:
+        table: Existing table to replace
+        create_sql: CREATE TABLE statement with a {name} placeholder
+        columns: Target column list for the INSERT
+        select_exprs: Matching SELECT expressions over the old table
+        key_columns: Source columns identifying the rows a write touched;
+            enables replay of concurrent writes. Without them the rebuild
+            aborts if the source changed during the copy.
+        shadow_key_exprs: Predicates (one "?" each) matching the same rows in
+            the new table; defaults to "<key_column> = ?"
+        indexes: CREATE INDEX statements to run after the swap
+    """
+    table: str
+    create_sql: str
+    columns: Sequence[str]
+    select_exprs: Sequence[str]
+    key_columns: Sequence[str] = ()
+    shadow_key_exprs: Sequence[str] = ()
+    indexes: Sequence[str] = ()
+
+
+@dataclass
+class Migration:
+    """An ordered, idempotent schema change."""
+    version: int
+    name: str
+    upgrade: Callable[[sqlite3.Connection], None]
+    plan: Callable[[sqlite3.Connection], List[PlanStep]] = field(default=lambda conn: [])
+
+
+# ----------------------------------------------------------------------
+# Size estimation
+# ----------------------------------------------------------------------
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'index') AND name = ?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def estimate_table_bytes(conn: sqlite3.Connection, table: str) -> int:
+    """On-disk size of a table and its indexes (dbstat if compiled in, else sampled)."""
+    if not table_exists(conn, table):
+        return 0
+    try:
+        row = conn.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = ? "
+            "OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?)",
+            (table, table),
+        ).fetchone()
+        return int(row[0] or 0)
+    except sqlite3.OperationalError:
+        columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+        width = " + ".join(f"LENGTH(QUOTE({c}))" for c in columns) or "0"
+        sample = conn.execute(f"SELECT AVG({width}) FROM (SELECT * FROM {table} LIMIT 1000)").fetchone()[0] or 0
+        return int(sample * row_count(conn, table))
+
+
+def row_count(conn: sqlite3.Connection, table: str) -> int:
+    if not table_exists(conn, table):
+        return 0
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+# ----------------------------------------------------------------------
+# Online helpers
+# ----------------------------------------------------------------------
+def create_index_online(conn: sqlite3.Connection, create_sql: str) -> None:
+    """
+    Build one index without holding a transaction open around other work.
+
+    SQLite cannot build an index incrementally, but in WAL mode readers are
+    not blocked by the build, and committing first means the write lock is
+    held only for the CREATE INDEX itself.
+    """
+    conn.commit()
+    conn.execute(create_sql)
+    conn.commit()
+
+
+def _install_changelog(conn: sqlite3.Connection, spec: RebuildSpec) -> None:
+    """
+    Log writes to spec.table from any connection while it is copied.
+
+    Persistent triggers: TEMP triggers would only see this connection's writes.
+    """
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {CHANGELOG_TABLE} (tbl TEXT NOT NULL, key TEXT)"
+    )
+    if spec.key_columns:
+        new_key = "json_array(" + ", ".join(f"NEW.{c}" for c in spec.key_columns) + ")"
+        old_key = "json_array(" + ", ".join(f"OLD.{c}" for c in spec.key_columns) + ")"
+    else:
+        new_key = old_key = "NULL"
+    for op, key_expr in [("INSERT", new_key), ("UPDATE", old_key), ("DELETE", old_key)]:
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {spec.table}__changelog_{op.lower()}
+            AFTER {op} ON {spec.table}
+            BEGIN
+                INSERT INTO {CHANGELOG_TABLE} (tbl, key) VALUES ('{spec.table}', {key_expr});
+            END
+        """)
+    conn.commit()
+
+
+def _drop_changelog_triggers(conn: sqlite3.Connection, table: str) -> None:
+    for op in ("insert", "update", "delete"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {table}__changelog_{op}")
+
+
+def _claim_rebuild(conn: sqlite3.Connection) -> None:
+    """Record this process as the rebuild's owner, so connect() leaves its triggers alone."""
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {REBUILD_OWNER_TABLE} (pid INTEGER NOT NULL, started_at TEXT NOT NULL)")
+    conn.execute(f"DELETE FROM {REBUILD_OWNER_TABLE}")
+    conn.execute(f"INSERT INTO {REBUILD_OWNER_TABLE} (pid, started_at) VALUES (?, ?)",
+                 (os.getpid(), datetime.now().isoformat(timespec="seconds")))
+    conn.commit()
+
+
+def _copy_in_chunks(conn: sqlite3.Connection, spec: RebuildSpec, shadow: str, chunk_size: int) -> int:
+    insert = (
+        f"INSERT INTO {shadow} ({', '.join(spec.columns)}) "
+        f"SELECT {', '.join(spec.select_exprs)} FROM {spec.table} WHERE rowid >= ? AND rowid < ?"
+    )
+    low, high = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {spec.table}").fetchone()
+    copied = 0
+    if low is None:
+        return copied
+    for start in range(low, high + 1, chunk_size):
+        copied += conn.execute(insert, (start, start + chunk_size)).rowcount
+        conn.commit()
+    return copied
+
+
+def _replay_changes(conn: sqlite3.Connection, spec: RebuildSpec, shadow: str) -> int:
+    """Re-copy rows touched by other writers since the chunked copy started."""
+    keys = [r[0] for r in conn.execute(
+        f"SELECT DISTINCT key FROM {CHANGELOG_TABLE} WHERE tbl = ?", (spec.table,)
+    )]
+    if not keys:
+        return 0
+    if not spec.key_columns:
+        raise MigrationError(
+            f"{spec.table} was modified during the rebuild and has no replay key; "
+            "stop the writers and rerun the migration"
+        )
+
+    source_match = " AND ".join(f"{c} = ?" for c in spec.key_columns)
+    shadow_match = " AND ".join(spec.shadow_key_exprs or [f"{c} = ?" for c in spec.key_columns])
+    for key in keys:
+        params = json.loads(key)
+        conn.execute(f"DELETE FROM {shadow} WHERE {shadow_match}", params)
+        conn.execute(
+            f"INSERT INTO {shadow} ({', '.join(spec.columns)}) "
+            f"SELECT {', '.join(spec.select_exprs)} FROM {spec.table} WHERE {source_match}",
+            params,
+        )
+    return len(keys)
+
+
+def rebuild_tables(conn: sqlite3.Connection, specs: Sequence[RebuildSpec], chunk_size: int = 50_000) -> Dict[str, int]:
+    """
+    Rebuild tables through shadow copies and swap them in atomically.
+
+    Specs are swapped as a group (children dropped before parents in reverse
+    order, renamed in order), so a parent table and its children can change
+    keys together.
+
+    Returns:
+        Rows copied per table
+    """
+    conn.commit()
+    _claim_rebuild(conn)
+    # Shadow tables reference each other by their final names, so FK
+    # enforcement stays off until the swap is done.
+    conn.execute("PRAGMA foreign_keys = OFF")
+    copied = {}
+    try:
+        for spec in specs:
+            shadow = f"{spec.table}{SHADOW_SUFFIX}"
+            conn.execute(f"DROP TABLE IF EXISTS {shadow}")
+            conn.execute(spec.create_sql.format(name=shadow))
+            _install_changelog(conn, spec)
+            copied[spec.table] = _copy_in_chunks(conn, spec, shadow, chunk_size)
+            logger.info(f"  {spec.table}: {copied[spec.table]:,} rows copied")
+
+        # Swap: the only step that holds the write lock for more than a chunk.
+        conn.execute("BEGIN IMMEDIATE")
+        for spec in specs:
+            replayed = _replay_changes(conn, spec, f"{spec.table}{SHADOW_SUFFIX}")
+            if replayed:
+                logger.info(f"  {spec.table}: replayed {replayed:,} concurrent changes")
+            _drop_changelog_triggers(conn, spec.table)
+        for spec in reversed(list(specs)):
+            conn.execute(f"DROP TABLE {spec.table}")
+        for spec in specs:
+            conn.execute(f"ALTER TABLE {spec.table}{SHADOW_SUFFIX} RENAME TO {spec.table}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        for spec in specs:
+            conn.execute(f"DROP TABLE IF EXISTS {spec.table}{SHADOW_SUFFIX}")
+        raise
+    finally:
+        # Never leave change-log triggers on the live tables.
+        for spec in specs:
+            _drop_changelog_triggers(conn, spec.table)
+        conn.execute(f"DROP TABLE IF EXISTS {CHANGELOG_TABLE}")
+        conn.execute(f"DROP TABLE IF EXISTS {REBUILD_OWNER_TABLE}")
+        conn.commit()
+        conn.execute("PRAGMA foreign_keys = ON")
+
+    for spec in specs:
+        for sql in spec.indexes:
+            create_index_online(conn, sql)
+
+    return copied
+
+
+def plan_rebuild(conn: sqlite3.Connection, specs: Sequence[RebuildSpec]) -> List[PlanStep]:
+    steps = []
+    for spec in specs:
+        steps.append(PlanStep("rebuild table", spec.table, row_count(conn, spec.table),
+                              estimate_table_bytes(conn, spec.table)))
+    return steps
+
+
+# ----------------------------------------------------------------------
+# Migration steps
+# ----------------------------------------------------------------------
+def _baseline(conn: sqlite3.Connection) -> None:
+    # create_all_tables prints a line per table; keep migration output readable.
+    with contextlib.redirect_stdout(io.StringIO()):
+        NBADatabaseSchema(conn.execute("PRAGMA database_list").fetchone()[2]).create_all_tables()
+
+
+def _plan_baseline(conn: sqlite3.Connection) -> List[PlanStep]:
+    return [PlanStep("create missing tables", "*")]
+
+
+def _drop_triggers(conn: sqlite3.Connection) -> None:
+    possession_store.drop_row_update_triggers(conn)
+
+
+def _plan_drop_triggers(conn: sqlite3.Connection) -> List[PlanStep]:
+    existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    return [PlanStep("drop trigger", name) for name in possession_store.LEGACY_UPDATE_TRIGGERS if name in existing]
+
+
+def integer_key_rebuild_specs() -> List[RebuildSpec]:
+    """Rebuild specs moving the possession tables onto integer surrogate keys."""
+    # Replay keys: which source column a concurrent write is logged under,
+    # and how the same rows are found in the integer-key table.
+    replay = {
+        "possessions": (["possession_id"], ["possession_id = ?"]),
+        "possession_events": (["event_id"], ["event_key = event_key(?)"]),
+        "possession_lineups": (["possession_id"], ["possession_key = possession_key(?)"]),
+        "possession_matchups": (["possession_id"], ["possession_key = possession_key(?)"]),
+    }
+    specs = []
+    for table, ddl in possession_store.INTEGER_KEY_TABLES.items():
+        columns, select_exprs = possession_store.INTEGER_KEY_COPY[table]
+        key_columns, shadow_key_exprs = replay[table]
+        specs.append(RebuildSpec(
+            table=table,
+            create_sql=ddl,
+            columns=[c.strip() for c in columns.split(",")],
+            select_exprs=[e.strip() for e in select_exprs.split(",")],
+            key_columns=key_columns,
+            shadow_key_exprs=shadow_key_exprs,
+            indexes=[sql for sql in possession_store.INTEGER_KEY_INDEXES if f" ON {table}(" in sql],
+        ))
+    return specs
+
+
+def migrate_possessions_to_integer_keys(conn: sqlite3.Connection, chunk_size: int = 50_000) -> Dict[str, int]:
+    """
+    Rebuild the four possession tables with integer surrogate keys.
+
+    No-op if the layout is already in place.
+
+    Returns:
+        Rows copied per table
+    """
+    if possession_store.uses_integer_keys(conn):
+        logger.info("Possession tables already use integer keys")
+        return {}
+    # The key functions run inside the copy and replay statements.
+    possession_store.register_key_functions(conn)
+    return rebuild_tables(conn, integer_key_rebuild_specs(), chunk_size=chunk_size)
+
+
+def _plan_integer_keys(conn: sqlite3.Connection) -> List[PlanStep]:
+    if possession_store.uses_integer_keys(conn):
+        return []
+    return plan_rebuild(conn, integer_key_rebuild_specs())
+
+
+SEASON_LOOKUP_INDEXES = {
+    "idx_games_season": "CREATE INDEX IF NOT EXISTS idx_games_season ON games(season, season_type)",
+    "idx_player_season_stats_season":
+        "CREATE INDEX IF NOT EXISTS idx_player_season_stats_season ON player_season_stats(season, player_id, season_type)",
+}
+
+
+def _add_season_indexes(conn: sqlite3.Connection) -> None:
+    for sql in SEASON_LOOKUP_INDEXES.values():
+        create_index_online(conn, sql)
+
+
+def _plan_season_indexes(conn: sqlite3.Connection) -> List[PlanStep]:
+    steps = []
+    for name, sql in SEASON_LOOKUP_INDEXES.items():
+        if table_exists(conn, name):
+            continue
+        table = sql.split(" ON ")[1].split("(")[0]
+        steps.append(PlanStep("create index", name, row_count(conn, table)))
+    return steps
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline_schema", _baseline, _plan_baseline),
+    Migration(2, "drop_row_update_triggers", _drop_triggers, _plan_drop_triggers),
+    Migration(3, "possession_integer_keys", migrate_possessions_to_integer_keys, _plan_integer_keys),
+    Migration(4, "season_lookup_indexes", _add_season_indexes, _plan_season_indexes),
+]
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+class MigrationRunner:
+    """Applies pending migrations and records them in schema_version."""
+
+    def __init__(self, db_path: str = "data/nba_stats.db", migrations: Optional[List[Migration]] = None):
+        """Initialize with database path and the ordered migration list."""
+        self.db_path = Path(db_path)
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+        versions = [m.version for m in self.migrations]
+        if len(set(versions)) != len(versions):
+            raise MigrationError(f"Duplicate migration versions: {versions}")
+
+    def _ensure_version_table(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT NOT NULL,
+                duration_seconds REAL
+            )
+        """)
+        conn.commit()
+
+    def current_version(self, conn: sqlite3.Connection) -> int:
+        if not table_exists(conn, "schema_version"):
+            return 0
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        return row[0] or 0
+
+    def _connect_read_only(self) -> sqlite3.Connection:
+        """
+        Open the database without writing to it: no PRAGMA profile (which
+        would switch the journal mode) and no schema_version table. A missing
+        database is planned as an empty one.
+        """
+        if not self.db_path.exists():
+            return sqlite3.connect(":memory:")
+        return sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+
+    def pending(self, conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+        current = self.current_version(conn)
+        return [
+            m for m in self.migrations
+            if m.version > current and (target is None or m.version <= target)
+        ]
+
+    def plan(self, target: Optional[int] = None) -> List[Dict[str, object]]:
+        """Describe pending migrations and their estimated rewrite size without applying them."""
+        conn = self._connect_read_only()
+        try:
+            rows = []
+            for migration in self.pending(conn, target):
+                steps = migration.plan(conn) or [PlanStep("apply", migration.name)]
+                for step in steps:
+                    rows.append({
+                        "version": migration.version,
+                        "migration": migration.name,
+                        "action": step.action,
+                        "target": step.target,
+                        "rows": step.rows,
+                        "estimated_mb": round(step.estimated_bytes / 1e6, 2),
+                    })
+            return rows
+        finally:
+            conn.close()
+
+    def upgrade(self, target: Optional[int] = None) -> List[int]:
+        """
+        Apply pending migrations in order.
+
+        Each step is recorded only after it succeeds, and every step is
+        idempotent, so an interrupted run can simply be restarted.
+
+        Returns:
+            Versions applied
+        """
+        conn = connect(self.db_path)
+        self._ensure_version_table(conn)
+        applied = []
+        try:
+            for migration in self.pending(conn, target):
+                logger.info(f"▶ Applying migration {migration.version}: {migration.name}")
+                start = time.perf_counter()
+                migration.upgrade(conn)
+                duration = time.perf_counter() - start
+                conn.execute(
+                    "INSERT INTO schema_version (version, name, applied_at, duration_seconds) VALUES (?, ?, ?, ?)",
+                    (migration.version, migration.name, datetime.now().isoformat(timespec="seconds"), duration),
+                )
+                conn.commit()
+                applied.append(migration.version)
+                logger.info(f"✓ Migration {migration.version} applied in {duration:.2f}s")
+        finally:
+            conn.close()
+        return applied
+
+
+def main():
+    """Apply or preview schema migrations."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Versioned schema migrations for the NBA stats database")
+    parser.add_argument("--db-path", default="data/nba_stats.db", help="Database path")
+    parser.add_argument("--target", type=int, help="Upgrade to this version (default: latest)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan and estimated rewrite size only")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    runner = MigrationRunner(args.db_path)
+
+    if args.dry_run:
+        plan = runner.plan(args.target)
+        if not plan:
+            print("✅ Database is up to date")
+            return
+        print("\n📋 Migration Plan (dry run)")
+        print("=" * 80)
+        for step in plan:
+            print(f"  v{step['version']:<3} {step['migration']:<28} {step['action']:<22} "
+                  f"{step['target']:<28} rows={step['rows']:>10,}  ~{step['estimated_mb']:.1f} MB")
+        total = sum(step["estimated_mb"] for step in plan)
+        print(f"\nEstimated rewrite: {total:,.1f} MB")
+        return
+
+    applied = runner.upgrade(args.target)
+    print(f"\n✅ Applied {len(applied)} migration(s): {applied}" if applied else "\n✅ Database is up to date")
+
+
+if __name__ == "__main__":
+    main()
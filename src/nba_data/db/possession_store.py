@@ -0,0 +1,346 @@
+"""
+Possession Write Path
+
+Shared writer for the high-volume play-by-play tables (`possessions`,
+`possession_events`, `possession_lineups`, `possession_matchups`) plus the
+schema changes that make re-ingestion cheap:
+
+1. UPSERT instead of INSERT OR REPLACE. Rows are updated in place and only
+   when a value changed; updated_at is set by the statement, so the
+   per-row AFTER UPDATE trigger is no longer needed.
+2. Optional integer surrogate keys. Possession IDs are built as
+   "{game_id}_{period}_{elapsed_seconds}" and event IDs append
+   "_{event_number}", so both encode losslessly into int64:
+
+       possession_key = game_id * 10^7 + period * 10^5 + round(elapsed * 10)
+       event_key      = possession_key * 10^3 + event_number
+
+   In the integer layout `possessions` and `possession_events` use these as
+   INTEGER PRIMARY KEY (the rowid itself, no separate PK index) and the
+   composite-key child tables become WITHOUT ROWID, clustered on
+   (possession_key, player_id).
+
+PossessionWriter detects which layout the database has, so the populate
+scripts work before and after the integer-key migration
+(`migrations.migrate_possessions_to_integer_keys`, schema version 3).
+"""
+
+import logging
+import sqlite3
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .schema import LEGACY_UPDATE_TRIGGERS, build_upsert_sql
+
+logger = logging.getLogger(__name__)
+
+GAME_STRIDE = 10 ** 7
+PERIOD_STRIDE = 10 ** 5
+ELAPSED_SCALE = 10
+EVENT_STRIDE = 10 ** 3
+
+POSSESSION_COLUMNS = [
+    "game_id", "period", "clock_time_start", "clock_time_end",
+    "home_team_id", "away_team_id", "offensive_team_id", "defensive_team_id",
+    "possession_start", "possession_end", "duration_seconds", "points_scored",
+    "expected_points", "possession_type", "start_reason", "end_reason",
+]
+
+EVENT_COLUMNS = [
+    "event_number", "clock_time", "elapsed_seconds",
+    "player_id", "team_id", "opponent_team_id", "event_type", "event_subtype",
+    "shot_type", "shot_distance", "shot_result", "points_scored", "assist_player_id",
+    "block_player_id", "steal_player_id", "turnover_type", "foul_type", "rebound_type",
+    "location_x", "location_y", "defender_player_id", "touches_before_action",
+    "dribbles_before_action",
+]
+
+LINEUP_COLUMNS = ["player_id", "team_id", "position"]
+
+MATCHUP_COLUMNS = [
+    "offensive_player_id", "defensive_player_id",
+    "matchup_start_time", "matchup_end_time", "duration_seconds",
+    "switches_during_matchup",
+]
+
+
+# ----------------------------------------------------------------------
+# Key encoding
+# ----------------------------------------------------------------------
+def possession_key(possession_id: str) -> int:
+    """Encode a '{game_id}_{period}_{elapsed}' possession ID as an int64 key."""
+    try:
+        game_id, period, elapsed = possession_id.split("_")
+        return int(game_id) * GAME_STRIDE + int(period) * PERIOD_STRIDE + int(round(float(elapsed) * ELAPSED_SCALE))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Unrecognized possession_id format: {possession_id!r}")
+
+
+def event_key(event_id: str) -> int:
+    """Encode a '{possession_id}_{event_number}' event ID as an int64 key."""
+    possession_id, _, event_number = str(event_id).rpartition("_")
+    return possession_key(possession_id) * EVENT_STRIDE + int(event_number)
+
+
+def encode_possession_keys(possession_ids: pd.Series) -> np.ndarray:
+    """Vectorized possession_key() for a column of possession IDs."""
+    parts = possession_ids.astype(str).str.split("_", expand=True)
+    if parts.shape[1] != 3:
+        raise ValueError("Unrecognized possession_id format in column")
+    game = parts[0].astype("int64").to_numpy()
+    period = parts[1].astype("int64").to_numpy()
+    elapsed = np.rint(parts[2].astype("float64").to_numpy() * ELAPSED_SCALE).astype("int64")
+    return game * GAME_STRIDE + period * PERIOD_STRIDE + elapsed
+
+
+def uses_integer_keys(conn: sqlite3.Connection) -> bool:
+    """True when the possession tables use the integer-key layout."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(possessions)")}
+    return "possession_key" in columns
+
+
+# ----------------------------------------------------------------------
+# Writer
+# ----------------------------------------------------------------------
+class PossessionWriter:
+    """Batched UPSERT writer for parsed Possession objects."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """Initialize against an open connection (layout is detected once)."""
+        self.conn = conn
+        self.integer_keys = uses_integer_keys(conn)
+
+        if self.integer_keys:
+            self._sql = {
+                "possessions": build_upsert_sql(
+                    "possessions", ["possession_key", "possession_id"] + POSSESSION_COLUMNS,
+                    ["possession_key"], touch_updated_at=True),
+                "possession_events": build_upsert_sql(
+                    "possession_events", ["event_key", "possession_key"] + EVENT_COLUMNS, ["event_key"]),
+                "possession_lineups": build_upsert_sql(
+                    "possession_lineups", ["possession_key"] + LINEUP_COLUMNS, ["possession_key", "player_id"]),
+                "possession_matchups": build_upsert_sql(
+                    "possession_matchups", ["possession_key"] + MATCHUP_COLUMNS,
+                    ["possession_key", "offensive_player_id", "defensive_player_id"]),
+            }
+        else:
+            self._sql = {
+                "possessions": build_upsert_sql(
+                    "possessions", ["possession_id"] + POSSESSION_COLUMNS,
+                    ["possession_id"], touch_updated_at=True),
+                "possession_events": build_upsert_sql(
+                    "possession_events", ["event_id", "possession_id"] + EVENT_COLUMNS, ["event_id"]),
+                "possession_lineups": build_upsert_sql(
+                    "possession_lineups", ["possession_id"] + LINEUP_COLUMNS, ["possession_id", "player_id"]),
+                "possession_matchups": build_upsert_sql(
+                    "possession_matchups", ["possession_id"] + MATCHUP_COLUMNS,
+                    ["possession_id", "offensive_player_id", "defensive_player_id"]),
+            }
+
+    def _rows(self, possessions: Sequence[Any]) -> Dict[str, List[tuple]]:
+        rows = {table: [] for table in self._sql}
+        for possession in possessions:
+            if self.integer_keys:
+                key = possession_key(possession.possession_id)
+                parent = (key,)
+                rows["possessions"].append(
+                    (key, possession.possession_id) + tuple(getattr(possession, c) for c in POSSESSION_COLUMNS)
+                )
+            else:
+                parent = (possession.possession_id,)
+                rows["possessions"].append(
+                    parent + tuple(getattr(possession, c) for c in POSSESSION_COLUMNS)
+                )
+
+            for event in possession.events:
+                if self.integer_keys:
+                    ids = (parent[0] * EVENT_STRIDE + int(event.event_number), parent[0])
+                else:
+                    ids = (event.event_id, event.possession_id)
+                rows["possession_events"].append(ids + tuple(getattr(event, c) for c in EVENT_COLUMNS))
+
+            for lineup in possession.lineups or []:
+                rows["possession_lineups"].append(parent + tuple(lineup.get(c) for c in LINEUP_COLUMNS))
+
+            for matchup in possession.matchups or []:
+                rows["possession_matchups"].append(parent + tuple(matchup.get(c) for c in MATCHUP_COLUMNS))
+        return rows
+
+    def write(self, possessions: Sequence[Any]) -> Dict[str, int]:
+        """
+        Upsert possessions with their events, lineups and matchups.
+
+        The caller owns the transaction (commit/rollback).
+
+        Returns:
+            Counts of rows submitted per entity
+        """
+        rows = self._rows(possessions)
+        for table, table_rows in rows.items():
+            if table_rows:
+                self.conn.executemany(self._sql[table], table_rows)
+
+        return {
+            "possessions": len(rows["possessions"]),
+            "events": len(rows["possession_events"]),
+            "lineups": len(rows["possession_lineups"]),
+            "matchups": len(rows["possession_matchups"]),
+        }
+
+
+# ----------------------------------------------------------------------
+# Migrations
+# ----------------------------------------------------------------------
+def drop_row_update_triggers(conn: sqlite3.Connection) -> List[str]:
+    """Drop the legacy per-row updated_at triggers. Returns the ones that existed."""
+    existing = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+    }
+    dropped = [name for name in LEGACY_UPDATE_TRIGGERS if name in existing]
+    for name in dropped:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.commit()
+    return dropped
+
+
+INTEGER_KEY_TABLES = {
+    "possessions": """
+        CREATE TABLE {name} (
+            possession_key INTEGER PRIMARY KEY,
+            possession_id TEXT NOT NULL,
+            game_id TEXT NOT NULL,
+            period INTEGER,
+            clock_time_start TEXT,
+            clock_time_end TEXT,
+            home_team_id INTEGER NOT NULL,
+            away_team_id INTEGER NOT NULL,
+            offensive_team_id INTEGER NOT NULL,
+            defensive_team_id INTEGER NOT NULL,
+            possession_start REAL,
+            possession_end REAL,
+            duration_seconds REAL,
+            points_scored INTEGER DEFAULT 0,
+            expected_points REAL,
+            possession_type TEXT,
+            start_reason TEXT,
+            end_reason TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (game_id) REFERENCES games(game_id),
+            FOREIGN KEY (home_team_id) REFERENCES teams(team_id),
+            FOREIGN KEY (away_team_id) REFERENCES teams(team_id),
+            FOREIGN KEY (offensive_team_id) REFERENCES teams(team_id),
+            FOREIGN KEY (defensive_team_id) REFERENCES teams(team_id)
+        )
+    """,
+    "possession_events": """
+        CREATE TABLE {name} (
+            event_key INTEGER PRIMARY KEY,
+            possession_key INTEGER NOT NULL,
+            event_number INTEGER NOT NULL,
+            clock_time TEXT NOT NULL,
+            elapsed_seconds REAL NOT NULL,
+            player_id INTEGER,
+            team_id INTEGER NOT NULL,
+            opponent_team_id INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            event_subtype TEXT,
+            shot_type TEXT,
+            shot_distance INTEGER,
+            shot_result TEXT,
+            points_scored INTEGER DEFAULT 0,
+            assist_player_id INTEGER,
+            block_player_id INTEGER,
+            steal_player_id INTEGER,
+            turnover_type TEXT,
+            foul_type TEXT,
+            rebound_type TEXT,
+            location_x REAL,
+            location_y REAL,
+            defender_player_id INTEGER,
+            touches_before_action INTEGER,
+            dribbles_before_action INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (possession_key) REFERENCES possessions(possession_key),
+            FOREIGN KEY (player_id) REFERENCES players(player_id),
+            FOREIGN KEY (team_id) REFERENCES teams(team_id),
+            FOREIGN KEY (opponent_team_id) REFERENCES teams(team_id),
+            FOREIGN KEY (assist_player_id) REFERENCES players(player_id),
+            FOREIGN KEY (block_player_id) REFERENCES players(player_id),
+            FOREIGN KEY (steal_player_id) REFERENCES players(player_id),
+            FOREIGN KEY (defender_player_id) REFERENCES players(player_id)
+        )
+    """,
+    "possession_lineups": """
+        CREATE TABLE {name} (
+            possession_key INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            team_id INTEGER NOT NULL,
+            position TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (possession_key, player_id),
+            FOREIGN KEY (possession_key) REFERENCES possessions(possession_key),
+            FOREIGN KEY (player_id) REFERENCES players(player_id),
+            FOREIGN KEY (team_id) REFERENCES teams(team_id)
+        ) WITHOUT ROWID
+    """,
+    "possession_matchups": """
+        CREATE TABLE {name} (
+            possession_key INTEGER NOT NULL,
+            offensive_player_id INTEGER NOT NULL,
+            defensive_player_id INTEGER NOT NULL,
+            matchup_start_time TEXT,
+            matchup_end_time TEXT,
+            duration_seconds REAL,
+            switches_during_matchup INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (possession_key, offensive_player_id, defensive_player_id),
+            FOREIGN KEY (possession_key) REFERENCES possessions(possession_key),
+            FOREIGN KEY (offensive_player_id) REFERENCES players(player_id),
+            FOREIGN KEY (defensive_player_id) REFERENCES players(player_id)
+        ) WITHOUT ROWID
+    """,
+}
+
+INTEGER_KEY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_possessions_game_id ON possessions(game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_possessions_offensive_team ON possessions(offensive_team_id)",
+    "CREATE INDEX IF NOT EXISTS idx_possessions_period ON possessions(game_id, period)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_events_possession ON possession_events(possession_key, event_number)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_events_player ON possession_events(player_id, event_type)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_events_type ON possession_events(event_type, event_subtype)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_events_team ON possession_events(team_id, event_type)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_lineups_player ON possession_lineups(player_id)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_lineups_team ON possession_lineups(team_id)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_matchups_offensive ON possession_matchups(offensive_player_id)",
+    "CREATE INDEX IF NOT EXISTS idx_possession_matchups_defensive ON possession_matchups(defensive_player_id)",
+]
+
+# Copy statements from the TEXT-key tables (used by migrations.py); possession_key()/event_key() are
+# registered as SQL functions on the connection before these run.
+INTEGER_KEY_COPY = {
+    "possessions": (
+        "possession_key, possession_id, " + ", ".join(POSSESSION_COLUMNS) + ", created_at, updated_at",
+        "possession_key(possession_id), possession_id, " + ", ".join(POSSESSION_COLUMNS) + ", created_at, updated_at",
+    ),
+    "possession_events": (
+        "event_key, possession_key, " + ", ".join(EVENT_COLUMNS) + ", created_at",
+        "event_key(event_id), possession_key(possession_id), " + ", ".join(EVENT_COLUMNS) + ", created_at",
+    ),
+    "possession_lineups": (
+        "possession_key, " + ", ".join(LINEUP_COLUMNS) + ", created_at",
+        "possession_key(possession_id), " + ", ".join(LINEUP_COLUMNS) + ", created_at",
+    ),
+    "possession_matchups": (
+        "possession_key, " + ", ".join(MATCHUP_COLUMNS) + ", created_at",
+        "possession_key(possession_id), " + ", ".join(MATCHUP_COLUMNS) + ", created_at",
+    ),
+}
+
+
+def register_key_functions(conn: sqlite3.Connection) -> None:
+    """Expose possession_key()/event_key() to SQL on this connection."""
+    conn.create_function("possession_key", 1, possession_key, deterministic=True)
+    conn.create_function("event_key", 1, event_key, deterministic=True)
@@ -0,0 +1,478 @@
+"""
+Query-Plan Regression Suite
+
+Collects the SELECT statements the pipeline sends to data/nba_stats.db,
+runs EXPLAIN QUERY PLAN for each against a synthetic database with
+production-shaped row counts, and fails when a query scans a large table
+instead of using an index. Per-query timings are recorded so a schema or
+script change that slows a query down shows up against a saved baseline.
+
+Queries are discovered from the source rather than listed by hand: every
+string literal starting with SELECT under `src/nba_data/scripts` and
+`src/nba_data/db` is checked. `{key}` templates (columnar_store) are
+formatted for the database's possession key; other f-strings and templates
+are dynamic and reported as skipped. Intentional whole-table reads (one-off
+backfills, summary counts) are listed in FULL_SCAN_ALLOWED with the reason.
+
+Usage:
+    python -m src.nba_data.db.query_plans                                  # check plans
+    python -m src.nba_data.db.query_plans --output results/query_plans.json
+    python -m src.nba_data.db.query_plans --baseline results/query_plans.json --scale 0.1
+"""
+
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import random
+import re
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .schema import connect
+from .migrations import MigrationRunner
+from .possession_store import uses_integer_keys
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+SCAN_PATHS = [PROJECT_ROOT / "src" / "nba_data" / "scripts", PROJECT_ROOT / "src" / "nba_data" / "db"]
+EXCLUDED_FILES = {"query_plans.py", "benchmark_possession_writes.py"}
+
+# A table is "large" if the full 9-season database holds at least this many rows.
+PRODUCTION_SEASONS = 9
+LARGE_TABLE_ROWS = 5_000
+
+# Rows per season at production scale; the synthetic build multiplies the
+# per-game tables by --scale and keeps the per-player tables at full size.
+ROWS_PER_SEASON = {
+    "games": 1_315,
+    "player_season_stats": 1_200,
+    "player_advanced_stats": 1_200,
+    "player_tracking_stats": 1_200,
+    "player_playoff_stats": 220,
+    "player_game_logs": 1_315 * 26,
+    "player_playtype_stats": 600 * 10,
+    "player_shot_dashboard_stats": 600 * 24,
+    "player_shot_locations": 1_315 * 170,
+    "possessions": 1_315 * 200,
+    "possession_events": 1_315 * 200 * 4,
+    "possession_lineups": 1_315 * 200 * 5,
+}
+
+# (source file, table) -> why a full scan is acceptable there.
+FULL_SCAN_ALLOWED = {
+    ("populate_games_data.py", "possessions"): "one-off backfill of games from every possession",
+    ("populate_minimal_players.py", "player_season_stats"): "collects every player id once",
+    ("populate_minimal_players.py", "player_advanced_stats"): "collects every player id once",
+    ("populate_minimal_players.py", "player_tracking_stats"): "collects every player id once",
+    ("populate_player_metadata.py", "player_season_stats"): "anti-join over all players without metadata",
+    ("populate_player_data.py", "player_season_stats"): "whole-table summary counts",
+    ("populate_player_data.py", "player_advanced_stats"): "whole-table summary counts",
+    ("populate_player_data.py", "player_tracking_stats"): "whole-table summary counts",
+    ("populate_shot_location_data.py", "player_season_stats"): "unfiltered variant lists every player-season",
+    ("populate_shot_location_data.py", "player_shot_locations"): "resume check over everything collected",
+    ("columnar_store.py", "possessions"): "per-game fingerprints for incremental export",
+}
+
+SEASON_TYPES = ["Regular Season", "Playoffs"]
+TEAM_IDS = [1610612737 + i for i in range(30)]
+PLAY_TYPES = ["Isolation", "PRBallHandler", "PRRollman", "Postup", "Spotup",
+              "Handoff", "Cut", "OffScreen", "Transition", "Misc"]
+DEF_DIST_RANGES = ["0-2 Feet - Very Tight", "2-4 Feet - Tight", "4-6 Feet - Open", "6+ Feet - Wide Open"]
+SHOT_CLOCK_RANGES = ["24-22", "22-18 Very Early", "18-15 Early", "15-7 Average", "7-4 Late", "4-0 Very Late"]
+
+
+@dataclass
+class DiscoveredQuery:
+    """A SELECT statement found in the source tree."""
+    sql: str
+    sources: List[Tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def query_id(self) -> str:
+        file_name = self.sources[0][0]
+        digest = hashlib.sha1(normalize_sql(self.sql).encode()).hexdigest()[:8]
+        return f"{file_name}:{digest}"
+
+
+@dataclass
+class QueryResult:
+    """Plan check and timing for one query."""
+    query_id: str
+    sources: List[str]
+    sql: str
+    plan: List[str]
+    full_scans: List[str]
+    allowed_scans: Dict[str, str]
+    median_ms: Optional[float]
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.full_scans) or self.error is not None
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def scanned_table(detail: str) -> Optional[str]:
+    """
+    Table (or alias) a plan step scans in full, or None. SQLite >= 3.36
+    writes "SCAN x"; older versions write "SCAN TABLE x".
+    """
+    scan = re.match(r"SCAN (?:TABLE )?(\w+)", detail)
+    return scan.group(1) if scan else None
+
+
+# ----------------------------------------------------------------------
+# Discovery
+# ----------------------------------------------------------------------
+def discover_queries(paths: Sequence[Path] = SCAN_PATHS) -> Tuple[List[DiscoveredQuery], List[Tuple[str, int]]]:
+    """
+    Find SELECT string literals in the given source trees.
+
+    Returns:
+        (static queries, locations of dynamic f-string queries that were skipped)
+    """
+    found: Dict[str, DiscoveredQuery] = {}
+    dynamic = []
+    for root in paths:
+        for path in sorted(Path(root).glob("*.py")):
+            if path.name in EXCLUDED_FILES:
+                continue
+            try:
+                tree = ast.parse(path.read_text())
+            except SyntaxError:
+                logger.warning(f"Skipping {path.name}: not parseable")
+                continue
+            # Constant pieces of f-strings are visited on their own too; skip them.
+            fragments = {
+                id(value) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr) for value in node.values
+            }
+            for node in ast.walk(tree):
+                if id(node) in fragments:
+                    continue
+                if isinstance(node, ast.JoinedStr):
+                    text = "".join(v.value for v in node.values if isinstance(v, ast.Constant) and isinstance(v.value, str))
+                    if re.match(r"\s*SELECT\b", text, re.IGNORECASE):
+                        dynamic.append((path.name, node.lineno))
+                elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                    if not re.match(r"\s*SELECT\b", node.value, re.IGNORECASE):
+                        continue
+                    if re.search(r"\{(?!key\})\w*\}", node.value):
+                        dynamic.append((path.name, node.lineno))
+                        continue
+                    key = normalize_sql(node.value)
+                    found.setdefault(key, DiscoveredQuery(sql=node.value)).sources.append((path.name, node.lineno))
+    return list(found.values()), sorted(set(dynamic))
+
+
+# ----------------------------------------------------------------------
+# Synthetic database
+# ----------------------------------------------------------------------
+def _insert(conn: sqlite3.Connection, table: str, rows: List[Dict[str, Any]]) -> None:
+    """Insert dict rows, filling NOT NULL columns the generator left out."""
+    if not rows:
+        return
+    info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    filler = {}
+    for _, name, col_type, notnull, default, _ in info:
+        if notnull and default is None and name not in rows[0]:
+            filler[name] = 0 if "INT" in col_type.upper() else 0.0 if "REAL" in col_type.upper() else ""
+    columns = list(rows[0]) + list(filler)
+    sql = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    conn.executemany(sql, ([row[c] for c in rows[0]] + list(filler.values()) for row in rows))
+
+
+def _season_labels(n_seasons: int, last_season: str = "2023-24") -> List[str]:
+    end = int(last_season[:4])
+    return [f"{year}-{str(year + 1)[2:]}" for year in range(end - n_seasons + 1, end + 1)]
+
+
+def build_synthetic_database(db_path: Path, seasons: int = PRODUCTION_SEASONS, scale: float = 0.02, seed: int = 42) -> Dict[str, int]:
+    """
+    Create a database with the current schema and production-shaped data.
+
+    Per-player tables are generated at full size; per-game tables (games,
+    game logs, shots, possessions) are multiplied by `scale`. The database is
+    migrated to the latest schema version and ANALYZEd so the planner sees
+    realistic statistics.
+
+    Returns:
+        Row counts per populated table
+    """
+    rng = random.Random(seed)
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+    with contextlib.redirect_stdout(io.StringIO()):
+        MigrationRunner(str(db_path)).upgrade(target=2)
+
+    conn = connect(db_path)
+    conn.execute("PRAGMA foreign_keys = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    player_ids = [200000 + i for i in range(1500)]
+    _insert(conn, "teams", [
+        {"team_id": t, "team_name": f"Team {t}", "team_abbreviation": f"T{i:02d}", "team_code": f"t{i}",
+         "team_city": "City", "team_conference": "East" if i < 15 else "West", "team_division": f"D{i // 5}"}
+        for i, t in enumerate(TEAM_IDS)
+    ])
+    _insert(conn, "players", [
+        {"player_id": p, "player_name": f"Player {p}", "team_id": rng.choice(TEAM_IDS)} for p in player_ids
+    ])
+
+    games_per_season = max(10, int(ROWS_PER_SEASON["games"] * scale))
+    for season in _season_labels(seasons):
+        yy = season[2:4]
+        active = rng.sample(player_ids, 600)
+        rosters = {t: active[i * 20:(i + 1) * 20] for i, t in enumerate(TEAM_IDS)}
+
+        for table in ("player_season_stats", "player_advanced_stats", "player_tracking_stats"):
+            _insert(conn, table, [
+                {"player_id": p, "season": season, "season_type": season_type, "team_id": team}
+                for season_type in SEASON_TYPES for team, roster in rosters.items() for p in roster
+            ])
+        _insert(conn, "player_playoff_stats", [
+            {"player_id": p, "season": season, "team_id": team}
+            for team, roster in list(rosters.items())[:16] for p in roster[:14]
+        ])
+        _insert(conn, "player_playtype_stats", [
+            {"player_id": p, "season": season, "season_type": "Regular Season", "team_id": team, "play_type": play_type,
+             "points_per_possession": rng.uniform(0.6, 1.4), "percentile": rng.random()}
+            for team, roster in rosters.items() for p in roster for play_type in PLAY_TYPES
+        ])
+        _insert(conn, "player_shot_dashboard_stats", [
+            {"player_id": p, "season": season, "season_type": "Regular Season", "team_id": team,
+             "close_def_dist_range": dist, "shot_clock_range": clock, "dribble_range": "", "shot_dist_range": ""}
+            for team, roster in rosters.items() for p in roster for dist in DEF_DIST_RANGES for clock in SHOT_CLOCK_RANGES
+        ])
+
+        for g in range(games_per_season):
+            season_type = "Regular Season" if g < games_per_season * 0.935 else "Playoffs"
+            game_id = f"00{'2' if season_type == 'Regular Season' else '4'}{yy}{g:05d}"
+            home, away = rng.sample(TEAM_IDS, 2)
+            _insert(conn, "games", [{"game_id": game_id, "home_team_id": home, "away_team_id": away,
+                                     "season": season, "season_type": season_type, "game_date": f"20{yy}-11-01"}])
+            _insert(conn, "player_game_logs", [
+                {"player_id": p, "game_id": game_id, "season": season, "season_type": season_type,
+                 "game_date": f"20{yy}-11-01", "team_id": team, "points": rng.randint(0, 40)}
+                for team in (home, away) for p in rosters[team][:13]
+            ])
+            _insert(conn, "player_shot_locations", [
+                {"game_id": game_id, "player_id": rng.choice(rosters[team]), "team_id": team, "season": season,
+                 "season_type": season_type, "shot_distance": rng.randint(0, 30)}
+                for team in (home, away) for _ in range(85)
+            ])
+            possessions, events, lineups = [], [], []
+            for n in range(200):
+                offense, defense = (home, away) if n % 2 == 0 else (away, home)
+                period = n * 4 // 200 + 1
+                possession_id = f"{game_id}_{period}_{float(n * 14)}"
+                possessions.append({
+                    "possession_id": possession_id, "game_id": game_id, "period": period,
+                    "home_team_id": home, "away_team_id": away, "offensive_team_id": offense,
+                    "defensive_team_id": defense, "possession_start": n * 14.0, "points_scored": rng.choice([0, 0, 2, 3]),
+                })
+                events.extend(
+                    {"event_id": f"{possession_id}_{e}", "possession_id": possession_id, "event_number": e,
+                     "clock_time": "10:00", "elapsed_seconds": n * 14.0 + e, "player_id": rng.choice(rosters[offense]),
+                     "team_id": offense, "opponent_team_id": defense, "event_type": rng.choice(["shot", "rebound", "turnover", "foul"])}
+                    for e in range(4)
+                )
+                lineups.extend({"possession_id": possession_id, "player_id": p, "team_id": offense}
+                               for p in rosters[offense][:5])
+            _insert(conn, "possessions", possessions)
+            _insert(conn, "possession_events", events)
+            _insert(conn, "possession_lineups", lineups)
+        conn.commit()
+    conn.close()
+
+    # Latest schema (integer keys, new indexes), then planner statistics.
+    with contextlib.redirect_stdout(io.StringIO()):
+        MigrationRunner(str(db_path)).upgrade()
+    conn = connect(db_path)
+    conn.execute("ANALYZE")
+    conn.commit()
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ROWS_PER_SEASON}
+    conn.close()
+    return counts
+
+
+# ----------------------------------------------------------------------
+# Plan checks
+# ----------------------------------------------------------------------
+def large_tables(threshold: int = LARGE_TABLE_ROWS) -> List[str]:
+    return [t for t, rows in ROWS_PER_SEASON.items() if rows * PRODUCTION_SEASONS >= threshold]
+
+
+def _aliases(sql: str) -> Dict[str, str]:
+    """Map aliases (and bare names) used in FROM/JOIN clauses to table names."""
+    aliases = {}
+    keywords = {"where", "join", "left", "inner", "on", "group", "order", "union", "limit", "having", "cross"}
+    for table, alias in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.lower() not in keywords:
+            aliases[alias] = table
+    return aliases
+
+
+def _sample_params(sql: str, samples: Dict[str, Any]) -> List[Any]:
+    """Bind a realistic value for each '?' from the column it is compared with."""
+    params = []
+    for match in re.finditer(r"\?", sql):
+        column = re.search(r"(\w+)\s*(?:=|<=|>=|<|>|IN\s*\()\s*$", sql[:match.start()], re.IGNORECASE)
+        params.append(samples.get(column.group(1).lower()) if column else None)
+    return params
+
+
+def _sample_values(conn: sqlite3.Connection) -> Dict[str, Any]:
+    row = conn.execute(
+        "SELECT p.game_id, g.season, g.season_type FROM possessions p JOIN games g ON g.game_id = p.game_id LIMIT 1"
+    ).fetchone()
+    player_id = conn.execute("SELECT player_id FROM player_game_logs LIMIT 1").fetchone()[0]
+    return {
+        "game_id": row[0], "season": row[1], "season_type": row[2],
+        "player_id": player_id, "team_id": TEAM_IDS[0],
+    }
+
+
+def check_query(conn: sqlite3.Connection, query: DiscoveredQuery, large: Sequence[str],
+                samples: Dict[str, Any], key: str, repeat: int = 5) -> QueryResult:
+    """EXPLAIN one query, classify any table scans, and time it."""
+    sql = query.sql.replace("{key}", key)
+    params = _sample_params(sql, samples)
+    sources = [f"{name}:{line}" for name, line in query.sources]
+    try:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    except sqlite3.Error as e:
+        return QueryResult(query.query_id, sources, normalize_sql(sql), [], [], {}, None, error=str(e))
+
+    aliases = _aliases(sql)
+    full_scans, allowed = [], {}
+    for detail in plan:
+        scanned = scanned_table(detail)
+        if not scanned:
+            continue
+        table = aliases.get(scanned, scanned)
+        if table not in large:
+            continue
+        reasons = [FULL_SCAN_ALLOWED.get((name, table)) for name, _ in query.sources]
+        if all(reasons):
+            allowed[table] = reasons[0]
+        else:
+            full_scans.append(detail)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return QueryResult(query.query_id, sources, normalize_sql(sql), plan, full_scans, allowed,
+                       round(statistics.median(timings), 3))
+
+
+def run_suite(db_path: Path, repeat: int = 5, threshold: int = LARGE_TABLE_ROWS) -> Tuple[List[QueryResult], List[Tuple[str, int]]]:
+    """Check every discovered query against an existing (synthetic) database."""
+    queries, dynamic = discover_queries()
+    conn = connect(db_path, read_only=True)
+    try:
+        key = "possession_key" if uses_integer_keys(conn) else "possession_id"
+        samples = _sample_values(conn)
+        large = large_tables(threshold)
+        results = [check_query(conn, q, large, samples, key, repeat) for q in queries]
+    finally:
+        conn.close()
+    return results, dynamic
+
+
+def compare_to_baseline(results: List[QueryResult], baseline: Dict[str, Any],
+                        tolerance: float = 2.0, min_delta_ms: float = 1.0) -> List[str]:
+    """Queries whose median time grew past `tolerance`x the baseline (and by more than noise)."""
+    regressions = []
+    for result in results:
+        previous = baseline.get("queries", {}).get(result.query_id, {}).get("median_ms")
+        if previous is None or result.median_ms is None:
+            continue
+        if result.median_ms > previous * tolerance and result.median_ms - previous > min_delta_ms:
+            regressions.append(f"{result.query_id}: {previous:.2f}ms -> {result.median_ms:.2f}ms")
+    return regressions
+
+
+def main():
+    """Build the synthetic database, check query plans and timings."""
+    import argparse
+    import sys
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN regression suite for the project's SQL")
+    parser.add_argument("--db-path", help="Reuse an existing synthetic database instead of building one")
+    parser.add_argument("--seasons", type=int, default=PRODUCTION_SEASONS, help="Seasons in the synthetic database")
+    parser.add_argument("--scale", type=float, default=0.02, help="Fraction of a full season's games to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    parser.add_argument("--baseline", help="Report from a previous run to compare timings against")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Slowdown factor that counts as a regression")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    with tempfile.TemporaryDirectory(prefix="query_plans_") as tmp:
+        db_path = Path(args.db_path) if args.db_path else Path(tmp) / "synthetic.db"
+        if not args.db_path:
+            logger.info(f"Building synthetic database ({args.seasons} seasons, scale {args.scale})...")
+            counts = build_synthetic_database(db_path, seasons=args.seasons, scale=args.scale)
+            logger.info("Rows: " + ", ".join(f"{t}={n:,}" for t, n in counts.items()))
+        results, dynamic = run_suite(db_path, repeat=args.repeat)
+
+    print(f"\n🔎 Query Plan Check ({len(results)} queries, {len(dynamic)} dynamic skipped)")
+    print("=" * 80)
+    for result in sorted(results, key=lambda r: r.query_id):
+        status = "❌" if result.failed else "✅"
+        timing = f"{result.median_ms:8.2f} ms" if result.median_ms is not None else "       n/a"
+        print(f"{status} {timing}  {result.query_id:<40} {', '.join(result.sources)}")
+        for scan in result.full_scans:
+            print(f"      full scan: {scan}")
+        if result.error:
+            print(f"      error: {result.error}")
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_to_baseline(results, baseline, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"🐢 Slower than baseline: {line}")
+
+    if args.output:
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seasons": args.seasons,
+            "scale": args.scale,
+            "queries": {
+                r.query_id: {"sources": r.sources, "sql": r.sql, "plan": r.plan, "median_ms": r.median_ms,
+                             "full_scans": r.full_scans, "allowed_scans": r.allowed_scans, "error": r.error}
+                for r in results
+            },
+            "dynamic_skipped": [f"{name}:{line}" for name, line in dynamic],
+        }
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nSaved report to {args.output}")
+
+    failures = [r for r in results if r.failed]
+    if failures or regressions:
+        print(f"\n❌ {len(failures)} plan failure(s), {len(regressions)} timing regression(s)")
+        sys.exit(1)
+    print("\n✅ All queries use indexes on large tables")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,330 @@ Core tables for NBA player analytics focused on playoff resilience.
 Based on the NBA Lineup Optimizer schema but simplified for our use case.
 """
 
+import logging
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Connection profile applied to every connection handed out by the
+# ConnectionManager. WAL lets readers run alongside the single writer;
+# synchronous=NORMAL is durable across application crashes under WAL and
+# avoids an fsync per commit.
+PERFORMANCE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,        # negative = KiB, i.e. 64 MB page cache
+    "mmap_size": 268435456,      # 256 MB memory-mapped I/O
+    "temp_store": "MEMORY",
+    "busy_timeout": 30000,       # ms to wait on a locked database
+    "foreign_keys": "ON",
+}
+
+
+def apply_performance_profile(conn: sqlite3.Connection, pragmas: Optional[Dict[str, object]] = None) -> sqlite3.Connection:
+    """Apply the tuned PRAGMA profile to an open connection."""
+    for name, value in (pragmas or PERFORMANCE_PRAGMAS).items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+# Objects an online table rebuild (migrations.rebuild_tables) leaves behind
+# while it runs: change-capture triggers named <table>__changelog_<op>, the
+# changelog they write to, shadow tables, and a row naming the owning process.
+REBUILD_CHANGELOG_TABLE = "_migration_changelog"
+REBUILD_OWNER_TABLE = "_migration_rebuild_owner"
+REBUILD_SHADOW_SUFFIX = "__rebuild"
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def clear_abandoned_rebuild(conn: sqlite3.Connection) -> List[str]:
+    """
+    Drop the triggers and tables of a table rebuild whose process died.
+
+    A rebuild that is still running (its owner process is alive) is left
+    alone. Returns the names of the dropped objects.
+    """
+    triggers = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%\\_\\_changelog\\_%' ESCAPE '\\'"
+    )]
+    if not triggers:
+        return []
+    owner = None
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (REBUILD_OWNER_TABLE,)).fetchone():
+        owner = conn.execute(f"SELECT pid FROM {REBUILD_OWNER_TABLE}").fetchone()
+    if owner is not None and _process_alive(owner[0]):
+        return []
+
+    shadows = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ESCAPE '\\'",
+        ("%" + REBUILD_SHADOW_SUFFIX.replace("_", "\\_"),),
+    )]
+    for name in triggers:
+        conn.execute(f'DROP TRIGGER IF EXISTS "{name}"')
+    for name in shadows + [REBUILD_CHANGELOG_TABLE, REBUILD_OWNER_TABLE]:
+        conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+    conn.commit()
+    logger.warning(f"Removed objects of an abandoned table rebuild: {triggers + shadows}")
+    return triggers + shadows
+
+
+def connect(db_path, read_only: bool = False, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open a SQLite connection with the project's performance profile.
+
+    Prefer ConnectionManager in multi-threaded code; this is the building
+    block it uses and the drop-in replacement for bare sqlite3.connect().
+    Write connections also clear what an interrupted table rebuild left
+    behind (see clear_abandoned_rebuild).
+    """
+    conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=check_same_thread)
+    apply_performance_profile(conn)
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    else:
+        clear_abandoned_rebuild(conn)
+    return conn
+
+
+class ConnectionManager:
+    """
+    Central connection factory for one database file.
+
+    - reader(): one read-only connection per thread (WAL readers never block
+      each other or the writer).
+    - writer(): the single designated write connection, serialized with a
+      lock so worker threads can share it without "database is locked".
+    - bulk_load(): writer session with foreign-key checks and secondary
+      index maintenance deferred until the load finishes.
+
+    Reader connections belong to the thread that opened them: SQLite
+    connections must not be closed from under a thread that may still be
+    using them, so each thread closes its own with close_reader(), and
+    readers of threads that have exited are released by close_all().
+    """
+
+    def __init__(self, db_path: str = "data/nba_stats.db"):
+        """Initialize with database path."""
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._readers: Dict[int, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.RLock()
+
+    def reader(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection."""
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            conn = connect(self.db_path, read_only=True)
+            self._local.reader = conn
+            with self._readers_lock:
+                self._readers[threading.get_ident()] = conn
+        return conn
+
+    def close_reader(self) -> None:
+        """Close the calling thread's read-only connection, if it has one."""
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            return
+        with self._readers_lock:
+            if self._readers.get(threading.get_ident()) is conn:
+                del self._readers[threading.get_ident()]
+        self._local.reader = None
+        conn.close()
+
+    def open_readers(self) -> int:
+        """Number of reader connections currently held (one per thread)."""
+        with self._readers_lock:
+            return len(self._readers)
+
+    def _writer_conn(self) -> sqlite3.Connection:
+        if self._writer is None:
+            self._writer = connect(self.db_path, check_same_thread=False)
+        return self._writer
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Exclusive access to the write connection.
+
+        Commits on success and rolls back on error:
+
+            with manager.writer() as conn:
+                conn.executemany(sql, rows)
+        """
+        with self._writer_lock:
+            conn = self._writer_conn()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def bulk_load(self, tables: Optional[Sequence[str]] = None) -> Iterator["ConnectionManager"]:
+        """
+        Put the writer into bulk-load mode for the duration of the block.
+
+        Foreign keys are switched off on the writer and verified with
+        PRAGMA foreign_key_check at the end. Secondary indexes on `tables`
+        are dropped up front and rebuilt once afterwards, which is much
+        cheaper than maintaining them row by row. Worker threads keep
+        writing through writer() as usual:
+
+            with manager.bulk_load(["possessions", "possession_events"]):
+                run_parallel_ingest()
+
+        Args:
+            tables: Tables being loaded; their indexes are deferred and their
+                foreign keys checked (None = check the whole database)
+
+        Raises:
+            sqlite3.IntegrityError: If the loaded rows violate a foreign key
+        """
+        tables = list(tables or [])
+        with self._writer_lock:
+            conn = self._writer_conn()
+            conn.commit()
+            # foreign_keys cannot be changed inside a transaction.
+            conn.execute("PRAGMA foreign_keys = OFF")
+            deferred_indexes = self._drop_secondary_indexes(conn, tables)
+
+        try:
+            yield self
+        finally:
+            with self._writer_lock:
+                conn.commit()
+                for sql in deferred_indexes:
+                    conn.execute(sql)
+                conn.commit()
+                conn.execute("PRAGMA foreign_keys = ON")
+
+        if tables:
+            violations = []
+            for table in tables:
+                violations.extend(self.reader().execute(f"PRAGMA foreign_key_check({table})").fetchall())
+        else:
+            violations = self.reader().execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            raise sqlite3.IntegrityError(
+                f"Bulk load left {len(violations)} foreign key violations, e.g. {violations[:3]}"
+            )
+
+    @staticmethod
+    def _drop_secondary_indexes(conn: sqlite3.Connection, tables: Sequence[str]) -> List[str]:
+        """Drop explicit indexes on `tables` and return the SQL to recreate them."""
+        recreate = []
+        for table in tables:
+            rows = conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            ).fetchall()
+            for name, sql in rows:
+                conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+                recreate.append(sql)
+        conn.commit()
+        return recreate
+
+    def close_all(self) -> None:
+        """
+        Close the calling thread's reader and the writer, and release the
+        readers of threads that have exited.
+
+        Readers of threads that are still running are left open; those
+        threads close them with close_reader().
+        """
+        self.close_reader()
+        alive = {thread.ident for thread in threading.enumerate()}
+        with self._readers_lock:
+            for ident in [ident for ident in self._readers if ident not in alive]:
+                # Only the owning thread may close() it; dropping the last
+                # reference lets the connection be finalized.
+                del self._readers[ident]
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+# Per-row triggers created by earlier versions of this schema; dropped by migration.
+# The bulk-written tables maintain updated_at in their write statements
+# instead (see build_upsert_sql), which saves an extra UPDATE per modified row.
+LEGACY_UPDATE_TRIGGERS = [f"{table}_updated_at" for table in [
+    "player_playtype_stats",
+    "player_playoff_playtype_stats",
+    "player_shot_dashboard_stats",
+    "player_playoff_shot_dashboard_stats",
+    "possessions",
+]]
+
+
+def build_upsert_sql(
+    table: str,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+    touch_updated_at: bool = False,
+) -> str:
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement.
+
+    Unlike INSERT OR REPLACE, which SQLite runs as DELETE + INSERT (rewriting
+    every index entry and resetting created_at), the existing row is updated
+    in place, and only when one of its values actually changed. Re-ingesting
+    identical data therefore writes nothing.
+
+    Args:
+        table: Target table
+        columns: Columns supplied as ? parameters, in order
+        conflict_columns: The table's primary key / unique constraint
+        touch_updated_at: Set updated_at = CURRENT_TIMESTAMP on change
+
+    Returns:
+        SQL string for use with executemany()
+    """
+    update_columns = [c for c in columns if c not in conflict_columns]
+    placeholders = ", ".join("?" for _ in columns)
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({', '.join(conflict_columns)}) "
+    )
+    if not update_columns:
+        return sql + "DO NOTHING"
+
+    assignments = [f"{c} = excluded.{c}" for c in update_columns]
+    if touch_updated_at:
+        assignments.append("updated_at = CURRENT_TIMESTAMP")
+    changed = " OR ".join(f"{table}.{c} IS NOT excluded.{c}" for c in update_columns)
+    return sql + f"DO UPDATE SET {', '.join(assignments)} WHERE {changed}"
+
+
+_managers: Dict[Path, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: str = "data/nba_stats.db") -> ConnectionManager:
+    """Get the process-wide ConnectionManager for a database file."""
+    key = Path(db_path).resolve()
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = ConnectionManager(db_path)
+        return _managers[key]
+
 
 class NBADatabaseSchema:
     """Manages the NBA database schema creation and management."""
@@ -18,21 +339,22 @@ class NBADatabaseSchema:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = None
 
+    @property
+    def connections(self) -> ConnectionManager:
+        """Shared per-thread readers / single writer for this database."""
+        return get_connection_manager(str(self.db_path))
+
     @property
     def conn(self):
-        """Get database connection with strict foreign key enforcement."""
+        """Get database connection with strict foreign key enforcement and the performance profile."""
         if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path)
-            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn = connect(self.db_path)
         return self._conn
 
     def create_all_tables(self) -> None:
         """Create all necessary database tables."""
-        with sqlite3.connect(self.db_path) as conn:
-            # Enable foreign keys
-            conn.execute("PRAGMA foreign_keys = ON")
-
-            # Create all tables
+        with connect(self.db_path) as conn:
+            # Create all tables (connect() applies WAL and foreign key enforcement)
             self._create_teams_table(conn)
             self._create_games_table(conn)
             self._create_players_table(conn)
@@ -168,6 +490,11 @@ class NBADatabaseSchema:
             ) STRICT;
         """)
 
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_games_season
+            ON games(season, season_type)
+        """)
+
         conn.commit()
         print("✓ Games table created")
 
@@ -235,6 +562,13 @@ class NBADatabaseSchema:
             )
         """)
 
+        # Season-wide lookups (player lists per season) can't use the PK,
+        # which leads with player_id.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_player_season_stats_season
+            ON player_season_stats(season, player_id, season_type)
+        """)
+
         conn.commit()
         print("✓ PlayerSeasonStats table created")
 
@@ -819,16 +1153,6 @@ class NBADatabaseSchema:
             ON player_playtype_stats(play_type)
         """)
 
-        # Update trigger
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS player_playtype_stats_updated_at
-            AFTER UPDATE ON player_playtype_stats
-            BEGIN
-                UPDATE player_playtype_stats SET updated_at = CURRENT_TIMESTAMP
-                WHERE player_id = NEW.player_id AND season = NEW.season AND team_id = NEW.team_id AND play_type = NEW.play_type;
-            END
-        """)
-
         conn.commit()
         print("✓ PlayerPlaytypeStats table created")
 
@@ -880,16 +1204,6 @@ class NBADatabaseSchema:
             ON player_playoff_playtype_stats(play_type)
         """)
 
-        # Update trigger
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS player_playoff_playtype_stats_updated_at
-            AFTER UPDATE ON player_playoff_playtype_stats
-            BEGIN
-                UPDATE player_playoff_playtype_stats SET updated_at = CURRENT_TIMESTAMP
-                WHERE player_id = NEW.player_id AND season = NEW.season AND team_id = NEW.team_id AND play_type = NEW.play_type;
-            END
-        """)
-
         conn.commit()
         print("✓ PlayerPlayoffPlaytypeStats table created")
 
@@ -957,18 +1271,6 @@ class NBADatabaseSchema:
             ON player_shot_dashboard_stats(shot_dist_range)
         """)
 
-        # Update trigger
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS player_shot_dashboard_stats_updated_at
-            AFTER UPDATE ON player_shot_dashboard_stats
-            BEGIN
-                UPDATE player_shot_dashboard_stats SET updated_at = CURRENT_TIMESTAMP
-                WHERE player_id = NEW.player_id AND season = NEW.season AND team_id = NEW.team_id
-                AND close_def_dist_range = NEW.close_def_dist_range AND shot_clock_range = NEW.shot_clock_range
-                AND dribble_range = NEW.dribble_range AND shot_dist_range = NEW.shot_dist_range;
-            END
-        """)
-
         conn.commit()
         print("✓ PlayerShotDashboardStats table created")
 
@@ -1035,18 +1337,6 @@ class NBADatabaseSchema:
             ON player_playoff_shot_dashboard_stats(shot_dist_range)
         """)
 
-        # Update trigger
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS player_playoff_shot_dashboard_stats_updated_at
-            AFTER UPDATE ON player_playoff_shot_dashboard_stats
-            BEGIN
-                UPDATE player_playoff_shot_dashboard_stats SET updated_at = CURRENT_TIMESTAMP
-                WHERE player_id = NEW.player_id AND season = NEW.season AND team_id = NEW.team_id
-                AND close_def_dist_range = NEW.close_def_dist_range AND shot_clock_range = NEW.shot_clock_range
-                AND dribble_range = NEW.dribble_range AND shot_dist_range = NEW.shot_dist_range;
-            END
-        """)
-
         conn.commit()
         print("✓ PlayerPlayoffShotDashboardStats table created")
 
@@ -1095,16 +1385,6 @@ class NBADatabaseSchema:
             ON possessions(game_id, period)
         """)
 
-        # Update trigger
-        conn.execute("""
-            CREATE TRIGGER IF NOT EXISTS possessions_updated_at
-            AFTER UPDATE ON possessions
-            BEGIN
-                UPDATE possessions SET updated_at = CURRENT_TIMESTAMP
-                WHERE possession_id = NEW.possession_id;
-            END
-        """)
-
         conn.commit()
         print("✓ Enhanced Possessions table created")
 
@@ -4,11 +4,31 @@ import argparse
 import logging
 from pathlib import Path
 import re
+import sys
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.nba_data.utils.game_log_enrichment import enrich_game_logs, load_enriched_game_logs
+from src.nba_data.utils.split_aggregation import aggregate_splits, count, ratio, total, true_shooting, weighted_mean
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SERIES_METRICS = {
+    'po_games_played': count(),
+    'po_minutes_total': total('MIN'),
+    'po_poss_total': total('POSS'),
+    'po_fga': total('FGA'),
+    'po_fta': total('FTA'),
+    'po_pts': total('PTS'),
+    'po_ts_pct': true_shooting(fill=0),
+    'po_ppg_per75': ratio({'PTS': 1}, {'POSS': 1}, scale=75, fill=0),
+    'po_ast_pct': weighted_mean('AST_PCT', 'MIN', fill=0),
+    'po_usg_pct': weighted_mean('USG_PCT', 'MIN', fill=0),  # Kept for reference
+}
+
 def load_data(seasons):
     """Load all data files for requested seasons."""
     rs_data = []
@@ -34,10 +54,10 @@ def load_data(seasons):
         else:
             logger.warning(f"Missing {def_path}")
             
-        # Load Playoff Logs
+        # Load Playoff Logs (enriched with opponent columns, cached per season)
         po_path = f"data/playoff_logs_{season}.csv"
         if Path(po_path).exists():
-            df = pd.read_csv(po_path)
+            df = load_enriched_game_logs(season, kind="playoffs")
             df['SEASON'] = season
             po_data.append(df)
         else:
@@ -49,29 +69,6 @@ def load_data(seasons):
         pd.concat(po_data, ignore_index=True) if po_data else pd.DataFrame()
     )
 
-def parse_opponent(matchup, player_team_abbrev):
-    """
-    Parse opponent abbreviation from MATCHUP string.
-    Format: "DEN vs. LAL" or "DEN @ LAL"
-    """
-    # Split by vs. or @
-    if ' vs. ' in matchup:
-        parts = matchup.split(' vs. ')
-    elif ' @ ' in matchup:
-        parts = matchup.split(' @ ')
-    else:
-        return None
-        
-    # Clean whitespace
-    parts = [p.strip() for p in parts]
-    player_team_abbrev = player_team_abbrev.strip()
-    
-    # One part is player's team, the other is opponent
-    if parts[0] == player_team_abbrev:
-        return parts[1]
-    else:
-        return parts[0]
-
 def aggregate_playoff_series(po_logs, team_map):
     """
     Aggregate per-game logs into series-level stats.
@@ -84,67 +81,17 @@ def aggregate_playoff_series(po_logs, team_map):
         if col in po_logs.columns:
             po_logs[col] = pd.to_numeric(po_logs[col], errors='coerce').fillna(0)
             
-    # Parse Opponent
-    po_logs['OPP_ABBREV'] = po_logs.apply(
-        lambda row: parse_opponent(row['MATCHUP'], row['TEAM_ABBREVIATION']), axis=1
+    # Opponent from MATCHUP (already present when loaded through load_data)
+    if 'OPPONENT_ABBREV' not in po_logs.columns:
+        po_logs = enrich_game_logs(po_logs)
+    
+    # Group by Player, Season, Opponent: series totals, minute-weighted
+    # AST%/USG% and TS%/per-75 from the totals, in one grouped pass
+    return aggregate_splits(
+        po_logs,
+        by=['PLAYER_ID', 'PLAYER_NAME', 'SEASON', 'OPPONENT_ABBREV'],
+        metrics=SERIES_METRICS,
     )
-    
-    # Group by Player, Season, Opponent
-    grouped = po_logs.groupby(['PLAYER_ID', 'PLAYER_NAME', 'SEASON', 'OPP_ABBREV'])
-    
-    series_data = []
-    
-    for name, group in grouped:
-        player_id, player_name, season, opp_abbrev = name
-        
-        # Sums
-        total_min = group['MIN'].sum()
-        total_pts = group['PTS'].sum()
-        total_poss = group['POSS'].sum()
-        total_fga = group['FGA'].sum()
-        total_fta = group['FTA'].sum()
-        games_played = len(group)
-        
-        # Weighted Averages (AST%, USG%)
-        # Avoid division by zero
-        if total_min > 0:
-            avg_ast_pct = (group['AST_PCT'] * group['MIN']).sum() / total_min
-            avg_usg_pct = (group['USG_PCT'] * group['MIN']).sum() / total_min
-        else:
-            avg_ast_pct = 0
-            avg_usg_pct = 0
-            
-        # Derived Metrics
-        # TS% = PTS / (2 * (FGA + 0.44 * FTA))
-        if (total_fga + 0.44 * total_fta) > 0:
-            ts_pct = total_pts / (2 * (total_fga + 0.44 * total_fta))
-        else:
-            ts_pct = 0
-            
-        # PPG per 75 = (PTS / POSS) * 75
-        if total_poss > 0:
-            ppg75 = (total_pts / total_poss) * 75
-        else:
-            ppg75 = 0
-            
-        series_data.append({
-            'PLAYER_ID': player_id,
-            'PLAYER_NAME': player_name,
-            'SEASON': season,
-            'OPPONENT_ABBREV': opp_abbrev,
-            'po_games_played': games_played,
-            'po_minutes_total': total_min,
-            'po_poss_total': total_poss,
-            'po_fga': total_fga,
-            'po_fta': total_fta,
-            'po_pts': total_pts,
-            'po_ts_pct': ts_pct,
-            'po_ppg_per75': ppg75,
-            'po_ast_pct': avg_ast_pct,
-            'po_usg_pct': avg_usg_pct # Kept for reference
-        })
-        
-    return pd.DataFrame(series_data)
 
 def main():
     parser = argparse.ArgumentParser(description='Assemble Training Data')
@@ -0,0 +1,249 @@
+"""
+Benchmark the possession write path.
+
+Loads the same synthetic play-by-play data into scratch databases using:
+
+  legacy   - INSERT OR REPLACE + possessions_updated_at trigger (pre-migration)
+  upsert   - ON CONFLICT DO UPDATE, timestamps set in the statement
+  intkey   - upsert on the integer-key layout (WITHOUT ROWID child tables)
+
+and reports rows/sec for an initial load, an identical re-ingest, and a
+re-ingest where 10% of possessions changed.
+
+Usage:
+    python src/nba_data/scripts/benchmark_possession_writes.py --games 50
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from src.nba_data.api.possession_fetcher import Possession, PossessionEvent
+from src.nba_data.db.schema import NBADatabaseSchema, connect
+from src.nba_data.db.migrations import migrate_possessions_to_integer_keys
+from src.nba_data.db.possession_store import PossessionWriter
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+HOME_TEAM_ID = 1610612738
+AWAY_TEAM_ID = 1610612747
+PLAYER_IDS = list(range(200000, 200030))
+
+LEGACY_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS possessions_updated_at
+    AFTER UPDATE ON possessions
+    BEGIN
+        UPDATE possessions SET updated_at = CURRENT_TIMESTAMP
+        WHERE possession_id = NEW.possession_id;
+    END
+"""
+
+LEGACY_SQL = {
+    "possessions": """
+        INSERT OR REPLACE INTO possessions
+        (possession_id, game_id, period, clock_time_start, clock_time_end,
+         home_team_id, away_team_id, offensive_team_id, defensive_team_id,
+         possession_start, possession_end, duration_seconds, points_scored,
+         expected_points, possession_type, start_reason, end_reason)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "possession_events": """
+        INSERT OR REPLACE INTO possession_events
+        (event_id, possession_id, event_number, clock_time, elapsed_seconds,
+         player_id, team_id, opponent_team_id, event_type, event_subtype,
+         shot_type, shot_distance, shot_result, points_scored, assist_player_id,
+         block_player_id, steal_player_id, turnover_type, foul_type, rebound_type,
+         location_x, location_y, defender_player_id, touches_before_action,
+         dribbles_before_action)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "possession_lineups": """
+        INSERT OR REPLACE INTO possession_lineups
+        (possession_id, player_id, team_id, position)
+        VALUES (?, ?, ?, ?)
+    """,
+}
+
+
+def make_games(n_games: int, possessions_per_game: int = 220, seed: int = 42) -> List[List[Possession]]:
+    """Generate synthetic games shaped like PossessionFetcher output."""
+    rng = random.Random(seed)
+    games = []
+    for g in range(n_games):
+        game_id = f"00223{g:05d}"
+        possessions = []
+        for p in range(possessions_per_game):
+            period = min(4, p * 4 // possessions_per_game + 1)
+            elapsed = float(p * 13)
+            possession_id = f"{game_id}_{period}_{elapsed}"
+            offense = HOME_TEAM_ID if p % 2 == 0 else AWAY_TEAM_ID
+            defense = AWAY_TEAM_ID if offense == HOME_TEAM_ID else HOME_TEAM_ID
+            events = [
+                PossessionEvent(
+                    event_id=f"{possession_id}_{e}", possession_id=possession_id, event_number=e,
+                    clock_time="10:00", elapsed_seconds=elapsed + e, player_id=rng.choice(PLAYER_IDS),
+                    team_id=offense, opponent_team_id=defense,
+                    event_type=rng.choice(["shot", "rebound", "turnover", "foul"]),
+                    shot_distance=rng.randint(0, 28), points_scored=rng.choice([0, 0, 2, 3]),
+                )
+                for e in range(4)
+            ]
+            lineups = [{"player_id": pid, "team_id": offense, "position": None} for pid in rng.sample(PLAYER_IDS, 5)]
+            possessions.append(Possession(
+                possession_id=possession_id, game_id=game_id, period=period,
+                clock_time_start="12:00", clock_time_end="11:46",
+                home_team_id=HOME_TEAM_ID, away_team_id=AWAY_TEAM_ID,
+                offensive_team_id=offense, defensive_team_id=defense,
+                possession_start=elapsed, possession_end=elapsed + 13, duration_seconds=13.0,
+                points_scored=rng.choice([0, 0, 1, 2, 3]), events=events, lineups=lineups,
+            ))
+        games.append(possessions)
+    return games
+
+
+def modify_games(games: List[List[Possession]], fraction: float = 0.1, seed: int = 7) -> List[List[Possession]]:
+    """Copy of `games` with `fraction` of possessions carrying a new score."""
+    rng = random.Random(seed)
+    return [
+        [replace(p, points_scored=p.points_scored + 1) if rng.random() < fraction else p for p in game]
+        for game in games
+    ]
+
+
+def create_database(path: Path, layout: str, game_ids: List[str]) -> None:
+    """Create a scratch database with reference rows for the foreign keys."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        NBADatabaseSchema(str(path)).create_all_tables()
+    conn = connect(path)
+    conn.executemany(
+        "INSERT INTO teams (team_id, team_name, team_abbreviation, team_code, team_city, team_conference, team_division) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(HOME_TEAM_ID, "Home", "HOM", "home", "Home", "East", "Atlantic"),
+         (AWAY_TEAM_ID, "Away", "AWY", "away", "Away", "West", "Pacific")],
+    )
+    conn.executemany("INSERT INTO players (player_id, player_name) VALUES (?, ?)",
+                     [(pid, f"Player {pid}") for pid in PLAYER_IDS])
+    conn.executemany(
+        "INSERT INTO games (game_id, home_team_id, away_team_id, season, season_type) VALUES (?, ?, ?, ?, ?)",
+        [(game_id, HOME_TEAM_ID, AWAY_TEAM_ID, "2023-24", "Regular Season") for game_id in game_ids],
+    )
+    conn.commit()
+
+    if layout == "legacy":
+        conn.execute(LEGACY_TRIGGER)
+    elif layout == "intkey":
+        migrate_possessions_to_integer_keys(conn)
+    conn.commit()
+    conn.close()
+
+
+def legacy_write(conn: sqlite3.Connection, possessions: List[Possession]) -> int:
+    """The pre-migration write path: one INSERT OR REPLACE per row."""
+    rows = 0
+    cursor = conn.cursor()
+    for p in possessions:
+        cursor.execute(LEGACY_SQL["possessions"], (
+            p.possession_id, p.game_id, p.period, p.clock_time_start, p.clock_time_end,
+            p.home_team_id, p.away_team_id, p.offensive_team_id, p.defensive_team_id,
+            p.possession_start, p.possession_end, p.duration_seconds, p.points_scored,
+            p.expected_points, p.possession_type, p.start_reason, p.end_reason))
+        rows += 1
+        for e in p.events:
+            cursor.execute(LEGACY_SQL["possession_events"], (
+                e.event_id, e.possession_id, e.event_number, e.clock_time, e.elapsed_seconds,
+                e.player_id, e.team_id, e.opponent_team_id, e.event_type, e.event_subtype,
+                e.shot_type, e.shot_distance, e.shot_result, e.points_scored, e.assist_player_id,
+                e.block_player_id, e.steal_player_id, e.turnover_type, e.foul_type, e.rebound_type,
+                e.location_x, e.location_y, e.defender_player_id, e.touches_before_action,
+                e.dribbles_before_action))
+            rows += 1
+        for lineup in p.lineups:
+            cursor.execute(LEGACY_SQL["possession_lineups"], (
+                p.possession_id, lineup["player_id"], lineup["team_id"], lineup["position"]))
+            rows += 1
+    return rows
+
+
+def upsert_write(conn: sqlite3.Connection, possessions: List[Possession]) -> int:
+    counts = PossessionWriter(conn).write(possessions)
+    return counts["possessions"] + counts["events"] + counts["lineups"] + counts["matchups"]
+
+
+def timed_load(db_path: Path, games: List[List[Possession]], write: Callable, foreign_keys: bool = True) -> Dict[str, float]:
+    """Write every game (one transaction per game, as the populate scripts do)."""
+    conn = connect(db_path)
+    if not foreign_keys:
+        conn.execute("PRAGMA foreign_keys = OFF")
+    rows = 0
+    start = time.perf_counter()
+    for possessions in games:
+        rows += write(conn, possessions)
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return {"rows": rows, "seconds": elapsed, "rows_per_sec": rows / elapsed if elapsed else float("inf")}
+
+
+def run_benchmark(n_games: int, workdir: Path) -> pd.DataFrame:
+    games = make_games(n_games)
+    changed = modify_games(games)
+    writers = {"legacy": legacy_write, "upsert": upsert_write, "intkey": upsert_write}
+
+    results = []
+    for layout, write in writers.items():
+        db_path = workdir / f"bench_{layout}.db"
+        create_database(db_path, layout, [possessions[0].game_id for possessions in games])
+        for phase, data in [("initial_load", games), ("reingest_identical", games), ("reingest_10pct_changed", changed)]:
+            # Foreign keys are off for every layout: INSERT OR REPLACE deletes
+            # the parent possession row, which fails under enforcement once
+            # events reference it (the legacy path only worked on bare
+            # connections), and FK checks would otherwise dominate the timing.
+            stats = timed_load(db_path, data, write, foreign_keys=False)
+            results.append({"layout": layout, "phase": phase, **stats})
+            logger.info(f"{layout:>7} {phase:<24} {stats['rows_per_sec']:>12,.0f} rows/sec")
+
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark possession write throughput before/after the UPSERT migration")
+    parser.add_argument("--games", type=int, default=50, help="Synthetic games to load")
+    parser.add_argument("--output", help="Optional CSV path for the results table")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="possession_bench_"))
+    try:
+        df = run_benchmark(args.games, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    pivot = df.pivot(index="phase", columns="layout", values="rows_per_sec")[["legacy", "upsert", "intkey"]]
+    pivot["upsert_speedup"] = pivot["upsert"] / pivot["legacy"]
+    pivot["intkey_speedup"] = pivot["intkey"] / pivot["legacy"]
+
+    print("\n🏁 Possession Write Throughput (rows/sec)")
+    print("=" * 70)
+    print(pivot.round(2).to_string())
+
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"\nSaved raw timings to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
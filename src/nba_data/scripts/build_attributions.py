@@ -0,0 +1,147 @@
+"""
+Build Prediction Attributions Across the Usage Grid
+
+Computes the archetype model's predictions and TreeSHAP feature
+contributions (src/model/attribution.py) for every player-season, both as
+observed and projected to every usage level of the simulator's grid
+(10%-40% in 1% steps by default), and stores them as one columnar table in
+results/.cache/attributions/<model>/. scripts/debug.py and the Streamlit
+usage simulator read their explanations from that table.
+
+Each usage level is projected for the whole league at once
+(usage_projection.project_to_usages) and prepared with the trainer's own
+feature pipeline (RFEModelTrainer.prepare_features); all levels are then
+explained in one batched pass over the booster. The table is rebuilt only
+when the model files, the training CSVs, the usage curves, the grid or
+this code change.
+
+Usage:
+    python src/nba_data/scripts/build_attributions.py
+    python src/nba_data/scripts/build_attributions.py --model resilience_xgb_rfe_15 --threads 8
+    python src/nba_data/scripts/build_attributions.py --usages 0.20 0.25 0.30 --rebuild
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model import attribution
+from src.model.attribution import ATTRIBUTIONS_DIR, USAGE_GRID, attribution_frame
+from src.model.evaluation import model_features
+from src.model.registry import load_model
+from src.model.training_tables import load_or_build
+from src.nba_data.utils import usage_projection
+from src.nba_data.utils.usage_projection import (
+    DEFAULT_CURVES_PATH, PROJECTED_FEATURES, UsageCurves, normalize_usage, project_to_usages
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TABLE_VERSION = 1
+ID_COLUMNS = ['PLAYER_ID', 'PLAYER_NAME', 'SEASON']
+
+
+def load_curves(df: pd.DataFrame, path: Path) -> UsageCurves:
+    """The saved usage curves, or curves fitted on `df` if none are saved."""
+    if path.exists():
+        return UsageCurves.load(path)
+    logger.warning(f"No usage curves at {path}; fitting them on the training frame "
+                   f"(run project_usage.py --fit-only to save them)")
+    return UsageCurves.fit(df, PROJECTED_FEATURES)
+
+
+def usage_grid_matrix(trainer, df: pd.DataFrame, features, usages, curves: UsageCurves) -> tuple:
+    """
+    Prepared features for every player-season as observed and at every usage.
+
+    Returns:
+        (ids, X): ids has the ID_COLUMNS present, USAGE_LEVEL, BASE_USAGE and PROJECTED
+    """
+    id_columns = [c for c in ID_COLUMNS if c in df.columns]
+    base_usage = normalize_usage(df['USG_PCT']).to_numpy()
+    X, _ = trainer.prepare_features(df, features)
+    ids = [df[id_columns].assign(USAGE_LEVEL=base_usage, BASE_USAGE=base_usage, PROJECTED=False)]
+    blocks = [X]
+    for usage in usages:
+        projected = project_to_usages(df, [usage], curves)
+        X, _ = trainer.prepare_features(projected, features)
+        ids.append(projected[id_columns].assign(USAGE_LEVEL=usage, BASE_USAGE=projected['BASE_USAGE'],
+                                                PROJECTED=True))
+        blocks.append(X)
+    return pd.concat(ids, ignore_index=True), pd.concat(blocks, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache predictions and SHAP contributions over the usage grid")
+    parser.add_argument('--model', default='production', help="Registry reference (default: production)")
+    parser.add_argument('--usages', nargs='+', type=float, default=list(USAGE_GRID), help='Usage levels as fractions')
+    parser.add_argument('--curves', default=str(DEFAULT_CURVES_PATH), help='Usage curves artifact (JSON)')
+    parser.add_argument('--threads', type=int, default=None, help='XGBoost threads (default: all cores)')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute even if the stored table is current')
+    args = parser.parse_args()
+
+    # train_rfe_model logs to logs/train_rfe_model.log on import
+    Path("logs").mkdir(exist_ok=True)
+    from src.nba_data.scripts.sweep_rfe_features import load_training_frame
+    from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+
+    loaded = load_model(args.model)
+    features = loaded.features or model_features(loaded.model)
+    if not features or not all(f.isupper() for f in features):
+        parser.error(f"{loaded.name} is not an archetype model on the RFE training frame")
+    usages = sorted({round(u / 100.0 if u > 1.0 else u, 4) for u in args.usages})
+    trainer = RFEModelTrainer()
+    curves_path = Path(args.curves)
+
+    def build():
+        df = load_training_frame(trainer, loaded.name.endswith('_merchant')).reset_index(drop=True)
+        curves = load_curves(df, curves_path)
+        start = time.perf_counter()
+        ids, X = usage_grid_matrix(trainer, df, features, usages, curves)
+        logger.info(f"Projected {len(df)} player-seasons to {len(usages)} usage levels "
+                    f"({len(X)} rows) in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        frame = attribution_frame(loaded.model, X, encoder=loaded.encoder, features=features, ids=ids,
+                                  nthread=args.threads)
+        logger.info(f"Computed contributions for {len(frame)} rows in {time.perf_counter() - start:.1f}s")
+        return frame
+
+    results_dir = trainer.results_dir
+    table = load_or_build(
+        loaded.name, build=build, version=TABLE_VERSION,
+        inputs=list(loaded.spec.artifacts().values()) + [
+            results_dir / "predictive_dataset_with_friction.csv",
+            results_dir / "predictive_dataset.csv",
+            results_dir / "resilience_archetypes.csv",
+            curves_path,
+        ],
+        code=[__file__, attribution.__file__, usage_projection.__file__,
+              Path(__file__).with_name('train_rfe_model.py')],
+        params={'usages': usages},
+        rebuild=args.rebuild, root=ATTRIBUTIONS_DIR,
+        metadata={
+            'model': loaded.name,
+            'version': loaded.spec.version,
+            'checksums': loaded.spec.checksums,
+            'features': list(features),
+            'classes': [str(c) for c in loaded.encoder.classes_] if loaded.encoder is not None else [],
+            'usage_grid': usages,
+            # PROB__ columns are calibrated; the SHAP__ columns explain the raw margin
+            'calibrated_probabilities': bool((getattr(loaded.model, 'calibration', None) or {}).get('probability')),
+        },
+    )
+    frame = table.frame
+    print(f"\n{loaded.name}: {frame['PROJECTED'].eq(False).sum()} player-seasons x "
+          f"{len(usages)} usage levels -> {ATTRIBUTIONS_DIR / loaded.name} ({len(frame)} rows)")
+
+
+if __name__ == "__main__":
+    main()
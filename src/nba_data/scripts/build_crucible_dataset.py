@@ -5,15 +5,29 @@ This script aggregates all seasonal predictive feature files into a single,
 comprehensive dataset for running the full Telescope pipeline.
 
 It scans for `predictive_features_*.csv` files in the `data/` directory.
+The merged dataset is stored as the 'crucible_dataset_full' training table
+(src/model/training_tables.py); while the regular season files, the physics
+features and this script are unchanged, the merge is skipped.
 
 Output:
     data/crucible_dataset_full.csv
+
+Usage:
+    python src/nba_data/scripts/build_crucible_dataset.py
+    python src/nba_data/scripts/build_crucible_dataset.py --rebuild   # ignore the stored table
 """
 
+import argparse
 import pandas as pd
 import logging
+import sys
 from pathlib import Path
 
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.training_tables import load_or_build
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,19 +36,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def build_full_dataset():
+DATA_DIR = Path("data")
+PHYSICS_PATH = Path("results/predictive_dataset_with_friction.csv")
+OUTPUT_PATH = DATA_DIR / "crucible_dataset_full.csv"
+TABLE_VERSION = 1  # Bump when the merge changes beyond what the fingerprint captures
+
+
+def build_full_dataset(rebuild=False):
     """
     Synthesize a full dataset by merging regular season stats with 
     engineered predictive features for each season.
     """
-    data_dir = Path("data")
-    
-    # 1. Aggregate Regular Season Data (the base)
-    reg_season_files = sorted(list(data_dir.glob("regular_season_*.csv")))
+    reg_season_files = sorted(list(DATA_DIR.glob("regular_season_*.csv")))
     if not reg_season_files:
         logger.error("No 'regular_season_*.csv' files found.")
         return
 
+    table = load_or_build(
+        'crucible_dataset_full', build=lambda: merge_full_dataset(reg_season_files),
+        version=TABLE_VERSION, inputs=reg_season_files + [PHYSICS_PATH],
+        code=[Path(__file__).resolve()], rebuild=rebuild,
+    )
+    df_full = table.frame
+    if not table.rebuilt and OUTPUT_PATH.exists():
+        logger.info(f"⚡ {OUTPUT_PATH} is current ({len(df_full)} records); nothing to do")
+        return
+
+    # Save to new file
+    df_full.to_csv(OUTPUT_PATH, index=False)
+    
+    logger.info("="*50)
+    logger.info(f"Successfully synthesized {len(df_full)} records.")
+    logger.info(f"Saved full dataset to {OUTPUT_PATH}")
+    logger.info(f"Seasons covered: {sorted(df_full['SEASON'].unique())}")
+    logger.info("="*50)
+
+
+def merge_full_dataset(reg_season_files):
+    """Merge the regular season files with the physics features."""
+    # 1. Aggregate Regular Season Data (the base)
     all_reg_dfs = []
     for file in reg_season_files:
         df = pd.read_csv(file)
@@ -47,7 +87,7 @@ def build_full_dataset():
     logger.info(f"Aggregated {len(df_base)} records from {len(reg_season_files)} regular season files.")
 
     # 2. Load Physics Features Data (from evaluate_plasticity_potential.py)
-    physics_path = Path("results/predictive_dataset_with_friction.csv")
+    physics_path = PHYSICS_PATH
     if not physics_path.exists():
         logger.warning(f"Physics features file not found at {physics_path}. Output will lack physics features.")
         df_features = pd.DataFrame()
@@ -99,16 +139,11 @@ def build_full_dataset():
     if 'usg_pct_vs_top10' in df_full.columns and 'USG_PCT' not in df_full.columns:
         df_full.rename(columns={'usg_pct_vs_top10': 'USG_PCT'}, inplace=True)
         logger.info("Renamed 'usg_pct_vs_top10' to 'USG_PCT'.")
-    
-    # Save to new file
-    output_path = data_dir / "crucible_dataset_full.csv"
-    df_full.to_csv(output_path, index=False)
-    
-    logger.info("="*50)
-    logger.info(f"Successfully synthesized {len(df_full)} records.")
-    logger.info(f"Saved full dataset to {output_path}")
-    logger.info(f"Seasons covered: {sorted(df_full['SEASON'].unique())}")
-    logger.info("="*50)
+
+    return df_full
 
 if __name__ == "__main__":
-    build_full_dataset()
+    parser = argparse.ArgumentParser(description="Build data/crucible_dataset_full.csv")
+    parser.add_argument('--rebuild', action='store_true', help='Re-merge even if the stored table is current')
+    args = parser.parse_args()
+    build_full_dataset(rebuild=args.rebuild)
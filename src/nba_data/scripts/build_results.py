@@ -0,0 +1,253 @@
+"""
+Build results/ Artifacts
+
+Declares which script produces which results/ (and intermediate data/)
+files and from which inputs, then rebuilds only the stale ones. Targets
+whose inputs are unchanged are served from the previous build; independent
+targets (e.g. per-season features) run in parallel processes. Every build
+writes a report with per-target timings and cache hits.
+
+Targets that fetch from the NBA Stats API (stress_vectors) cannot see API
+changes in their fingerprint; use --force to refresh them. Within a
+target, the season-scoped stages (stress_vectors,
+shot_quality_generation_delta) keep per-season partitions under
+data/partitions/ and recompute only the seasons whose inputs changed.
+
+Usage:
+    python src/nba_data/scripts/build_results.py                    # everything stale
+    python src/nba_data/scripts/build_results.py latent_stars       # one target + upstream
+    python src/nba_data/scripts/build_results.py --dry-run          # what would rebuild
+    python src/nba_data/scripts/build_results.py --seasons 2023-24 --jobs 4
+"""
+
+import argparse
+import functools
+import logging
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Sequence
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.nba_data.utils.build_graph import BuildGraph, BuildGraphError, Target
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+REPORT_PATH = Path("results/build_report.json")
+
+DEFAULT_SEASONS = [
+    '2015-16', '2016-17', '2017-18', '2018-19', '2019-20',
+    '2020-21', '2021-22', '2022-23', '2023-24', '2024-25'
+]
+
+SCRIPTS = "src/nba_data/scripts"
+ENRICHMENT_MODULES = [
+    "src/nba_data/constants.py",
+    "src/nba_data/utils/game_log_enrichment.py",
+    "src/nba_data/utils/split_aggregation.py",
+]
+
+
+def run_script(script: str, *args: str) -> None:
+    """Run a producing script with the current interpreter from the project root."""
+    Path("logs").mkdir(exist_ok=True)  # several scripts log to logs/*.log
+    subprocess.run([sys.executable, script, *args], check=True)
+
+
+def script_target(name: str, script: str, outputs: Sequence[str], inputs: Sequence[str],
+                  args: Sequence[str] = ()) -> Target:
+    """Target built by running `script`; the script itself is an input."""
+    return Target(name, outputs, [script, *inputs], functools.partial(run_script, script, *args))
+
+
+def declare_targets(seasons: Sequence[str] = DEFAULT_SEASONS) -> List[Target]:
+    """The results/ build graph for `seasons`."""
+    targets = []
+
+    # Per-season intermediates (independent, built in parallel)
+    for season in seasons:
+        targets.append(script_target(
+            f"predictive_features_{season}",
+            f"{SCRIPTS}/generate_predictive_features.py",
+            outputs=[f"data/predictive_features_{season}.csv"],
+            inputs=ENRICHMENT_MODULES + [
+                f"data/rs_game_logs_{season}.csv",
+                f"data/defensive_context_{season}.csv",
+            ],
+            args=["--seasons", season],
+        ))
+        targets.append(script_target(
+            f"shot_quality_aggregates_{season}",
+            f"{SCRIPTS}/aggregate_shot_quality.py",
+            outputs=[f"data/shot_quality_aggregates_{season}.csv"],
+            inputs=[f"data/shot_quality/shot_quality_{season}.csv"],
+            args=["--seasons", season],
+        ))
+
+    targets += [
+        script_target(
+            "shot_quality_generation_delta",
+            f"{SCRIPTS}/calculate_shot_quality_generation.py",
+            outputs=["results/shot_quality_generation_delta.csv"],
+            inputs=[
+                "src/nba_data/utils/season_partitions.py",
+                "src/nba_data/utils/hashing.py",
+                "data/shot_quality/shot_quality_*.csv",
+                "data/shot_quality_aggregates_*.csv",
+                "data/predictive_features_*.csv",
+                "results/predictive_dataset.csv",
+            ],
+            args=["--seasons", *seasons],
+        ),
+        script_target(
+            "stress_vectors",
+            f"{SCRIPTS}/evaluate_plasticity_potential.py",
+            outputs=["results/predictive_dataset_with_friction.csv"],
+            inputs=ENRICHMENT_MODULES + [
+                f"{SCRIPTS}/calculate_dependence_score.py",
+                "src/nba_data/core/models.py",
+                "src/nba_data/utils/season_partitions.py",
+                "src/nba_data/utils/hashing.py",
+                "data/rs_game_logs_*.csv",
+                "data/defensive_context_*.csv",
+                "results/pressure_features.csv",
+                "results/physicality_features.csv",
+                "results/rim_pressure_features.csv",
+                "results/shot_quality_generation_delta.csv",
+            ],
+            args=["--seasons", *seasons],
+        ),
+        script_target(
+            "usage_projections",
+            f"{SCRIPTS}/project_usage.py",
+            outputs=["models/usage_projection_curves.json", "results/usage_projections.csv"],
+            inputs=[
+                "src/nba_data/utils/usage_projection.py",
+                "src/nba_data/utils/projection_utils.py",
+                "results/predictive_dataset.csv",
+            ],
+            args=["--refit"],
+        ),
+        script_target(
+            "friction_coefficients",
+            f"{SCRIPTS}/derive_friction_coefficients.py",
+            outputs=[
+                "results/friction_coefficient_analysis.csv",
+                "results/friction_coefficients_bootstrap.json",
+                "results/friction_coefficients_bootstrap_replicates.csv",
+            ],
+            inputs=["src/nba_data/utils/friction_bootstrap.py", "results/predictive_dataset.csv"],
+            args=["--bootstrap", "2000", "--jobs", "0"],
+        ),
+        script_target(
+            "training_dataset",
+            f"{SCRIPTS}/assemble_training_data.py",
+            outputs=["data/training_dataset.csv"],
+            inputs=ENRICHMENT_MODULES + [
+                "data/regular_season_*.csv",
+                "data/defensive_context_*.csv",
+                "data/playoff_logs_*.csv",
+            ],
+        ),
+        script_target(
+            "crucible_dataset",
+            f"{SCRIPTS}/build_crucible_dataset.py",
+            outputs=["data/crucible_dataset_full.csv"],
+            inputs=["data/regular_season_*.csv", "results/predictive_dataset_with_friction.csv"],
+        ),
+        script_target(
+            "rfe_model_15",
+            f"{SCRIPTS}/train_rfe_model.py",
+            outputs=[
+                "models/resilience_xgb_rfe_15.pkl",
+                "models/archetype_encoder_rfe_15.pkl",
+                "results/rfe_model_results_15.json",
+                "results/feature_importance_rfe_15.png",
+                "results/confusion_matrix_rfe_15.png",
+            ],
+            inputs=[
+                "results/predictive_dataset_with_friction.csv",
+                "results/predictive_dataset.csv",
+                "results/resilience_archetypes.csv",
+                "results/rfe_feature_count_comparison.csv",
+            ],
+        ),
+        script_target(
+            "latent_stars",
+            f"{SCRIPTS}/detect_latent_stars.py",
+            outputs=["results/latent_stars.csv", "results/latent_star_detection_report.md"],
+            inputs=[
+                "results/predictive_dataset.csv",
+                "results/pressure_features.csv",
+                "results/physicality_features.csv",
+                "results/rfe_model_results_10.json",
+                "data/regular_season_*.csv",
+                "models/resilience_xgb_rfe_10.pkl",
+                "models/archetype_encoder_rfe_10.pkl",
+                "models/resilience_xgb.pkl",
+                "models/archetype_encoder.pkl",
+                "models/predictive_features.json",
+            ],
+        ),
+        script_target(
+            "telescope_model",
+            f"{SCRIPTS}/train_telescope_model.py",
+            outputs=["models/telescope_model.pkl", "models/telescope_features.json"],
+            inputs=["results/predictive_dataset_with_friction.csv", "results/training_targets_helio.csv"],
+        ),
+        script_target(
+            "telescope_validation",
+            f"{SCRIPTS}/validate_telescope_resilience.py",
+            outputs=["results/telescope_validation_results.csv", "results/telescope_validation_summary.md"],
+            inputs=[
+                "models/telescope_model.pkl",
+                "models/telescope_features.json",
+                "results/predictive_dataset_with_friction.csv",
+            ],
+        ),
+    ]
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally rebuild results/ artifacts")
+    parser.add_argument('targets', nargs='*', help='Targets to build (default: all); upstream targets are included')
+    parser.add_argument('--seasons', nargs='+', default=DEFAULT_SEASONS, help='Seasons to build')
+    parser.add_argument('--jobs', type=int, default=None, help='Parallel worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Rebuild the selected targets even if current')
+    parser.add_argument('--dry-run', action='store_true', help='Only report which targets are stale')
+    parser.add_argument('--list', action='store_true', help='List targets with their dependencies')
+    parser.add_argument('--report', default=str(REPORT_PATH), help='Where to write the build report (JSON)')
+    args = parser.parse_args()
+
+    try:
+        graph = BuildGraph(declare_targets(args.seasons), root=PROJECT_ROOT)
+        if args.list:
+            for name in graph.order:
+                deps = ', '.join(sorted(graph.dependencies[name])) or '-'
+                print(f"{name:<40} <- {deps}")
+            return
+        if args.dry_run:
+            report = graph.plan(args.targets, force=args.force)
+        else:
+            report = graph.build(args.targets, jobs=args.jobs, force=args.force)
+    except BuildGraphError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(2)
+
+    print(report.summary())
+    if not args.dry_run:
+        report.write(PROJECT_ROOT / args.report)
+        logger.info(f"Build report saved to {args.report}")
+        if not report.ok:
+            logger.error("❌ Some targets failed")
+            sys.exit(1)
+        logger.info("✅ results/ is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Calibrate an Archetype Model's Probabilities
+
+Fits the probability calibration (src/model/calibration.py) of a registered
+RFE archetype model on its walk-forward out-of-fold predictions: every
+season in the rolling CV folds (cached in results/.cache/hpo/, shared with
+tune_hyperparameters.py) is predicted by the model configuration trained on
+the seasons before it, and a per-class isotonic (or Platt) map is fitted
+to those predictions. The risk-quadrant performance thresholds are derived
+from the calibrated star-level scores.
+
+The result is written to results/calibration_<model>.json and the model is
+re-exported, so its artifact carries the calibration and the derived
+thresholds (used by the predictor's risk quadrants). registry.load_model()
+applies the calibration to the artifact or, for models without one, to the
+pickle (CalibratedModel), so every caller loading the model through the
+registry gets calibrated probabilities. Later exports of the same model,
+e.g. after retraining, pick the file up again as long as the model is fitted
+on the same set of features as the folds were.
+
+Usage:
+    python src/nba_data/scripts/calibrate_models.py
+    python src/nba_data/scripts/calibrate_models.py --model resilience_xgb_rfe_15 --method platt --jobs 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.calibration import METHODS, calibration_path, fit_calibration
+from src.model.registry import resolve
+from src.model.season_cv import out_of_fold_predictions
+from src.nba_data.scripts.refresh_models import model_factory
+from src.nba_data.scripts.tune_hyperparameters import RFE_MODEL_PATTERN, rfe_folds
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit an archetype model's probability calibration on rolling-CV folds")
+    parser.add_argument('--model', default='production',
+                        help="resilience_xgb_rfe_<n>[_merchant] (default: the production archetype model)")
+    parser.add_argument('--method', choices=METHODS, default='isotonic')
+    parser.add_argument('--min-train-seasons', type=int, default=3, help='Seasons in the first training window')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPUs / threads)')
+    parser.add_argument('--threads', type=int, default=1, help='XGBoost threads per worker')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the cached fold matrices')
+    parser.add_argument('--no-export', action='store_true', help='Only write the calibration file')
+    args = parser.parse_args()
+
+    name = resolve(args.model).name
+    if not RFE_MODEL_PATTERN.match(name):
+        parser.error(f"{name} is not an RFE archetype model")
+
+    folds_path, features = rfe_folds(name, args.min_train_seasons, args.rebuild)
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // args.threads)
+    start = time.perf_counter()
+    proba, y, _, classes = out_of_fold_predictions(folds_path, features, model_factory(name),
+                                                   jobs=jobs, threads=args.threads)
+    result = fit_calibration(proba, y, classes, method=args.method)
+    # The requested RFE list can name features the data lacks; record the columns the folds actually had
+    with np.load(folds_path, allow_pickle=False) as data:
+        columns = set(data['columns'].tolist())
+    features = [f for f in features if f in columns]
+    logger.info(f"Fitted {args.method} calibration on {len(y)} out-of-fold rows in {time.perf_counter() - start:.1f}s")
+
+    output = {
+        'model': name,
+        'features': list(features),
+        'fitted_at': datetime.now().isoformat(timespec='seconds'),
+        'folds': str(folds_path),
+        **result,
+    }
+    path = calibration_path(name)
+    path.write_text(json.dumps(output, indent=2))
+
+    metrics = result['metrics']
+    print(f"\n{name} ({args.method}, {len(y)} out-of-fold rows):")
+    print(f"  Brier:    {metrics['raw_brier']:.4f} -> {metrics['calibrated_brier']:.4f}")
+    print(f"  log loss: {metrics['raw_log_loss']:.4f} -> {metrics['calibrated_log_loss']:.4f}")
+    print(f"  performance thresholds: {result['risk_thresholds'] or 'defaults (target star rates never reached)'}")
+    logger.info(f"Calibration -> {path}")
+
+    if not args.no_export:
+        from src.nba_data.scripts.export_model_artifacts import export_registered
+        export_registered(name)
+        logger.info(f"Re-exported {name} with its calibration")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Compare Registered Models on the Same Players
+
+Scores every model in models/registry.json (or a chosen subset) on one
+shared feature matrix: the RFE training frame is loaded and prepared once
+(RFEModelTrainer.prepare_features over the union of all models' features),
+the Telescope's lowercase features are joined from
+results/predictive_dataset_with_friction.csv, and each model reads its own
+columns from that matrix. Models are scored in parallel (see
+src/model/evaluation.compare_model_set). Outputs:
+- results/model_comparison.csv: one row per player-season with every
+  model's class probabilities, predicted archetype and star score, the
+  regressors' predictions, and consensus/agreement/star-spread columns
+- results/model_comparison_pairwise.csv: agreement rate and Cohen's kappa
+  for every pair of archetype models
+- results/model_comparison_summary.json: per-model and consensus accuracy
+  against the labeled archetypes. The matrix is the models' own training
+  frame, so 'accuracy' is mostly in-sample; 'test_season_accuracy' covers
+  only the seasons after the temporal split (RFEModelTrainer.temporal_split).
+  Models missing features are listed as 'unscored' and left out of both
+
+Usage:
+    python src/nba_data/scripts/compare_registered_models.py
+    python src/nba_data/scripts/compare_registered_models.py --models resilience_xgb_rfe_10 resilience_xgb_rfe_15 telescope_model
+    python src/nba_data/scripts/compare_registered_models.py --status production staging --jobs 4
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.evaluation import agreement_statistics, compare_model_set, model_features
+from src.model.registry import ModelRegistryError, load_model, load_registry
+from src.nba_data.scripts.sweep_rfe_features import load_training_frame
+from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+from src.nba_data.utils.feature_dtypes import read_feature_csv
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FRICTION_DATASET_PATH = Path("results/predictive_dataset_with_friction.csv")
+OUTPUT_PATH = Path("results/model_comparison.csv")
+PAIRWISE_OUTPUT_PATH = Path("results/model_comparison_pairwise.csv")
+SUMMARY_OUTPUT_PATH = Path("results/model_comparison_summary.json")
+ID_COLUMNS = ['PLAYER_ID', 'PLAYER_NAME', 'SEASON', 'ARCHETYPE']
+
+
+def load_models(names):
+    """Registry name -> LoadedModel, skipping models whose artifacts are missing or fail verification."""
+    loaded = {}
+    for name in names:
+        try:
+            loaded[name] = load_model(name)
+        except (ModelRegistryError, OSError) as e:
+            logger.error(f"❌ Skipping {name}: {e}")
+    return loaded
+
+
+def build_shared_matrix(loaded) -> tuple:
+    """
+    The union feature matrix for every model, built once.
+
+    Returns:
+        (ids, X): identifier/label columns and the prepared features, same index
+    """
+    needed = []
+    for entry in loaded.values():
+        for f in entry.features or model_features(entry.model) or []:
+            if f not in needed:
+                needed.append(f)
+
+    trainer = RFEModelTrainer()
+    with_merchant = any(name.endswith('_merchant') for name in loaded)
+    df = load_training_frame(trainer, with_merchant).reset_index(drop=True)
+    X, _ = trainer.prepare_features(df, [f for f in needed if f in df.columns or f.isupper()])
+
+    # Telescope-style models use the projected (lowercase) features
+    lowercase = [f for f in needed if f not in X.columns and not f.isupper()]
+    if lowercase and FRICTION_DATASET_PATH.exists():
+        friction = read_feature_csv(FRICTION_DATASET_PATH)
+        columns = [f for f in lowercase if f in friction.columns]
+        friction = friction[['player_id', 'season'] + columns].assign(
+            player_id=friction['player_id'].astype(str), season=friction['season'].astype(str)
+        ).drop_duplicates(['player_id', 'season'])
+        keys = pd.DataFrame({'player_id': df['PLAYER_ID'].astype(str), 'season': df['SEASON'].astype(str)})
+        joined = keys.merge(friction, on=['player_id', 'season'], how='left')
+        for col in columns:
+            X[col] = joined[col].to_numpy()
+        logger.info(f"Joined {len(columns)} projected features from {FRICTION_DATASET_PATH}")
+
+    ids = df[[c for c in ID_COLUMNS if c in df.columns]]
+    logger.info(f"Shared matrix: {X.shape[0]} player-seasons x {X.shape[1]} features for {len(loaded)} models")
+    return ids, X
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score registered models on one shared feature matrix")
+    parser.add_argument('--models', nargs='+', default=None, help='Registry model names (default: all)')
+    parser.add_argument('--status', nargs='+', default=None, help='Only models with these statuses')
+    parser.add_argument('--jobs', type=int, default=None, help='Scoring threads (default: one per model)')
+    args = parser.parse_args()
+
+    registry = load_registry()['models']
+    names = args.models or [n for n, e in registry.items() if not args.status or e.get('status') in args.status]
+    loaded = load_models(names)
+    if not loaded:
+        logger.error("No models to compare")
+        sys.exit(1)
+
+    ids, X = build_shared_matrix(loaded)
+    start = time.perf_counter()
+    result = compare_model_set(
+        {n: e.model for n, e in loaded.items()}, X,
+        y_true=ids['ARCHETYPE'] if 'ARCHETYPE' in ids.columns else None,
+        encoders={n: e.encoder for n, e in loaded.items() if e.encoder is not None},
+        features={n: e.features for n, e in loaded.items() if e.features},
+        jobs=args.jobs,
+    )
+    elapsed = time.perf_counter() - start
+    logger.info(f"Scored {len(loaded)} models on {len(X)} player-seasons in {elapsed:.2f}s")
+
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    pd.concat([ids, result['scores']], axis=1).to_csv(OUTPUT_PATH, index=False)
+    result['pairwise'].to_csv(PAIRWISE_OUTPUT_PATH, index=False)
+    scores = result['scores']
+    test_accuracy = {}
+    if 'ARCHETYPE' in ids.columns:
+        _, test_mask = RFEModelTrainer().temporal_split(ids)
+        test_accuracy = agreement_statistics(scores[test_mask], result['classifiers'],
+                                             ids.loc[test_mask, 'ARCHETYPE'])['accuracy']
+    summary = {
+        'models': list(loaded),
+        'classifiers': result['classifiers'],
+        'regressors': result['regressors'],
+        'player_seasons': int(len(X)),
+        'scoring_seconds': round(elapsed, 3),
+        'unscored': result['unscored'],
+        'accuracy_rows': "all labeled player-seasons, including the models' training seasons",
+        'accuracy': result['accuracy'],
+        'test_season_accuracy': test_accuracy,
+        'unanimous_share': float(scores['unanimous'].mean()) if 'unanimous' in scores else None,
+        'mean_star_spread': float(scores['star_spread'].mean()) if 'star_spread' in scores else None,
+    }
+    with open(SUMMARY_OUTPUT_PATH, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print("\nAccuracy vs labeled archetypes (all rows, mostly training data / test seasons only):")
+    for name, acc in sorted(result['accuracy'].items(), key=lambda kv: -kv[1]):
+        print(f"  {name:<35} {acc:.3f}   {test_accuracy.get(name, float('nan')):.3f}")
+    if result['unscored']:
+        print(f"\nNot scored (features missing from the matrix): {', '.join(result['unscored'])}")
+    if not result['pairwise'].empty:
+        print("\nLeast-agreeing pairs:")
+        print(result['pairwise'].sort_values('kappa').head(5).to_string(index=False))
+    logger.info(f"✅ Wrote {OUTPUT_PATH}, {PAIRWISE_OUTPUT_PATH}, {SUMMARY_OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
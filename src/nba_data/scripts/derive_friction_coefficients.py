@@ -20,17 +20,28 @@ Methodology (First Principles):
     d. Group players by their SHOT_QUALITY_GENERATION_DELTA in year N.
     e. Analyze the relationship between delta_usg and delta_ts for each group. 
        This relationship defines the friction coefficient for that archetype.
+5.  Uncertainty (--bootstrap N): resample players N times and report the
+    distribution and confidence interval of each coefficient (and of the SQ
+    delta thresholds), saved as an artifact projection_utils can load.
+
+Usage:
+    python src/nba_data/scripts/derive_friction_coefficients.py
+    python src/nba_data/scripts/derive_friction_coefficients.py --bootstrap 2000 --jobs 4
 """
 
 import pandas as pd
 import numpy as np
+import argparse
 import logging
 from pathlib import Path
 import sys
+import time
 
 # Add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
+from src.nba_data.utils.friction_bootstrap import DEFAULT_ARTIFACT_PATH, bootstrap_friction
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -156,13 +167,47 @@ def analyze_friction_by_archetype(deltas_df: pd.DataFrame):
     logger.info(f"\nAnalysis saved to {output_path}")
 
 
+def bootstrap_friction_coefficients(deltas_df: pd.DataFrame, n_replicates: int, jobs: int, seed: int,
+                                    confidence: float, output_path: Path):
+    """Bootstrap confidence intervals for the coefficients and save the artifact."""
+    start = time.perf_counter()
+    result = bootstrap_friction(deltas_df, n_replicates=n_replicates, seed=seed, jobs=jobs,
+                                confidence=confidence)
+    elapsed = time.perf_counter() - start
+
+    summary = result.summary()
+    logger.info("\n" + "="*80)
+    logger.info(f"BOOTSTRAP FRICTION COEFFICIENTS ({n_replicates} player resamples, {confidence:.0%} CI)")
+    logger.info("="*80)
+    logger.info("\n" + summary.to_string(float_format=lambda x: f"{x:.6f}"))
+    for key, spec in result.threshold_summary().items():
+        logger.info(f"SQ_DELTA {key} threshold: {spec['point']:.4f} "
+                    f"[{spec['ci_lower']:.4f}, {spec['ci_upper']:.4f}]")
+
+    replicates_path = output_path.with_name(output_path.stem + "_replicates.csv")
+    result.save(output_path, replicates_path)
+    logger.info(f"✅ {n_replicates} replicates in {elapsed:.1f}s; saved {output_path} and {replicates_path}")
+
+
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Derive friction coefficients by SQ delta archetype")
+    parser.add_argument('--bootstrap', type=int, default=0,
+                        help='Number of bootstrap replicates for confidence intervals (default: 0, off)')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes for the bootstrap (0 = all CPUs)')
+    parser.add_argument('--seed', type=int, default=42, help='Bootstrap seed')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Confidence interval width')
+    parser.add_argument('--output', default=str(DEFAULT_ARTIFACT_PATH), help='Bootstrap artifact (JSON)')
+    args = parser.parse_args()
+
     try:
         logger.info("Starting Friction Coefficient Derivation...")
         player_data = load_data()
         deltas_df = calculate_yoy_deltas(player_data)
         analyze_friction_by_archetype(deltas_df)
+        if args.bootstrap > 0:
+            bootstrap_friction_coefficients(deltas_df, args.bootstrap, args.jobs or None, args.seed,
+                                            args.confidence, Path(args.output))
         logger.info("Friction coefficient derivation complete.")
         
     except (FileNotFoundError, ValueError) as e:
@@ -25,9 +25,14 @@ import pandas as pd
 import numpy as np
 import logging
 import sys
-import joblib
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.registry import ModelRegistryError, load_model
+from src.nba_data.utils.feature_dtypes import apply_feature_dtypes
 
 # Setup logging
 logging.basicConfig(
@@ -44,12 +49,15 @@ logger = logging.getLogger(__name__)
 class LatentStarDetector:
     """Detect players with high stress profiles but low usage."""
     
-    def __init__(self, use_rfe_model: bool = True):
+    def __init__(self, use_rfe_model: bool = True, model_ref: Optional[str] = None):
         """
-        Initialize latent star detector.
+        Initialize detector.
         
         Args:
-            use_rfe_model: If True, use RFE-selected 10-feature model (default: True)
+            use_rfe_model: If True, use the production (RFE) model from the
+                registry; otherwise the full model 'resilience_xgb'
+            model_ref: Registry reference ('production', a model name or
+                'name@version'); overrides use_rfe_model
         """
         self.results_dir = Path("results")
         self.data_dir = Path("data")
@@ -60,69 +68,24 @@ class LatentStarDetector:
         self.model = None
         self.label_encoder = None
         self.model_features = None
-        self._load_model(use_rfe_model=use_rfe_model)
+        self._load_model(model_ref or ('production' if use_rfe_model else 'resilience_xgb'))
     
-    def _load_model(self, use_rfe_model: bool = True):
-        """Load the trained XGBoost model and label encoder."""
-        # Try RFE model first (default)
-        if use_rfe_model:
-            model_path = self.models_dir / "resilience_xgb_rfe_10.pkl"
-            encoder_path = self.models_dir / "archetype_encoder_rfe_10.pkl"
-            
-            if not model_path.exists() or not encoder_path.exists():
-                logger.warning(f"RFE model not found at {model_path}, falling back to full model")
-                model_path = self.models_dir / "resilience_xgb.pkl"
-                encoder_path = self.models_dir / "archetype_encoder.pkl"
-                use_rfe_model = False
-        else:
-            model_path = self.models_dir / "resilience_xgb.pkl"
-            encoder_path = self.models_dir / "archetype_encoder.pkl"
-        
-        if not model_path.exists() or not encoder_path.exists():
-            logger.warning("Model files not found. Archetype prediction will be skipped.")
-            logger.warning(f"Expected: {model_path} and {encoder_path}")
-            return
-        
+    def _load_model(self, model_ref: str = 'production'):
+        """Load the trained XGBoost model and label encoder from the model registry."""
         try:
-            self.model = joblib.load(model_path)
-            self.label_encoder = joblib.load(encoder_path)
-            
-            # Get feature names from model (if available)
-            if hasattr(self.model, 'feature_names_in_'):
-                self.model_features = list(self.model.feature_names_in_)
-            else:
-                # If using RFE model, load RFE features from results
-                if use_rfe_model:
-                    import json
-                    rfe_results_path = self.results_dir / "rfe_model_results_10.json"
-                    if rfe_results_path.exists():
-                        with open(rfe_results_path, 'r') as f:
-                            rfe_data = json.load(f)
-                            self.model_features = rfe_data['features']
-                    else:
-                        # Fallback: hardcoded RFE features
-                        self.model_features = [
-                            'LEVERAGE_USG_DELTA', 'EFG_PCT_0_DRIBBLE', 'LATE_CLOCK_PRESSURE_APPETITE_DELTA',
-                            'USG_PCT', 'USG_PCT_X_CREATION_VOLUME_RATIO', 'USG_PCT_X_LEVERAGE_USG_DELTA',
-                            'USG_PCT_X_RS_PRESSURE_APPETITE', 'USG_PCT_X_EFG_ISO_WEIGHTED',
-                            'PREV_RS_PRESSURE_RESILIENCE', 'NEGATIVE_SIGNAL_COUNT'
-                        ]
-                else:
-                    # Fallback: try to get from predictive_features.json if it exists
-                    import json
-                    features_path = self.models_dir / "predictive_features.json"
-                    if features_path.exists():
-                        with open(features_path, 'r') as f:
-                            self.model_features = json.load(f)
-                    else:
-                        logger.warning("Could not determine model feature names. Will use all available features.")
-                        self.model_features = None
-            
-            model_type = "RFE (10 features)" if use_rfe_model else "Full"
-            logger.info(f"Loaded {model_type} model with {len(self.model_features) if self.model_features else 'unknown'} features")
-        except Exception as e:
-            logger.error(f"Error loading model: {e}")
+            loaded = load_model(model_ref)
+        except (ModelRegistryError, OSError) as e:
+            logger.warning(f"Could not load model '{model_ref}': {e}")
             logger.warning("Archetype prediction will be skipped.")
+            return
+        
+        self.model = loaded.model
+        self.label_encoder = loaded.encoder
+        self.model_features = loaded.features
+        if self.model_features is None:
+            logger.warning("Could not determine model feature names. Will use all available features.")
+        logger.info(f"Loaded {loaded.name} model with "
+                    f"{len(self.model_features) if self.model_features else 'unknown'} features")
     
     def predict_archetypes(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -267,7 +230,7 @@ class LatentStarDetector:
         else:
             logger.info(f"AGE already in dataset: {df_features['AGE'].notna().sum()} / {len(df_features)} values")
         
-        return df_features
+        return apply_feature_dtypes(df_features)
     
     def get_stress_vector_weights(self) -> Dict[str, float]:
         """
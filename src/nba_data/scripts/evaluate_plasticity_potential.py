@@ -15,7 +15,7 @@ import logging
 import sys
 from pathlib import Path
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import argparse
 
 # Add project root to path
@@ -29,15 +29,21 @@ if str(script_dir) not in sys.path:
 from src.nba_data.api.nba_stats_client import create_nba_stats_client
 from src.nba_data.api.synergy_playtypes_client import SynergyPlaytypesClient
 from src.nba_data.constants import ID_TO_ABBREV, get_team_abbrev, ABBREV_TO_ID
+from src.nba_data.utils.game_log_enrichment import load_enriched_game_logs
+from src.nba_data.utils.split_aggregation import aggregate_splits, mean, total, true_shooting, weighted_mean
 from calculate_dependence_score import calculate_dependence_scores_batch
 from src.nba_data.core.models import PlayerSeason
-from pydantic import ValidationError
+from src.nba_data.core.validation import FrameSchema
+from src.nba_data.utils.season_partitions import SeasonPartitions
 
+PLAYER_SEASON_SCHEMA = FrameSchema.from_model(PlayerSeason)
 
-def validate_with_pydantic(df: pd.DataFrame) -> pd.DataFrame:
+
+def validate_player_seasons(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Validates the DataFrame against the PlayerSeason Pydantic model.
-    Logs errors for rows that fail validation.
+    Validates the DataFrame against the PlayerSeason schema.
+    The model's constraints are checked as vectorized column masks
+    (core/validation.py); rows that fail are logged and dropped.
 
     Args:
         df: The final DataFrame to validate.
@@ -82,33 +88,27 @@ def validate_with_pydantic(df: pd.DataFrame) -> pd.DataFrame:
          logger.warning("No 'season' column found for validation. Using 'Unknown' as default.")
          df_to_validate['season'] = 'Unknown'
 
-    validated_records = []
-    error_count = 0
-    total_rows = len(df_to_validate)
-    
-    for index, row in df_to_validate.iterrows():
-        try:
-            # Pydantic can validate directly from a dict
-            validated_model = PlayerSeason.model_validate(row.to_dict())
-            validated_records.append(validated_model.model_dump())
-        except ValidationError as e:
-            if error_count == 0: # Log only the first error to avoid spam
-                logger.error(f"First Pydantic validation error: {e}")
-                logger.error(f"Row data that failed validation: {row.to_dict()}")
-            error_count += 1
-            pass
+    result = PLAYER_SEASON_SCHEMA.validate(df_to_validate)
+    total_rows = result.total_rows
+    error_count = result.invalid_rows
 
     if error_count > 0:
+        first_row = result.errors['row'].iloc[0]
+        first_errors = result.errors[result.errors['row'] == first_row]
+        # Log only the first failing row to avoid spam
+        logger.error(f"First validation error: {first_errors[['field', 'error', 'value']].to_dict('records')}")
+        logger.error(f"Row data that failed validation: {df_to_validate.loc[first_row].to_dict()}")
         logger.warning(f"Validation failed for {error_count} out of {total_rows} rows ({error_count/total_rows:.1%}). These rows will be dropped.")
-    
-    if not validated_records:
+        logger.info(f"Failures by field: {result.errors['field'].value_counts().to_dict()}")
+
+    validated_df = result.valid
+    if validated_df.empty:
         logger.error("No records passed validation. Returning an empty DataFrame.")
         return pd.DataFrame()
 
-    validated_df = pd.DataFrame(validated_records)
     logger.info(f"Validation complete. {len(validated_df)} / {total_rows} rows passed.")
     
-    # We return the Pydantic-validated DataFrame as is. 
+    # We return the validated DataFrame as is. 
     # This enforces the lowercase schema (e.g. 'player_id', 'season', 'usg_pct')
     # derived from src/nba_data/core/models.py
     
@@ -126,6 +126,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Context (quality of competition) aggregates per opponent-tier split.
+# TS% uses FGM + 0.5 * FG3M as points; the opponent DCS columns are read from the 'all' split.
+CONTEXT_METRICS = {
+    'TS_PCT': true_shooting(points={'FGM': 1, 'FG3M': 0.5}, fill=0),
+    'USG_PCT': mean('USG_PCT'),
+    'MIN': total('MIN'),
+    'AVG_OPPONENT_DCS': weighted_mean('OPPONENT_DCS', 'MIN'),
+    'MEAN_OPPONENT_DCS': mean('OPPONENT_DCS'),
+}
+
+
+def timed_stage(timings, stage, func, *args, **kwargs):
+    """Call func, adding its wall time to timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def to_columns(df):
+    """Compact columnar form of a season frame for returning from a worker process."""
+    if df is None:
+        return None
+    return {'columns': list(df.columns), 'values': [df[col].to_numpy() for col in df.columns]}
+
+
+def from_columns(payload):
+    """Inverse of to_columns."""
+    if payload is None:
+        return None
+    return pd.DataFrame(dict(zip(payload['columns'], payload['values'])), columns=payload['columns'])
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Code whose changes invalidate every season partition
+PARTITION_CODE = [
+    Path(__file__).resolve(),
+    PROJECT_ROOT / "src/nba_data/constants.py",
+    PROJECT_ROOT / "src/nba_data/utils/game_log_enrichment.py",
+    PROJECT_ROOT / "src/nba_data/utils/split_aggregation.py",
+]
+
+
 class StressVectorEngine:
     def __init__(self):
         self.client = create_nba_stats_client()
@@ -566,120 +610,44 @@ class StressVectorEngine:
                 logger.warning(f"  - Defensive context file not found at {def_context_path}, skipping.")
                 return pd.DataFrame()
             
-            df_def = pd.read_csv(def_context_path)
-            # Rank by DEF_RATING (lower is better)
-            df_def['DEF_RANK'] = df_def['DEF_RATING'].rank(method='first', ascending=True)
-            
-            # Create DCS map for quick lookup
-            dcs_map = dict(zip(df_def['TEAM_ID'], df_def['def_context_score']))
-            
-            top_10_defenses = df_def[df_def['DEF_RANK'] <= 10]['TEAM_ID'].tolist()
-            bottom_10_defenses = df_def[df_def['DEF_RANK'] > 20]['TEAM_ID'].tolist()
-            
-            # Elite defenses (DCS > 70) and weak defenses (DCS < 40)
-            elite_defenses = df_def[df_def['def_context_score'] > 70]['TEAM_ID'].tolist()
-            weak_defenses = df_def[df_def['def_context_score'] < 40]['TEAM_ID'].tolist()
-
-            # 2. Load Regular Season Game Logs
+            # 2. Load Regular Season Game Logs (pre-enriched with opponent ID,
+            # opponent DCS and defense-tier flags)
             game_logs_path = self.data_dir / f"rs_game_logs_{season}.csv"
             if not game_logs_path.exists():
                 logger.warning(f"  - RS Game Logs not found at {game_logs_path}, skipping.")
                 return pd.DataFrame()
-                
-            df_logs = pd.read_csv(game_logs_path, dtype={'GAME_ID': str, 'PLAYER_ID': int, 'TEAM_ID': int})
-
-            # Get opponent team ID
-            def get_opponent_team_abbrev(row):
-                matchup = row['MATCHUP']
-                teams = matchup.replace('@', 'vs.').split(' vs. ')
-                # Find the abbreviation that is NOT the player's team's abbreviation
-                player_team_abbrev = row['TEAM_ABBREVIATION']
-                opponent_abbrev = teams[0] if teams[0] != player_team_abbrev else teams[1]
-                return opponent_abbrev
 
-            df_logs['OPPONENT_TEAM_ABBREV'] = df_logs.apply(get_opponent_team_abbrev, axis=1)
-            df_logs['OPPONENT_TEAM_ID'] = df_logs['OPPONENT_TEAM_ABBREV'].map(ABBREV_TO_ID)
+            df_logs = load_enriched_game_logs(season, kind="rs", data_dir=self.data_dir)
+            df_logs['PLAYER_ID'] = df_logs['PLAYER_ID'].astype(int)
 
             # Drop rows where opponent ID could not be mapped (just in case)
-            df_logs.dropna(subset=['OPPONENT_TEAM_ID'], inplace=True)
+            df_logs = df_logs.dropna(subset=['OPPONENT_TEAM_ID'])
             df_logs['OPPONENT_TEAM_ID'] = df_logs['OPPONENT_TEAM_ID'].astype(int)
-            
-            # Add opponent DCS to each game log
-            df_logs['OPPONENT_DCS'] = df_logs['OPPONENT_TEAM_ID'].map(dcs_map)
-
-            # 3. Split by Opponent Quality
-            df_vs_top10 = df_logs[df_logs['OPPONENT_TEAM_ID'].isin(top_10_defenses)]
-            df_vs_bottom10 = df_logs[df_logs['OPPONENT_TEAM_ID'].isin(bottom_10_defenses)]
-            df_vs_elite = df_logs[df_logs['OPPONENT_TEAM_ID'].isin(elite_defenses)]
-            df_vs_weak = df_logs[df_logs['OPPONENT_TEAM_ID'].isin(weak_defenses)]
+            df_logs['OPPONENT_DCS'] = df_logs['OPP_DCS']
 
-            # 4. Aggregate Player Stats
-            def aggregate_player_stats(df, suffix):
-                if df.empty:
-                    return pd.DataFrame()
-                
-                player_agg = df.groupby('PLAYER_ID').agg(
-                    FGA=('FGA', 'sum'),
-                    FGM=('FGM', 'sum'),
-                    FG3A=('FG3A', 'sum'),
-                    FG3M=('FG3M', 'sum'),
-                    FTA=('FTA', 'sum'),
-                    FTM=('FTM', 'sum'),
-                    USG_PCT=('USG_PCT', 'mean'), # Note: API has a typo USU_PCT corrected to USG_PCT
-                    MIN=('MIN', 'sum')
-                ).reset_index()
-
-                # Calculate TS%
-                player_agg[f'TS_PCT_{suffix}'] = np.where(
-                    player_agg['FGA'] + 0.44 * player_agg['FTA'] > 0,
-                    (player_agg['FGM'] + 0.5 * player_agg['FG3M']) / (2 * (player_agg['FGA'] + 0.44 * player_agg['FTA'])),
-                    0
-                )
-                player_agg = player_agg.rename(columns={'USG_PCT': f'USG_PCT_{suffix}', 'MIN': f'MIN_{suffix}'})
-                return player_agg[['PLAYER_ID', f'TS_PCT_{suffix}', f'USG_PCT_{suffix}', f'MIN_{suffix}']]
-
-            agg_top10 = aggregate_player_stats(df_vs_top10, 'vs_top10')
-            agg_bottom10 = aggregate_player_stats(df_vs_bottom10, 'vs_bottom10')
-            agg_elite = aggregate_player_stats(df_vs_elite, 'vs_elite')
-            agg_weak = aggregate_player_stats(df_vs_weak, 'vs_weak')
-
-            # 5. Calculate average opponent DCS faced (weighted by minutes)
-            # Handle case where df_logs might be empty or have no valid DCS values
-            if len(df_logs) > 0 and df_logs['OPPONENT_DCS'].notna().any():
-                opp_dcs_weighted = df_logs.groupby('PLAYER_ID').apply(
-                    lambda x: np.average(x['OPPONENT_DCS'], weights=x['MIN']) if x['OPPONENT_DCS'].notna().any() else np.nan,
-                    include_groups=False
-                ).reset_index()
-                opp_dcs_weighted.columns = ['PLAYER_ID', 'AVG_OPPONENT_DCS']
-                
-                # Also calculate simple average
-                opp_dcs_simple = df_logs.groupby('PLAYER_ID')['OPPONENT_DCS'].mean().reset_index()
-                opp_dcs_simple.columns = ['PLAYER_ID', 'MEAN_OPPONENT_DCS']
-            else:
-                opp_dcs_weighted = pd.DataFrame(columns=['PLAYER_ID', 'AVG_OPPONENT_DCS'])
-                opp_dcs_simple = pd.DataFrame(columns=['PLAYER_ID', 'MEAN_OPPONENT_DCS'])
-
-            # 6. Merge all context features - start with top10/bottom10 which should always exist
-            if not agg_top10.empty and not agg_bottom10.empty:
-                df_context = pd.merge(agg_top10, agg_bottom10, on='PLAYER_ID', how='outer')
-            elif not agg_top10.empty:
-                df_context = agg_top10.copy()
-            elif not agg_bottom10.empty:
-                df_context = agg_bottom10.copy()
-            else:
-                # If both are empty, we can't create context features
+            # 3. Context features need games against top10/bottom10 defenses
+            if not (df_logs['IS_TOP_10_DEF'].any() or df_logs['IS_BOTTOM_10_DEF'].any()):
                 logger.warning(f"  - No top10/bottom10 data for {season}, skipping context metrics.")
                 return pd.DataFrame()
-            
-            # Merge elite/weak stats if they exist
-            if not agg_elite.empty:
-                df_context = pd.merge(df_context, agg_elite, on='PLAYER_ID', how='outer')
-            if not agg_weak.empty:
-                df_context = pd.merge(df_context, agg_weak, on='PLAYER_ID', how='outer')
-            if not opp_dcs_weighted.empty:
-                df_context = pd.merge(df_context, opp_dcs_weighted, on='PLAYER_ID', how='outer')
-            if not opp_dcs_simple.empty:
-                df_context = pd.merge(df_context, opp_dcs_simple, on='PLAYER_ID', how='outer')
+
+            # 4. Aggregate Player Stats per opponent tier, plus the average
+            # opponent DCS faced (minute-weighted and simple), in one grouped pass
+            splits = {
+                'vs_top10': df_logs['IS_TOP_10_DEF'],
+                'vs_bottom10': df_logs['IS_BOTTOM_10_DEF'],
+                'vs_elite': df_logs['IS_ELITE_DEF'],
+                'vs_weak': df_logs['IS_WEAK_DEF'],
+                'all': None,
+            }
+            agg = aggregate_splits(df_logs, by='PLAYER_ID', splits=splits, metrics=CONTEXT_METRICS)
+
+            context_cols = ['PLAYER_ID']
+            for split in ['vs_top10', 'vs_bottom10', 'vs_elite', 'vs_weak']:
+                context_cols += [f'TS_PCT_{split}', f'USG_PCT_{split}', f'MIN_{split}']
+            df_context = agg[context_cols + ['AVG_OPPONENT_DCS_all', 'MEAN_OPPONENT_DCS_all']].rename(columns={
+                'AVG_OPPONENT_DCS_all': 'AVG_OPPONENT_DCS',
+                'MEAN_OPPONENT_DCS_all': 'MEAN_OPPONENT_DCS',
+            })
             
             # Filter for meaningful sample size (at least 50 minutes vs top 10 and bottom 10)
             df_context = df_context[
@@ -1149,162 +1117,240 @@ class StressVectorEngine:
         
         return df
 
-    def run(self, seasons=['2021-22', '2022-23', '2023-24'], max_workers=1):
-        
-        all_seasons_data = []
-        
-        def process_single_season(season):
-            logger.info(f"=== Processing {season} ===")
-            
-            try:
-                # 1. Fetch Base Metadata (The new "Source of Truth" for a season)
-                logger.info(f"--- Fetching Base Player Metadata for {season} ---")
-                df_season = self.fetch_player_metadata(season)
-                if df_season.empty:
-                    logger.warning(f"Skipping {season} due to missing base metadata.")
-                    return None
-
-                # 2. Fetch Regular Season Features
-                logger.info(f"--- Fetching Regular Season data for {season} ---")
-                df_creation_rs = self.fetch_creation_metrics(season, season_type="Regular Season")
-                df_playtype_rs = self.fetch_playtype_metrics(season, season_type="Regular Season")
-                
-                # 3. Fetch Playoff Data for Friction Calculation
-                logger.info(f"--- Fetching Playoff data for {season} ---")
-                df_creation_po = self.fetch_creation_metrics(season, season_type="Playoffs")
-                df_playtype_po = self.fetch_playtype_metrics(season, season_type="Playoffs")
-                
-                # 4. Calculate Friction Coefficients
-                logger.info(f"--- Calculating Friction Coefficients for {season} ---")
-                
-                # Merge Creation Metrics
-                df_creation_merged = pd.merge(
-                    df_creation_rs.add_suffix('_RS'),
-                    df_creation_po.add_suffix('_PO'),
-                    left_on='PLAYER_ID_RS', right_on='PLAYER_ID_PO',
-                    how='inner' # Inner join: must have both RS and PO data
-                )
-                if not df_creation_merged.empty:
-                    df_creation_merged = df_creation_merged.drop(columns=['PLAYER_ID_PO', 'PLAYER_NAME_PO'])
-                    df_creation_merged = df_creation_merged.rename(columns={'PLAYER_ID_RS': 'PLAYER_ID', 'PLAYER_NAME_RS': 'PLAYER_NAME'})
-
-                # Merge Playtype Metrics
-                df_playtype_merged = pd.merge(
-                    df_playtype_rs.add_suffix('_RS'),
-                    df_playtype_po.add_suffix('_PO'),
-                    left_on='PLAYER_ID_RS', right_on='PLAYER_ID_PO',
-                    how='inner'
-                )
-                if not df_playtype_merged.empty:
-                    df_playtype_merged = df_playtype_merged.drop(columns=['PLAYER_ID_PO'])
-                    df_playtype_merged = df_playtype_merged.rename(columns={'PLAYER_ID_RS': 'PLAYER_ID'})
-
-                # Combine all friction data
-                if not df_creation_merged.empty and not df_playtype_merged.empty:
-                    df_friction = pd.merge(df_creation_merged, df_playtype_merged, on='PLAYER_ID', how='outer')
-                elif not df_creation_merged.empty:
-                    df_friction = df_creation_merged
-                elif not df_playtype_merged.empty:
-                    df_friction = df_playtype_merged
-                else:
-                    df_friction = pd.DataFrame()
-                
-                friction_cols = []
-                if not df_friction.empty:
-                    # Dribble-based friction
-                    if 'EFG_ISO_WEIGHTED_PO' in df_friction.columns and 'EFG_ISO_WEIGHTED_RS' in df_friction.columns:
-                        df_friction['FRICTION_COEFF_ISO'] = df_friction['EFG_ISO_WEIGHTED_PO'] / df_friction['EFG_ISO_WEIGHTED_RS']
-                        friction_cols.append('FRICTION_COEFF_ISO')
-                    if 'EFG_PCT_0_DRIBBLE_PO' in df_friction.columns and 'EFG_PCT_0_DRIBBLE_RS' in df_friction.columns:
-                        df_friction['FRICTION_COEFF_0_DRIBBLE'] = df_friction['EFG_PCT_0_DRIBBLE_PO'] / df_friction['EFG_PCT_0_DRIBBLE_RS']
-                        friction_cols.append('FRICTION_COEFF_0_DRIBBLE')
-                    
-                    # Playtype-based friction (using PPP)
-                    if 'ISO_PPP_PO' in df_friction.columns and 'ISO_PPP_RS' in df_friction.columns:
-                        df_friction['FRICTION_COEFF_PLAYTYPE_ISO'] = df_friction['ISO_PPP_PO'] / df_friction['ISO_PPP_RS']
-                        friction_cols.append('FRICTION_COEFF_PLAYTYPE_ISO')
-                    if 'PNR_HANDLER_PPP_PO' in df_friction.columns and 'PNR_HANDLER_PPP_RS' in df_friction.columns:
-                        df_friction['FRICTION_COEFF_PNR_HANDLER'] = df_friction['PNR_HANDLER_PPP_PO'] / df_friction['PNR_HANDLER_PPP_RS']
-                        friction_cols.append('FRICTION_COEFF_PNR_HANDLER')
-                    if 'POST_PPP_PO' in df_friction.columns and 'POST_PPP_RS' in df_friction.columns:
-                        df_friction['FRICTION_COEFF_POST'] = df_friction['POST_PPP_PO'] / df_friction['POST_PPP_RS']
-                        friction_cols.append('FRICTION_COEFF_POST')
-                    
-                    if friction_cols:
-                        df_friction[friction_cols] = df_friction[friction_cols].replace([np.inf, -np.inf], np.nan).fillna(1.0)
-                    
-                    logger.info(f"Calculated friction for {len(df_friction)} players in {season}.")
-                
-                # 5. Fetch other RS-based metrics (Tracking, Leverage, Context, etc.)
-                df_tracking = self.fetch_tracking_metrics(season, season_type="Regular Season")
-                df_touch = self.fetch_touch_metrics(season, season_type="Regular Season")
-                df_leverage = self.fetch_leverage_metrics(season)
-                df_context = self.fetch_context_metrics(season)
-                
-                # 6. Combine all data for the season using LEFT joins from metadata
-                logger.info(f"--- Merging all feature sets for {season} ---")
-
-                # Merge tracking data
-                if not df_tracking.empty:
-                    df_season = pd.merge(df_season, df_tracking, on='PLAYER_ID', how='left')
-
-                # Merge touch data
-                if not df_touch.empty:
-                     df_season = pd.merge(df_season, df_touch, on='PLAYER_ID', how='left')
-
-                # Merge creation data
-                if not df_creation_rs.empty:
-                    df_season = pd.merge(df_season, df_creation_rs.drop(columns=['PLAYER_NAME']), on='PLAYER_ID', how='left')
-
-                # Merge friction coefficients
-                if not df_friction.empty:
-                    df_season = pd.merge(df_season, df_friction[['PLAYER_ID'] + friction_cols], on='PLAYER_ID', how='left')
-                    for col in friction_cols:
-                         if col in df_season.columns:
-                              df_season[col] = df_season[col].fillna(1.0)
-                else:
-                    for col in ['FRICTION_COEFF_ISO', 'FRICTION_COEFF_0_DRIBBLE', 'FRICTION_COEFF_PLAYTYPE_ISO', 'FRICTION_COEFF_PNR_HANDLER', 'FRICTION_COEFF_POST']:
-                        df_season[col] = 1.0
-
-                # Merge other datasets
-                if not df_leverage.empty:
-                    df_season = pd.merge(df_season, df_leverage, on='PLAYER_ID', how='left')
-                if not df_context.empty:
-                    df_season = pd.merge(df_season, df_context, on='PLAYER_ID', how='left')
-                if not df_playtype_rs.empty:
-                     df_season = pd.merge(df_season, df_playtype_rs.add_suffix('_RS'), left_on='PLAYER_ID', right_on='PLAYER_ID_RS', how='left')
-                     if 'PLAYER_ID_RS' in df_season.columns:
-                          df_season = df_season.drop(columns=['PLAYER_ID_RS'])
-
-                # 7. Calculate Subsidy Index (Prior to Projection)
-                df_season = self.calculate_subsidy_index(df_season)
-
-                # 8. Engineer the Projected Playoff Output Feature
-                df_season = self.calculate_projected_playoff_output(df_season)
-                
-                df_season['SEASON'] = season
-                return df_season
-                
-            except Exception as e:
-                logger.error(f"Failed to process {season}: {e}", exc_info=True)
-                return None
+    def process_seasons(self, seasons, max_workers=1, executor='process'):
+        """
+        Run process_season for every season, reporting progress and per-stage timings.
 
-        # Process seasons in parallel
-        logger.info(f"Processing {len(seasons)} seasons with {max_workers} workers...")
-        if max_workers > 1:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                results = list(executor.map(process_single_season, seasons))
+        Returns:
+            Season frames (None for failed seasons) in the order of `seasons`
+        """
+        start = time.perf_counter()
+        results = {}
+
+        def report(season, frame, timings):
+            results[season] = frame
+            stages = ", ".join(f"{stage} {secs:.1f}s" for stage, secs in timings.items())
+            status = f"{len(frame)} players" if frame is not None else "failed"
+            logger.info(f"[{len(results)}/{len(seasons)}] {season}: {status} in {sum(timings.values()):.1f}s ({stages})")
+
+        max_workers = min(max_workers, len(seasons)) or 1
+        logger.info(f"Processing {len(seasons)} seasons with {max_workers} {executor} workers...")
+        if max_workers > 1 and executor == 'process':
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_season_worker,
+                                     initargs=(max_workers,)) as pool:
+                futures = {pool.submit(_season_worker, season): season for season in seasons}
+                for future in as_completed(futures):
+                    payload, timings = future.result()
+                    report(futures[future], from_columns(payload), timings)
+        elif max_workers > 1:
+            def run_in_thread(season):
+                timings = {}
+                return self.process_season(season, timings), timings
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {pool.submit(run_in_thread, season): season for season in seasons}
+                for future in as_completed(futures):
+                    report(futures[future], *future.result())
         else:
-            results = [process_single_season(s) for s in seasons]
-            
-        all_seasons_data = [r for r in results if r is not None]
-        
+            for season in seasons:
+                timings = {}
+                report(season, self.process_season(season, timings), timings)
+
+        logger.info(f"Processed {len(seasons)} seasons in {time.perf_counter() - start:.1f}s wall time")
+        return [results[season] for season in seasons]
+
+    def process_season(self, season, timings=None):
+        """
+        Build the feature frame for one season.
+
+        Args:
+            season: Season string (e.g. '2023-24')
+            timings: Optional dict that receives seconds spent per stage
+
+        Returns:
+            One row per player, or None if the season could not be processed
+        """
+        timings = {} if timings is None else timings
+        logger.info(f"=== Processing {season} ===")
+
+        try:
+            # 1. Fetch Base Metadata (The new "Source of Truth" for a season)
+            logger.info(f"--- Fetching Base Player Metadata for {season} ---")
+            df_season = timed_stage(timings, 'metadata', self.fetch_player_metadata, season)
+            if df_season.empty:
+                logger.warning(f"Skipping {season} due to missing base metadata.")
+                return None
+
+            # 2. Fetch Regular Season Features
+            logger.info(f"--- Fetching Regular Season data for {season} ---")
+            df_creation_rs = timed_stage(timings, 'creation', self.fetch_creation_metrics, season, season_type="Regular Season")
+            df_playtype_rs = timed_stage(timings, 'playtype', self.fetch_playtype_metrics, season, season_type="Regular Season")
+
+            # 3. Fetch Playoff Data for Friction Calculation
+            logger.info(f"--- Fetching Playoff data for {season} ---")
+            df_creation_po = timed_stage(timings, 'creation', self.fetch_creation_metrics, season, season_type="Playoffs")
+            df_playtype_po = timed_stage(timings, 'playtype', self.fetch_playtype_metrics, season, season_type="Playoffs")
+
+            # 4. Calculate Friction Coefficients
+            logger.info(f"--- Calculating Friction Coefficients for {season} ---")
+
+            # Merge Creation Metrics
+            df_creation_merged = pd.merge(
+                df_creation_rs.add_suffix('_RS'),
+                df_creation_po.add_suffix('_PO'),
+                left_on='PLAYER_ID_RS', right_on='PLAYER_ID_PO',
+                how='inner' # Inner join: must have both RS and PO data
+            )
+            if not df_creation_merged.empty:
+                df_creation_merged = df_creation_merged.drop(columns=['PLAYER_ID_PO', 'PLAYER_NAME_PO'])
+                df_creation_merged = df_creation_merged.rename(columns={'PLAYER_ID_RS': 'PLAYER_ID', 'PLAYER_NAME_RS': 'PLAYER_NAME'})
+
+            # Merge Playtype Metrics
+            df_playtype_merged = pd.merge(
+                df_playtype_rs.add_suffix('_RS'),
+                df_playtype_po.add_suffix('_PO'),
+                left_on='PLAYER_ID_RS', right_on='PLAYER_ID_PO',
+                how='inner'
+            )
+            if not df_playtype_merged.empty:
+                df_playtype_merged = df_playtype_merged.drop(columns=['PLAYER_ID_PO'])
+                df_playtype_merged = df_playtype_merged.rename(columns={'PLAYER_ID_RS': 'PLAYER_ID'})
+
+            # Combine all friction data
+            if not df_creation_merged.empty and not df_playtype_merged.empty:
+                df_friction = pd.merge(df_creation_merged, df_playtype_merged, on='PLAYER_ID', how='outer')
+            elif not df_creation_merged.empty:
+                df_friction = df_creation_merged
+            elif not df_playtype_merged.empty:
+                df_friction = df_playtype_merged
+            else:
+                df_friction = pd.DataFrame()
+
+            friction_cols = []
+            if not df_friction.empty:
+                # Dribble-based friction
+                if 'EFG_ISO_WEIGHTED_PO' in df_friction.columns and 'EFG_ISO_WEIGHTED_RS' in df_friction.columns:
+                    df_friction['FRICTION_COEFF_ISO'] = df_friction['EFG_ISO_WEIGHTED_PO'] / df_friction['EFG_ISO_WEIGHTED_RS']
+                    friction_cols.append('FRICTION_COEFF_ISO')
+                if 'EFG_PCT_0_DRIBBLE_PO' in df_friction.columns and 'EFG_PCT_0_DRIBBLE_RS' in df_friction.columns:
+                    df_friction['FRICTION_COEFF_0_DRIBBLE'] = df_friction['EFG_PCT_0_DRIBBLE_PO'] / df_friction['EFG_PCT_0_DRIBBLE_RS']
+                    friction_cols.append('FRICTION_COEFF_0_DRIBBLE')
+
+                # Playtype-based friction (using PPP)
+                if 'ISO_PPP_PO' in df_friction.columns and 'ISO_PPP_RS' in df_friction.columns:
+                    df_friction['FRICTION_COEFF_PLAYTYPE_ISO'] = df_friction['ISO_PPP_PO'] / df_friction['ISO_PPP_RS']
+                    friction_cols.append('FRICTION_COEFF_PLAYTYPE_ISO')
+                if 'PNR_HANDLER_PPP_PO' in df_friction.columns and 'PNR_HANDLER_PPP_RS' in df_friction.columns:
+                    df_friction['FRICTION_COEFF_PNR_HANDLER'] = df_friction['PNR_HANDLER_PPP_PO'] / df_friction['PNR_HANDLER_PPP_RS']
+                    friction_cols.append('FRICTION_COEFF_PNR_HANDLER')
+                if 'POST_PPP_PO' in df_friction.columns and 'POST_PPP_RS' in df_friction.columns:
+                    df_friction['FRICTION_COEFF_POST'] = df_friction['POST_PPP_PO'] / df_friction['POST_PPP_RS']
+                    friction_cols.append('FRICTION_COEFF_POST')
+
+                if friction_cols:
+                    df_friction[friction_cols] = df_friction[friction_cols].replace([np.inf, -np.inf], np.nan).fillna(1.0)
+
+                logger.info(f"Calculated friction for {len(df_friction)} players in {season}.")
+
+            # 5. Fetch other RS-based metrics (Tracking, Leverage, Context, etc.)
+            df_tracking = timed_stage(timings, 'tracking', self.fetch_tracking_metrics, season, season_type="Regular Season")
+            df_touch = timed_stage(timings, 'touch', self.fetch_touch_metrics, season, season_type="Regular Season")
+            df_leverage = timed_stage(timings, 'leverage', self.fetch_leverage_metrics, season)
+            df_context = timed_stage(timings, 'context', self.fetch_context_metrics, season)
+
+            # 6. Combine all data for the season using LEFT joins from metadata
+            logger.info(f"--- Merging all feature sets for {season} ---")
+
+            # Merge tracking data
+            if not df_tracking.empty:
+                df_season = pd.merge(df_season, df_tracking, on='PLAYER_ID', how='left')
+
+            # Merge touch data
+            if not df_touch.empty:
+                 df_season = pd.merge(df_season, df_touch, on='PLAYER_ID', how='left')
+
+            # Merge creation data
+            if not df_creation_rs.empty:
+                df_season = pd.merge(df_season, df_creation_rs.drop(columns=['PLAYER_NAME']), on='PLAYER_ID', how='left')
+
+            # Merge friction coefficients
+            if not df_friction.empty:
+                df_season = pd.merge(df_season, df_friction[['PLAYER_ID'] + friction_cols], on='PLAYER_ID', how='left')
+                for col in friction_cols:
+                     if col in df_season.columns:
+                          df_season[col] = df_season[col].fillna(1.0)
+            else:
+                for col in ['FRICTION_COEFF_ISO', 'FRICTION_COEFF_0_DRIBBLE', 'FRICTION_COEFF_PLAYTYPE_ISO', 'FRICTION_COEFF_PNR_HANDLER', 'FRICTION_COEFF_POST']:
+                    df_season[col] = 1.0
+
+            # Merge other datasets
+            if not df_leverage.empty:
+                df_season = pd.merge(df_season, df_leverage, on='PLAYER_ID', how='left')
+            if not df_context.empty:
+                df_season = pd.merge(df_season, df_context, on='PLAYER_ID', how='left')
+            if not df_playtype_rs.empty:
+                 df_season = pd.merge(df_season, df_playtype_rs.add_suffix('_RS'), left_on='PLAYER_ID', right_on='PLAYER_ID_RS', how='left')
+                 if 'PLAYER_ID_RS' in df_season.columns:
+                      df_season = df_season.drop(columns=['PLAYER_ID_RS'])
+
+            # 7. Calculate Subsidy Index (Prior to Projection)
+            df_season = timed_stage(timings, 'subsidy', self.calculate_subsidy_index, df_season)
+
+            # 8. Engineer the Projected Playoff Output Feature
+            df_season = timed_stage(timings, 'projection', self.calculate_projected_playoff_output, df_season)
+
+            df_season['SEASON'] = season
+            return df_season
+
+        except Exception as e:
+            logger.error(f"Failed to process {season}: {e}", exc_info=True)
+            return None
+
+    def season_fingerprints(self, partitions, seasons):
+        """Fingerprint of each season's local inputs (game logs, defensive context)."""
+        return {
+            season: partitions.fingerprint(season, inputs=[
+                self.data_dir / f"rs_game_logs_{season}.csv",
+                self.data_dir / f"defensive_context_{season}.csv",
+            ])
+            for season in seasons
+        }
+
+    def run(self, seasons=['2021-22', '2022-23', '2023-24'], max_workers=1, executor='process',
+            refresh=(), incremental=True):
+        """
+        Process every season, then merge, score and save the predictive dataset.
+
+        With max_workers > 1 each season runs in its own worker process
+        (executor='process', the default) or thread (executor='thread').
+        Workers share the on-disk API cache and return columnar results that
+        are merged in the order of `seasons`, independent of completion order.
+
+        Season frames are kept as partitions (data/partitions/stress_vectors/)
+        keyed by this script, the enrichment modules and the season's local
+        files; seasons whose partition is current are not recomputed. The
+        NBA Stats API responses are not part of the fingerprint, so pass the
+        in-progress season in `refresh` (or incremental=False to recompute
+        everything). The dataset-wide steps below always run on the
+        concatenated partitions.
+        """
+        partitions = SeasonPartitions("stress_vectors", code=PARTITION_CODE)
+        fingerprints = self.season_fingerprints(partitions, seasons)
+        to_compute = partitions.stale(fingerprints, refresh=refresh if incremental else seasons)
+
+        if to_compute:
+            results = self.process_seasons(to_compute, max_workers=max_workers, executor=executor)
+            for season, frame in zip(to_compute, results):
+                if frame is not None:
+                    partitions.write(season, frame, fingerprints[season])
+                elif partitions.path(season).exists():
+                    logger.warning(f"{season} failed; keeping its previous partition")
+
         # Combine all
-        if not all_seasons_data:
+        final_df = partitions.concat(seasons)
+        if final_df.empty:
             logger.error("No data generated.")
             return
-            
-        final_df = pd.concat(all_seasons_data, ignore_index=True)
 
         pressure_path = self.results_dir / "pressure_features.csv"
         if pressure_path.exists():
@@ -1421,8 +1467,8 @@ class StressVectorEngine:
         # INSERT THIS CALL
         final_df = self._calculate_fragility_score(final_df)
         
-        # PHASE 5 REFACTOR: Validate the final dataset against the Pydantic schema
-        final_df = validate_with_pydantic(final_df)
+        # PHASE 5 REFACTOR: Validate the final dataset against the PlayerSeason schema
+        final_df = validate_player_seasons(final_df)
         
         # For now, just save what we have
         output_path = self.results_dir / "predictive_dataset_with_friction.csv"
@@ -1430,10 +1476,34 @@ class StressVectorEngine:
         logger.info(f"Successfully saved Predictive Dataset with Friction to {output_path}")
         logger.info(f"Total Rows: {len(final_df)}")
 
+_WORKER_ENGINE = None
+
+
+def _init_season_worker(n_workers):
+    """Process-pool initializer: one engine (and API client) per worker process."""
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = StressVectorEngine()
+    # Workers share the API budget: keep the combined request rate at the single-client limit
+    for client in (_WORKER_ENGINE.client, _WORKER_ENGINE.playtype_client.base_client):
+        client.min_request_interval *= n_workers
+
+
+def _season_worker(season):
+    """Process-pool task: one season's frame in columnar form plus its stage timings."""
+    timings = {}
+    df_season = _WORKER_ENGINE.process_season(season, timings)
+    return to_columns(df_season), timings
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Feature Engineering for Stylistic Stress Test")
     parser.add_argument('--workers', type=int, default=1, help='Number of parallel workers (default: 1)')
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                        help='Worker type when --workers > 1 (default: process)')
     parser.add_argument('--seasons', nargs='+', help='Seasons to process (e.g., 2023-24)')
+    parser.add_argument('--refresh', nargs='+', default=[],
+                        help='Seasons to recompute even if their partition is current (e.g., the current season)')
+    parser.add_argument('--full', action='store_true', help='Recompute every season, ignoring partitions')
     args = parser.parse_args()
 
     engine = StressVectorEngine()
@@ -1448,4 +1518,5 @@ if __name__ == "__main__":
             '2019-20', '2020-21', '2021-22', '2022-23', '2023-24', '2024-25'
         ]
         
-    engine.run(seasons=seasons_to_process, max_workers=args.workers)
+    engine.run(seasons=seasons_to_process, max_workers=args.workers, executor=args.executor,
+               refresh=args.refresh, incremental=not args.full)
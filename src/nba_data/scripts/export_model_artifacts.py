@@ -0,0 +1,128 @@
+"""
+Export Registered Models as Portable Artifacts
+
+Converts the joblib-pickled models in models/registry.json into portable
+model artifacts (src/model/artifact.py): the booster in XGBoost's native
+UBJSON, the label classes, feature order, calibration thresholds and
+metadata in one checksummed file, models/<name>.xgbm. The artifact is
+registered as the entry's artifact_path, so load_model() uses it instead
+of unpickling. The trainers call export_registered() after every training
+run, so the artifact never lags the pickle.
+
+Archetype models carry the risk-quadrant thresholds the predictor uses
+(star-level performance cut points and the dependence thresholds from
+results/dependence_thresholds.json) and, once calibrate_models.py has
+fitted one, the probability calibration that predict_proba applies.
+
+Usage:
+    python src/nba_data/scripts/export_model_artifacts.py                  # every registered model
+    python src/nba_data/scripts/export_model_artifacts.py --models resilience_xgb_rfe_10 telescope_model
+    python src/nba_data/scripts/export_model_artifacts.py --benchmark      # joblib vs artifact load time
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+import joblib
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.artifact import ARTIFACT_SUFFIX, export_artifact, load_artifact
+from src.model.calibration import read_calibration, risk_thresholds
+from src.model.registry import (
+    REGISTRY_PATH, ModelRegistryError, load_registry, register_model, resolve, verify_artifacts
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def calibration_for(role: str, name: Optional[str] = None, features: Optional[Sequence[str]] = None) -> dict:
+    """
+    Calibration stored with a model of `role`: for archetype models the
+    risk-quadrant cut points and, if calibrate_models.py has fitted one for
+    `name` on the same features, the probability calibration and the
+    performance thresholds derived from it.
+    """
+    if role != 'archetype':
+        return {}
+    fitted = read_calibration(name, features) if name else None
+    calibration = {'risk_thresholds': risk_thresholds(fitted)}
+    if fitted:
+        calibration['probability'] = fitted['probability']
+    return calibration
+
+
+def export_registered(name: str, registry_path: Path = REGISTRY_PATH) -> Path:
+    """Export the pickled model `name` as models/<name>.xgbm and register it as the entry's artifact."""
+    spec = resolve(name, path=registry_path)
+    verify_artifacts(spec)
+    model = joblib.load(spec.path)
+    encoder = joblib.load(spec.encoder_path) if spec.encoder_path else None
+
+    features = None
+    if not hasattr(model, 'feature_names_in_') and spec.features_path:
+        with open(spec.features_path) as f:
+            data = json.load(f)
+        features = data['features'] if isinstance(data, dict) else data
+
+    model_features = list(model.feature_names_in_) if hasattr(model, 'feature_names_in_') else features
+    entry = load_registry(registry_path)['models'][name]
+    metadata = {k: entry[k] for k in ('version', 'algorithm', 'training_date', 'description') if k in entry}
+    artifact_path = export_artifact(
+        model, Path(spec.path).with_suffix(ARTIFACT_SUFFIX), name=name, encoder=encoder, features=features,
+        calibration=calibration_for(spec.role, name, model_features), metadata=metadata,
+    )
+    register_model(name, spec.path, role=spec.role, artifact_path=artifact_path, registry_path=registry_path)
+    return artifact_path
+
+
+def benchmark(name: str, registry_path: Path = REGISTRY_PATH, repeat: int = 5) -> dict:
+    """Best-of-`repeat` load time of the pickles vs the artifact (in one process, so imports are warm)."""
+    spec = resolve(name, path=registry_path)
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    joblib_s = best(lambda: (joblib.load(spec.path), spec.encoder_path and joblib.load(spec.encoder_path)))
+    artifact_s = best(lambda: load_artifact(spec.artifact_path))
+    return {'model': name, 'joblib_ms': joblib_s * 1000, 'artifact_ms': artifact_s * 1000,
+            'speedup': joblib_s / artifact_s if artifact_s else float('nan')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export registered models as portable artifacts")
+    parser.add_argument('--models', nargs='+', default=None, help='Registry model names (default: all)')
+    parser.add_argument('--benchmark', action='store_true', help='Compare joblib and artifact load times')
+    args = parser.parse_args()
+
+    names = args.models or list(load_registry()['models'])
+    rows = []
+    for name in names:
+        try:
+            path = export_registered(name)
+        except (ModelRegistryError, OSError, ValueError) as e:
+            logger.error(f"❌ {name}: {e}")
+            continue
+        if args.benchmark:
+            rows.append(benchmark(name))
+        logger.info(f"✅ {name} -> {path}")
+
+    for row in rows:
+        print(f"{row['model']:<35} joblib {row['joblib_ms']:8.1f} ms   artifact {row['artifact_ms']:8.1f} ms   "
+              f"{row['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from src.nba_data.api.nba_stats_client import NBAStatsClient
-from src.nba_data.db.schema import init_database
+from src.nba_data.db.schema import init_database, get_connection_manager, build_upsert_sql
 
 # Configure logging
 logging.basicConfig(
@@ -42,14 +42,12 @@ SEASONS = [
     "2020-21", "2021-22", "2022-23", "2023-24", "2024-25"
 ]
 
-# Thread-local storage for database connections and clients
+# Thread-local storage for API clients
 thread_local = threading.local()
 
-def get_db_connection():
-    """Get a thread-local database connection."""
-    if not hasattr(thread_local, "conn"):
-        thread_local.conn = sqlite3.connect(DB_PATH)
-    return thread_local.conn
+def get_db_manager():
+    """Get the shared connection manager (per-thread readers, one serialized writer)."""
+    return get_connection_manager(DB_PATH)
 
 def get_client():
     """Get a thread-local API client."""
@@ -111,27 +109,33 @@ def process_game_logs(logs: List[Dict[str, Any]], season: str, season_type: str)
             
     return processed_logs
 
+GAME_LOG_COLUMNS = [
+    "player_id", "game_id", "season", "season_type", "game_date", "team_id", "matchup", "outcome",
+    "minutes_played", "points", "field_goals_made", "field_goals_attempted", "field_goal_percentage",
+    "three_pointers_made", "three_pointers_attempted", "three_point_percentage",
+    "free_throws_made", "free_throws_attempted", "free_throw_percentage",
+    "offensive_rebounds", "defensive_rebounds", "total_rebounds",
+    "assists", "steals", "blocks", "turnovers", "personal_fouls", "plus_minus",
+]
+
+# Re-fetching a season updates rows in place (and only when something changed)
+# instead of INSERT OR REPLACE's delete + reinsert of every row.
+GAME_LOG_UPSERT_SQL = build_upsert_sql(
+    "player_game_logs", GAME_LOG_COLUMNS, ["player_id", "game_id"], touch_updated_at=True
+)
+
 def save_game_logs(conn: sqlite3.Connection, logs: List[Tuple]):
     """Save processed game logs to the database."""
     cursor = conn.cursor()
     
-    cursor.executemany("""
-        INSERT OR REPLACE INTO player_game_logs (
-            player_id, game_id, season, season_type, game_date, team_id, matchup, outcome,
-            minutes_played, points, field_goals_made, field_goals_attempted, field_goal_percentage,
-            three_pointers_made, three_pointers_attempted, three_point_percentage,
-            free_throws_made, free_throws_attempted, free_throw_percentage,
-            offensive_rebounds, defensive_rebounds, total_rebounds,
-            assists, steals, blocks, turnovers, personal_fouls, plus_minus
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, logs)
+    cursor.executemany(GAME_LOG_UPSERT_SQL, logs)
     
     conn.commit()
 
 def process_player_logs(player_id: int, season: str) -> int:
     """Process game logs for a single player (Worker function)."""
     client = get_client()
-    conn = get_db_connection()
+    db = get_db_manager()
     processed_count = 0
     
     try:
@@ -152,7 +156,8 @@ def process_player_logs(player_id: int, season: str) -> int:
             
             if logs:
                 processed = process_game_logs(logs, season, "Regular Season")
-                save_game_logs(conn, processed)
+                with db.writer() as conn:
+                    save_game_logs(conn, processed)
                 processed_count += len(processed)
         
         # Fetch Playoff logs
@@ -170,7 +175,8 @@ def process_player_logs(player_id: int, season: str) -> int:
             
             if logs:
                 processed = process_game_logs(logs, season, "Playoffs")
-                save_game_logs(conn, processed)
+                with db.writer() as conn:
+                    save_game_logs(conn, processed)
                 processed_count += len(processed)
                 
     except Exception as e:
@@ -188,8 +194,9 @@ def main():
     # Initialize database schema if needed
     # init_database() # Assuming schema is already active or controlled elsewhere
     
-    # Main connection for getting player list
-    main_conn = sqlite3.connect(DB_PATH)
+    # Read connection for getting player list
+    db = get_db_manager()
+    main_conn = db.reader()
     
     # Determine seasons to process
     if args.season:
@@ -228,7 +235,7 @@ def main():
                         pbar.update(1)
                 
     print(f"\n✅ Successfully populated {total_processed} game logs across {len(seasons_to_process)} seasons.")
-    main_conn.close()
+    db.close_all()
 
 if __name__ == "__main__":
     main()
@@ -19,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from nba_data.api.possession_fetcher import create_possession_fetcher
 from nba_data.db.schema import NBADatabaseSchema
+from nba_data.db.possession_store import PossessionWriter
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -238,140 +239,14 @@ class PlayByPlayDataPopulator:
         Returns:
             Counts of stored records
         """
-        cursor = self.schema.conn.cursor()
-
+        conn = self.schema.conn
         try:
-            possessions_count = 0
-            events_count = 0
-            lineups_count = 0
-            matchups_count = 0
-
-            for possession in possessions:
-                # Insert possession
-                possession_data = (
-                    possession.possession_id,
-                    possession.game_id,
-                    possession.period,
-                    possession.clock_time_start,
-                    possession.clock_time_end,
-                    possession.home_team_id,
-                    possession.away_team_id,
-                    possession.offensive_team_id,
-                    possession.defensive_team_id,
-                    possession.possession_start,
-                    possession.possession_end,
-                    possession.duration_seconds,
-                    possession.points_scored,
-                    possession.expected_points,
-                    possession.possession_type,
-                    possession.start_reason,
-                    possession.end_reason
-                )
-
-                cursor.execute("""
-                    INSERT OR REPLACE INTO possessions
-                    (possession_id, game_id, period, clock_time_start, clock_time_end,
-                     home_team_id, away_team_id, offensive_team_id, defensive_team_id,
-                     possession_start, possession_end, duration_seconds, points_scored,
-                     expected_points, possession_type, start_reason, end_reason)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, possession_data)
-
-                possessions_count += 1
-
-                # Insert possession events
-                for event in possession.events:
-                    event_data = (
-                        event.event_id,
-                        event.possession_id,
-                        event.event_number,
-                        event.clock_time,
-                        event.elapsed_seconds,
-                        event.player_id,
-                        event.team_id,
-                        event.opponent_team_id,
-                        event.event_type,
-                        event.event_subtype,
-                        event.shot_type,
-                        event.shot_distance,
-                        event.shot_result,
-                        event.points_scored,
-                        event.assist_player_id,
-                        event.block_player_id,
-                        event.steal_player_id,
-                        event.turnover_type,
-                        event.foul_type,
-                        event.rebound_type,
-                        event.location_x,
-                        event.location_y,
-                        event.defender_player_id,
-                        event.touches_before_action,
-                        event.dribbles_before_action
-                    )
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO possession_events
-                        (event_id, possession_id, event_number, clock_time, elapsed_seconds,
-                         player_id, team_id, opponent_team_id, event_type, event_subtype,
-                         shot_type, shot_distance, shot_result, points_scored, assist_player_id,
-                         block_player_id, steal_player_id, turnover_type, foul_type, rebound_type,
-                         location_x, location_y, defender_player_id, touches_before_action,
-                         dribbles_before_action)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, event_data)
-
-                    events_count += 1
-
-                # Insert lineups (if available)
-                for lineup in possession.lineups or []:
-                    lineup_data = (
-                        possession.possession_id,
-                        lineup.get("player_id"),
-                        lineup.get("team_id"),
-                        lineup.get("position")
-                    )
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO possession_lineups
-                        (possession_id, player_id, team_id, position)
-                        VALUES (?, ?, ?, ?)
-                    """, lineup_data)
-
-                    lineups_count += 1
-
-                # Insert matchups (if available)
-                for matchup in possession.matchups or []:
-                    matchup_data = (
-                        possession.possession_id,
-                        matchup.get("offensive_player_id"),
-                        matchup.get("defensive_player_id"),
-                        matchup.get("matchup_start_time"),
-                        matchup.get("matchup_end_time"),
-                        matchup.get("duration_seconds"),
-                        matchup.get("switches_during_matchup")
-                    )
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO possession_matchups
-                        (possession_id, offensive_player_id, defensive_player_id,
-                         matchup_start_time, matchup_end_time, duration_seconds,
-                         switches_during_matchup)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, matchup_data)
-
-                    matchups_count += 1
-
-            self.schema.conn.commit()
-
-            return {
-                "possessions": possessions_count,
-                "events": events_count,
-                "lineups": lineups_count,
-                "matchups": matchups_count
-            }
-
-        finally:
-            cursor.close()
+            counts = PossessionWriter(conn).write(possessions)
+            conn.commit()
+            return counts
+        except Exception:
+            conn.rollback()
+            raise
 
 
 def main():
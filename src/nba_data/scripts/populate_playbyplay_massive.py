@@ -24,11 +24,14 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from nba_data.api.possession_fetcher import create_possession_fetcher
 from nba_data.api.game_discovery import discover_nba_games
 from nba_data.db.schema import NBADatabaseSchema
+from nba_data.db.possession_store import PossessionWriter
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+POSSESSION_TABLES = ["possessions", "possession_events", "possession_lineups", "possession_matchups"]
+
 
 @dataclass
 class ProcessingStats:
@@ -56,6 +59,7 @@ class ProcessingConfig:
     progress_save_interval: int = 10  # Save progress every N games
     checkpoint_file: str = "data/cache/processing_checkpoint.json"
     historical_mode: bool = False  # Use existing database games instead of API discovery
+    bulk_load: bool = False  # Defer FK checks and index maintenance until the run finishes
 
 
 class MassivePlayByPlayProcessor:
@@ -75,8 +79,8 @@ class MassivePlayByPlayProcessor:
         self.stats = ProcessingStats()
         self.stats_lock = threading.Lock()
 
-        # Thread-safe database connections (one per thread)
-        self.db_connections = {}
+        # Shared connections: per-thread readers plus one serialized writer
+        self.db = self.schema.connections
 
         # Load checkpoint if exists
         self.checkpoint_data = self._load_checkpoint()
@@ -118,7 +122,11 @@ class MassivePlayByPlayProcessor:
             logger.info(f"📋 Processing {len(game_ids)} games with {self.config.max_workers} workers")
 
             # Process games in parallel batches
-            self._process_games_parallel(game_ids)
+            if self.config.bulk_load:
+                with self.db.bulk_load(POSSESSION_TABLES):
+                    self._process_games_parallel(game_ids)
+            else:
+                self._process_games_parallel(game_ids)
 
             # Final statistics
             self.stats.end_time = datetime.now()
@@ -162,8 +170,7 @@ class MassivePlayByPlayProcessor:
         """Get existing games from database for historical processing."""
         logger.info(f"📚 Getting existing {season_type} games for {season} from database...")
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.db.reader().cursor()
 
         try:
             # Convert season_type to match database format (e.g., 'regular' -> 'Regular Season')
@@ -195,7 +202,7 @@ class MassivePlayByPlayProcessor:
             logger.error(f"Error querying database games: {e}")
             return []
         finally:
-            conn.close()
+            cursor.close()
 
     def _filter_processed_games(self, game_ids: List[str]) -> List[str]:
         """Filter out games that have already been processed."""
@@ -249,16 +256,8 @@ class MassivePlayByPlayProcessor:
     def _process_single_game_thread_safe(self, game_id: str) -> Dict[str, Any]:
         """
         Process a single game in a thread-safe manner.
-        Each thread gets its own database connection.
+        Fetching runs concurrently; writes go through the single writer connection.
         """
-        thread_id = threading.current_thread().ident
-
-        # Get thread-specific database connection
-        if thread_id not in self.db_connections:
-            self.db_connections[thread_id] = sqlite3.connect(self.db_path)
-
-        conn = self.db_connections[thread_id]
-
         try:
             # Rate limiting
             time.sleep(self.config.rate_limit_delay * random.uniform(0.8, 1.2))
@@ -274,7 +273,8 @@ class MassivePlayByPlayProcessor:
                 }
 
             # Store in database
-            counts = self._store_possessions_thread_safe(conn, possessions)
+            with self.db.writer() as conn:
+                counts = self._store_possessions_thread_safe(conn, possessions)
 
             return {
                 'game_id': game_id,
@@ -310,141 +310,8 @@ class MassivePlayByPlayProcessor:
         return None
 
     def _store_possessions_thread_safe(self, conn: sqlite3.Connection, possessions: List[Any]) -> Dict[str, int]:
-        """Store possession data using thread-specific connection."""
-        cursor = conn.cursor()
-
-        try:
-            possessions_count = 0
-            events_count = 0
-            lineups_count = 0
-            matchups_count = 0
-
-            for possession in possessions:
-                # Insert possession
-                possession_data = (
-                    possession.possession_id,
-                    possession.game_id,
-                    possession.period,
-                    possession.clock_time_start,
-                    possession.clock_time_end,
-                    possession.home_team_id,
-                    possession.away_team_id,
-                    possession.offensive_team_id,
-                    possession.defensive_team_id,
-                    possession.possession_start,
-                    possession.possession_end,
-                    possession.duration_seconds,
-                    possession.points_scored,
-                    possession.expected_points,
-                    possession.possession_type,
-                    possession.start_reason,
-                    possession.end_reason
-                )
-
-                cursor.execute("""
-                    INSERT OR REPLACE INTO possessions
-                    (possession_id, game_id, period, clock_time_start, clock_time_end,
-                     home_team_id, away_team_id, offensive_team_id, defensive_team_id,
-                     possession_start, possession_end, duration_seconds, points_scored,
-                     expected_points, possession_type, start_reason, end_reason)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, possession_data)
-
-                possessions_count += 1
-
-                # Insert possession events
-                for event in possession.events:
-                    event_data = (
-                        event.event_id,
-                        event.possession_id,
-                        event.event_number,
-                        event.clock_time,
-                        event.elapsed_seconds,
-                        event.player_id,
-                        event.team_id,
-                        event.opponent_team_id,
-                        event.event_type,
-                        event.event_subtype,
-                        event.shot_type,
-                        event.shot_distance,
-                        event.shot_result,
-                        event.points_scored,
-                        event.assist_player_id,
-                        event.block_player_id,
-                        event.steal_player_id,
-                        event.turnover_type,
-                        event.foul_type,
-                        event.rebound_type,
-                        event.location_x,
-                        event.location_y,
-                        event.defender_player_id,
-                        event.touches_before_action,
-                        event.dribbles_before_action
-                    )
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO possession_events
-                        (event_id, possession_id, event_number, clock_time, elapsed_seconds,
-                         player_id, team_id, opponent_team_id, event_type, event_subtype,
-                         shot_type, shot_distance, shot_result, points_scored, assist_player_id,
-                         block_player_id, steal_player_id, turnover_type, foul_type, rebound_type,
-                         location_x, location_y, defender_player_id, touches_before_action,
-                         dribbles_before_action)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, event_data)
-
-                    events_count += 1
-
-                # Insert lineups (if available)
-                for lineup in possession.lineups or []:
-                    lineup_data = (
-                        possession.possession_id,
-                        lineup.get("player_id"),
-                        lineup.get("team_id"),
-                        lineup.get("position")
-                    )
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO possession_lineups
-                        (possession_id, player_id, team_id, position)
-                        VALUES (?, ?, ?, ?)
-                    """, lineup_data)
-
-                    lineups_count += 1
-
-                # Insert matchups (if available)
-                for matchup in possession.matchups or []:
-                    matchup_data = (
-                        possession.possession_id,
-                        matchup.get("offensive_player_id"),
-                        matchup.get("defensive_player_id"),
-                        matchup.get("matchup_start_time"),
-                        matchup.get("matchup_end_time"),
-                        matchup.get("duration_seconds"),
-                        matchup.get("switches_during_matchup")
-                    )
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO possession_matchups
-                        (possession_id, offensive_player_id, defensive_player_id,
-                         matchup_start_time, matchup_end_time, duration_seconds,
-                         switches_during_matchup)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, matchup_data)
-
-                    matchups_count += 1
-
-            conn.commit()
-
-            return {
-                "possessions": possessions_count,
-                "events": events_count,
-                "lineups": lineups_count,
-                "matchups": matchups_count
-            }
-
-        finally:
-            cursor.close()
+        """Upsert possession data using the caller's (writer) connection."""
+        return PossessionWriter(conn).write(possessions)
 
     def _update_stats_from_result(self, result: Dict[str, Any]) -> None:
         """Update statistics from a processing result."""
@@ -470,7 +337,7 @@ class MassivePlayByPlayProcessor:
 
     def _game_has_possession_data(self, game_id: str) -> bool:
         """Check if a game already has possession data."""
-        cursor = self.schema.conn.cursor()
+        cursor = self.db.reader().cursor()
         try:
             cursor.execute("SELECT COUNT(*) FROM possessions WHERE game_id = ?", (game_id,))
             count = cursor.fetchone()[0]
@@ -538,6 +405,7 @@ def main():
     parser.add_argument("--batch-size", type=int, default=25, help="Games per batch")
     parser.add_argument("--db-path", default="data/nba_stats.db", help="Database path")
     parser.add_argument("--historical", action="store_true", help="Use existing database games instead of API discovery")
+    parser.add_argument("--bulk", action="store_true", help="Bulk-load mode: rebuild indexes and check foreign keys once at the end")
 
     args = parser.parse_args()
 
@@ -545,7 +413,8 @@ def main():
     config = ProcessingConfig(
         max_workers=args.workers,
         batch_size=args.batch_size,
-        historical_mode=args.historical
+        historical_mode=args.historical,
+        bulk_load=args.bulk
     )
 
     # Run massive processing
@@ -17,11 +17,33 @@ from tqdm import tqdm
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from nba_data.api.synergy_playtypes_client import SynergyPlaytypesClient
+from nba_data.db.schema import build_upsert_sql
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PLAYTYPE_STAT_COLUMNS = [
+    "team_id", "play_type", "type_grouping",
+    "percentile", "games_played", "possession_percentage", "points_per_possession",
+    "field_goal_percentage", "free_throw_possession_percentage",
+    "turnover_possession_percentage", "shot_foul_possession_percentage",
+    "plus_one_possession_percentage", "score_possession_percentage",
+    "effective_field_goal_percentage", "possessions", "points",
+    "field_goals_made", "field_goals_attempted", "field_goals_missed",
+]
+
+# Re-fetching a season updates rows in place (and only when something changed)
+# instead of INSERT OR REPLACE's delete + reinsert of every row.
+PLAYTYPE_UPSERT_SQL = {
+    "player_playtype_stats": build_upsert_sql(
+        "player_playtype_stats", ["player_id", "season", "season_type"] + PLAYTYPE_STAT_COLUMNS,
+        ["player_id", "season", "season_type", "team_id", "play_type"], touch_updated_at=True),
+    "player_playoff_playtype_stats": build_upsert_sql(
+        "player_playoff_playtype_stats", ["player_id", "season"] + PLAYTYPE_STAT_COLUMNS,
+        ["player_id", "season", "team_id", "play_type"], touch_updated_at=True),
+}
+
 
 class PlaytypeDataPopulator:
     """Populates player playtype statistics into the database."""
@@ -50,8 +72,8 @@ class PlaytypeDataPopulator:
         """
         results = {
             "play_types_processed": 0,
-            "records_inserted": 0,
-            "records_updated": 0,
+            "records_written": 0,
+            "records_unchanged": 0,
             "errors": [],
             "season_year": season_year,
             "season_type": season_type
@@ -80,8 +102,8 @@ class PlaytypeDataPopulator:
 
                 # Store records in database
                 playtype_results = self._store_playtype_records(records, season_type)
-                results["records_inserted"] += playtype_results["inserted"]
-                results["records_updated"] += playtype_results["updated"]
+                results["records_written"] += playtype_results["written"]
+                results["records_unchanged"] += playtype_results["unchanged"]
 
                 if playtype_results["errors"]:
                     results["errors"].extend(playtype_results["errors"])
@@ -94,12 +116,12 @@ class PlaytypeDataPopulator:
                 logger.error(error_msg)
                 results["errors"].append(error_msg)
 
-        logger.info(f"Playtype data population complete: {results['records_inserted']} inserted, {results['records_updated']} updated")
+        logger.info(f"Playtype data population complete: {results['records_written']} written, {results['records_unchanged']} unchanged")
         return results
 
     def _store_playtype_records(self, records: List[Dict[str, Any]], season_type: str) -> Dict[str, Any]:
         """Store playtype records in the database."""
-        results = {"inserted": 0, "updated": 0, "errors": []}
+        results = {"written": 0, "unchanged": 0, "errors": []}
 
         table_name = "player_playtype_stats" if season_type == "Regular Season" else "player_playoff_playtype_stats"
 
@@ -112,48 +134,17 @@ class PlaytypeDataPopulator:
                     season = self.client.extract_season_from_season_id(record.get('season_id', ''))
 
                     # Prepare data for insertion
-                    data = (
-                        record['player_id'],
-                        season,
-                        record['team_id'],
-                        record['play_type'],
-                        record['type_grouping'],
-                        record.get('percentile'),
-                        record.get('games_played'),
-                        record.get('possession_percentage'),
-                        record.get('points_per_possession'),
-                        record.get('field_goal_percentage'),
-                        record.get('free_throw_possession_percentage'),
-                        record.get('turnover_possession_percentage'),
-                        record.get('shot_foul_possession_percentage'),
-                        record.get('plus_one_possession_percentage'),
-                        record.get('score_possession_percentage'),
-                        record.get('effective_field_goal_percentage'),
-                        record.get('possessions'),
-                        record.get('points'),
-                        record.get('field_goals_made'),
-                        record.get('field_goals_attempted'),
-                        record.get('field_goals_missed')
-                    )
-
-                    # Insert or replace record
-                    cursor.execute(f'''
-                        INSERT OR REPLACE INTO {table_name} (
-                            player_id, season, team_id, play_type, type_grouping,
-                            percentile, games_played, possession_percentage, points_per_possession,
-                            field_goal_percentage, free_throw_possession_percentage,
-                            turnover_possession_percentage, shot_foul_possession_percentage,
-                            plus_one_possession_percentage, score_possession_percentage,
-                            effective_field_goal_percentage, possessions, points,
-                            field_goals_made, field_goals_attempted, field_goals_missed
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', data)
-
-                    # Check if this was an insert or update
+                    row = (record['player_id'], season)
+                    if table_name == "player_playtype_stats":
+                        row += (season_type,)
+                    row += tuple(record.get(c) for c in PLAYTYPE_STAT_COLUMNS)
+
+                    # Upsert: updated in place, and only when a value changed
+                    cursor.execute(PLAYTYPE_UPSERT_SQL[table_name], row)
                     if cursor.rowcount > 0:
-                        results["inserted"] += 1
+                        results["written"] += 1
                     else:
-                        results["updated"] += 1
+                        results["unchanged"] += 1
 
                 except Exception as e:
                     error_msg = f"Failed to store record for player {record.get('player_id', 'unknown')}: {e}"
@@ -247,8 +238,8 @@ def main():
 
     print("\n📊 Population Results:")
     print(f"✅ Play Types Processed: {results['play_types_processed']}")
-    print(f"✅ Records Inserted: {results['records_inserted']}")
-    print(f"✅ Records Updated: {results['records_updated']}")
+    print(f"✅ Records Written: {results['records_written']}")
+    print(f"✅ Records Unchanged: {results['records_unchanged']}")
     print(f"❌ Errors: {len(results['errors'])}")
 
     if results['errors']:
@@ -0,0 +1,79 @@
+"""
+Project All Players to Target Usage Levels
+
+Fits the empirical usage curves (feature medians per usage bucket) from the
+feature dataset, saves them as a small artifact, and projects every
+player-season to each target usage in one vectorized pass. The output feeds
+the usage simulator and the Telescope model's projected inputs.
+
+Usage:
+    python src/nba_data/scripts/project_usage.py --fit-only
+    python src/nba_data/scripts/project_usage.py --targets 0.20 0.25 0.30
+    python src/nba_data/scripts/project_usage.py --input results/predictive_dataset_with_friction.csv \
+        --usage-col usg_pct --features creation_volume_ratio --ts-col ts_pct \
+        --sq-delta-col shot_quality_generation_delta --targets 0.25 0.30
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.nba_data.utils.feature_dtypes import read_feature_csv
+from src.nba_data.utils.projection_utils import load_friction_coefficients
+from src.nba_data.utils.usage_projection import (
+    DEFAULT_CURVES_PATH, METHODS, MODES, PROJECTED_FEATURES, UsageCurves, project_to_usages
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit usage curves and project players to target usages")
+    parser.add_argument('--input', default='results/predictive_dataset.csv', help='Feature dataset')
+    parser.add_argument('--curves', default=str(DEFAULT_CURVES_PATH), help='Usage curves artifact (JSON)')
+    parser.add_argument('--refit', action='store_true', help='Refit the curves even if the artifact exists')
+    parser.add_argument('--fit-only', action='store_true', help='Only fit and save the curves')
+    parser.add_argument('--features', nargs='+', default=PROJECTED_FEATURES, help='Features to fit')
+    parser.add_argument('--usage-col', default='USG_PCT', help='Usage column')
+    parser.add_argument('--ts-col', default='TS_PCT', help='TS%% column projected with friction (if present)')
+    parser.add_argument('--sq-delta-col', default='SHOT_QUALITY_GENERATION_DELTA', help='SQ delta column')
+    parser.add_argument('--targets', nargs='+', type=float, default=[0.20, 0.25, 0.30, 0.35],
+                        help='Target usages as fractions')
+    parser.add_argument('--friction', help='Friction bootstrap artifact (JSON) to use instead of the '
+                                           'built-in coefficients')
+    parser.add_argument('--mode', choices=MODES, default='shift')
+    parser.add_argument('--method', choices=METHODS, default='interpolate')
+    parser.add_argument('--output', default='results/usage_projections.csv', help='Projected dataset')
+    args = parser.parse_args()
+
+    df = read_feature_csv(args.input)
+    logger.info(f"Loaded {len(df)} player-seasons from {args.input}")
+
+    curves_path = Path(args.curves)
+    if curves_path.exists() and not args.refit and not args.fit_only:
+        curves = UsageCurves.load(curves_path)
+        logger.info(f"Loaded usage curves from {curves_path}")
+    else:
+        curves = UsageCurves.fit(df, args.features, usage_col=args.usage_col)
+        curves.save(curves_path)
+        logger.info(f"Saved usage curves to {curves_path}")
+    print(curves.table().to_string(float_format=lambda x: f"{x:.3f}"))
+
+    if args.fit_only:
+        return
+
+    coefficients, thresholds = load_friction_coefficients(args.friction) if args.friction else (None, None)
+    projected = project_to_usages(df, args.targets, curves, mode=args.mode, method=args.method,
+                                  ts_col=args.ts_col, sq_delta_col=args.sq_delta_col,
+                                  friction_coefficients=coefficients, sq_delta_thresholds=thresholds)
+    projected.to_csv(args.output, index=False)
+    logger.info(f"✅ Projected {len(df)} players x {len(args.targets)} usages -> {args.output} ({len(projected)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Incremental Model Refresh
+
+Refreshes a registered model when a new season of labeled data lands by
+continuing to boost from its current booster (src/model/refresh.py) instead
+of retraining from scratch:
+1. Parity check: on the walk-forward season folds (cached in
+   results/.cache/hpo/, shared with tune_hyperparameters.py), every fold's
+   previous-season model is refreshed and also fully retrained; the time
+   saved and the metric deltas are written to
+   results/refresh_parity_<model>.csv and printed.
+2. Refresh: the registered model is loaded, --rounds boosting rounds are
+   fitted on the training table (src/model/training_tables.py) through
+   --through, and the result is saved next to it as
+   models/<name>-<version>.pkl with a bumped patch version. The previous
+   pickle is kept (recorded as the entry's previous_path).
+3. Promotion: only a refresh that passed the parity check replaces the
+   registry entry (keeping its status, so a production model stays
+   production) and is exported as an artifact. With --skip-parity the
+   refresh is registered as its own staging entry, <name>-<version>, and
+   the current model is left in place.
+
+If the parity check shows the warm start losing more than
+--max-accuracy-drop accuracy (classifiers) or --max-rmse-increase RMSE
+(regressors) against a full retrain, or the new data has a label the model
+has never seen, the model is fully retrained with its trainer instead.
+
+Supported models: resilience_xgb_rfe_<n>[_merchant], telescope_model,
+crucible_impact_model.
+
+Usage:
+    python src/nba_data/scripts/refresh_models.py --model resilience_xgb_rfe_10
+    python src/nba_data/scripts/refresh_models.py --model telescope_model --rounds 40 --jobs 4
+    python src/nba_data/scripts/refresh_models.py --model crucible_impact_model --parity-only
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.refresh import continue_boosting, summarize_parity, warm_start_parity
+from src.model.registry import register_model, resolve, verify_artifacts
+from src.nba_data.scripts.tune_hyperparameters import (
+    CRUCIBLE_DATASET_PATH, REGRESSION_INPUTS, RFE_MODEL_PATTERN, rfe_folds, regression_folds
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def model_factory(model_name: str):
+    """Picklable model_factory(n_jobs=...) building `model_name` the way its trainer does."""
+    if RFE_MODEL_PATTERN.match(model_name):
+        from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+        return partial(RFEModelTrainer().build_model, model_name=model_name)
+    if model_name == 'telescope_model':
+        from src.nba_data.scripts.train_telescope_model import build_model
+        return build_model
+    from src.nba_data.scripts.train_crucible_model import CrucibleModelTrainer
+    return CrucibleModelTrainer().build_model
+
+
+def refresh_data(model_name: str, model, encoder, through: int = None):
+    """
+    (X, y, sample weights, last season year) of the updated training set,
+    in the model's feature order and label encoding.
+    """
+    features = list(model.feature_names_in_)
+    match = RFE_MODEL_PATTERN.match(model_name)
+    if match:
+        from src.nba_data.scripts.sweep_rfe_features import load_training_frame
+        from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+        trainer = RFEModelTrainer()
+        df = load_training_frame(trainer, match.group(2) == 'merchant').reset_index(drop=True)
+        season_year = trainer.season_years(df)
+        df = df[season_year <= (through or season_year.max())].reset_index(drop=True)
+        X, _ = trainer.prepare_features(df, features)
+        y = encoder.transform(df['ARCHETYPE'].astype(str))  # ValueError on an unseen archetype
+        weights = trainer.calculate_crucible_weights(df, df.index).to_numpy()
+        return X[features], y, weights, int(trainer.season_years(df).max())
+
+    if model_name == 'telescope_model':
+        from src.nba_data.scripts import train_telescope_model as telescope
+        df = telescope.load_and_merge_data()
+        df = df[df['age'] <= telescope.GROWTH_COHORT_AGE_LIMIT]
+        season_year = df['SEASON_YEAR'] - 1
+        target = 'FUTURE_PEAK_HELIO'
+    else:
+        from src.nba_data.scripts.train_crucible_model import CrucibleModelTrainer
+        trainer = CrucibleModelTrainer()
+        df = trainer.load_training_data(CRUCIBLE_DATASET_PATH)
+        season_year = pd.to_numeric(df['SEASON'].astype(str).str[:4], errors='coerce')
+        target = trainer.target
+    keep = (season_year <= (through or season_year.max())) & df[target].notna()
+    df = df[keep]
+    X = df[features].fillna(0) if model_name == 'crucible_impact_model' else df[features]
+    return X, df[target].to_numpy(), None, int(season_year[keep].max())
+
+
+def full_retrain(model_name: str):
+    """Retrain `model_name` from scratch with its trainer (which registers and exports it)."""
+    match = RFE_MODEL_PATTERN.match(model_name)
+    if match:
+        if match.group(2):
+            raise SystemExit(f"{model_name}: retrain it with its variant trainer")
+        from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+        RFEModelTrainer().train(n_features=int(match.group(1)))
+    elif model_name == 'telescope_model':
+        from src.nba_data.scripts.train_telescope_model import train_telescope_model
+        train_telescope_model()
+    else:
+        from src.nba_data.scripts.train_crucible_model import CrucibleModelTrainer
+        CrucibleModelTrainer().train(str(CRUCIBLE_DATASET_PATH))
+
+
+def bump_version(version: str) -> str:
+    """'1.2.3' -> '1.2.4' (a refresh is a patch release of the same model)."""
+    parts = str(version).split('.')
+    if parts[-1].isdigit():
+        parts[-1] = str(int(parts[-1]) + 1)
+    else:
+        parts.append('1')
+    return '.'.join(parts)
+
+
+def run_parity(args) -> dict:
+    """Run the warm-start vs full-retrain parity check and write its fold table."""
+    if RFE_MODEL_PATTERN.match(args.model):
+        folds_path, features = rfe_folds(args.model, args.min_train_seasons, args.rebuild)
+    else:
+        folds_path, features = regression_folds(args.model, args.min_train_seasons, args.rebuild)
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // args.threads)
+    results = warm_start_parity(folds_path, features, model_factory(args.model), extra_rounds=args.rounds,
+                                jobs=jobs, threads=args.threads)
+    output_path = Path(f"results/refresh_parity_{args.model}.csv")
+    results.to_csv(output_path, index=False)
+    summary = summarize_parity(results)
+
+    print(f"\nWarm start (+{args.rounds} rounds) vs full retrain over {summary['folds']} folds:")
+    print(f"  fit time: {summary['warm_seconds']:.2f}s vs {summary['full_seconds']:.2f}s "
+          f"(saved {summary['time_saved_seconds']:.2f}s, {summary['speedup']}x)")
+    for metric in ('accuracy', 'log_loss', 'rmse'):
+        if f'{metric}_delta' in summary:
+            print(f"  {metric}: {summary[f'warm_{metric}']:.4f} vs {summary[f'full_{metric}']:.4f} "
+                  f"(delta {summary[f'{metric}_delta']:+.4f}; vs stale {summary[f'{metric}_delta_vs_stale']:+.4f})")
+    logger.info(f"Parity folds -> {output_path}")
+    return summary
+
+
+def parity_failure(summary: dict, args) -> str:
+    """Why the warm start should not replace a full retrain, or '' if it may."""
+    if summary.get('accuracy_delta', 0.0) < -args.max_accuracy_drop:
+        return f"accuracy delta {summary['accuracy_delta']:+.4f} exceeds -{args.max_accuracy_drop}"
+    if 'rmse_delta' in summary and summary['rmse_delta'] > args.max_rmse_increase * summary['full_rmse']:
+        return f"RMSE delta {summary['rmse_delta']:+.4f} exceeds {args.max_rmse_increase:.0%} of the full-retrain RMSE"
+    return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm-start refresh of a registered model")
+    parser.add_argument('--model', required=True,
+                        help="resilience_xgb_rfe_<n>[_merchant], telescope_model or crucible_impact_model")
+    parser.add_argument('--rounds', type=int, default=25, help='Boosting rounds to add')
+    parser.add_argument('--through', type=int, default=None,
+                        help='Last season start year to train on (default: the latest labeled season)')
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.01,
+                        help='Largest mean accuracy loss vs a full retrain the refresh may have')
+    parser.add_argument('--max-rmse-increase', type=float, default=0.02,
+                        help='Largest relative RMSE increase vs a full retrain the refresh may have')
+    parser.add_argument('--skip-parity', action='store_true',
+                        help='Refresh without the parity check (registered as staging, not promoted)')
+    parser.add_argument('--parity-only', action='store_true', help='Only run the parity check')
+    parser.add_argument('--min-train-seasons', type=int, default=3, help='Seasons in the first training window')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPUs / threads)')
+    parser.add_argument('--threads', type=int, default=1, help='XGBoost threads per worker')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the cached fold matrices')
+    args = parser.parse_args()
+
+    if not (RFE_MODEL_PATTERN.match(args.model) or args.model in REGRESSION_INPUTS):
+        parser.error(f"Unknown model: {args.model}")
+    if RFE_MODEL_PATTERN.match(args.model):
+        # train_rfe_model logs to logs/train_rfe_model.log on import
+        Path("logs").mkdir(exist_ok=True)
+
+    summary = None
+    if not args.skip_parity:
+        summary = run_parity(args)
+        if args.parity_only:
+            return
+        failure = parity_failure(summary, args)
+        if failure:
+            logger.warning(f"Warm start fails the parity check ({failure}); retraining {args.model} from scratch")
+            full_retrain(args.model)
+            return
+
+    spec = resolve(args.model)
+    verify_artifacts(spec)
+    model = joblib.load(spec.path)
+    encoder = joblib.load(spec.encoder_path) if spec.encoder_path else None
+    try:
+        X, y, weights, through = refresh_data(args.model, model, encoder, args.through)
+    except ValueError as e:
+        logger.warning(f"Cannot warm-start {args.model} ({e}); retraining from scratch")
+        full_retrain(args.model)
+        return
+
+    start = time.perf_counter()
+    refreshed = continue_boosting(model, X, y, sample_weight=weights, extra_rounds=args.rounds)
+    seconds = time.perf_counter() - start
+    logger.info(f"Refreshed {args.model}: +{args.rounds} rounds on {len(X)} rows through {through} in {seconds:.2f}s "
+                f"({refreshed.n_estimators} rounds total)")
+
+    version = bump_version(spec.version)
+    refreshed_path = Path(spec.path).with_name(f"{args.model}-{version}.pkl")
+    joblib.dump(refreshed, refreshed_path)
+    fields = {
+        'version': version,
+        'refreshed_from': spec.version,
+        'previous_path': spec.path,
+        'refresh_rounds': args.rounds,
+        'trained_through': through,
+        'training_date': datetime.now().strftime('%Y-%m-%d'),
+    }
+
+    if summary is None:
+        # Unchecked refreshes never replace the current model
+        name = f"{args.model}-{version}"
+        register_model(name, refreshed_path, role=spec.role, encoder_path=spec.encoder_path,
+                       features_path=spec.features_path, status='staging', **fields)
+        logger.warning(f"Parity check skipped: {refreshed_path} registered as staging model {name}; "
+                       f"{args.model} is unchanged")
+    else:
+        name = args.model
+        fields['refresh_parity'] = {k: v for k, v in summary.items() if isinstance(v, (int, float)) and np.isfinite(v)}
+        register_model(name, refreshed_path, role=spec.role, **fields)
+        from src.nba_data.scripts.export_model_artifacts import export_registered
+        export_registered(name)
+        logger.info(f"Promoted {refreshed_path} as {name} ({spec.status}); previous pickle kept at {spec.path}")
+    print(json.dumps({'model': name, 'path': str(refreshed_path), 'refresh_seconds': round(seconds, 3), **fields},
+                     indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
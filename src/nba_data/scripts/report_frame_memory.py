@@ -0,0 +1,72 @@
+"""
+Feature Frame Memory Report
+
+Loads the feature datasets the app and batch scripts keep in memory and
+reports their size with default dtypes vs. the shared feature dtype schema
+(src/nba_data/utils/feature_dtypes.py).
+
+Usage:
+    python src/nba_data/scripts/report_frame_memory.py
+    python src/nba_data/scripts/report_frame_memory.py --output results/frame_memory_report.csv
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.nba_data.utils.feature_dtypes import memory_report
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FEATURE_FILES = [
+    "results/predictive_dataset.csv",
+    "results/predictive_dataset_with_friction.csv",
+    "results/pressure_features.csv",
+    "results/physicality_features.csv",
+    "results/rim_pressure_features.csv",
+    "results/trajectory_features.csv",
+    "results/gate_features.csv",
+    "results/previous_playoff_features.csv",
+    "results/resilience_archetypes.csv",
+    "results/2d_risk_matrix_all_players.csv",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report memory savings of typed feature frames")
+    parser.add_argument('files', nargs='*', default=FEATURE_FILES, help='CSV files to measure')
+    parser.add_argument('--output', help='Optional CSV path for the report')
+    args = parser.parse_args()
+
+    frames = {}
+    for path in args.files:
+        if Path(path).exists():
+            frames[Path(path).name] = pd.read_csv(path)
+        else:
+            logger.warning(f"Skipping missing {path}")
+
+    if not frames:
+        logger.error("❌ No feature files found")
+        sys.exit(1)
+
+    report = memory_report(frames)
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    total = report.iloc[-1]
+    logger.info(f"✅ {total['default_mb']:.1f} MB -> {total['typed_mb']:.1f} MB per copy "
+                f"({total['saved_pct']:.0f}% saved)")
+
+    if args.output:
+        report.to_csv(args.output, index=False)
+        logger.info(f"Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Season-Rolling Cross-Validation for the RFE Models
+
+Scores RFE feature-set variants with walk-forward CV (train on seasons <= k,
+test on season k+1) instead of the single train <= 2020 / test 2021+ split
+used by train_rfe_model.py. Every fold uses the training pipeline's own
+features (RFEModelTrainer.prepare_features), model (build_model) and
+Crucible sample weights, computed from the fold's training seasons only.
+
+The fold matrices are built once and cached in results/.cache/ (keyed by
+the input files, feature union and fold settings); (fold, variant) fits
+run in parallel worker processes. Outputs:
+- results/season_cv_folds.csv: one row per variant and test season
+- results/season_cv_summary.csv: mean/pooled accuracy with standard error,
+  log loss, fit time, and a paired per-fold comparison to the baseline
+
+Usage:
+    python src/nba_data/scripts/rolling_season_cv.py
+    python src/nba_data/scripts/rolling_season_cv.py --counts 10 15 20 --variants base merchant --baseline rfe_15
+    python src/nba_data/scripts/rolling_season_cv.py --min-train-seasons 4 --jobs 4 --threads 2
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.season_cv import FoldMatrices, build_fold_matrices, evaluate_folds, summarize_folds
+from src.nba_data.scripts.sweep_rfe_features import (
+    VARIANTS, candidate_feature_sets, load_training_frame, matrix_key
+)
+from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FOLDS_CACHE_PATH = Path("results/.cache/season_cv_folds.npz")
+FOLDS_OUTPUT_PATH = Path("results/season_cv_folds.csv")
+SUMMARY_OUTPUT_PATH = Path("results/season_cv_summary.csv")
+
+
+def build_season_folds(trainer: RFEModelTrainer, features, with_merchant: bool, min_train_seasons: int,
+                       key: str) -> FoldMatrices:
+    """Prepare the dataset once and materialize every fold's rows and Crucible weights."""
+    df = load_training_frame(trainer, with_merchant).reset_index(drop=True)
+    X, columns = trainer.prepare_features(df, features)
+    encoder = LabelEncoder()
+    y = encoder.fit_transform(df['ARCHETYPE'])
+    season_year = trainer.season_years(df).to_numpy()
+
+    def crucible_weights(train_rows):
+        return trainer.calculate_crucible_weights(df, df.index[train_rows]).to_numpy(dtype=np.float64)
+
+    return build_fold_matrices(
+        X.to_numpy(dtype=np.float32, na_value=np.nan), y, season_year, columns, encoder.classes_,
+        weight_fn=crucible_weights, min_train_seasons=min_train_seasons, key=key,
+    )
+
+
+def load_or_build_folds(trainer: RFEModelTrainer, features, with_merchant: bool, min_train_seasons: int,
+                        cache_path: Path = FOLDS_CACHE_PATH, rebuild: bool = False) -> Path:
+    """Path of cached fold matrices for `features`, rebuilding them if the inputs changed."""
+    key = hashlib.sha256(json.dumps({
+        'matrix': matrix_key(features, with_merchant),
+        'min_train_seasons': min_train_seasons,
+        'script': Path(__file__).name,
+    }, sort_keys=True).encode()).hexdigest()
+    if not rebuild and FoldMatrices.cached_key(cache_path) == key:
+        logger.info(f"⚡ Reusing fold matrices {cache_path}")
+        return cache_path
+
+    start = time.perf_counter()
+    folds = build_season_folds(trainer, features, with_merchant, min_train_seasons, key)
+    folds.save(cache_path)
+    logger.info(f"Built {folds.n_folds} folds over {folds.X.shape} in {time.perf_counter() - start:.1f}s -> {cache_path}")
+    return cache_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward season CV for RFE feature-set variants")
+    parser.add_argument('--counts', nargs='+', type=int, default=[10, 15, 20], help='RFE feature counts')
+    parser.add_argument('--variants', nargs='+', choices=list(VARIANTS), default=['base'],
+                        help='Feature-set variants')
+    parser.add_argument('--baseline', default=None,
+                        help='Variant the others are compared to (default: rfe_15, or the first)')
+    parser.add_argument('--min-train-seasons', type=int, default=3,
+                        help='Seasons in the first training window')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPUs / threads)')
+    parser.add_argument('--threads', type=int, default=1, help='XGBoost threads per worker')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the cached fold matrices')
+    parser.add_argument('--output', default=str(SUMMARY_OUTPUT_PATH), help='Summary table (CSV)')
+    parser.add_argument('--folds-output', default=str(FOLDS_OUTPUT_PATH), help='Per-fold table (CSV)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    trainer = RFEModelTrainer()
+    rfe_lists = {n: trainer.load_rfe_features(n_features=n) for n in sorted(set(args.counts))}
+    candidates = candidate_feature_sets(rfe_lists, args.variants)
+    variants = {c['name']: c['features'] for c in candidates}
+    union = sorted(set().union(*variants.values()))
+
+    cache_path = load_or_build_folds(trainer, union, 'merchant' in args.variants, args.min_train_seasons,
+                                     rebuild=args.rebuild)
+
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // args.threads)
+    results = evaluate_folds(cache_path, variants, trainer.build_model, jobs=jobs, threads=args.threads)
+    baseline = args.baseline or ('rfe_15' if 'rfe_15' in variants else next(iter(variants)))
+    summary = summarize_folds(results, baseline=baseline)
+
+    results.drop(columns=['missing_features']).to_csv(args.folds_output, index=False)
+    summary.to_csv(args.output, index=False)
+
+    per_fold = results.pivot(index='test_season', columns='variant', values='accuracy')
+    print("\nAccuracy by test season:")
+    print(per_fold.to_string(float_format=lambda x: f"{x:.4f}"))
+    print(f"\nSummary (baseline: {baseline}):")
+    print(summary.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+
+    missing = sorted(set().union(*results['missing_features']))
+    if missing:
+        logger.warning(f"Features not in the dataset (skipped): {missing}")
+    logger.info(f"✅ {len(results)} fold fits in {time.perf_counter() - start:.1f}s "
+                f"-> {args.output}, {args.folds_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+RFE Feature-Count Sweep
+
+Compares RFE feature counts and feature-set variants in one run. Running
+train_rfe_model.py once per count reloads, merges and prepares the dataset
+every time; the sweep prepares the training matrix once (RFEModelTrainer's
+transformations, label encoding, temporal split and Crucible weights over
+the union of every candidate's features), caches it as a NumPy file keyed
+by the input files, and evaluates all candidates concurrently in worker
+processes that each load the matrix once.
+
+Candidates are feature counts x variants:
+- base: the features train_rfe_model uses for that count (RFE list plus
+  the force-included critical features)
+- merchant: base plus the system-merchant features (results/merchant_features.csv)
+- phoenix: base plus the 0-dribble ground truth features
+
+With --rfe-path the RFE lists come from a single elimination run over the
+pooled (non-critical) features instead of rfe_feature_count_comparison.csv:
+the ranking of one RFE down to the smallest count yields the nested subsets
+for every larger count. As in the CSV lists, the critical features count
+towards each list's size: a count of 15 with 7 critical features keeps the
+8 best of the rest.
+
+Usage:
+    python src/nba_data/scripts/sweep_rfe_features.py
+    python src/nba_data/scripts/sweep_rfe_features.py --counts 5 10 15 20 25 --variants base merchant
+    python src/nba_data/scripts/sweep_rfe_features.py --rfe-path --counts 5 10 15 20 --jobs 4 --threads 2
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_selection import RFE
+from sklearn.metrics import accuracy_score, f1_score, log_loss
+from sklearn.preprocessing import LabelEncoder
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.nba_data.utils.hashing import file_digest
+
+# train_rfe_model logs to logs/train_rfe_model.log on import
+Path("logs").mkdir(exist_ok=True)
+from src.nba_data.scripts.train_rfe_model import CRITICAL_FEATURES, RFEModelTrainer
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MATRIX_CACHE_PATH = Path("results/.cache/rfe_sweep_matrix.npz")
+OUTPUT_PATH = Path("results/rfe_sweep_comparison.csv")
+
+VARIANTS = {
+    'base': [],
+    'merchant': ['SYSTEM_MERCHANT_INDEX', 'ABDICATION_COEFFICIENT', 'EMPTY_CALORIE_RATIO'],
+    'phoenix': ['EFG_PCT_0_DRIBBLE', 'FGA_0_DRIBBLE'],
+}
+MERCHANT_FEATURES_PATH = Path("results/merchant_features.csv")
+
+# Files the prepared matrix depends on (besides the requested feature union)
+MATRIX_INPUTS = [
+    Path("results/predictive_dataset_with_friction.csv"),
+    Path("results/predictive_dataset.csv"),
+    Path("results/resilience_archetypes.csv"),
+    MERCHANT_FEATURES_PATH,
+    Path(__file__).resolve().parent / "train_rfe_model.py",
+]
+
+
+def load_training_frame(trainer: RFEModelTrainer, with_merchant: bool) -> pd.DataFrame:
+    """The trainer's merged dataset, plus the merchant features if requested and available."""
+    df = trainer.load_and_merge_data()
+    if with_merchant and MERCHANT_FEATURES_PATH.exists():
+        merchant = pd.read_csv(MERCHANT_FEATURES_PATH)
+        columns = [c for c in VARIANTS['merchant'] if c in merchant.columns and c not in df.columns]
+        merchant = merchant[['PLAYER_ID', 'SEASON'] + columns].drop_duplicates(['PLAYER_ID', 'SEASON'])
+        merchant['PLAYER_ID'] = merchant['PLAYER_ID'].astype(df['PLAYER_ID'].dtype)
+        merchant['SEASON'] = merchant['SEASON'].astype(str)
+        df = df.assign(SEASON=df['SEASON'].astype(str)).merge(merchant, on=['PLAYER_ID', 'SEASON'], how='left')
+        logger.info(f"Merged merchant features: {columns}")
+    return df
+
+
+def build_training_matrix(trainer: RFEModelTrainer, features, with_merchant: bool) -> dict:
+    """
+    Prepare X (float32, all requested features that exist), y, Crucible
+    weights and the temporal split once, exactly as RFEModelTrainer.train does.
+    """
+    df = load_training_frame(trainer, with_merchant)
+    X, columns = trainer.prepare_features(df, features)
+    encoder = LabelEncoder()
+    y = encoder.fit_transform(df['ARCHETYPE'])
+
+    train_mask, test_mask = trainer.temporal_split(df)
+    train_indices = df[train_mask].index
+    weights = trainer.calculate_crucible_weights(df, train_indices)
+
+    return {
+        'X': X.to_numpy(dtype=np.float32, na_value=np.nan),
+        'columns': np.array(columns, dtype=str),
+        'y': y.astype(np.int32),
+        'classes': np.asarray(encoder.classes_, dtype=str),
+        'train': train_mask.to_numpy(),
+        'test': test_mask.to_numpy(),
+        'weights': weights.to_numpy(dtype=np.float64),
+    }
+
+
+def matrix_key(features, with_merchant: bool) -> str:
+    payload = {
+        'inputs': [[p.name, file_digest(p)] for p in MATRIX_INPUTS],
+        'features': sorted(features),
+        'merchant': with_merchant,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def load_or_build_matrix(trainer: RFEModelTrainer, features, with_merchant: bool,
+                         cache_path: Path = MATRIX_CACHE_PATH, rebuild: bool = False) -> Path:
+    """Path of a cached training matrix for `features`, building it if the inputs changed."""
+    key = matrix_key(features, with_merchant)
+    if cache_path.exists() and not rebuild:
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                if str(cached['key']) == key:
+                    logger.info(f"⚡ Reusing training matrix {cache_path}")
+                    return cache_path
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable matrix cache {cache_path}: {e}")
+
+    start = time.perf_counter()
+    matrix = build_training_matrix(trainer, features, with_merchant)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(cache_path, key=np.array(key), **matrix)
+    logger.info(f"Built training matrix {matrix['X'].shape} in {time.perf_counter() - start:.1f}s -> {cache_path}")
+    return cache_path
+
+
+def load_matrix(path: Path) -> dict:
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def rfe_elimination_path(trainer: RFEModelTrainer, matrix: dict, pool, n_min: int, threads=None) -> dict:
+    """
+    Nested RFE feature lists from a single elimination down to n_min features.
+
+    RFE ranks selected features 1 and each later elimination round one
+    higher. Rounds remove one feature each (step=1; a larger step would give
+    several features the same rank), so the best k features (k >= n_min)
+    are those ranked <= k - n_min + 1.
+
+    Returns:
+        Feature -> RFE rank; rfe_subset() reads the list for a count
+    """
+    columns = list(matrix['columns'])
+    pool = [f for f in pool if f in columns]
+    idx = [columns.index(f) for f in pool]
+    train = matrix['train']
+    rfe = RFE(trainer.build_model(n_jobs=threads), n_features_to_select=n_min, step=1)
+    start = time.perf_counter()
+    rfe.fit(matrix['X'][train][:, idx], matrix['y'][train], sample_weight=matrix['weights'])
+    logger.info(f"RFE path over {len(pool)} features -> {n_min} in {time.perf_counter() - start:.1f}s")
+    return dict(zip(pool, rfe.ranking_.tolist()))
+
+
+def rfe_subset(ranking: dict, n_features: int, n_min: int):
+    return sorted(f for f, rank in ranking.items() if rank <= n_features - n_min + 1)
+
+
+def rfe_path_lists(trainer: RFEModelTrainer, matrix: dict, pool, counts, threads=None) -> dict:
+    """
+    Count -> feature list from one elimination run: the critical features in
+    the matrix plus the best (count - critical) of the other pooled features.
+    """
+    columns = list(matrix['columns'])
+    critical = [f for f in CRITICAL_FEATURES if f in columns]
+    counts = sorted(counts)
+    if counts[0] <= len(critical):
+        raise ValueError(f"Feature counts must exceed the {len(critical)} critical features: {counts}")
+    # Critical features are force-included in every list, so only the rest compete
+    n_min = counts[0] - len(critical)
+    ranking = rfe_elimination_path(trainer, matrix, [f for f in pool if f not in CRITICAL_FEATURES], n_min,
+                                   threads=threads)
+    return {n: sorted(set(rfe_subset(ranking, n - len(critical), n_min)) | set(critical)) for n in counts}
+
+
+def candidate_feature_sets(rfe_lists, variants):
+    """Candidates (name, variant, count, features) for every RFE list x variant."""
+    return [
+        {
+            'name': f"rfe_{n}" if variant == 'base' else f"rfe_{n}_{variant}",
+            'variant': variant,
+            'n_features': n,
+            'features': sorted(set(features) | set(VARIANTS[variant])),
+        }
+        for n, features in rfe_lists.items() for variant in variants
+    ]
+
+
+_WORKER = {}
+
+
+def _init_sweep_worker(matrix_path: str, threads: int):
+    """Process-pool initializer: load the shared matrix once per worker; models get `threads` as n_jobs."""
+    _WORKER['matrix'] = load_matrix(Path(matrix_path))
+    _WORKER['threads'] = threads
+    _WORKER['trainer'] = RFEModelTrainer()
+
+
+def evaluate_candidate(candidate: dict) -> dict:
+    """Fit and score one candidate feature set on the worker's matrix."""
+    matrix, trainer = _WORKER['matrix'], _WORKER['trainer']
+    columns = list(matrix['columns'])
+    features = [f for f in candidate['features'] if f in columns]
+    idx = [columns.index(f) for f in features]
+    train, test = matrix['train'], matrix['test']
+    X = matrix['X'][:, idx]
+    y = matrix['y']
+
+    start = time.perf_counter()
+    model = trainer.build_model(n_jobs=_WORKER['threads'], model_name=f"resilience_xgb_{candidate['name']}")
+    model.fit(X[train], y[train], sample_weight=matrix['weights'])
+    fit_seconds = time.perf_counter() - start
+
+    proba = model.predict_proba(X[test])
+    y_pred = proba.argmax(axis=1)
+    labels = np.arange(len(matrix['classes']))
+    return {
+        'candidate': candidate['name'],
+        'variant': candidate['variant'],
+        'n_features': candidate['n_features'],
+        'total_features': len(features),
+        'accuracy': accuracy_score(y[test], y_pred),
+        'macro_f1': f1_score(y[test], y_pred, labels=labels, average='macro', zero_division=0),
+        'log_loss': log_loss(y[test], proba, labels=labels),
+        'fit_seconds': fit_seconds,
+        'missing_features': [f for f in candidate['features'] if f not in columns],
+        'features': features,
+    }
+
+
+def run_sweep(candidates, matrix_path: Path, jobs: int = 1, threads: int = 1) -> pd.DataFrame:
+    """Evaluate every candidate, in worker processes when jobs > 1."""
+    jobs = max(1, min(jobs, len(candidates)))
+    logger.info(f"Evaluating {len(candidates)} candidates on {jobs} processes x {threads} threads...")
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_sweep_worker,
+                                 initargs=(str(matrix_path), threads)) as pool:
+            rows = list(pool.map(evaluate_candidate, candidates))
+    else:
+        _init_sweep_worker(str(matrix_path), threads)
+        rows = [evaluate_candidate(c) for c in candidates]
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep RFE feature counts and variants in one run")
+    parser.add_argument('--counts', nargs='+', type=int, default=[10, 15, 20], help='RFE feature counts')
+    parser.add_argument('--variants', nargs='+', choices=list(VARIANTS), default=list(VARIANTS),
+                        help='Feature-set variants')
+    parser.add_argument('--rfe-path', action='store_true',
+                        help='Derive the RFE lists from one elimination run instead of the comparison CSV')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPUs / threads)')
+    parser.add_argument('--threads', type=int, default=1, help='XGBoost threads per worker')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the cached training matrix')
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help='Comparison table (CSV)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    trainer = RFEModelTrainer()
+    counts = sorted(set(args.counts))
+    rfe_lists = {n: trainer.load_rfe_features(n_features=n) for n in counts}
+    pool = sorted(set().union(*rfe_lists.values()))
+
+    extra = sorted({f for v in args.variants for f in VARIANTS[v]})
+    matrix_path = load_or_build_matrix(trainer, sorted(set(pool) | set(extra)), 'merchant' in args.variants,
+                                       rebuild=args.rebuild)
+
+    if args.rfe_path:
+        try:
+            rfe_lists = rfe_path_lists(trainer, load_matrix(matrix_path), pool, counts, threads=os.cpu_count())
+        except ValueError as e:
+            parser.error(str(e))
+
+    candidates = candidate_feature_sets(rfe_lists, args.variants)
+
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // args.threads)
+    results = run_sweep(candidates, matrix_path, jobs=jobs, threads=args.threads)
+    results = results.sort_values(['accuracy', 'log_loss'], ascending=[False, True]).reset_index(drop=True)
+    results.to_csv(args.output, index=False)
+
+    table = results.drop(columns=['features', 'missing_features'])
+    print(table.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    missing = sorted(set().union(*results['missing_features']))
+    if missing:
+        logger.warning(f"Features not in the dataset (skipped): {missing}")
+
+    best = results.iloc[0]
+    logger.info(f"✅ {len(results)} candidates in {time.perf_counter() - start:.1f}s; best: {best['candidate']} "
+                f"({best['accuracy']:.4f} accuracy) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,17 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 import joblib
 import logging
+from datetime import datetime
 from pathlib import Path
 import sys
 
 # Add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
+from src.model.registry import register_model, registered_hyperparameters
+from src.model.training_tables import load_or_build
+from src.nba_data.scripts.export_model_artifacts import export_registered
+
 # Setup Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +23,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CRUCIBLE_TABLE_VERSION = 1  # Bump when the table's assembly changes beyond what the fingerprint captures
+
 class CrucibleModelTrainer:
     def __init__(self):
         self.data_dir = Path("data")
@@ -38,6 +45,28 @@ class CrucibleModelTrainer:
         ]
         self.target = 'PIE_TARGET'
 
+    def load_training_data(self, input_path="data/crucible_dataset.csv", rebuild=False):
+        """
+        The Crucible dataset as a training table (named after the input file),
+        re-read from CSV only when the file changes.
+        """
+        table = load_or_build(
+            Path(input_path).stem, build=lambda: pd.read_csv(input_path), version=CRUCIBLE_TABLE_VERSION,
+            inputs=[input_path], label=self.target, rebuild=rebuild,
+        )
+        return table.frame
+
+    def build_model(self, n_jobs=None):
+        """
+        The physics-to-impact XGBoost regressor. Hyperparameters registered by
+        tune_hyperparameters.py override the defaults.
+        """
+        params = {'n_estimators': 200, 'learning_rate': 0.05, 'max_depth': 5,
+                  'subsample': 0.8, 'colsample_bytree': 0.8}
+        params.update(registered_hyperparameters('crucible_impact_model'))
+        logger.info(f"Hyperparameters: {params}")
+        return xgb.XGBRegressor(random_state=42, n_jobs=n_jobs, **params)
+
     def train(self, input_path="data/crucible_dataset.csv"):
         """
         Trains the physics-to-impact translation model.
@@ -46,7 +75,7 @@ class CrucibleModelTrainer:
             logger.error(f"Missing {input_path}")
             return
             
-        df = pd.read_csv(input_path)
+        df = self.load_training_data(input_path)
         logger.info(f"Loaded {len(df)} samples for training.")
         
         # 1. Prepare Features and Target
@@ -63,14 +92,7 @@ class CrucibleModelTrainer:
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # 3. Train XGBoost Regressor
-        model = xgb.XGBRegressor(
-            n_estimators=200,
-            learning_rate=0.05,
-            max_depth=5,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42
-        )
+        model = self.build_model()
         
         logger.info("Training XGBoost Regressor...")
         model.fit(X_train, y_train)
@@ -94,6 +116,10 @@ class CrucibleModelTrainer:
         model_path = self.models_dir / "crucible_impact_model.pkl"
         joblib.dump(model, model_path)
         logger.info(f"✅ Saved model to {model_path}")
+        register_model('crucible_impact_model', model_path, role='crucible',
+                       n_features=len(existing_features), mse=round(float(mse), 4), r2=round(float(r2), 4),
+                       training_date=datetime.now().strftime('%Y-%m-%d'))
+        export_registered('crucible_impact_model')
         
         # 7. Identify "Ghosts" in the training data
         # Predicted Impact >> Actual Impact
@@ -13,14 +13,21 @@ import numpy as np
 import logging
 import sys
 import joblib
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from sklearn.preprocessing import LabelEncoder
 import xgboost as xgb
 import ast
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.registry import register_model, registered_hyperparameters
+from src.nba_data.scripts.export_model_artifacts import export_registered
+from src.model.training_tables import load_or_build
+from src.nba_data.utils.feature_dtypes import apply_feature_dtypes
 
 # Setup Logging
 logging.basicConfig(
@@ -33,6 +40,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# [NEW] FORCE INCLUSION: The "Physics-Based Truth Tellers" (Dec 21, 2025)
+# These features are direct simulations of playoff reality, not proxies.
+# We force their inclusion because they represent our core causal hypothesis.
+# CRITICAL: Added friction coefficients to the list of features to include
+CRITICAL_FEATURES = [
+    'PROJECTED_PLAYOFF_OUTPUT', # The "Remainder" after applying playoff friction.
+    'PROJECTED_PLAYOFF_PPS',    # The projected efficiency component of the Remainder.
+    'FRICTION_COEFF_ISO',       # The friction coefficient for isolation
+    'FRICTION_COEFF_0_DRIBBLE', # The friction coefficient for off-ball
+    'SHOT_QUALITY_GENERATION_DELTA', # Existing critical feature - keep.
+    'HELIO_ABOVE_REPLACEMENT_VALUE', # NEW (Dec 2025): Rewards inefficient stars less than efficient ones, but rewards VOLUME.
+    'FRAGILITY_SCORE'           # NEW (Dec 2025): Physicality and system dependence.
+]
+
+# The 'archetype' training table; bump the version when the merge changes in a
+# way the input/code fingerprint does not capture
+ARCHETYPE_TABLE_VERSION = 1
+TABLE_CODE = [
+    Path(__file__).resolve(),
+    Path(__file__).resolve().parents[1] / "utils" / "feature_dtypes.py",
+]
+
+
 class RFEModelTrainer:
     def __init__(self):
         self.data_dir = Path("data")
@@ -65,21 +95,7 @@ class RFEModelTrainer:
                 features_str = row.iloc[0]['features']
                 features = ast.literal_eval(features_str)
         
-        # [NEW] FORCE INCLUSION: The "Physics-Based Truth Tellers" (Dec 21, 2025)
-        # These features are direct simulations of playoff reality, not proxies.
-        # We force their inclusion because they represent our core causal hypothesis.
-        # CRITICAL: Added friction coefficients to the list of features to include
-        critical_features = [
-            'PROJECTED_PLAYOFF_OUTPUT', # The "Remainder" after applying playoff friction.
-            'PROJECTED_PLAYOFF_PPS',    # The projected efficiency component of the Remainder.
-            'FRICTION_COEFF_ISO',       # The friction coefficient for isolation
-            'FRICTION_COEFF_0_DRIBBLE', # The friction coefficient for off-ball
-            'SHOT_QUALITY_GENERATION_DELTA', # Existing critical feature - keep.
-            'HELIO_ABOVE_REPLACEMENT_VALUE', # NEW (Dec 2025): Rewards inefficient stars less than efficient ones, but rewards VOLUME.
-            'FRAGILITY_SCORE'           # NEW (Dec 2025): Physicality and system dependence.
-        ]
-        
-        for feat in critical_features:
+        for feat in CRITICAL_FEATURES:
             if feat not in features:
                 features.append(feat)
                 logger.info(f"Force-included critical feature: {feat}")
@@ -93,7 +109,24 @@ class RFEModelTrainer:
         
         return features
     
-    def load_and_merge_data(self):
+    def load_and_merge_data(self, rebuild=False):
+        """
+        The archetype training set: features merged with the archetype labels,
+        plus the Crucible weights of the default temporal split's training rows
+        (CRUCIBLE_WEIGHT, NaN on test rows). Stored as the 'archetype' training
+        table and rebuilt only when the input CSVs or this script change.
+        """
+        table = load_or_build(
+            'archetype', build=self._merge_training_data, version=ARCHETYPE_TABLE_VERSION,
+            inputs=[self.results_dir / "predictive_dataset_with_friction.csv",
+                    self.results_dir / "predictive_dataset.csv",
+                    self.results_dir / "resilience_archetypes.csv"],
+            code=TABLE_CODE,
+            label='ARCHETYPE', weight='CRUCIBLE_WEIGHT', rebuild=rebuild,
+        )
+        return table.frame
+
+    def _merge_training_data(self):
         """Load features and labels, merge them into a training set (same as train_predictive_model.py)."""
         # [NEW] Physics-Based Features (Dec 21, 2025)
         # We are moving from a collection of proxy CSVs to a single, unified source of truth.
@@ -146,6 +179,10 @@ class RFEModelTrainer:
         
         logger.info(f"Merged Dataset Size: {len(df_merged)} player-seasons.")
         
+        df_merged = apply_feature_dtypes(df_merged).reset_index(drop=True)
+        train_mask, _ = self.temporal_split(df_merged)
+        weights = self.calculate_crucible_weights(df_merged, df_merged[train_mask].index)
+        df_merged['CRUCIBLE_WEIGHT'] = weights.reindex(df_merged.index).astype(np.float64)
         return df_merged
 
     def prepare_features(self, df, rfe_features):
@@ -461,31 +498,8 @@ class RFEModelTrainer:
         
         return final_score
 
-    def train(self, n_features=15):
-        """Train the XGBoost Model with RFE-selected features."""
-        logger.info("=" * 80)
-        logger.info(f"Training Model with RFE-Selected Top {n_features} Features")
-        logger.info("=" * 80)
-        
-        # Load RFE-selected features
-        rfe_features = self.load_rfe_features(n_features=n_features)
-        
-        # Load and merge data
-        df = self.load_and_merge_data()
-        
-        # Prepare features
-        X, feature_names = self.prepare_features(df, rfe_features)
-        y = df['ARCHETYPE']
-        
-        # Encode Labels
-        le = LabelEncoder()
-        y_encoded = le.fit_transform(y)
-        
-        # DATA LEAKAGE FIX: Temporal Train/Test Split (not random)
-        # Train on earlier seasons (2015-2020), test on later seasons (2021-2024)
-        logger.info("Performing temporal train/test split...")
-        
-        # Create season year for sorting
+    def season_years(self, df):
+        """Starting year of each row's season ('2019-20' -> 2019; 0 if unparseable)."""
         def parse_season_year(season_str):
             try:
                 if isinstance(season_str, str):
@@ -494,30 +508,21 @@ class RFEModelTrainer:
                 return 0
             except:
                 return 0
+
+        return df['SEASON'].apply(parse_season_year)
+
+    def temporal_split(self, df, split_year=2020):
+        """
+        Temporal train/test masks: train on seasons starting in or before
+        `split_year` (2015-2020), test on later seasons (2021-2024).
+        """
+        logger.info("Performing temporal train/test split...")
         
-        df['_SEASON_YEAR'] = df['SEASON'].apply(parse_season_year)
-        
-        # Split at 2020-21 season (train on 2015-2020, test on 2021-2024)
-        split_year = 2020
-        train_mask = df['_SEASON_YEAR'] <= split_year
-        test_mask = df['_SEASON_YEAR'] > split_year
-        
-        # Get indices for train/test split
-        train_indices = df[train_mask].index
-        test_indices = df[test_mask].index
-        
-        # Split X and y using indices
-        X_train = X.loc[train_indices]
-        X_test = X.loc[test_indices]
-        y_train = y_encoded[train_indices]
-        y_test = y_encoded[test_indices]
-        
-        train_seasons = df.loc[train_mask, 'SEASON'].unique()
-        test_seasons = df.loc[test_mask, 'SEASON'].unique()
-        logger.info(f"Training seasons: {sorted(train_seasons)} ({len(X_train)} samples)")
-        logger.info(f"Testing seasons: {sorted(test_seasons)} ({len(X_test)} samples)")
-        logger.info(f"Feature count: {len(feature_names)} (reduced from 65)")
-        
+        season_year = self.season_years(df)
+        return season_year <= split_year, season_year > split_year
+
+    def calculate_crucible_weights(self, df, train_indices):
+        """Crucible sample weights for the training rows of `df` (indexed by train_indices)."""
         # Calculate sample weights for asymmetric loss
         # False positives (predicting "Victim" as "King") are much worse than false negatives
         # REDUCED from 5x to 3x (Dec 8, 2025) - SHOT_QUALITY_GENERATION_DELTA feature reduces reliance on sample weighting
@@ -605,20 +610,84 @@ class RFEModelTrainer:
         logger.info(f"    - Players with Synthetic Crucible Boost: {synthetic_crucible_weight.sum()}")
         logger.info(f"    - Players with Efficient Clutch Boost: {(is_clutch & is_efficient_clutch).sum()}")
         
-        # Initialize XGBoost
-        model = xgb.XGBClassifier(
+        return sample_weights
+
+    def build_model(self, n_jobs=None, model_name=None):
+        """
+        The XGBoost classifier every RFE model is trained with. Hyperparameters
+        registered for `model_name` (tune_hyperparameters.py) override the defaults.
+        """
+        params = {'n_estimators': 100, 'max_depth': 4, 'learning_rate': 0.1}
+        if model_name:
+            tuned = registered_hyperparameters(model_name)
+            if tuned:
+                logger.info(f"Using registered hyperparameters for {model_name}: {tuned}")
+                params.update(tuned)
+        return xgb.XGBClassifier(
             objective='multi:softprob',
-            n_estimators=100,
-            max_depth=4,
-            learning_rate=0.1,
             use_label_encoder=False,
             eval_metric='mlogloss',
-            random_state=42
+            random_state=42,
+            n_jobs=n_jobs,
+            **params
         )
+
+    def fit(self, n_features=15):
+        """
+        Fit the RFE model on the temporal split's training seasons.
+        Returns (model, label encoder, X_test, y_test, feature names).
+        """
+        # Load RFE-selected features
+        rfe_features = self.load_rfe_features(n_features=n_features)
+        
+        # Load and merge data
+        df = self.load_and_merge_data()
+        
+        # Prepare features
+        X, feature_names = self.prepare_features(df, rfe_features)
+        y = df['ARCHETYPE']
+        
+        # Encode Labels
+        le = LabelEncoder()
+        y_encoded = le.fit_transform(y)
+        
+        # DATA LEAKAGE FIX: Temporal Train/Test Split (not random)
+        train_mask, test_mask = self.temporal_split(df)
+        
+        # Get indices for train/test split
+        train_indices = df[train_mask].index
+        test_indices = df[test_mask].index
+        
+        # Split X and y using indices
+        X_train = X.loc[train_indices]
+        X_test = X.loc[test_indices]
+        y_train = y_encoded[train_indices]
+        y_test = y_encoded[test_indices]
+        
+        train_seasons = df.loc[train_mask, 'SEASON'].unique()
+        test_seasons = df.loc[test_mask, 'SEASON'].unique()
+        logger.info(f"Training seasons: {sorted(train_seasons)} ({len(X_train)} samples)")
+        logger.info(f"Testing seasons: {sorted(test_seasons)} ({len(X_test)} samples)")
+        logger.info(f"Feature count: {len(feature_names)} (reduced from 65)")
+        
+        # Crucible weights of the default split, computed once with the training table
+        sample_weights = df.loc[train_indices, 'CRUCIBLE_WEIGHT']
+        
+        # Initialize XGBoost
+        model = self.build_model(model_name=f"resilience_xgb_rfe_{n_features}")
         
         # Train with sample weights
         logger.info("Training model with Crucible sample weighting...")
         model.fit(X_train, y_train, sample_weight=sample_weights.values)
+        return model, le, X_test, y_test, feature_names
+
+    def train(self, n_features=15):
+        """Train the XGBoost Model with RFE-selected features."""
+        logger.info("=" * 80)
+        logger.info(f"Training Model with RFE-Selected Top {n_features} Features")
+        logger.info("=" * 80)
+        
+        model, le, X_test, y_test, feature_names = self.fit(n_features=n_features)
         
         # Save Model
         model_path = self.models_dir / f"resilience_xgb_rfe_{n_features}.pkl"
@@ -645,6 +714,8 @@ class RFEModelTrainer:
         logger.info("\nFeature Importance:\n" + str(importance))
         
         # Visualization: Feature Importance
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         plt.figure(figsize=(10, max(6, len(feature_names) * 0.3)))
         sns.barplot(data=importance, x='Importance', y='Feature', hue='Feature', legend=False)
         plt.title(f"Feature Importance: RFE-Selected Top {n_features} Features", fontsize=14, fontweight='bold')
@@ -673,9 +744,18 @@ class RFEModelTrainer:
         }
         
         import json
-        with open(self.results_dir / f"rfe_model_results_{n_features}.json", 'w') as f:
+        results_path = self.results_dir / f"rfe_model_results_{n_features}.json"
+        with open(results_path, 'w') as f:
             json.dump(results_summary, f, indent=2)
         
+        # Record the new artifacts (and their checksums) in the model registry
+        register_model(
+            f"resilience_xgb_rfe_{n_features}", model_path, role='archetype', encoder_path=encoder_path,
+            features_path=results_path, n_features=len(feature_names), accuracy=round(float(accuracy), 4),
+            training_date=datetime.now().strftime('%Y-%m-%d'),
+        )
+        export_registered(f"resilience_xgb_rfe_{n_features}")
+        
         logger.info(f"\n{'='*80}")
         logger.info("Training Complete!")
         logger.info(f"{'='*80}")
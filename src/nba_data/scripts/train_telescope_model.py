@@ -20,10 +20,19 @@ import xgboost as xgb
 import joblib
 import logging
 import sys
+from datetime import datetime
 from pathlib import Path
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.registry import register_model, registered_hyperparameters
+from src.model.training_tables import load_or_build
+from src.nba_data.scripts.export_model_artifacts import export_registered
+from src.nba_data.utils.feature_dtypes import read_feature_csv
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,6 +43,9 @@ logger = logging.getLogger(__name__)
 
 # Constants
 GROWTH_COHORT_AGE_LIMIT = 26
+FEATURES_PATH = Path("results/predictive_dataset_with_friction.csv")
+TARGETS_PATH = Path("results/training_targets_helio.csv")
+TELESCOPE_TABLE_VERSION = 1  # Bump when the merge changes beyond what the fingerprint captures
 FEATURES = [
     'age',
     'usg_pct',
@@ -50,15 +62,29 @@ FEATURES = [
     'physicality_score'
 ]
 
-def load_and_merge_data():
+def load_and_merge_data(rebuild=False):
+    """
+    Projected features merged with the telescope targets, stored as the
+    'telescope' training table and rebuilt only when the inputs or this
+    script change.
+    """
+    table = load_or_build(
+        'telescope', build=_merge_training_data, version=TELESCOPE_TABLE_VERSION,
+        inputs=[FEATURES_PATH, TARGETS_PATH],
+        code=[Path(__file__).resolve(), Path(__file__).resolve().parents[1] / "utils" / "feature_dtypes.py"],
+        label='FUTURE_PEAK_HELIO', rebuild=rebuild,
+    )
+    return table.frame
+
+
+def _merge_training_data():
     """Load projected features and telescope targets, merge them."""
     # 1. Load Features (Projected Avatars)
-    features_path = Path("results/predictive_dataset_with_friction.csv")
-    if not features_path.exists():
-        logger.error(f"Features not found at {features_path}")
+    if not FEATURES_PATH.exists():
+        logger.error(f"Features not found at {FEATURES_PATH}")
         sys.exit(1)
     
-    df_features = pd.read_csv(features_path)
+    df_features = read_feature_csv(FEATURES_PATH)
     
     # Ensure all features are present (even as 0) to avoid XGBoost errors
     for feature in FEATURES:
@@ -67,11 +93,10 @@ def load_and_merge_data():
             df_features[feature] = 0.0
             
     # 2. Load Targets
-    targets_path = Path("results/training_targets_helio.csv")
-    if not targets_path.exists():
-        logger.error(f"Targets not found at {targets_path}")
+    if not TARGETS_PATH.exists():
+        logger.error(f"Targets not found at {TARGETS_PATH}")
         sys.exit(1)
-    df_targets = pd.read_csv(targets_path)
+    df_targets = pd.read_csv(TARGETS_PATH)
     df_targets_slim = df_targets[['PLAYER_ID', 'SEASON_YEAR', 'FUTURE_PEAK_HELIO']]
     
     # 3. Merge
@@ -93,6 +118,21 @@ def load_and_merge_data():
     
     return merged
 
+def build_model(n_jobs=-1):
+    """
+    The Telescope XGBoost regressor. Hyperparameters registered by
+    tune_hyperparameters.py override the defaults.
+    """
+    params = {'n_estimators': 100, 'max_depth': 4, 'learning_rate': 0.05}
+    params.update(registered_hyperparameters('telescope_model'))
+    logger.info(f"Hyperparameters: {params}")
+    return xgb.XGBRegressor(
+        objective='reg:squarederror',
+        n_jobs=n_jobs,
+        random_state=42,
+        **params
+    )
+
 def train_telescope_model():
     df = load_and_merge_data()
     
@@ -114,14 +154,7 @@ def train_telescope_model():
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
     # XGBoost Regressor
-    model = xgb.XGBRegressor(
-        objective='reg:squarederror',
-        n_estimators=100,
-        max_depth=4,
-        learning_rate=0.05,
-        n_jobs=-1,
-        random_state=42
-    )
+    model = build_model()
     
     logger.info("Training XGBoost model...")
     model.fit(X_train, y_train)
@@ -158,8 +191,15 @@ def train_telescope_model():
     
     # Save Feature List (for inference)
     import json
-    with open(output_dir / "telescope_features.json", 'w') as f:
+    features_path = output_dir / "telescope_features.json"
+    with open(features_path, 'w') as f:
         json.dump(available_features, f)
+    
+    # Record the new artifacts (and their checksums) in the model registry
+    register_model('telescope_model', model_path, role='telescope', features_path=features_path,
+                   n_features=len(available_features), rmse=round(float(rmse), 4), r2=round(float(r2), 4),
+                   training_date=datetime.now().strftime('%Y-%m-%d'))
+    export_registered('telescope_model')
 
 if __name__ == "__main__":
     train_telescope_model()
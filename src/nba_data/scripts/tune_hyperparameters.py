@@ -0,0 +1,197 @@
+"""
+Hyperparameter Search for the XGBoost Models
+
+Tunes one model with successive halving or Hyperband on the walk-forward
+season folds (src/model/hyperparameter_search.py) and registers the best
+configuration in models/registry.json, where the trainers pick it up:
+- resilience_xgb_rfe_<n>[_merchant|_phoenix]: archetype classifier on the
+  RFE feature set, with the Crucible sample weights of each fold's training
+  seasons (rolling_season_cv.load_or_build_folds)
+- telescope_model: future-peak regressor on the growth cohort
+- crucible_impact_model: physics-to-impact regressor (data/crucible_dataset.csv)
+
+Fold matrices are cached per model in results/.cache/hpo/, and every
+finished trial is logged next to them, so rerunning the same command
+resumes the study. --budget caps the wall-clock time of a run.
+
+Usage:
+    python src/nba_data/scripts/tune_hyperparameters.py --model resilience_xgb_rfe_15
+    python src/nba_data/scripts/tune_hyperparameters.py --model telescope_model --mode halving --configs 40
+    python src/nba_data/scripts/tune_hyperparameters.py --model crucible_impact_model --budget 900 --jobs 4
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from src.model.hyperparameter_search import run_search
+from src.model.registry import register_hyperparameters
+from src.model.season_cv import FoldMatrices, build_fold_matrices
+from src.nba_data.utils.hashing import file_digest
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+HPO_DIR = Path("results/.cache/hpo")
+RFE_MODEL_PATTERN = re.compile(r'^resilience_xgb_rfe_(\d+)(?:_(merchant|phoenix))?$')
+CRUCIBLE_DATASET_PATH = Path("data/crucible_dataset.csv")
+
+# Files each regression model's fold matrices depend on
+REGRESSION_INPUTS = {
+    'telescope_model': [
+        Path("results/predictive_dataset_with_friction.csv"),
+        Path("results/training_targets_helio.csv"),
+        Path(__file__).resolve().parent / "train_telescope_model.py",
+    ],
+    'crucible_impact_model': [
+        CRUCIBLE_DATASET_PATH,
+        Path(__file__).resolve().parent / "train_crucible_model.py",
+    ],
+}
+
+
+def rfe_folds(model_name: str, min_train_seasons: int, rebuild: bool):
+    """Fold matrices and features for an RFE archetype model."""
+    # train_rfe_model logs to logs/train_rfe_model.log on import
+    Path("logs").mkdir(exist_ok=True)
+    from src.nba_data.scripts.rolling_season_cv import load_or_build_folds
+    from src.nba_data.scripts.sweep_rfe_features import candidate_feature_sets
+    from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+
+    n_features, variant = RFE_MODEL_PATTERN.match(model_name).groups()
+    variant = variant or 'base'
+    trainer = RFEModelTrainer()
+    rfe_list = {int(n_features): trainer.load_rfe_features(n_features=int(n_features))}
+    features = candidate_feature_sets(rfe_list, [variant])[0]['features']
+    path = load_or_build_folds(trainer, features, variant == 'merchant', min_train_seasons,
+                               cache_path=HPO_DIR / f"{model_name}_folds.npz", rebuild=rebuild)
+    return path, features
+
+
+def regression_frame(model_name: str):
+    """(training frame, features, target, season start year) for a regression model."""
+    if model_name == 'telescope_model':
+        from src.nba_data.scripts import train_telescope_model as telescope
+        df = telescope.load_and_merge_data()
+        df = df[df['age'] <= telescope.GROWTH_COHORT_AGE_LIMIT]
+        features = [f for f in telescope.FEATURES if f in df.columns]
+        target = 'FUTURE_PEAK_HELIO'
+        season_year = df['SEASON_YEAR'] - 1
+    else:
+        from src.nba_data.scripts.train_crucible_model import CrucibleModelTrainer
+        trainer = CrucibleModelTrainer()
+        df = trainer.load_training_data(CRUCIBLE_DATASET_PATH)
+        features = [f for f in trainer.features if f in df.columns]
+        target = trainer.target
+        df[features] = df[features].fillna(0)
+        season_year = pd.to_numeric(df['SEASON'].astype(str).str[:4], errors='coerce')
+
+    keep = df[target].notna() & season_year.notna()
+    return df[keep].reset_index(drop=True), features, target, season_year[keep].astype(int).to_numpy()
+
+
+def regression_folds(model_name: str, min_train_seasons: int, rebuild: bool):
+    """Fold matrices and features for the Telescope or Crucible regressor."""
+    cache_path = HPO_DIR / f"{model_name}_folds.npz"
+    key = hashlib.sha256(json.dumps({
+        'inputs': [[p.name, file_digest(p)] for p in REGRESSION_INPUTS[model_name]],
+        'min_train_seasons': min_train_seasons,
+        'script': Path(__file__).name,
+    }, sort_keys=True).encode()).hexdigest()
+    if not rebuild and FoldMatrices.cached_key(cache_path) == key:
+        logger.info(f"⚡ Reusing fold matrices {cache_path}")
+        with np.load(cache_path, allow_pickle=False) as data:
+            return cache_path, data['columns'].tolist()
+
+    df, features, target, season_year = regression_frame(model_name)
+    folds = build_fold_matrices(
+        df[features].to_numpy(dtype=np.float32, na_value=np.nan), df[target].to_numpy(dtype=np.float64),
+        season_year, features, [], min_train_seasons=min_train_seasons, key=key,
+    )
+    folds.save(cache_path)
+    logger.info(f"Built {folds.n_folds} folds over {folds.X.shape} -> {cache_path}")
+    return cache_path, features
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budgeted hyperparameter search on walk-forward season folds")
+    parser.add_argument('--model', required=True,
+                        help="resilience_xgb_rfe_<n>[_merchant|_phoenix], telescope_model or crucible_impact_model")
+    parser.add_argument('--mode', choices=['hyperband', 'halving'], default='hyperband', help='Search strategy')
+    parser.add_argument('--configs', type=int, default=27, help='Configurations (halving mode)')
+    parser.add_argument('--min-rounds', type=int, default=50, help='Boosting rounds at the lowest rung')
+    parser.add_argument('--max-rounds', type=int, default=800, help='Boosting rounds at the highest rung')
+    parser.add_argument('--eta', type=int, default=3, help='Halving rate')
+    parser.add_argument('--early-stopping', type=int, default=25, help="Early-stopping rounds (watched on each fold's latest training season)")
+    parser.add_argument('--budget', type=float, default=None, help='Wall-clock budget in seconds')
+    parser.add_argument('--min-train-seasons', type=int, default=3, help='Seasons in the first training window')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPUs / threads)')
+    parser.add_argument('--threads', type=int, default=1, help='XGBoost threads per worker')
+    parser.add_argument('--seed', type=int, default=42, help='Configuration sampling seed')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the cached fold matrices')
+    parser.add_argument('--no-register', action='store_true', help='Do not write the best configuration to the registry')
+    args = parser.parse_args()
+
+    if RFE_MODEL_PATTERN.match(args.model):
+        folds_path, features = rfe_folds(args.model, args.min_train_seasons, args.rebuild)
+    elif args.model in REGRESSION_INPUTS:
+        folds_path, features = regression_folds(args.model, args.min_train_seasons, args.rebuild)
+    else:
+        parser.error(f"Unknown model: {args.model}")
+
+    start = time.perf_counter()
+    jobs = args.jobs or max(1, (os.cpu_count() or 1) // args.threads)
+    result = run_search(
+        folds_path, features, HPO_DIR / f"{args.model}_trials.jsonl", mode=args.mode, n_configs=args.configs,
+        min_rounds=args.min_rounds, max_rounds=args.max_rounds, eta=args.eta,
+        early_stopping_rounds=args.early_stopping, budget_seconds=args.budget,
+        jobs=jobs, threads=args.threads, seed=args.seed,
+    )
+
+    trials_path = Path(f"results/hyperparameter_trials_{args.model}.csv")
+    trials = result.trials.drop(columns=['params']).join(pd.json_normalize(result.trials['params']))
+    trials.to_csv(trials_path, index=False)
+
+    if result.best is None:
+        logger.error("No configuration finished every fold within the budget; nothing registered")
+        return
+
+    best = result.best
+    metric = result.trials['metric'].iloc[0]
+    print(f"\nBest configuration ({best['config_id']}, {best['rounds']}-round rung):")
+    for name, value in best['params'].items():
+        print(f"  {name}: {value:.4g}" if isinstance(value, float) else f"  {name}: {value}")
+    print(f"  n_estimators: {best['n_estimators']}")
+    print(f"  {metric}: {best['score']:.4f} ± {best['score_std']:.4f} over {best['folds']} folds")
+
+    if not args.no_register:
+        with np.load(folds_path, allow_pickle=False) as data:
+            test_seasons = data['test_years'].tolist()
+        register_hyperparameters(
+            args.model, {**best['params'], 'tree_method': 'hist'}, best['n_estimators'], best['score'], metric,
+            study={
+                'mode': args.mode,
+                'trials': len(result.trials),
+                'rung_rounds': int(best['rounds']),
+                'test_seasons': test_seasons,
+                'out_of_budget': result.out_of_budget,
+                'seconds': round(result.seconds, 1),
+            },
+        )
+    logger.info(f"✅ {len(result.trials)} trials in {time.perf_counter() - start:.1f}s -> {trials_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,6 @@ Follows first principles: Performance vs. Dependence.
 
 import pandas as pd
 import numpy as np
-import joblib
-import json
 import logging
 import sys
 from pathlib import Path
@@ -15,6 +13,8 @@ from typing import List, Optional
 # Add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
+from src.model.registry import ModelRegistryError, load_model
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -486,16 +486,14 @@ def get_test_cases() -> List[LatentStarTestCase]:
 
 def validate_telescope_resilience():
     # 1. Load Model and Features
-    model_path = Path("models/telescope_model.pkl")
-    features_path = Path("models/telescope_features.json")
-    
-    if not model_path.exists() or not features_path.exists():
-        logger.error("Model or features list missing. Please run train_telescope_model.py first.")
+    try:
+        loaded = load_model('production', role='telescope')
+    except (ModelRegistryError, OSError) as e:
+        logger.error(f"Telescope model unavailable ({e}). Please run train_telescope_model.py first.")
         return
     
-    model = joblib.load(model_path)
-    with open(features_path, 'r') as f:
-        features = json.load(f)
+    model = loaded.model
+    features = loaded.features
     
     # 2. Load Dataset
     data_path = Path("results/predictive_dataset_with_friction.csv")
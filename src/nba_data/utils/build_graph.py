@@ -0,0 +1,379 @@
+"""
+Content-Hashed Build Graph
+
+A small make-style engine for the scripts that produce results/ (and the
+intermediate data/ files they depend on). Each Target declares:
+
+- outputs: files it writes
+- inputs: files or glob patterns it reads (including its own script)
+- build: a top-level callable that produces the outputs
+
+Dependencies are derived from the declarations: a target depends on every
+target whose outputs match one of its inputs. A target is rebuilt only when
+it is stale:
+
+- it has never been built, or an output is missing
+- an output no longer matches the hash recorded after its last build
+- the fingerprint of its inputs changed (SHA-256 of every input file's
+  content, plus the build recipe)
+
+Because fingerprints hash content rather than timestamps, an upstream target
+that rebuilds to byte-identical output does not invalidate its dependents.
+Independent targets run in parallel worker processes. Hashes are cached by
+(size, mtime) in the state file so unchanged inputs are not re-read.
+
+Example:
+    graph = BuildGraph([Target("features", ["data/f.csv"], ["data/logs.csv"], build_features)])
+    report = graph.build(jobs=4)
+    print(report.summary())
+"""
+
+import fnmatch
+import functools
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path("results/.build_state.json")
+MISSING = "missing"
+
+
+class BuildGraphError(Exception):
+    """Invalid graph declaration (duplicate producers, cycles, unknown targets)."""
+
+
+@dataclass(frozen=True)
+class Target:
+    """One node of the build graph; paths are relative to the graph root."""
+    name: str
+    outputs: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    build: Callable[[], None]
+
+    def __post_init__(self):
+        object.__setattr__(self, "outputs", tuple(self.outputs))
+        object.__setattr__(self, "inputs", tuple(self.inputs))
+
+    @property
+    def recipe(self) -> str:
+        """Stable description of the build callable (part of the fingerprint)."""
+        return describe_callable(self.build)
+
+
+@dataclass
+class TargetResult:
+    """Outcome of one target in a build."""
+    name: str
+    status: str  # built | cached | failed | skipped | stale (dry run)
+    reason: str = ""
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BuildReport:
+    """Per-target timings and cache hits for one build."""
+    started_at: str
+    seconds: float = 0.0
+    results: List[TargetResult] = field(default_factory=list)
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def ok(self) -> bool:
+        return self.count("failed") == 0 and self.count("skipped") == 0
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "seconds": round(self.seconds, 3),
+            "counts": {s: self.count(s) for s in ("built", "cached", "failed", "skipped", "stale")},
+            "targets": [asdict(r) for r in self.results],
+        }
+
+    def write(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+    def summary(self) -> str:
+        lines = [f"{'Target':<40} {'Status':<8} {'Seconds':>8}  Reason"]
+        for r in self.results:
+            lines.append(f"{r.name:<40} {r.status:<8} {r.seconds:>8.2f}  {r.error or r.reason}")
+        counts = f"{self.count('built')} built, {self.count('cached')} cached, " \
+                 f"{self.count('failed')} failed, {self.count('skipped')} skipped"
+        if self.count("stale"):
+            counts += f", {self.count('stale')} stale"
+        lines.append(f"{counts} in {self.seconds:.1f}s")
+        return "\n".join(lines)
+
+
+def describe_callable(func: Callable) -> str:
+    """Module-qualified name plus bound arguments for functools.partial objects."""
+    if isinstance(func, functools.partial):
+        args = ", ".join([repr(a) for a in func.args] + [f"{k}={v!r}" for k, v in sorted(func.keywords.items())])
+        return f"{describe_callable(func.func)}({args})"
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _run_target(build: Callable[[], None], root: str) -> float:
+    """Run a build callable from the graph root (in a worker or in-process)."""
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        start = time.perf_counter()
+        build()
+        return time.perf_counter() - start
+    finally:
+        os.chdir(previous)
+
+
+class BuildGraph:
+    """Declared targets plus the persisted hashes of their last successful builds."""
+
+    def __init__(self, targets: Sequence[Target], root: Union[str, Path] = ".",
+                 state_path: Union[str, Path] = DEFAULT_STATE_PATH):
+        self.root = Path(root).resolve()
+        self.state_path = self.root / state_path
+        self.targets: Dict[str, Target] = {}
+        producers: Dict[str, str] = {}
+        for target in targets:
+            if target.name in self.targets:
+                raise BuildGraphError(f"Duplicate target '{target.name}'")
+            self.targets[target.name] = target
+            for output in target.outputs:
+                if output in producers:
+                    raise BuildGraphError(f"'{output}' is produced by both '{producers[output]}' and '{target.name}'")
+                producers[output] = target.name
+
+        self.dependencies: Dict[str, Set[str]] = {}
+        for target in self.targets.values():
+            self.dependencies[target.name] = {
+                producer for output, producer in producers.items()
+                if producer != target.name and any(fnmatch.fnmatch(output, pattern) for pattern in target.inputs)
+            }
+        self.order = self._topological_order()
+        self._state = self._load_state()
+
+    # ----- graph structure -----
+
+    def _topological_order(self) -> List[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name, path):
+            if name in done:
+                return
+            if name in visiting:
+                raise BuildGraphError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in sorted(self.dependencies[name]):
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.targets:
+            visit(name, [])
+        return order
+
+    def select(self, names: Optional[Sequence[str]] = None) -> List[str]:
+        """Requested targets plus everything upstream of them, in build order."""
+        if not names:
+            return list(self.order)
+        unknown = [n for n in names if n not in self.targets]
+        if unknown:
+            raise BuildGraphError(f"Unknown targets: {unknown}")
+        wanted: Set[str] = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.dependencies[name])
+        return [n for n in self.order if n in wanted]
+
+    # ----- hashing and state -----
+
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            try:
+                state = json.loads(self.state_path.read_text())
+                return {"targets": state.get("targets", {}), "files": state.get("files", {})}
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable build state {self.state_path}: {e}")
+        return {"targets": {}, "files": {}}
+
+    def _save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._state, indent=1, sort_keys=True))
+        tmp_path.replace(self.state_path)
+
+    def file_hash(self, rel_path: str) -> str:
+        """SHA-256 of a file under the root, cached by (size, mtime)."""
+        path = self.root / rel_path
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return MISSING
+        cached = self._state["files"].get(rel_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = _sha256(path)
+        self._state["files"][rel_path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def expand_inputs(self, target: Target) -> List[str]:
+        """Input patterns expanded against the filesystem; unmatched literal paths are kept."""
+        paths = set()
+        for pattern in target.inputs:
+            if glob.has_magic(pattern):
+                paths.update(Path(p).relative_to(self.root).as_posix()
+                             for p in glob.glob(str(self.root / pattern)))
+            else:
+                paths.add(pattern)
+        return sorted(paths)
+
+    def fingerprint(self, target: Target) -> str:
+        payload = {
+            "recipe": target.recipe,
+            "outputs": list(target.outputs),
+            "inputs": [[p, self.file_hash(p)] for p in self.expand_inputs(target)],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def stale_reason(self, target: Target, fingerprint: str) -> Optional[str]:
+        """Why `target` needs a rebuild, or None if its outputs are current."""
+        record = self._state["targets"].get(target.name)
+        if record is None:
+            return "never built"
+        for output in target.outputs:
+            current = self.file_hash(output)
+            if current == MISSING:
+                return f"missing {output}"
+            if current != record["outputs"].get(output):
+                return f"{output} modified outside the build"
+        if record["fingerprint"] != fingerprint:
+            return "inputs changed"
+        return None
+
+    def _record(self, target: Target, fingerprint: str, seconds: float) -> None:
+        self._state["targets"][target.name] = {
+            "fingerprint": fingerprint,
+            "outputs": {output: self.file_hash(output) for output in target.outputs},
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(seconds, 3),
+        }
+        self._save_state()
+
+    # ----- building -----
+
+    def plan(self, names: Optional[Sequence[str]] = None, force: bool = False) -> BuildReport:
+        """Dry run: which selected targets are stale, without building anything."""
+        report = BuildReport(started_at=datetime.now().isoformat(timespec="seconds"))
+        stale: Set[str] = set()
+        for name in self.select(names):
+            target = self.targets[name]
+            upstream = sorted(self.dependencies[name] & stale)
+            reason = "forced" if force else self.stale_reason(target, self.fingerprint(target))
+            if reason is None and upstream:
+                reason = f"upstream stale: {', '.join(upstream)}"
+            if reason is not None:
+                stale.add(name)
+            report.results.append(TargetResult(name, "stale" if reason else "cached", reason or "up to date"))
+        self._save_state()
+        return report
+
+    def build(self, names: Optional[Sequence[str]] = None, jobs: Optional[int] = None,
+              force: bool = False) -> BuildReport:
+        """
+        Rebuild the stale targets among `names` (default: all) and their upstream.
+
+        Args:
+            names: Targets to bring up to date
+            jobs: Worker processes for independent targets (default: CPU count;
+                1 runs every build in this process)
+            force: Rebuild the selected targets even if they are current
+
+        Returns:
+            BuildReport with one result per selected target, in completion order
+        """
+        start = time.perf_counter()
+        report = BuildReport(started_at=datetime.now().isoformat(timespec="seconds"))
+        selected = self.select(names)
+        pending = {name: set(self.dependencies[name]) & set(selected) for name in selected}
+        finished: Dict[str, str] = {}
+        jobs = jobs or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        running = {}
+
+        def finish(result: TargetResult):
+            finished[result.name] = result.status
+            report.results.append(result)
+            icon = {"built": "✅", "cached": "⚡", "failed": "❌", "skipped": "⏭️"}[result.status]
+            logger.info(f"{icon} {result.name}: {result.status} ({result.error or result.reason}) {result.seconds:.2f}s")
+
+        try:
+            while pending or running:
+                for name in [n for n in self.order if n in pending and not (pending[n] - finished.keys())]:
+                    deps = pending.pop(name)
+                    target = self.targets[name]
+                    broken = sorted(d for d in deps if finished[d] in ("failed", "skipped"))
+                    if broken:
+                        finish(TargetResult(name, "skipped", f"upstream failed: {', '.join(broken)}"))
+                        continue
+                    fingerprint = self.fingerprint(target)
+                    reason = "forced" if force else self.stale_reason(target, fingerprint)
+                    if reason is None:
+                        finish(TargetResult(name, "cached", "up to date"))
+                    elif executor is None:
+                        try:
+                            seconds = _run_target(target.build, str(self.root))
+                            finish(self._built(target, reason, seconds))
+                        except Exception as e:
+                            finish(TargetResult(name, "failed", reason, error=f"{type(e).__name__}: {e}"))
+                    else:
+                        running[executor.submit(_run_target, target.build, str(self.root))] = (name, reason)
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, reason = running.pop(future)
+                    try:
+                        finish(self._built(self.targets[name], reason, future.result()))
+                    except Exception as e:
+                        finish(TargetResult(name, "failed", reason, error=f"{type(e).__name__}: {e}"))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _built(self, target: Target, reason: str, seconds: float) -> TargetResult:
+        missing = [o for o in target.outputs if not (self.root / o).exists()]
+        if missing:
+            return TargetResult(target.name, "failed", reason, seconds, error=f"build did not write {missing}")
+        # Re-fingerprint: inputs are hashed again in case the build touched them
+        self._record(target, self.fingerprint(target), seconds)
+        return TargetResult(target.name, "built", reason, seconds)
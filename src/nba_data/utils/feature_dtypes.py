@@ -0,0 +1,140 @@
+"""
+Typed Feature Frames
+
+The predictive datasets are wide CSVs (~150 columns) that every loader reads
+with default dtypes: float64 for every metric and Python-object strings for
+PLAYER_NAME, SEASON and the archetype labels. The Streamlit workers and the
+batch scripts each keep several copies of these frames, so this module
+declares one dtype schema for them and applies it after loading:
+
+- metrics: float32 (the models train on float32 anyway); a column stays
+  float64 only if it holds whole numbers beyond float32's exact range
+- IDs: nullable integers (Int32, Int64 if the values need it)
+- player names, team abbreviations, archetype labels: categoricals
+- seasons: ordered categoricals, so sorting and max() stay chronological
+- other integer counts: int32 when they fit
+
+Apply it once, after the loader's merges (merging on a categorical key
+against an object key returns an object key again).
+
+Example:
+    df = read_feature_csv("results/predictive_dataset.csv")
+    df = apply_feature_dtypes(merged_frame)
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ID_COLUMNS = ('PLAYER_ID', 'player_id', 'TEAM_ID', 'OPPONENT_TEAM_ID')
+CATEGORY_COLUMNS = (
+    'PLAYER_NAME', 'player_name', 'TEAM_ABBREVIATION', 'OPPONENT_ABBREV',
+    'ARCHETYPE', 'PREDICTED_ARCHETYPE', 'RISK_CATEGORY',
+)
+SEASON_COLUMNS = ('SEASON', 'season')
+
+# Whole numbers above 2**24 are not exactly representable in float32
+FLOAT32_EXACT_INT = 2 ** 24
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def _id_dtype(values: pd.Series) -> Union[str, None]:
+    """Nullable integer dtype for an ID column, or None if it holds non-integral values."""
+    numeric = pd.to_numeric(values, errors='coerce')
+    present = numeric.dropna()
+    if numeric.isna().sum() != values.isna().sum() or not (present == np.floor(present)).all():
+        return None
+    if present.empty or (present.min() >= INT32_MIN and present.max() <= INT32_MAX):
+        return 'Int32'
+    return 'Int64'
+
+
+def _keeps_float64(values: np.ndarray) -> bool:
+    finite = values[np.isfinite(values)]
+    large = np.abs(finite) > FLOAT32_EXACT_INT
+    return bool(large.any() and (finite[large] == np.floor(finite[large])).all())
+
+
+def apply_feature_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return `df` with the feature dtype schema applied.
+
+    Columns the schema does not cover (and ID columns holding non-integral
+    values) keep their dtype.
+
+    Args:
+        df: Feature frame as loaded from CSV (and merged)
+
+    Returns:
+        New DataFrame with compact dtypes
+    """
+    converted = {}
+    for col in df.columns:
+        values = df[col]
+        dtype = values.dtype
+        if col in ID_COLUMNS:
+            target = _id_dtype(values)
+            if target is None:
+                logger.debug(f"Leaving ID column {col} as {dtype}: non-integral values")
+            elif dtype != target:
+                converted[col] = pd.to_numeric(values, errors='coerce').astype(target)
+        elif col in SEASON_COLUMNS:
+            if not isinstance(dtype, pd.CategoricalDtype) or not dtype.ordered:
+                seasons = sorted(values.dropna().astype(str).unique())
+                converted[col] = values.astype(str).where(values.notna()).astype(
+                    pd.CategoricalDtype(seasons, ordered=True))
+        elif col in CATEGORY_COLUMNS:
+            if not isinstance(dtype, pd.CategoricalDtype):
+                converted[col] = values.astype('category')
+        elif dtype == np.float64:
+            if not _keeps_float64(values.to_numpy()):
+                converted[col] = values.astype(np.float32)
+        elif dtype == np.int64:
+            if values.empty or (values.min() >= INT32_MIN and values.max() <= INT32_MAX):
+                converted[col] = values.astype(np.int32)
+
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def read_feature_csv(path: Union[str, Path], **kwargs) -> pd.DataFrame:
+    """pd.read_csv with the feature dtype schema applied."""
+    return apply_feature_dtypes(pd.read_csv(path, **kwargs))
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    """Deep memory usage of a frame in MB (object strings included)."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def memory_report(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Memory of each frame with default dtypes vs. the feature dtype schema.
+
+    Args:
+        frames: Name -> frame with default (as-read) dtypes
+
+    Returns:
+        DataFrame with rows, columns, default_mb, typed_mb and saved_pct per frame,
+        plus a TOTAL row
+    """
+    rows = []
+    for name, df in frames.items():
+        default_mb = frame_memory_mb(df)
+        typed_mb = frame_memory_mb(apply_feature_dtypes(df))
+        rows.append({'frame': name, 'rows': len(df), 'columns': df.shape[1],
+                     'default_mb': default_mb, 'typed_mb': typed_mb})
+    report = pd.DataFrame(rows, columns=['frame', 'rows', 'columns', 'default_mb', 'typed_mb'])
+    if not report.empty:
+        total = {'frame': 'TOTAL', 'rows': report['rows'].sum(), 'columns': pd.NA,
+                 'default_mb': report['default_mb'].sum(), 'typed_mb': report['typed_mb'].sum()}
+        report = pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+        report = report.astype({'rows': 'int64', 'columns': 'Int64'})
+    report['saved_pct'] = (1 - report['typed_mb'] / report['default_mb']) * 100
+    return report
@@ -0,0 +1,295 @@
+"""
+Bootstrap Friction Coefficients
+
+Confidence intervals for the friction coefficients derived by
+scripts/derive_friction_coefficients.py (average change in TS% per 1%
+increase in USG%, per SHOT_QUALITY_GENERATION_DELTA archetype).
+
+Replicates resample players, not rows: a player's consecutive-season deltas
+only exist within that player, so drawing players with replacement and
+re-running calculate_yoy_deltas on the resample gives exactly the sampled
+players' delta rows, each repeated once per draw. The deltas are therefore
+computed once and every replicate is a row of per-delta weights. A chunk of
+replicates is evaluated at once on a (replicates x deltas) weight matrix:
+
+- the 10th/90th SQ delta percentiles (archetype thresholds) are re-derived
+  per replicate as quantiles of the weighted sample
+- per-archetype means of DELTA_USG / DELTA_TS over the usage increases
+  (>2%) are weighted sums, i.e. matrix products
+
+Chunks are seeded from one SeedSequence, so results do not depend on how
+many worker processes run them.
+
+Example:
+    result = bootstrap_friction(deltas_df, n_replicates=2000, jobs=4)
+    result.summary()          # point estimate, mean, std and CI per archetype
+    result.save()             # results/friction_coefficients_bootstrap.json
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTIFACT_PATH = Path("results/friction_coefficients_bootstrap.json")
+
+ARCHETYPES = ('High SQ Delta (Creators)', 'Low SQ Delta (Finishers)', 'Mid SQ Delta')
+THRESHOLD_COLUMNS = ('LOW_SQ_THRESHOLD', 'HIGH_SQ_THRESHOLD')
+SQ_QUANTILES = (0.1, 0.9)
+MIN_USAGE_INCREASE = 0.02
+
+
+@dataclass
+class DeltaArrays:
+    """Year-over-year deltas as arrays sorted by previous-season SQ delta."""
+    sq_delta: np.ndarray
+    delta_usg: np.ndarray
+    delta_ts: np.ndarray
+    increased: np.ndarray  # DELTA_USG > MIN_USAGE_INCREASE
+    player: np.ndarray     # player code (0..n_players-1) of each delta
+    n_players: int
+
+    @classmethod
+    def from_deltas(cls, deltas_df: pd.DataFrame, player_col: str = 'PLAYER_ID') -> "DeltaArrays":
+        """Arrays from the output of calculate_yoy_deltas (rows without PREV_SQ_DELTA are dropped)."""
+        df = deltas_df.dropna(subset=['PREV_SQ_DELTA']).sort_values('PREV_SQ_DELTA', kind='stable')
+        player, players = pd.factorize(df[player_col])
+        delta_usg = df['DELTA_USG'].to_numpy(dtype=float)
+        return cls(
+            sq_delta=df['PREV_SQ_DELTA'].to_numpy(dtype=float),
+            delta_usg=delta_usg,
+            delta_ts=df['DELTA_TS'].to_numpy(dtype=float),
+            increased=delta_usg > MIN_USAGE_INCREASE,
+            player=player,
+            n_players=len(players),
+        )
+
+
+def _weighted_quantile(sorted_values: np.ndarray, cum_weights: np.ndarray, q: float) -> np.ndarray:
+    """
+    Per-row quantile of the sample that repeats sorted_values[j] weights[j]
+    times, with pandas' default linear interpolation.
+    """
+    n_rows, n = cum_weights.shape
+    total = cum_weights[:, -1]
+    position = (total - 1) * q
+    below = np.floor(position)
+    frac = position - below
+    above = np.minimum(below + 1, total - 1)
+
+    # Offsetting each row by more than the largest total keeps the flattened
+    # cumulative weights sorted, so one searchsorted serves every row
+    stride = total.max() + 1
+    offsets = np.arange(n_rows) * stride
+    flat = (cum_weights + offsets[:, None]).ravel()
+    row_start = np.arange(n_rows) * n
+    lo = np.searchsorted(flat, below + offsets, side='right') - row_start
+    hi = np.searchsorted(flat, above + offsets, side='right') - row_start
+    return sorted_values[lo] + frac * (sorted_values[hi] - sorted_values[lo])
+
+
+def friction_from_weights(arrays: DeltaArrays, weights: np.ndarray) -> pd.DataFrame:
+    """
+    Friction coefficients and archetype thresholds for each row of weights.
+
+    Args:
+        arrays: Prepared deltas
+        weights: (replicates x deltas) count of each delta in a replicate
+
+    Returns:
+        One row per replicate: a coefficient column per archetype (NaN if the
+        archetype has no usage increase in the replicate), sample-size columns
+        (n_<archetype>) and the LOW/HIGH_SQ_THRESHOLD used
+    """
+    cum_weights = np.cumsum(weights, axis=1)
+    low, high = (_weighted_quantile(arrays.sq_delta, cum_weights, q) for q in SQ_QUANTILES)
+
+    is_high = arrays.sq_delta >= high[:, None]
+    is_low = (arrays.sq_delta <= low[:, None]) & ~is_high
+    masks = {ARCHETYPES[0]: is_high, ARCHETYPES[1]: is_low, ARCHETYPES[2]: ~(is_high | is_low)}
+
+    increase_weights = (weights * arrays.increased).astype(float)
+    out = {}
+    for archetype, mask in masks.items():
+        w = increase_weights * mask
+        size = w.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_delta_usg = (w @ arrays.delta_usg) / size
+            avg_delta_ts = (w @ arrays.delta_ts) / size
+            out[archetype] = avg_delta_ts / (avg_delta_usg * 100)
+        out[f'n_{archetype}'] = size.astype(np.int64)
+    out[THRESHOLD_COLUMNS[0]] = low
+    out[THRESHOLD_COLUMNS[1]] = high
+    return pd.DataFrame(out)
+
+
+def resample_weights(arrays: DeltaArrays, n_replicates: int, rng: np.random.Generator) -> np.ndarray:
+    """(replicates x deltas) weights from drawing n_players players with replacement."""
+    draws = rng.integers(0, arrays.n_players, size=(n_replicates, arrays.n_players))
+    # One bincount over row-offset draws counts every replicate at once
+    offsets = np.arange(n_replicates)[:, None] * arrays.n_players
+    counts = np.bincount((draws + offsets).ravel(), minlength=n_replicates * arrays.n_players)
+    return counts.reshape(n_replicates, arrays.n_players)[:, arrays.player]
+
+
+def _run_chunk(arrays: DeltaArrays, n_replicates: int, seed: np.random.SeedSequence) -> pd.DataFrame:
+    weights = resample_weights(arrays, n_replicates, np.random.default_rng(seed))
+    return friction_from_weights(arrays, weights)
+
+
+_WORKER_ARRAYS: Optional[DeltaArrays] = None
+
+
+def _init_bootstrap_worker(arrays: DeltaArrays):
+    """Process-pool initializer: ship the deltas to each worker once."""
+    global _WORKER_ARRAYS
+    _WORKER_ARRAYS = arrays
+
+
+def _bootstrap_worker(task):
+    n_replicates, seed = task
+    return _run_chunk(_WORKER_ARRAYS, n_replicates, seed)
+
+
+@dataclass
+class FrictionBootstrap:
+    """Point estimates and bootstrap replicates of the friction coefficients."""
+    point: pd.DataFrame        # one row: the estimate on the full sample
+    replicates: pd.DataFrame   # one row per replicate
+    seed: int
+    n_players: int
+    n_deltas: int
+    confidence: float = 0.95
+
+    def summary(self, confidence: Optional[float] = None) -> pd.DataFrame:
+        """
+        Per-archetype coefficient distribution.
+
+        Returns:
+            DataFrame indexed by ARCHETYPE with FRICTION_COEFFICIENT (point
+            estimate), sample_size, BOOT_MEAN, BOOT_STD, CI_LOWER / CI_UPPER
+            (percentile interval) and valid_replicates
+        """
+        confidence = self.confidence if confidence is None else confidence
+        tail = (1 - confidence) / 2 * 100
+        rows = []
+        for archetype in ARCHETYPES:
+            values = self.replicates[archetype].to_numpy(dtype=float)
+            valid = values[~np.isnan(values)]
+            lower, upper = np.percentile(valid, [tail, 100 - tail]) if len(valid) else (np.nan, np.nan)
+            rows.append({
+                'ARCHETYPE': archetype,
+                'FRICTION_COEFFICIENT': float(self.point[archetype].iloc[0]),
+                'sample_size': int(self.point[f'n_{archetype}'].iloc[0]),
+                'BOOT_MEAN': valid.mean() if len(valid) else np.nan,
+                'BOOT_STD': valid.std(ddof=1) if len(valid) > 1 else np.nan,
+                'CI_LOWER': lower,
+                'CI_UPPER': upper,
+                'valid_replicates': len(valid),
+            })
+        return pd.DataFrame(rows).set_index('ARCHETYPE')
+
+    def threshold_summary(self, confidence: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Point estimate and percentile interval of the low/high SQ delta thresholds."""
+        confidence = self.confidence if confidence is None else confidence
+        tail = (1 - confidence) / 2 * 100
+        out = {}
+        for key, col in zip(('low', 'high'), THRESHOLD_COLUMNS):
+            lower, upper = np.percentile(self.replicates[col], [tail, 100 - tail])
+            out[key] = {'point': float(self.point[col].iloc[0]),
+                        'ci_lower': float(lower), 'ci_upper': float(upper)}
+        return out
+
+    def to_dict(self) -> Dict:
+        summary = self.summary()
+        return {
+            'n_replicates': len(self.replicates),
+            'confidence': self.confidence,
+            'seed': self.seed,
+            'resample_unit': 'player',
+            'n_players': self.n_players,
+            'n_deltas': self.n_deltas,
+            'min_usage_increase': MIN_USAGE_INCREASE,
+            'thresholds': self.threshold_summary(),
+            'coefficients': {
+                archetype: {
+                    'friction_coefficient': row['FRICTION_COEFFICIENT'],
+                    'sample_size': int(row['sample_size']),
+                    'mean': None if np.isnan(row['BOOT_MEAN']) else float(row['BOOT_MEAN']),
+                    'std': None if np.isnan(row['BOOT_STD']) else float(row['BOOT_STD']),
+                    'ci_lower': None if np.isnan(row['CI_LOWER']) else float(row['CI_LOWER']),
+                    'ci_upper': None if np.isnan(row['CI_UPPER']) else float(row['CI_UPPER']),
+                    'valid_replicates': int(row['valid_replicates']),
+                }
+                for archetype, row in summary.iterrows()
+            },
+        }
+
+    def save(self, path: Union[str, Path] = DEFAULT_ARTIFACT_PATH,
+             replicates_path: Optional[Union[str, Path]] = None) -> Path:
+        """Write the JSON artifact (and optionally every replicate as CSV)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        if replicates_path is not None:
+            self.replicates.to_csv(replicates_path, index_label='replicate')
+        return path
+
+
+def bootstrap_friction(
+    deltas_df: pd.DataFrame,
+    n_replicates: int = 2000,
+    seed: int = 42,
+    jobs: Optional[int] = 1,
+    chunk_size: int = 250,
+    confidence: float = 0.95,
+) -> FrictionBootstrap:
+    """
+    Bootstrap the per-archetype friction coefficients by resampling players.
+
+    Args:
+        deltas_df: Output of calculate_yoy_deltas (PLAYER_ID, PREV_SQ_DELTA,
+            DELTA_USG, DELTA_TS)
+        n_replicates: Number of bootstrap replicates
+        seed: Seed for the replicate draws (same seed, same replicates, for
+            any number of jobs)
+        jobs: Worker processes (None = all CPUs; 1 runs in-process)
+        chunk_size: Replicates evaluated per weight matrix
+        confidence: Default interval width for summaries
+
+    Returns:
+        FrictionBootstrap
+    """
+    arrays = DeltaArrays.from_deltas(deltas_df)
+    if arrays.n_players == 0:
+        raise ValueError("No year-over-year deltas to resample")
+
+    point = friction_from_weights(arrays, np.ones((1, len(arrays.sq_delta)), dtype=np.int64))
+
+    sizes = [chunk_size] * (n_replicates // chunk_size)
+    if n_replicates % chunk_size:
+        sizes.append(n_replicates % chunk_size)
+    tasks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks)) or 1
+    logger.info(f"Bootstrapping {n_replicates} replicates over {arrays.n_players} players "
+                f"({len(arrays.sq_delta)} deltas) in {len(tasks)} chunks on {jobs} processes...")
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_bootstrap_worker,
+                                 initargs=(arrays,)) as pool:
+            chunks = list(pool.map(_bootstrap_worker, tasks))
+    else:
+        chunks = [_run_chunk(arrays, n, s) for n, s in tasks]
+
+    replicates = pd.concat(chunks, ignore_index=True) if chunks else point.iloc[:0]
+    return FrictionBootstrap(point=point, replicates=replicates, seed=seed, n_players=arrays.n_players,
+                             n_deltas=len(arrays.sq_delta), confidence=confidence)
@@ -0,0 +1,198 @@
+"""
+Shared Game Log Enrichment
+
+Derives the per-game context columns that feature scripts used to compute
+separately (and row by row) from the collected game logs:
+
+- OPPONENT_ABBREV / OPPONENT_TEAM_ID / IS_HOME, parsed from MATCHUP
+  ("BOS vs. MIA" is a home game for BOS, "BOS @ MIA" an away game)
+- GAME_SCORE (Hollinger)
+- OPP_DEF_RATING / OPP_DEF_RANK / OPP_DCS and the opponent-tier flags
+  IS_TOP_10_DEF, IS_BOTTOM_10_DEF, IS_ELITE_DEF, IS_WEAK_DEF
+
+Everything is computed with vectorized string and array operations.
+`load_enriched_game_logs()` caches the result per season under
+data/cache/enriched_game_logs and rebuilds it when an input file changes.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.nba_data.constants import ABBREV_TO_ID, HISTORICAL_ABBREV_MAP
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/cache/enriched_game_logs")
+
+# Raw log file per kind of game log, formatted with the season.
+LOG_FILES = {
+    "rs": "rs_game_logs_{season}.csv",
+    "playoffs": "playoff_logs_{season}.csv",
+}
+
+# Opponent tiers (rank by DEF_RATING, lower is better; DCS thresholds).
+TOP_DEFENSE_RANK = 10
+BOTTOM_DEFENSE_RANK = 20
+ELITE_DCS = 70
+WEAK_DCS = 40
+
+MATCHUP_PATTERN = r"^\s*(?P<first>\S+)\s+(?P<sep>vs\.|@)\s+(?P<second>\S+)\s*$"
+
+
+def parse_matchups(matchup: pd.Series, team_abbrev: pd.Series) -> pd.DataFrame:
+    """
+    Split MATCHUP strings into opponent abbreviation and home flag.
+
+    The opponent is whichever side is not the player's team. Unparseable
+    (or missing) matchups give a missing opponent and IS_HOME = <NA>
+    (nullable boolean dtype).
+
+    Returns:
+        DataFrame with OPPONENT_ABBREV and IS_HOME, aligned to `matchup`
+    """
+    # A season has only ~1,800 distinct matchups: parse those, then broadcast.
+    codes, uniques = pd.factorize(matchup)
+    parsed = pd.Series(uniques, dtype="string").str.extract(MATCHUP_PATTERN)
+    parts = parsed.reindex(codes).set_axis(matchup.index)
+    team = team_abbrev.astype("string").str.strip()
+    team_first = (parts["first"] == team).fillna(False).astype(bool)
+
+    opponent = parts["second"].where(team_first, parts["first"])
+    # "A vs. B": A is home. "A @ B": B is home.
+    first_is_home = parts["sep"] == "vs."
+    is_home = first_is_home.where(team_first, ~first_is_home).astype("boolean")
+    is_home = is_home.mask(parts["sep"].isna(), pd.NA)
+    return pd.DataFrame({"OPPONENT_ABBREV": opponent, "IS_HOME": is_home}, index=matchup.index)
+
+
+def team_ids_from_abbrev(abbrev: pd.Series) -> pd.Series:
+    """Map abbreviations to team IDs, resolving historical abbreviations."""
+    return abbrev.replace(HISTORICAL_ABBREV_MAP).map(ABBREV_TO_ID).astype("Int64")
+
+
+def game_score(logs: pd.DataFrame) -> pd.Series:
+    """
+    Hollinger Game Score for every row.
+
+    GmSc = PTS + 0.4*FGM - 0.7*FGA - 0.4*(FTA - FTM) + 0.7*OREB + 0.3*DREB
+           + STL + 0.7*AST + 0.7*BLK - 0.4*PF - TOV
+
+    OREB/DREB default to 0 when absent; if any other component is missing the
+    score is 0 for every row.
+    """
+    required = ["PTS", "FGM", "FGA", "FTA", "FTM", "STL", "AST", "BLK", "PF", "TOV"]
+    if any(col not in logs.columns for col in required):
+        return pd.Series(0.0, index=logs.index)
+
+    zero = pd.Series(0.0, index=logs.index)
+    return (
+        logs["PTS"] + 0.4 * logs["FGM"] - 0.7 * logs["FGA"] - 0.4 * (logs["FTA"] - logs["FTM"])
+        + 0.7 * logs.get("OREB", zero) + 0.3 * logs.get("DREB", zero)
+        + logs["STL"] + 0.7 * logs["AST"] + 0.7 * logs["BLK"] - 0.4 * logs["PF"] - logs["TOV"]
+    )
+
+
+def defense_tiers(def_context: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per team with its defensive rank, DCS and tier flags.
+
+    Rank 1 is the lowest DEF_RATING; ties are broken by order of appearance.
+    """
+    tiers = pd.DataFrame({"TEAM_ID": def_context["TEAM_ID"].astype("int64")})
+    tiers["OPP_DEF_RATING"] = def_context["DEF_RATING"].to_numpy()
+    tiers["OPP_DEF_RANK"] = def_context["DEF_RATING"].rank(method="first", ascending=True).to_numpy()
+    if "def_context_score" in def_context.columns:
+        tiers["OPP_DCS"] = def_context["def_context_score"].to_numpy()
+    else:
+        tiers["OPP_DCS"] = np.nan
+    tiers["IS_TOP_10_DEF"] = tiers["OPP_DEF_RANK"] <= TOP_DEFENSE_RANK
+    tiers["IS_BOTTOM_10_DEF"] = tiers["OPP_DEF_RANK"] > BOTTOM_DEFENSE_RANK
+    tiers["IS_ELITE_DEF"] = tiers["OPP_DCS"] > ELITE_DCS
+    tiers["IS_WEAK_DEF"] = tiers["OPP_DCS"] < WEAK_DCS
+    return tiers
+
+
+def enrich_game_logs(logs: pd.DataFrame, def_context: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Add opponent, home/away, game score and opponent-defense columns.
+
+    Args:
+        logs: Game logs with MATCHUP and TEAM_ABBREVIATION
+        def_context: defensive_context_{season}.csv frame (TEAM_ID, DEF_RATING,
+            def_context_score); without it only the opponent and game score
+            columns are added
+
+    Returns:
+        Copy of `logs` with the enrichment columns. Rows whose opponent
+        cannot be resolved keep missing IDs and False tier flags.
+    """
+    enriched = logs.copy()
+    enriched[["OPPONENT_ABBREV", "IS_HOME"]] = parse_matchups(enriched["MATCHUP"], enriched["TEAM_ABBREVIATION"])
+    enriched["OPPONENT_TEAM_ID"] = team_ids_from_abbrev(enriched["OPPONENT_ABBREV"])
+    enriched["GAME_SCORE"] = game_score(enriched)
+
+    if def_context is None or def_context.empty:
+        return enriched
+
+    tiers = defense_tiers(def_context).set_index("TEAM_ID")
+    opponent = enriched["OPPONENT_TEAM_ID"]
+    for col in tiers.columns:
+        values = opponent.map(tiers[col])
+        if tiers[col].dtype == bool:
+            values = values.fillna(False).astype(bool)
+        enriched[col] = values
+    return enriched
+
+
+def _fingerprint(paths) -> list:
+    return [[str(p), p.stat().st_size, p.stat().st_mtime_ns] for p in paths if p.exists()]
+
+
+def load_enriched_game_logs(season: str, kind: str = "rs", data_dir: Union[str, Path] = "data",
+                            cache_dir: Union[str, Path, None] = DEFAULT_CACHE_DIR,
+                            refresh: bool = False) -> pd.DataFrame:
+    """
+    Load a season's game logs with the enrichment columns, cached per season.
+
+    Args:
+        season: Season string (e.g. '2023-24')
+        kind: 'rs' for rs_game_logs_{season}.csv, 'playoffs' for playoff_logs_{season}.csv
+        data_dir: Directory with the collected CSVs
+        cache_dir: Where enriched frames are cached; None disables caching
+        refresh: Rebuild even if the cache is current
+
+    Returns:
+        Enriched game logs, or an empty DataFrame if the log file is missing
+    """
+    if kind not in LOG_FILES:
+        raise ValueError(f"Unknown game log kind '{kind}', expected one of {list(LOG_FILES)}")
+
+    data_dir = Path(data_dir)
+    logs_path = data_dir / LOG_FILES[kind].format(season=season)
+    def_path = data_dir / f"defensive_context_{season}.csv"
+    if not logs_path.exists():
+        logger.warning(f"Game logs not found at {logs_path}")
+        return pd.DataFrame()
+
+    fingerprint = _fingerprint([logs_path, def_path])
+    cache_path = Path(cache_dir) / f"{kind}_{season}.pkl" if cache_dir is not None else None
+    if cache_path is not None and cache_path.exists() and not refresh:
+        cached = pd.read_pickle(cache_path)
+        if cached.get("fingerprint") == fingerprint:
+            return cached["logs"]
+
+    logs = pd.read_csv(logs_path, dtype={"GAME_ID": str})
+    def_context = pd.read_csv(def_path) if def_path.exists() else None
+    if def_context is None:
+        logger.warning(f"Defensive context not found at {def_path}; opponent tiers omitted")
+    enriched = enrich_game_logs(logs, def_context)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle({"fingerprint": fingerprint, "logs": enriched}, cache_path)
+        logger.info(f"Cached enriched {kind} game logs for {season} ({len(enriched):,} rows)")
+    return enriched
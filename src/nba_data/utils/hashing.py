@@ -0,0 +1,39 @@
+"""
+Content Digests
+
+SHA-256 digests of files and DataFrames, shared by every cache that decides
+staleness by content: season partitions, training tables, the model
+registry's artifact checksums and the sweep/tuning fold caches.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+MISSING = "missing"
+
+PathLike = Union[str, Path]
+
+
+def file_digest(path: PathLike) -> str:
+    """SHA-256 of a file's content, or 'missing'."""
+    path = Path(path)
+    if not path.exists():
+        return MISSING
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def frame_digest(df: Optional[pd.DataFrame]) -> str:
+    """SHA-256 of a frame's columns and values (row order matters, index does not)."""
+    if df is None:
+        return MISSING
+    digest = hashlib.sha256(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
@@ -13,9 +13,15 @@ Core Principles:
     creator archetype (SQ_DELTA quantiles).
 """
 
+import json
+import logging
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-from typing import Dict, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
 
 # Empirically derived friction coefficients from 'derive_friction_coefficients.py'
 # Represents the change in TS% for each 1% increase in USG%.
@@ -34,6 +40,33 @@ SQ_DELTA_THRESHOLDS = {
     'high': 0.1685
 }
 
+# Bootstrap artifact written by 'derive_friction_coefficients.py --bootstrap N'
+FRICTION_ARTIFACT_PATH = Path("results/friction_coefficients_bootstrap.json")
+
+
+def load_friction_coefficients(
+    path: Union[str, Path] = FRICTION_ARTIFACT_PATH
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Friction coefficients and SQ_DELTA thresholds from the bootstrap artifact.
+
+    Falls back to the hard-coded FRICTION_COEFFICIENTS / SQ_DELTA_THRESHOLDS
+    when the artifact does not exist.
+
+    Returns:
+        (archetype -> coefficient, {'low': ..., 'high': ...}) point estimates
+    """
+    path = Path(path)
+    if not path.exists():
+        logger.info(f"No friction artifact at {path}; using built-in coefficients")
+        return dict(FRICTION_COEFFICIENTS), dict(SQ_DELTA_THRESHOLDS)
+    with open(path) as f:
+        artifact = json.load(f)
+    coefficients = {archetype: spec['friction_coefficient']
+                    for archetype, spec in artifact['coefficients'].items()}
+    thresholds = {key: spec['point'] for key, spec in artifact['thresholds'].items()}
+    return coefficients, thresholds
+
 
 def get_player_archetype(shot_quality_generation_delta: float) -> str:
     """
@@ -113,6 +146,195 @@ def project_efficiency(
         "delta_ts_raw": delta_ts_raw
     }
 
+def project_efficiency_frame(
+    base_usg: Union[np.ndarray, pd.Series],
+    base_ts: Union[np.ndarray, pd.Series],
+    shot_quality_generation_delta: Union[np.ndarray, pd.Series],
+    target_usg: Union[np.ndarray, pd.Series, float],
+    friction_coefficients: Optional[Dict[str, float]] = None,
+    sq_delta_thresholds: Optional[Dict[str, float]] = None
+) -> pd.DataFrame:
+    """
+    Vectorized project_efficiency for many players (or usages) at once.
+
+    Args:
+        base_usg, base_ts, shot_quality_generation_delta: Arrays of equal length.
+        target_usg: Target USG% per row, or one target for all rows.
+        friction_coefficients, sq_delta_thresholds: Override the built-in
+            values (e.g. with load_friction_coefficients()).
+
+    Returns:
+        DataFrame with the same columns as project_efficiency's dictionary,
+        one row per input row (NaN / "Unknown" where an input is missing).
+    """
+    base_usg = np.asarray(base_usg, dtype=float)
+    base_ts = np.asarray(base_ts, dtype=float)
+    sq_delta = np.asarray(shot_quality_generation_delta, dtype=float)
+    target_usg = np.broadcast_to(np.asarray(target_usg, dtype=float), base_usg.shape)
+
+    coefficients = FRICTION_COEFFICIENTS if friction_coefficients is None else friction_coefficients
+    thresholds = SQ_DELTA_THRESHOLDS if sq_delta_thresholds is None else sq_delta_thresholds
+
+    known = ~(np.isnan(base_usg) | np.isnan(base_ts) | np.isnan(sq_delta))
+    archetype = np.select(
+        [sq_delta >= thresholds['high'], sq_delta <= thresholds['low']],
+        ['High SQ Delta (Creators)', 'Low SQ Delta (Finishers)'],
+        default='Mid SQ Delta'
+    )
+    friction_coeff = pd.Series(archetype).map(coefficients).to_numpy(dtype=float)
+    # Same Finisher cap as project_efficiency
+    is_capped = (archetype == 'Low SQ Delta (Finishers)') & (friction_coeff > 0)
+    friction_coeff = np.where(is_capped, 0.0, friction_coeff)
+
+    delta_usg = target_usg - base_usg
+    delta_ts_raw = friction_coeff * delta_usg * 100
+    projected_ts = base_ts + delta_ts_raw / 100
+
+    nan = np.full(base_usg.shape, np.nan)
+    return pd.DataFrame({
+        "projected_ts": np.where(known, projected_ts, nan),
+        "archetype": np.where(known, archetype, "Unknown"),
+        "friction_coefficient": np.where(known, friction_coeff, nan),
+        "delta_usg": np.where(known, delta_usg, nan),
+        "delta_ts_raw": np.where(known, delta_ts_raw, nan),
+    })
+
+def calculate_empirical_usage_buckets(df: pd.DataFrame, min_bucket_size: int = 10):
+    """
+    Fit empirical feature-vs-usage curves (per-bucket medians) from the dataset.
+
+    Returns:
+        UsageCurves; `'25-30%' in curves` and `curves['25-30%']` give the
+        feature medians of a bucket.
+    """
+    from src.nba_data.utils.usage_projection import UsageCurves  # usage_projection imports this module
+    return UsageCurves.fit(df, min_bucket_size=min_bucket_size)
+
+
+def calculate_feature_percentiles(df: pd.DataFrame) -> Dict[str, Optional[float]]:
+    """
+    Reference thresholds for the Flash Multiplier, from rotation players
+    (USG% >= 10% and, when tracked, at least 50 pressure shots).
+
+    Returns:
+        Dictionary with creation_vol_25th, creation_tax_80th, efg_iso_80th,
+        pressure_resilience_80th and star_median_creation_vol (None if the
+        column is missing)
+    """
+    from src.nba_data.utils.usage_projection import normalize_usage
+
+    usage = normalize_usage(df['USG_PCT']) if 'USG_PCT' in df.columns else pd.Series(np.nan, index=df.index)
+    qualified = df[usage >= 0.10]
+    if 'RS_TOTAL_VOLUME' in qualified.columns:
+        qualified = qualified[qualified['RS_TOTAL_VOLUME'] >= 50]
+
+    def quantile(frame, col, q):
+        if col not in frame.columns or frame[col].notna().sum() == 0:
+            return None
+        return float(frame[col].quantile(q))
+
+    if 'ARCHETYPE' in df.columns:
+        stars = df[df['ARCHETYPE'].isin(['King (Resilient Star)', 'Bulldozer (Fragile Star)'])]
+    else:
+        stars = df[usage >= 0.25]
+
+    return {
+        'creation_vol_25th': quantile(qualified, 'CREATION_VOLUME_RATIO', 0.25),
+        'creation_tax_80th': quantile(qualified, 'CREATION_TAX', 0.80),
+        'efg_iso_80th': quantile(qualified, 'EFG_ISO_WEIGHTED', 0.80),
+        'pressure_resilience_80th': quantile(qualified, 'RS_PRESSURE_RESILIENCE', 0.80),
+        'star_median_creation_vol': quantile(stars, 'CREATION_VOLUME_RATIO', 0.50),
+    }
+
+
+def project_stress_vectors_for_usage(
+    player_data: pd.Series,
+    target_usage: float,
+    usage_buckets,
+    percentiles: Dict[str, Optional[float]]
+) -> pd.Series:
+    """
+    Project one player's stress vectors to `target_usage` (usage simulator).
+
+    Features move along the empirical usage curves (see usage_projection),
+    TS% along the friction coefficients. When moving up in usage, a player
+    with elite efficiency on low creation volume ("flash") is projected to
+    at least the star-level median creation volume, and
+    `_FLASH_MULTIPLIER_ACTIVE` is set.
+
+    Args:
+        player_data: The player's row
+        target_usage: Target USG% as a fraction
+        usage_buckets: UsageCurves from calculate_empirical_usage_buckets
+        percentiles: Thresholds from calculate_feature_percentiles
+
+    Returns:
+        Projected player row
+    """
+    from src.nba_data.utils.usage_projection import normalize_usage, project_to_usages
+
+    projected = project_to_usages(player_data.to_frame().T, [target_usage], usage_buckets).iloc[0]
+    projected = projected.drop(['BASE_USAGE', 'TARGET_USAGE'])
+
+    current_usage = normalize_usage(pd.Series([player_data.get('USG_PCT')])).iloc[0]
+    creation_vol = pd.to_numeric(player_data.get('CREATION_VOLUME_RATIO'), errors='coerce')
+
+    def above(col, threshold):
+        value = pd.to_numeric(player_data.get(col), errors='coerce')
+        return threshold is not None and pd.notna(value) and value > threshold
+
+    is_flash = (
+        pd.notna(current_usage) and target_usage > current_usage
+        and percentiles.get('creation_vol_25th') is not None and pd.notna(creation_vol)
+        and creation_vol < percentiles['creation_vol_25th']
+        and percentiles.get('star_median_creation_vol') is not None
+        and (above('CREATION_TAX', percentiles.get('creation_tax_80th'))
+             or above('EFG_ISO_WEIGHTED', percentiles.get('efg_iso_80th'))
+             or above('RS_PRESSURE_RESILIENCE', percentiles.get('pressure_resilience_80th')))
+    )
+    if is_flash:
+        projected['CREATION_VOLUME_RATIO'] = max(
+            projected.get('CREATION_VOLUME_RATIO', creation_vol), percentiles['star_median_creation_vol'])
+    projected['_FLASH_MULTIPLIER_ACTIVE'] = bool(is_flash)
+    return projected
+
+
+def prepare_features_for_prediction(
+    player_data: pd.Series,
+    feature_names: Optional[List[str]] = None,
+    model=None
+) -> pd.DataFrame:
+    """
+    Build the one-row model input for a (projected) player.
+
+    Interaction features named A_X_B are computed from A and B when they are
+    not already present; anything else missing is NaN (XGBoost handles it).
+
+    Args:
+        player_data: The player's (projected) row
+        feature_names: Model feature order; defaults to model.feature_names_in_
+        model: Fitted model, used only when feature_names is None
+
+    Returns:
+        DataFrame with one row and the model's columns
+    """
+    if feature_names is None:
+        feature_names = list(model.feature_names_in_)
+
+    def value(name):
+        return pd.to_numeric(player_data.get(name, np.nan), errors='coerce')
+
+    row = {}
+    for name in feature_names:
+        if name in player_data.index:
+            row[name] = value(name)
+        elif '_X_' in name:
+            left, right = name.split('_X_', 1)
+            row[name] = value(left) * value(right)
+        else:
+            row[name] = np.nan
+    return pd.DataFrame([row], columns=feature_names).astype(float)
+
 # Example Usage (for demonstration and testing)
 if __name__ == '__main__':
     print("--- Universal Projection Engine: Example Cases ---")
@@ -0,0 +1,150 @@
+"""
+Season Partitions
+
+Season-scoped stages (stress vectors, shot quality generation) used to
+recompute every configured season on each run, although only the current
+season changes during the year. A SeasonPartitions store keeps one CSV per
+season for a stage, plus a manifest with the fingerprint of the inputs each
+partition was computed from:
+
+    data/partitions/<stage>/<season>.csv
+    data/partitions/<stage>/manifest.json
+
+A season's fingerprint is the SHA-256 of the stage's code files, the
+season's input files and (optionally) the content of in-memory input frames
+and parameters. A stage recomputes only the seasons whose fingerprint
+changed (or that it is told to refresh, e.g. the in-progress season whose
+API data cannot be fingerprinted), and re-assembles its combined output by
+concatenating the partitions.
+
+Example:
+    store = SeasonPartitions("shot_quality_generation", code=[__file__])
+    fingerprints = {s: store.fingerprint(s, inputs=[f"data/shot_quality/shot_quality_{s}.csv"]) for s in seasons}
+    for season in store.stale(fingerprints, refresh=args.refresh):
+        store.write(season, process_season(season), fingerprints[season])
+    combined = store.concat(seasons)
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from src.nba_data.utils.hashing import PathLike, file_digest, frame_digest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITIONS_DIR = Path("data/partitions")
+
+
+class SeasonPartitions:
+    """Per-season outputs of one stage, keyed by input fingerprints."""
+
+    def __init__(self, stage: str, code: Sequence[PathLike] = (), root: PathLike = DEFAULT_PARTITIONS_DIR):
+        """
+        Args:
+            stage: Stage name (partition subdirectory)
+            code: Source files whose content is part of every season's
+                fingerprint (the stage script and the modules it relies on)
+            root: Directory holding the stages' partitions
+        """
+        self.stage = stage
+        self.dir = Path(root) / stage
+        self.manifest_path = self.dir / "manifest.json"
+        self._code_digest = hashlib.sha256(
+            json.dumps([[Path(p).name, file_digest(p)] for p in code]).encode()).hexdigest()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        if self.manifest_path.exists():
+            try:
+                return json.loads(self.manifest_path.read_text())
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable partition manifest {self.manifest_path}: {e}")
+        return {}
+
+    def _save_manifest(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.manifest, indent=1, sort_keys=True))
+        tmp_path.replace(self.manifest_path)
+
+    def path(self, season: str) -> Path:
+        return self.dir / f"{season}.csv"
+
+    def fingerprint(self, season: str, inputs: Iterable[PathLike] = (),
+                    frames: Iterable[Optional[pd.DataFrame]] = (), params: Optional[dict] = None) -> str:
+        """
+        Fingerprint of one season's inputs.
+
+        Args:
+            season: Season string
+            inputs: Files the season is computed from (missing files count as 'missing')
+            frames: In-memory inputs, e.g. the season's slice of a shared dataset
+            params: JSON-serializable settings that change the output
+        """
+        payload = {
+            "season": season,
+            "code": self._code_digest,
+            "inputs": [[Path(p).as_posix(), file_digest(p)] for p in inputs],
+            "frames": [frame_digest(df) for df in frames],
+            "params": params or {},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def is_current(self, season: str, fingerprint: str) -> bool:
+        record = self.manifest.get(season)
+        return record is not None and record["fingerprint"] == fingerprint and self.path(season).exists()
+
+    def stale(self, fingerprints: Dict[str, str], refresh: Iterable[str] = ()) -> List[str]:
+        """
+        Seasons (in the order of `fingerprints`) that must be recomputed.
+
+        Args:
+            fingerprints: Season -> current fingerprint
+            refresh: Seasons to recompute regardless of their fingerprint
+        """
+        refresh = set(refresh)
+        stale = [s for s, fp in fingerprints.items() if s in refresh or not self.is_current(s, fp)]
+        current = [s for s in fingerprints if s not in stale]
+        logger.info(f"[{self.stage}] {len(stale)} of {len(fingerprints)} seasons to compute "
+                    f"({', '.join(stale) or 'none'}); reusing {len(current)} partitions")
+        return stale
+
+    def write(self, season: str, df: pd.DataFrame, fingerprint: str) -> Path:
+        """Store a season's output and record the fingerprint it was computed from."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(season)
+        tmp_path = path.with_suffix(".tmp")
+        df.to_csv(tmp_path, index=False)
+        tmp_path.replace(path)
+        self.manifest[season] = {
+            "fingerprint": fingerprint,
+            "rows": len(df),
+            "built_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._save_manifest()
+        return path
+
+    def remove(self, season: str) -> None:
+        """Drop a season's partition (e.g. its inputs no longer produce any rows)."""
+        self.path(season).unlink(missing_ok=True)
+        if self.manifest.pop(season, None) is not None:
+            self._save_manifest()
+
+    def read(self, season: str) -> pd.DataFrame:
+        return pd.read_csv(self.path(season))
+
+    def concat(self, seasons: Sequence[str]) -> pd.DataFrame:
+        """Partitions of `seasons` (in that order) as one frame; seasons without a partition are skipped."""
+        available = [s for s in seasons if s in self.manifest and self.path(s).exists()]
+        missing = [s for s in seasons if s not in available]
+        if missing:
+            logger.warning(f"[{self.stage}] No partitions for {missing}")
+        if not available:
+            return pd.DataFrame()
+        return pd.concat([self.read(s) for s in available], ignore_index=True)
@@ -0,0 +1,220 @@
+"""
+Declarative Split Aggregation
+
+Computes player x split aggregates from game logs in one grouped pass.
+Instead of filtering the logs once per split (vs top-10 defenses, vs
+bottom-10, ...) and looping over groupby groups, callers declare:
+
+- splits: name -> boolean row mask (None = all rows)
+- metrics: name -> Metric (sums, counts, means, weighted means, std and
+  ratios of sums such as TS%)
+
+Every metric is reduced to additive per-row primitives (value, count,
+value*weight, weight), the primitives are masked per split and summed with
+a single `groupby().sum()`, and the final metrics are derived from those
+sums with array arithmetic. Standard deviations take a second pass: squared
+deviations from each group's mean, summed per group with np.bincount
+(E[x^2] - E[x]^2 would cancel catastrophically for large, low-variance
+stats).
+
+Example:
+    aggregate_splits(
+        logs, by=["PLAYER_ID"],
+        splits={"vs_top10": logs["IS_TOP_10_DEF"], "vs_bottom10": logs["IS_BOTTOM_10_DEF"]},
+        metrics={"TS_PCT": true_shooting(), "MIN": total("MIN")},
+    )
+    # -> PLAYER_ID, TS_PCT_vs_top10, MIN_vs_top10, TS_PCT_vs_bottom10, MIN_vs_bottom10
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ROWS = ("rows",)
+
+
+@dataclass(frozen=True)
+class Metric:
+    """One aggregate; build with total(), count(), mean(), weighted_mean(), std() or ratio()."""
+    kind: str
+    column: Optional[str] = None
+    weight: Optional[str] = None
+    numerator: Tuple[Tuple[str, float], ...] = ()
+    denominator: Tuple[Tuple[str, float], ...] = ()
+    scale: float = 1.0
+    fill: float = np.nan
+
+    def primitives(self) -> List[tuple]:
+        """Additive per-row quantities this metric is computed from."""
+        if self.kind == "count":
+            return [ROWS]
+        if self.kind == "sum":
+            return [("sum", self.column)]
+        if self.kind == "mean":
+            return [("sum", self.column), ("n", self.column)]
+        if self.kind == "wmean":
+            return [("wsum", self.column, self.weight), ("wn", self.column, self.weight)]
+        if self.kind == "std":
+            return [("sum", self.column), ("n", self.column)]
+        if self.kind == "ratio":
+            return [("sum", col) for col, _ in self.numerator + self.denominator]
+        raise ValueError(f"Unknown metric kind '{self.kind}'")
+
+
+def total(column: str) -> Metric:
+    """Sum of a column (missing values count as 0)."""
+    return Metric("sum", column)
+
+
+def count() -> Metric:
+    """Number of rows (games)."""
+    return Metric("count")
+
+
+def mean(column: str, fill: float = np.nan) -> Metric:
+    """Mean of the non-missing values."""
+    return Metric("mean", column, fill=fill)
+
+
+def weighted_mean(column: str, weight: str, fill: float = np.nan) -> Metric:
+    """
+    sum(column * weight) / sum(weight); `fill` if the weights sum to 0.
+
+    A row whose `column` is missing adds nothing to the numerator but its
+    weight still counts in the denominator, like summing the products in
+    pandas (which skips NaN) and dividing by the total weight.
+    """
+    return Metric("wmean", column, weight=weight, fill=fill)
+
+
+def std(column: str, fill: float = np.nan) -> Metric:
+    """Sample standard deviation (ddof=1); `fill` with fewer than two values."""
+    return Metric("std", column, fill=fill)
+
+
+def ratio(numerator: Mapping[str, float], denominator: Mapping[str, float],
+          scale: float = 1.0, fill: float = np.nan) -> Metric:
+    """
+    scale * sum(coef * column) / sum(coef * column) over the split's rows.
+
+    `fill` is used where the denominator is not positive.
+    """
+    return Metric("ratio", numerator=tuple(numerator.items()), denominator=tuple(denominator.items()),
+                  scale=scale, fill=fill)
+
+
+def true_shooting(points: Optional[Mapping[str, float]] = None, fill: float = np.nan) -> Metric:
+    """TS% = PTS / (2 * (FGA + 0.44 * FTA)); pass `points` to build points from makes."""
+    return ratio(points or {"PTS": 1.0}, {"FGA": 2.0, "FTA": 0.88}, fill=fill)
+
+
+def _primitive_values(df: pd.DataFrame, primitive: tuple) -> np.ndarray:
+    kind = primitive[0]
+    if kind == "rows":
+        return np.ones(len(df))
+    values = pd.to_numeric(df[primitive[1]], errors="coerce").to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    if kind == "sum":
+        return np.where(present, values, 0.0)
+    if kind == "n":
+        return present.astype(float)
+    weights = pd.to_numeric(df[primitive[2]], errors="coerce").fillna(0).to_numpy(dtype=float)
+    if kind == "wsum":
+        return np.where(present, values * weights, 0.0)
+    if kind == "wn":
+        return weights
+    raise ValueError(f"Unknown primitive {primitive}")
+
+
+def _finalize(metric: Metric, sums: Dict[tuple, np.ndarray]) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metric.kind == "count":
+            return sums[ROWS]
+        if metric.kind == "sum":
+            return sums[("sum", metric.column)]
+        if metric.kind == "mean":
+            n = sums[("n", metric.column)]
+            return np.where(n > 0, sums[("sum", metric.column)] / n, metric.fill)
+        if metric.kind == "wmean":
+            wn = sums[("wn", metric.column, metric.weight)]
+            return np.where(wn > 0, sums[("wsum", metric.column, metric.weight)] / wn, metric.fill)
+        if metric.kind == "std":
+            n = sums[("n", metric.column)]
+            return np.where(n > 1, np.sqrt(sums[("ssd", metric.column)] / (n - 1)), metric.fill)
+        num = sum(coef * sums[("sum", col)] for col, coef in metric.numerator)
+        den = sum(coef * sums[("sum", col)] for col, coef in metric.denominator)
+        return np.where(den > 0, metric.scale * num / den, metric.fill)
+
+
+def _squared_deviations(df: pd.DataFrame, column: str, codes: np.ndarray, sums: Dict[tuple, np.ndarray],
+                        mask: Optional[np.ndarray]) -> np.ndarray:
+    """Per group: sum of (value - group mean)^2 over the present values in `mask`."""
+    values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums[("sum", column)] / sums[("n", column)]
+    rows = ~np.isnan(values) & (codes >= 0)
+    if mask is not None:
+        rows &= mask
+    deviations = values[rows] - means[codes[rows]]
+    return np.bincount(codes[rows], weights=deviations * deviations, minlength=len(means))
+
+
+def aggregate_splits(df: pd.DataFrame, by: Union[str, Sequence[str]], metrics: Mapping[str, Metric],
+                     splits: Optional[Mapping[str, Optional[Union[pd.Series, np.ndarray]]]] = None,
+                     nan_if_empty: bool = True) -> pd.DataFrame:
+    """
+    Aggregate every metric for every split in one grouped pass.
+
+    Args:
+        df: Row-level frame (e.g. game logs)
+        by: Group key column(s); rows with a missing key are dropped
+        metrics: Output name -> Metric
+        splits: Split name -> boolean mask aligned to `df` (None = all rows).
+            Without splits, output columns are the metric names; with
+            splits they are "{metric}_{split}".
+        nan_if_empty: Groups with no rows in a split get NaN for that split
+            (like an outer merge of per-split aggregates). If False, the
+            metrics' own fill values apply (sums and counts are 0).
+
+    Returns:
+        One row per group with the key columns first
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    split_items = list((splits or {None: None}).items())
+
+    primitives = [ROWS]
+    for metric in metrics.values():
+        for primitive in metric.primitives():
+            if primitive not in primitives:
+                primitives.append(primitive)
+    base = np.column_stack([_primitive_values(df, p) for p in primitives])
+
+    masks = [None if mask is None else np.asarray(mask, dtype=bool) for _, mask in split_items]
+    blocks = [base if mask is None else base * mask[:, None] for mask in masks]
+    columns = pd.MultiIndex.from_tuples(
+        [(i, j) for i in range(len(split_items)) for j in range(len(primitives))]
+    )
+    wide = pd.DataFrame(np.hstack(blocks), columns=columns, index=df.index)
+    groups = wide.groupby([df[col] for col in by], sort=True)
+    grouped = groups.sum()
+    std_columns = sorted({m.column for m in metrics.values() if m.kind == "std"})
+    # Group number per row (ordered like `grouped`); -1 where a key is missing
+    codes = groups.ngroup().fillna(-1).to_numpy(dtype=np.int64) if std_columns else None
+
+    result = pd.DataFrame(index=grouped.index)
+    for i, (split, _) in enumerate(split_items):
+        sums = {p: grouped[(i, j)].to_numpy() for j, p in enumerate(primitives)}
+        for column in std_columns:
+            sums[("ssd", column)] = _squared_deviations(df, column, codes, sums, masks[i])
+        empty = sums[ROWS] == 0
+        for name, metric in metrics.items():
+            values = _finalize(metric, sums)
+            if nan_if_empty:
+                values = np.where(empty, np.nan, values)
+            column = name if split is None else f"{name}_{split}"
+            if metric.kind == "count" and not np.isnan(values).any():
+                values = values.astype(int)
+            result[column] = values
+    return result.reset_index()
@@ -0,0 +1,298 @@
+"""
+Empirical Usage Projection
+
+Learns how stress-vector features move with usage from the historical
+dataset, and projects whole frames of players to any set of target usages
+in one vectorized call (instead of one player dict at a time against
+hand-typed buckets).
+
+A UsageCurves artifact holds, per usage bucket, the median of each feature
+among the players in that bucket. Curves are evaluated either as steps
+(method='bucket') or by linear interpolation between the buckets' median
+usages (method='interpolate'). A player is projected along the curve:
+
+- mode='shift' (default): keep the player's offset from the typical player
+  at their usage, i.e. value + curve(target) - curve(current)
+- mode='replace': take the typical value at the target usage
+
+Projected values are clipped to the range observed when fitting. TS% is
+projected separately with the friction coefficients in projection_utils.
+
+Example:
+    curves = UsageCurves.fit(df, PROJECTED_FEATURES)
+    curves.save()                                   # models/usage_projection_curves.json
+    projected = project_to_usages(df, [0.20, 0.25, 0.30], curves)
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.nba_data.utils.projection_utils import project_efficiency_frame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CURVES_PATH = Path("models/usage_projection_curves.json")
+
+# Bucket edges as usage fractions; buckets are [low, high)
+USAGE_EDGES = [0.0, 0.15, 0.20, 0.25, 0.30, 0.35, 1.0]
+
+# Volume/appetite features that scale with a player's role
+PROJECTED_FEATURES = [
+    'CREATION_VOLUME_RATIO',
+    'LEVERAGE_USG_DELTA',
+    'RS_PRESSURE_APPETITE',
+    'RS_LATE_CLOCK_PRESSURE_APPETITE',
+    'RS_EARLY_CLOCK_PRESSURE_APPETITE',
+    'RS_RIM_APPETITE',
+    'RS_FTr',
+]
+
+MODES = ('shift', 'replace')
+METHODS = ('interpolate', 'bucket')
+
+
+def normalize_usage(usage: pd.Series) -> pd.Series:
+    """Usage as a fraction; values stored as percentages (26.0) are divided by 100."""
+    usage = pd.to_numeric(usage, errors='coerce').astype(float)
+    return usage.where(usage <= 1.0, usage / 100.0)
+
+
+def bucket_label(low: float, high: float) -> str:
+    if high >= 1.0:
+        return f"{low * 100:.0f}%+"
+    return f"{low * 100:.0f}-{high * 100:.0f}%"
+
+
+@dataclass
+class UsageCurves:
+    """Per-bucket feature medians learned from historical player-seasons."""
+    edges: List[float]
+    centers: List[float]           # median usage of the players in each bucket
+    counts: List[int]
+    values: Dict[str, List[float]]  # feature -> bucket medians (NaN if too few players)
+    bounds: Dict[str, List[float]]  # feature -> [min, max] observed
+    usage_col: str = 'USG_PCT'
+
+    @property
+    def labels(self) -> List[str]:
+        return [bucket_label(lo, hi) for lo, hi in zip(self.edges[:-1], self.edges[1:])]
+
+    @property
+    def features(self) -> List[str]:
+        return list(self.values)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.labels
+
+    def __getitem__(self, label: str) -> Dict[str, float]:
+        """Feature medians of one usage bucket, e.g. curves['25-30%']."""
+        i = self.labels.index(label)
+        return {feature: values[i] for feature, values in self.values.items()}
+
+    def table(self) -> pd.DataFrame:
+        """Buckets x features, with usage center and player count."""
+        df = pd.DataFrame(self.values, index=pd.Index(self.labels, name='bucket'))
+        df.insert(0, 'players', self.counts)
+        df.insert(0, 'usage_center', self.centers)
+        return df
+
+    @classmethod
+    def fit(
+        cls,
+        df: pd.DataFrame,
+        features: Sequence[str] = PROJECTED_FEATURES,
+        usage_col: str = 'USG_PCT',
+        edges: Sequence[float] = USAGE_EDGES,
+        min_bucket_size: int = 10,
+    ) -> "UsageCurves":
+        """
+        Fit bucket medians of `features` against usage.
+
+        Args:
+            df: Historical player-seasons
+            features: Feature columns to fit (missing ones are skipped)
+            usage_col: Usage column (fraction or percentage)
+            edges: Bucket edges as usage fractions
+            min_bucket_size: Buckets with fewer players get no value for a
+                feature (interpolation bridges them)
+
+        Returns:
+            Fitted UsageCurves
+        """
+        edges = [float(e) for e in edges]
+        present = [f for f in features if f in df.columns]
+        skipped = [f for f in features if f not in df.columns]
+        if skipped:
+            logger.info(f"Usage curves: skipping features not in data: {skipped}")
+
+        usage = normalize_usage(df[usage_col])
+        bucket = pd.cut(usage, bins=edges, right=False, labels=False)
+        frame = df[present].apply(pd.to_numeric, errors='coerce').astype(float)
+        frame['_bucket'] = bucket
+        frame['_usage'] = usage
+        grouped = frame.dropna(subset=['_bucket']).groupby('_bucket')
+
+        n_buckets = len(edges) - 1
+        counts = grouped.size().reindex(range(n_buckets), fill_value=0)
+        centers = grouped['_usage'].median().reindex(range(n_buckets))
+        # Empty buckets sit at their midpoint so the usage axis stays ordered
+        midpoints = pd.Series([(lo + hi) / 2 for lo, hi in zip(edges[:-1], edges[1:])])
+        centers = centers.fillna(midpoints)
+
+        medians = grouped[present].median().reindex(range(n_buckets))
+        feature_counts = grouped[present].count().reindex(range(n_buckets), fill_value=0)
+        medians = medians.where(feature_counts >= min_bucket_size)
+
+        values = {f: medians[f].tolist() for f in present}
+        bounds = {f: [float(frame[f].min()), float(frame[f].max())] for f in present}
+        logger.info(f"Fitted usage curves for {len(present)} features on {int(counts.sum())} player-seasons")
+        return cls(edges=edges, centers=centers.tolist(), counts=[int(c) for c in counts],
+                   values=values, bounds=bounds, usage_col=usage_col)
+
+    def evaluate(self, usage: Union[np.ndarray, Sequence[float]], method: str = 'interpolate') -> pd.DataFrame:
+        """
+        Typical feature values at each usage.
+
+        Returns:
+            DataFrame (len(usage) x features); NaN where the usage is missing
+            or a feature has no fitted bucket
+        """
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got '{method}'")
+        usage = np.asarray(usage, dtype=float)
+        missing = np.isnan(usage)
+        centers = np.asarray(self.centers)
+        out = {}
+        for feature, values in self.values.items():
+            values = np.asarray(values, dtype=float)
+            fitted = ~np.isnan(values)
+            if not fitted.any():
+                out[feature] = np.full(len(usage), np.nan)
+                continue
+            if method == 'interpolate':
+                # Flat beyond the outermost fitted buckets
+                result = np.interp(usage, centers[fitted], values[fitted])
+            else:
+                # Step lookup; buckets without a value borrow the nearest fitted bucket
+                fitted_idx = np.flatnonzero(fitted)
+                nearest = fitted_idx[np.abs(np.arange(len(values))[:, None] - fitted_idx).argmin(axis=1)]
+                idx = np.clip(np.searchsorted(self.edges, np.where(missing, 0, usage), side='right') - 1,
+                              0, len(values) - 1)
+                result = values[nearest][idx]
+            result[missing] = np.nan
+            out[feature] = result
+        return pd.DataFrame(out)
+
+    def to_dict(self) -> Dict:
+        return {
+            'usage_col': self.usage_col,
+            'edges': self.edges,
+            'centers': self.centers,
+            'counts': self.counts,
+            'features': {f: {'values': [None if np.isnan(v) else v for v in self.values[f]],
+                             'bounds': self.bounds[f]} for f in self.values},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "UsageCurves":
+        features = data['features']
+        return cls(
+            edges=data['edges'],
+            centers=data['centers'],
+            counts=data['counts'],
+            values={f: [np.nan if v is None else v for v in spec['values']] for f, spec in features.items()},
+            bounds={f: spec['bounds'] for f, spec in features.items()},
+            usage_col=data.get('usage_col', 'USG_PCT'),
+        )
+
+    def save(self, path: Union[str, Path] = DEFAULT_CURVES_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = DEFAULT_CURVES_PATH) -> "UsageCurves":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def project_to_usages(
+    df: pd.DataFrame,
+    target_usages: Sequence[float],
+    curves: UsageCurves,
+    mode: str = 'shift',
+    method: str = 'interpolate',
+    ts_col: Optional[str] = 'TS_PCT',
+    sq_delta_col: Optional[str] = 'SHOT_QUALITY_GENERATION_DELTA',
+    friction_coefficients: Optional[Dict[str, float]] = None,
+    sq_delta_thresholds: Optional[Dict[str, float]] = None,
+) -> pd.DataFrame:
+    """
+    Project every player in `df` to every usage in `target_usages`.
+
+    Args:
+        df: Player-seasons with the curve features and usage column
+        target_usages: Usage fractions to project to
+        curves: Fitted UsageCurves
+        mode: 'shift' (keep the player's offset from the curve) or 'replace'
+        method: 'interpolate' or 'bucket'
+        ts_col, sq_delta_col: If both are present, TS% is projected with the
+            friction coefficients (ts_col is overwritten); pass None to skip
+        friction_coefficients, sq_delta_thresholds: Override the built-in
+            friction values (see projection_utils.load_friction_coefficients)
+
+    Returns:
+        DataFrame with len(df) * len(target_usages) rows (player-major): all
+        input columns, projected features, the usage column set to the target,
+        and BASE_USAGE / TARGET_USAGE. Players with unknown usage get NaN
+        projected features.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got '{mode}'")
+    targets = np.asarray(target_usages, dtype=float)
+    n, t = len(df), len(targets)
+
+    base_usage = normalize_usage(df[curves.usage_col]).to_numpy()
+    at_targets = curves.evaluate(targets, method)
+    at_base = curves.evaluate(base_usage, method) if mode == 'shift' else None
+
+    projected = df.loc[df.index.repeat(t)].reset_index(drop=True)
+    base = np.repeat(base_usage, t)
+    target = np.tile(targets, n)
+
+    for feature in curves.features:
+        if feature not in df.columns:
+            continue
+        typical = np.tile(at_targets[feature].to_numpy(), n)
+        if mode == 'shift':
+            current = pd.to_numeric(df[feature], errors='coerce').to_numpy(dtype=float)
+            values = np.repeat(current, t) + typical - np.repeat(at_base[feature].to_numpy(), t)
+        else:
+            values = typical
+        lower, upper = curves.bounds[feature]
+        values = np.clip(values, lower, upper)
+        values[np.isnan(base)] = np.nan
+        projected[feature] = values
+
+    if ts_col in df.columns and sq_delta_col in df.columns:
+        efficiency = project_efficiency_frame(
+            base, projected[ts_col].to_numpy(dtype=float), projected[sq_delta_col].to_numpy(dtype=float), target,
+            friction_coefficients, sq_delta_thresholds)
+        projected[ts_col] = efficiency['projected_ts'].to_numpy()
+
+    projected[curves.usage_col] = target
+    projected['BASE_USAGE'] = base
+    projected['TARGET_USAGE'] = target
+
+    unknown = int(np.isnan(base_usage).sum())
+    if unknown:
+        logger.warning(f"{unknown} players have no usage; their projected features are NaN")
+    return projected
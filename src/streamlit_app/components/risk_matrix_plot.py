@@ -316,6 +316,7 @@ def create_archetype_summary_chart(df_season: pd.DataFrame) -> go.Figure:
 
     # Count archetypes
     archetype_counts = df_season['RISK_CATEGORY'].value_counts()
+    archetype_counts = archetype_counts[archetype_counts > 0]  # categorical counts include absent categories
 
     # Create color mapping
     colors = []
@@ -17,8 +17,11 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # Import our components
+from src.model.registry import preload_models
 from src.streamlit_app.utils.data_loaders import (
     create_master_dataframe,
+    load_trained_model,
+    load_attributions,
     get_season_options,
     get_players_for_season,
     get_player_data,
@@ -26,6 +29,7 @@ from src.streamlit_app.utils.data_loaders import (
 )
 from src.streamlit_app.components.risk_matrix_plot import create_risk_matrix_plot, create_archetype_summary_chart
 from src.streamlit_app.components.stress_vectors_radar import create_stress_vectors_radar, get_stress_vector_explanation
+from src.model.attribution import explain
 
 # Import shared utilities
 from src.nba_data.utils.projection_utils import (
@@ -86,6 +90,9 @@ def main():
     st.markdown('<div class="main-header">🏀 NBA Playoff Resilience Engine</div>', unsafe_allow_html=True)
     st.markdown("*Identify players who consistently perform better than expected in the playoffs*")
 
+    # Unpickle the production model while the data frames load
+    preload_models()
+
     # Load data
     try:
         df_master = create_master_dataframe()
@@ -206,16 +213,8 @@ def main():
 
 
 def load_model_and_encoder():
-    """Load the trained model and encoder."""
-    try:
-        import joblib
-        model = joblib.load('models/resilience_xgb_rfe_15.pkl')
-        encoder = joblib.load('models/archetype_encoder_rfe_15.pkl')
-        return model, encoder
-    except FileNotFoundError as e:
-        st.error(f"❌ Model files not found: {e}")
-        st.error("Please run model training first.")
-        st.stop()
+    """Load the registry's production model and encoder."""
+    return load_trained_model()
 
 
 def display_player_analysis(player_data, df_season, df_filtered, model, encoder, usage_buckets, percentiles):
@@ -465,6 +464,32 @@ def display_usage_simulator_tab(player_data, df_season, model, encoder, usage_bu
             with prob_cols[i % 4]:
                 st.metric(short_name, f"{prob:.1%}")
 
+        # Why: precomputed TreeSHAP contributions at the nearest grid usage
+        attributions = load_attributions()
+        explanation = None
+        if attributions is not None:
+            explanation = explain(attributions, player_data['PLAYER_NAME'], player_data['SEASON'],
+                                  usage=target_usage, target=predicted_archetype, top_n=8)
+        if explanation is not None:
+            # The table is projected with build_attributions.py's batch pipeline at the nearest
+            # grid usage, so show its own prediction rather than assume it matches the one above
+            st.subheader(f"🧭 Why {archetype_names.get(predicted_archetype, predicted_archetype)}?")
+            table_col, chart_col = st.columns([1, 2])
+            with table_col:
+                st.metric(f"Explained row ({explanation['usage_level']:.0%} usage)",
+                          archetype_names.get(explanation['prediction'], explanation['prediction']))
+                st.metric(f"{archetype_names.get(predicted_archetype, predicted_archetype)} probability",
+                          f"{explanation['probability']:.1%}")
+                if explanation['prediction'] != predicted_archetype:
+                    st.warning("The precomputed projection predicts a different archetype than the "
+                               "simulator; the contributions explain the precomputed row.")
+            with chart_col:
+                probabilities_note = ("probabilities are calibrated" if explanation['calibrated']
+                                      else "probabilities are uncalibrated too")
+                st.caption(f"Feature contributions to the uncalibrated {predicted_archetype} log-odds "
+                           f"(baseline {explanation['bias']:+.2f}); {probabilities_note}")
+                st.bar_chart(explanation['contributions'].set_index('feature')['contribution'])
+
     except Exception as e:
         st.error(f"❌ Error in usage simulation: {str(e)}")
         logger.error(f"Usage simulation error: {e}", exc_info=True)
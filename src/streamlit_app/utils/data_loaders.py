@@ -5,12 +5,16 @@ Handles cached loading of model, features, and archetypes data.
 """
 
 import pandas as pd
-import joblib
 import streamlit as st
 from pathlib import Path
 from typing import Tuple, Optional
 import logging
 
+from src.model.attribution import read_attributions
+from src.model.registry import ModelRegistryError, load_model, resolve
+from src.model.training_tables import TrainingTable, TrainingTableError
+from src.nba_data.utils.feature_dtypes import apply_feature_dtypes, frame_memory_mb, read_feature_csv
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,7 +27,7 @@ def load_predictive_dataset() -> pd.DataFrame:
         DataFrame with player features and metadata
     """
     try:
-        df = pd.read_csv('results/predictive_dataset.csv')
+        df = read_feature_csv('results/predictive_dataset.csv')
         logger.info(f"Loaded predictive dataset: {len(df)} players")
         return df
     except FileNotFoundError:
@@ -48,24 +52,46 @@ def load_resilience_archetypes() -> pd.DataFrame:
         st.stop()
 
 
-@st.cache_data
-def load_trained_model() -> Tuple[object, object]:
+def load_trained_model(model_ref: str = 'production') -> Tuple[object, object]:
     """
-    Load trained XGBoost model and label encoder.
+    Load trained XGBoost model and label encoder from the model registry.
+
+    The registry memoizes loaded models per process, so this is not wrapped
+    in st.cache_data (which would copy the model on every call).
+
+    Args:
+        model_ref: Registry reference ('production', a model name or 'name@version')
 
     Returns:
         Tuple of (model, encoder)
     """
     try:
-        model = joblib.load('models/resilience_xgb_rfe_15.pkl')
-        encoder = joblib.load('models/archetype_encoder_rfe_15.pkl')
-        logger.info(f"Loaded trained model: {model} and encoder: archetype_encoder_rfe_15.pkl")
-        return model, encoder
-    except FileNotFoundError:
-        st.error("❌ Model files not found. Please train the model first.")
+        loaded = load_model(model_ref)
+        logger.info(f"Loaded trained model: {loaded.name} v{loaded.spec.version}")
+        return loaded.model, loaded.encoder
+    except (ModelRegistryError, OSError) as e:
+        st.error(f"❌ Model could not be loaded: {e}")
+        st.error("Please train and register the model first.")
         st.stop()
 
 
+@st.cache_resource
+def load_attributions(model_ref: str = 'production') -> Optional[TrainingTable]:
+    """
+    Precomputed predictions and feature contributions over the usage grid
+    (src/nba_data/scripts/build_attributions.py), memory-mapped once per process.
+
+    Returns:
+        The attribution table, or None if it is missing or was computed for
+        other model files
+    """
+    try:
+        return read_attributions(resolve(model_ref))
+    except (ModelRegistryError, TrainingTableError) as e:
+        logger.warning(f"No usable attributions: {e}")
+        return None
+
+
 @st.cache_data
 def create_master_dataframe() -> pd.DataFrame:
     """
@@ -157,7 +183,10 @@ def create_master_dataframe() -> pd.DataFrame:
         lambda x: x / 100.0 if x > 1.0 else x
     )
 
-    logger.info(f"Created master dataframe: {len(df_master)} records")
+    # Compact dtypes once, after all merges: every Streamlit worker caches this frame
+    df_master = apply_feature_dtypes(df_master)
+
+    logger.info(f"Created master dataframe: {len(df_master)} records ({frame_memory_mb(df_master):.1f} MB)")
     return df_master
 
 
@@ -0,0 +1,35 @@
+"""
+Shared test fixtures.
+
+The repository root is on sys.path through pytest.ini (pythonpath = .).
+"""
+
+import numpy as np
+import pytest
+
+
+def make_seasons(first: int = 2015, last: int = 2020, per_season: int = 80, n_features: int = 3,
+                 noise: float = 0.0, regression: bool = False, seed: int = 0):
+    """
+    Synthetic labeled player-seasons for the walk-forward fold and model tests.
+
+    X is standard normal (n_features >= 3). The signal is X0 + 0.5 * X1 plus
+    Gaussian noise; classification labels are 0/1 (signal > 0) plus 1 when
+    X2 > 1, so three classes with the top one rarer. Extra features are noise.
+
+    Returns:
+        (X, y, season_year), `per_season` rows for every year first..last
+    """
+    rng = np.random.default_rng(seed)
+    season_year = np.repeat(np.arange(first, last + 1), per_season)
+    X = rng.normal(size=(len(season_year), n_features))
+    signal = X[:, 0] + 0.5 * X[:, 1] + (rng.normal(0, noise, len(X)) if noise else 0.0)
+    if regression:
+        return X, signal, season_year
+    return X, (signal > 0).astype(int) + (X[:, 2] > 1), season_year
+
+
+@pytest.fixture
+def seasons():
+    """make_seasons, as a fixture: call it with the shape the test needs."""
+    return make_seasons
@@ -0,0 +1,78 @@
+"""
+Attributions: contributions add up to the model's margins, the stored
+table round-trips, and explanations are row lookups that pick the nearest
+usage level.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+xgb = pytest.importorskip('xgboost')
+
+from src.model.attribution import (
+    BIAS, PROBABILITY_PREFIX, attribution_frame, contribution_column, explain, tree_contributions
+)
+from src.model.training_tables import load_or_build
+
+FEATURES = ['USG_PCT', 'CREATION_VOLUME_RATIO', 'LEVERAGE_USG_DELTA']
+CLASSES = ['Bulldozer (Fragile Star)', 'King (Resilient Star)', 'Sniper (Resilient Role)', 'Victim (Fragile Role)']
+
+
+class Encoder:
+    classes_ = np.array(CLASSES, dtype=object)
+
+
+def make_data(seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(400, 3)), columns=FEATURES)
+    y = (X['USG_PCT'] > 0).astype(int) * 2 + (X['CREATION_VOLUME_RATIO'] > 0).astype(int)
+    return X, y
+
+
+def test_contributions_sum_to_margin():
+    X, y = make_data()
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X, y)
+    contribs = tree_contributions(model, X, chunk_rows=150)
+    assert contribs.shape == (400, 4, 4)
+    margin = model.predict(X, output_margin=True)
+    np.testing.assert_allclose(contribs.sum(axis=2), margin, rtol=1e-4, atol=1e-4)
+
+    regressor = xgb.XGBRegressor(n_estimators=20).fit(X, X['USG_PCT'] * 2)
+    contribs = tree_contributions(regressor, X)
+    assert contribs.shape == (400, 1, 4)
+    np.testing.assert_allclose(contribs[:, 0].sum(axis=1), regressor.predict(X), rtol=1e-4, atol=1e-4)
+
+
+def test_explain_lookup(tmp_path):
+    X, y = make_data()
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X, y)
+    ids = pd.DataFrame({
+        'PLAYER_NAME': np.repeat(['Player A', 'Player B'], 200),
+        'SEASON': np.tile(np.repeat(['2022-23', '2023-24'], 100), 2),
+        'USAGE_LEVEL': np.tile(np.round(np.linspace(0.10, 0.40, 100), 3), 4),
+        'PROJECTED': np.tile(np.arange(100) > 0, 4),
+    })
+    frame = attribution_frame(model, X, encoder=Encoder(), ids=ids)
+    assert frame['STAR_LEVEL_POTENTIAL'].between(0, 1).all()
+    np.testing.assert_allclose(frame[[PROBABILITY_PREFIX + c for c in CLASSES]].sum(axis=1), 1.0, rtol=1e-5)
+
+    table = load_or_build('model', build=lambda: frame, root=tmp_path,
+                          metadata={'features': FEATURES, 'classes': CLASSES})
+    row = frame.iloc[210]   # Player B, 2022-23, projected
+    explanation = explain(table, 'player b', '2022-23', usage=row['USAGE_LEVEL'] + 0.001, top_n=2)
+    assert explanation['usage_level'] == pytest.approx(row['USAGE_LEVEL'])
+    assert explanation['prediction'] == row['PREDICTION']
+    assert explanation['calibrated'] is False   # the metadata has no calibrated_probabilities flag
+    contributions = explanation['contributions']
+    assert len(contributions) == 2
+    assert contributions['contribution'].abs().is_monotonic_decreasing
+
+    full = explain(table, 'Player B', '2022-23', usage=row['USAGE_LEVEL'], target='King (Resilient Star)')
+    total = full['contributions']['contribution'].sum() + full['bias']
+    assert total == pytest.approx(row[contribution_column(BIAS, 'King (Resilient Star)')]
+                                  + sum(row[contribution_column(f, 'King (Resilient Star)')] for f in FEATURES))
+
+    observed = explain(table, 'Player A', '2023-24')
+    assert not observed['projected'] and observed['usage_level'] == pytest.approx(0.10)
+    assert explain(table, 'Player C', '2022-23') is None
@@ -0,0 +1,63 @@
+"""
+Incremental rebuild checks for the content-hashed build graph.
+
+Targets are small file transforms: `upper` reads raw.txt, `first_line` reads
+upper's output, `count` is independent.
+"""
+
+import functools
+from pathlib import Path
+
+from src.nba_data.utils.build_graph import BuildGraph, Target
+
+
+def transform(src, dst, how):
+    text = Path(src).read_text()
+    out = {"upper": text.upper(), "first_line": text.splitlines()[0], "count": str(len(text))}[how]
+    Path(dst).write_text(out)
+
+
+def fail():
+    raise RuntimeError("boom")
+
+
+def make_graph(root, broken=False):
+    upper = functools.partial(transform, "raw.txt", "upper.txt", "upper")
+    return BuildGraph([
+        Target("upper", ["upper.txt"], ["raw.txt"], fail if broken else upper),
+        Target("first_line", ["first.txt"], ["upper*.txt"], functools.partial(transform, "upper.txt", "first.txt", "first_line")),
+        Target("count", ["count.txt"], ["other.txt"], functools.partial(transform, "other.txt", "count.txt", "count")),
+    ], root=root, state_path="state.json")
+
+
+def statuses(report):
+    return {r.name: r.status for r in report.results}
+
+
+def test_only_stale_targets_rebuild(tmp_path):
+    (tmp_path / "raw.txt").write_text("a\nb\n")
+    (tmp_path / "other.txt").write_text("xyz")
+    graph = make_graph(tmp_path)
+    assert graph.dependencies["first_line"] == {"upper"}
+
+    assert set(statuses(graph.build(jobs=2)).values()) == {"built"}
+    assert set(statuses(make_graph(tmp_path).build(jobs=1)).values()) == {"cached"}
+
+    # Same content upstream -> downstream stays cached
+    (tmp_path / "raw.txt").write_text("a\nB\n")
+    assert statuses(make_graph(tmp_path).build(jobs=1)) == {"upper": "built", "first_line": "cached", "count": "cached"}
+
+    (tmp_path / "raw.txt").write_text("c\nb\n")
+    assert statuses(make_graph(tmp_path).build(jobs=2)) == {"upper": "built", "first_line": "built", "count": "cached"}
+    assert (tmp_path / "first.txt").read_text() == "C"
+
+    (tmp_path / "count.txt").unlink()
+    assert statuses(make_graph(tmp_path).build(["count"], jobs=1)) == {"count": "built"}
+
+
+def test_failed_target_skips_dependents(tmp_path):
+    (tmp_path / "raw.txt").write_text("a\n")
+    (tmp_path / "other.txt").write_text("xyz")
+    report = make_graph(tmp_path, broken=True).build(jobs=2)
+    assert statuses(report) == {"upper": "failed", "first_line": "skipped", "count": "built"}
+    assert not report.ok
@@ -0,0 +1,130 @@
+"""
+Probability calibration: fitted maps improve overconfident probabilities,
+apply the same way to one row and to a batch, survive the artifact round
+trip or the registry's wrapper for pickled models, and the performance
+thresholds follow the observed star rate.
+"""
+
+import json
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+
+from src.model.calibration import (
+    DEFAULT_RISK_THRESHOLDS, apply_calibration, derive_performance_thresholds, fit_calibration, risk_thresholds
+)
+
+CLASSES = ['Bulldozer (Fragile Star)', 'King (Resilient Star)', 'Sniper (Resilient Role)', 'Victim (Fragile Role)']
+
+
+def overconfident(seed=0, n=4000):
+    """Labels drawn from true probabilities; the 'model' reports them sharpened."""
+    rng = np.random.default_rng(seed)
+    logits = rng.normal(size=(n, 4))
+    true = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+    y = np.array([rng.choice(4, p=p) for p in true])
+    sharp = np.exp(3 * logits)
+    return sharp / sharp.sum(axis=1, keepdims=True), y
+
+
+@pytest.mark.parametrize('method', ['isotonic', 'platt'])
+def test_fit_improves_and_applies_row_or_batch(method):
+    proba, y = overconfident()
+    result = fit_calibration(proba, y, CLASSES, method=method)
+    metrics = result['metrics']
+    assert metrics['calibrated_log_loss'] < metrics['raw_log_loss']
+    assert metrics['calibrated_brier'] < metrics['raw_brier']
+
+    calibration = result['probability']
+    batch = apply_calibration(proba[:50], calibration)
+    np.testing.assert_allclose(batch.sum(axis=1), 1.0)
+    np.testing.assert_allclose(apply_calibration(proba[7], calibration), batch[7])
+    # Columns are matched to classes by name
+    reordered = apply_calibration(proba[:50, ::-1], calibration, CLASSES[::-1])
+    np.testing.assert_allclose(reordered[:, ::-1], batch)
+    np.testing.assert_array_equal(apply_calibration(proba, None), proba)
+
+
+def test_thresholds_follow_star_rate():
+    score = np.linspace(0, 1, 1001)
+    is_star = score > 0.55
+    thresholds = derive_performance_thresholds(score, is_star)
+    assert 0.5 <= thresholds['performance_low'] <= thresholds['performance_high'] <= 0.6
+
+    assert derive_performance_thresholds(score, np.zeros_like(score, dtype=bool)) == {}
+    merged = risk_thresholds({'risk_thresholds': thresholds})
+    assert merged['performance_high'] == thresholds['performance_high']
+    assert set(merged) == set(DEFAULT_RISK_THRESHOLDS)
+
+
+def test_artifact_applies_calibration(tmp_path):
+    xgb = pytest.importorskip('xgboost')
+    from sklearn.preprocessing import LabelEncoder
+
+    from src.model.artifact import export_artifact, load_artifact
+    from src.model.season_cv import build_fold_matrices, out_of_fold_predictions
+
+    rng = np.random.default_rng(0)
+    season_year = np.repeat(np.arange(2015, 2021), 150)
+    X = rng.normal(size=(len(season_year), 3))
+    y = ((X[:, 0] + rng.normal(size=len(X)) > 0).astype(int) * 2 + (X[:, 1] > 0).astype(int))
+    folds = build_fold_matrices(X, y, season_year, ['a', 'b', 'c'], CLASSES, min_train_seasons=3)
+    path = folds.save(tmp_path / 'folds.npz')
+    factory = partial(xgb.XGBClassifier, n_estimators=50, max_depth=4)
+
+    oof, y_oof, rows, classes = out_of_fold_predictions(path, ['a', 'b', 'c'], factory)
+    assert classes == CLASSES and len(rows) == 3 * 150
+    assert (y_oof == y[rows]).all()
+    calibration = fit_calibration(oof, y_oof, classes)
+
+    encoder = LabelEncoder().fit(CLASSES)
+    model = factory().fit(X, y)
+    artifact = load_artifact(export_artifact(model, tmp_path / 'm.xgbm', name='m', encoder=encoder,
+                                             features=['a', 'b', 'c'], calibration=calibration))
+    raw = artifact.predict_proba(X, calibrated=False)
+    np.testing.assert_allclose(raw, model.predict_proba(X), rtol=1e-6)
+    np.testing.assert_allclose(artifact.predict_proba(X), apply_calibration(raw, calibration['probability']),
+                               rtol=1e-6)
+
+
+def test_registry_calibrates_pickled_models(tmp_path, monkeypatch):
+    joblib = pytest.importorskip('joblib')
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import LabelEncoder
+
+    from src.model.registry import clear_cache, load_model, register_model
+
+    proba, y = overconfident()
+    X = np.log(proba)
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    monkeypatch.chdir(tmp_path)
+    joblib.dump(model, 'm.pkl')
+    joblib.dump(LabelEncoder().fit(CLASSES), 'encoder.pkl')
+    register_model('m', 'm.pkl', role='archetype', encoder_path='encoder.pkl', registry_path='registry.json')
+
+    calibration = fit_calibration(model.predict_proba(X), y, CLASSES)
+    Path('results').mkdir()
+    (Path('results') / 'calibration_m.json').write_text(json.dumps({**calibration, 'features': None}))
+    clear_cache()
+    loaded = load_model('m', path='registry.json').model
+
+    raw = model.predict_proba(X)
+    np.testing.assert_allclose(loaded.predict_proba(X, calibrated=False), raw)
+    np.testing.assert_allclose(loaded.predict_proba(X), apply_calibration(raw, calibration['probability']))
+    assert (loaded.predict(X) == loaded.predict_proba(X).argmax(axis=1)).all()
+    assert loaded.calibration['risk_thresholds'] == calibration['risk_thresholds']
+    np.testing.assert_array_equal(loaded.coef_, model.coef_)  # everything else is the model's
+    clear_cache()
+
+
+def test_read_calibration_compares_feature_sets(tmp_path):
+    from src.model.calibration import calibration_path, read_calibration
+
+    calibration_path('m', tmp_path).write_text(json.dumps({'features': ['b', 'a'], 'risk_thresholds': {}}))
+    assert read_calibration('m', ['a', 'b'], root=tmp_path)['features'] == ['b', 'a']
+    assert read_calibration('m', ['a', 'b', 'c'], root=tmp_path) is None
+    assert read_calibration('m', root=tmp_path) is not None
@@ -0,0 +1,87 @@
+"""
+Columnar store fingerprints: unchanged games are skipped, and an in-place
+edit of any possession table (same row count, no updated_at bump) causes
+the game to be re-exported.
+"""
+
+import contextlib
+import io
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.nba_data.db.columnar_store import PossessionColumnarStore
+from src.nba_data.db.migrations import MigrationRunner
+from src.nba_data.db.possession_store import possession_key
+
+GAME_ID = "0022300001"
+
+
+@pytest.fixture
+def store(tmp_path):
+    db_path = tmp_path / "nba.db"
+    with contextlib.redirect_stdout(io.StringIO()):
+        MigrationRunner(str(db_path)).upgrade()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO games (game_id, home_team_id, away_team_id, season, season_type, game_date) "
+                     "VALUES (?, 1, 2, '2023-24', 'Regular Season', '2023-11-01')", (GAME_ID,))
+        for n in range(3):
+            possession_id = f"{GAME_ID}_1_{float(n * 14)}"
+            key = possession_key(possession_id)
+            conn.execute("INSERT INTO possessions (possession_key, possession_id, game_id, period, home_team_id, "
+                         "away_team_id, offensive_team_id, defensive_team_id, points_scored) "
+                         "VALUES (?, ?, ?, 1, 1, 2, 1, 2, 2)", (key, possession_id, GAME_ID))
+            conn.execute("INSERT INTO possession_events (event_key, possession_key, event_number, clock_time, "
+                         "elapsed_seconds, team_id, opponent_team_id, event_type) "
+                         "VALUES (?, ?, 1, '12:00', ?, 1, 2, 'shot')", (key * 1000 + 1, key, n * 14.0))
+            conn.executemany("INSERT INTO possession_lineups (possession_key, player_id, team_id, position) "
+                             "VALUES (?, ?, 1, 'G')", [(key, p) for p in range(100, 105)])
+            conn.execute("INSERT INTO possession_matchups (possession_key, offensive_player_id, defensive_player_id) "
+                         "VALUES (?, 100, 200)", (key,))
+    return PossessionColumnarStore(str(db_path), str(tmp_path / "columnar")), db_path
+
+
+@pytest.mark.parametrize("edit", [
+    "UPDATE possession_lineups SET position = 'F' WHERE player_id = 103",
+    "UPDATE possession_matchups SET defensive_player_id = 201",
+    "UPDATE possession_events SET event_type = 'foul'",
+    "UPDATE possessions SET points_scored = 3",
+])
+def test_in_place_edit_is_reexported(store, edit):
+    store, db_path = store
+    assert store.export()["games_written"] == 1
+    assert store.export()["games_skipped"] == 1
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(edit)
+    summary = store.export()
+    assert summary["games_written"] == 1 and summary["games_skipped"] == 0
+
+
+@pytest.mark.parametrize("full_refresh", [False, True])
+def test_deleted_game_is_pruned(store, full_refresh):
+    store, db_path = store
+    store.export()
+    with sqlite3.connect(db_path) as conn:
+        for table in ("possession_events", "possession_lineups", "possession_matchups", "possessions"):
+            conn.execute(f"DELETE FROM {table}")
+
+    assert store.export(full_refresh=full_refresh)["games_removed"] == 1
+    assert store.read("possessions").empty
+    assert store._load_manifest() == {}
+
+
+def test_season_export_only_checksums_its_games(store, monkeypatch):
+    from src.nba_data.db import columnar_store
+
+    store, _ = store
+    hashed = []
+    checksum = columnar_store._row_checksum
+    monkeypatch.setattr(columnar_store, "_row_checksum", lambda *values: hashed.append(values) or checksum(*values))
+
+    assert store.export(seasons=["2022-23"])["games_written"] == 0
+    assert hashed == []
+    assert store.export(seasons=["2023-24"])["games_written"] == 1
+    assert len(hashed) == 3 + 3 + 15 + 3   # possessions, events, lineups, matchups
@@ -0,0 +1,62 @@
+"""
+ConnectionManager: readers are per thread and closed by their own thread;
+close_all() never closes a reader another thread is still using.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.nba_data.db.schema import ConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_path = tmp_path / "nba.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+    manager = ConnectionManager(str(db_path))
+    yield manager
+    manager.close_all()
+
+
+def test_close_all_leaves_running_threads_readers_open(manager):
+    opened, release, results = threading.Event(), threading.Event(), []
+
+    def worker():
+        conn = manager.reader()
+        opened.set()
+        release.wait(5)
+        results.append(conn.execute("SELECT x FROM t").fetchone()[0])
+        manager.close_reader()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    opened.wait(5)
+    main_reader = manager.reader()
+    assert manager.open_readers() == 2
+
+    manager.close_all()
+    with pytest.raises(sqlite3.ProgrammingError):
+        main_reader.execute("SELECT 1")
+    assert manager.open_readers() == 1
+
+    release.set()
+    thread.join(5)
+    assert results == [1]
+    assert manager.open_readers() == 0
+    assert manager.reader() is not main_reader
+
+
+def test_close_all_releases_exited_threads_readers(manager):
+    threads = [threading.Thread(target=manager.reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert manager.open_readers() == 3
+
+    manager.close_all()
+    assert manager.open_readers() == 0
@@ -0,0 +1,49 @@
+"""
+Feature dtype schema: compact dtypes without changing the values.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.nba_data.utils.feature_dtypes import apply_feature_dtypes, memory_report
+
+
+def make_frame():
+    return pd.DataFrame({
+        'PLAYER_ID': [201939, 1629029, np.nan],
+        'PLAYER_NAME': ['Stephen Curry', 'Luka Doncic', 'Luka Doncic'],
+        'SEASON': ['2023-24', '2015-16', '2019-20'],
+        'ARCHETYPE': ['King (Resilient Star)', 'Bulldozer (Fragile Star)', None],
+        'USG_PCT': [0.31, 0.36, np.nan],
+        'GAMES': [74, 70, 61],
+        'BIG_TOTAL': [2.0 ** 30, 3.0, 4.0],
+    })
+
+
+def test_schema_dtypes():
+    typed = apply_feature_dtypes(make_frame())
+
+    assert typed['PLAYER_ID'].dtype == 'Int32'
+    assert isinstance(typed['PLAYER_NAME'].dtype, pd.CategoricalDtype)
+    assert typed['SEASON'].dtype.ordered and typed['SEASON'].max() == '2023-24'
+    assert typed['USG_PCT'].dtype == np.float32
+    assert typed['GAMES'].dtype == np.int32
+    # Whole numbers beyond float32's exact range keep float64
+    assert typed['BIG_TOTAL'].dtype == np.float64
+
+
+def test_values_survive():
+    df = make_frame()
+    typed = apply_feature_dtypes(df)
+
+    assert typed['PLAYER_ID'].isna().tolist() == [False, False, True]
+    assert typed['PLAYER_NAME'].astype(str).tolist() == df['PLAYER_NAME'].tolist()
+    assert np.allclose(typed['USG_PCT'], df['USG_PCT'], equal_nan=True)
+    assert typed['ARCHETYPE'].isna().sum() == 1
+
+
+def test_memory_report_total_row():
+    report = memory_report({'a': make_frame(), 'b': make_frame()})
+
+    assert report['frame'].tolist() == ['a', 'b', 'TOTAL']
+    assert report.iloc[-1]['rows'] == 6
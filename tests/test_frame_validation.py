@@ -0,0 +1,83 @@
+"""
+FrameSchema must accept and reject the same rows as per-row Pydantic validation.
+"""
+
+import numpy as np
+import pandas as pd
+from pydantic import ValidationError
+
+from src.nba_data.core.models import PlayerSeason
+from src.nba_data.core.validation import FrameSchema
+
+
+def pydantic_valid_rows(df):
+    valid = []
+    for i, row in enumerate(df.to_dict('records')):
+        try:
+            PlayerSeason.model_validate(row)
+            valid.append(i)
+        except ValidationError:
+            pass
+    return valid
+
+
+def test_matches_pydantic_row_by_row():
+    mixed = lambda values: pd.Series(values, dtype=object)
+    df = pd.DataFrame({
+        'player_id': [1, 2, 3.5, np.nan, 5, 6, 7, 8],
+        'player_name': ['a', 'b', 'c', 'd', None, 'f', 'g', 'h'],
+        'season': '2023-24',
+        'age': mixed([25, None, 30, 31, 22, '27', 23, 24]),
+        'minutes': [1000, 900, 800, 700, 600, 500, -1, 300],
+        'usg_pct': mixed([0.2, 0.25, 0.3, 0.1, 0.2, 'abc', 0.2, None]),
+        'ts_pct': mixed([0.55, '0.6', 0.5, 0.5, 0.5, 0.5, 0.5, 0.5]),
+        'shot_quality_generation_delta': 0.01,
+        'creation_volume_ratio': mixed([0.3, None, 0.2, 0.2, np.nan, 0.2, 0.2, 0.2]),
+    })
+
+    result = FrameSchema.from_model(PlayerSeason).validate(df)
+
+    expected = pydantic_valid_rows(df)
+    assert expected == [0, 1]
+    assert sorted(set(range(len(df))) - set(result.errors['row'])) == expected
+    assert result.invalid_rows == len(df) - len(expected)
+    assert result.valid['player_id'].tolist() == [1, 2]
+    assert result.valid['ts_pct'].tolist() == [0.55, 0.6]
+    assert list(result.valid.columns) == list(PlayerSeason.model_fields)
+
+
+def test_missing_required_column_fails_every_row():
+    mixed = lambda values: pd.Series(values, dtype=object)
+    df = pd.DataFrame({'player_id': [1, 2], 'player_name': ['a', 'b'], 'season': '2023-24'})
+
+    result = FrameSchema.from_model(PlayerSeason).validate(df)
+
+    assert result.valid.empty
+    assert {'minutes', 'usg_pct', 'ts_pct'} <= set(result.errors['field'])
+
+
+def test_custom_validators_run_on_rows_that_pass_the_masks():
+    from pydantic import BaseModel, Field, field_validator
+
+    from src.nba_data.core.models import ShootingStats
+
+    class Shot(BaseModel):
+        season: str
+        fga: float = Field(..., ge=0)
+
+        @field_validator('season')
+        def check_season(cls, v):
+            if len(v) != 7:
+                raise ValueError('season should look like 2023-24')
+            return v.replace('-', '/')
+
+    df = pd.DataFrame({'season': ['2023-24', '2023', '2022-23', '2021-22'], 'fga': [3.0, 4.0, -1.0, 0.0]})
+    result = FrameSchema.from_model(Shot).validate(df)
+    assert result.valid['season'].tolist() == ['2023/24', '2021/22']
+    assert result.errors.set_index('row')['field'].to_dict() == {1: 'season', 2: 'fga'}
+
+    shots = pd.DataFrame({'player_id': [1, 2, 3], 'season': '2023-24', 'context': 'Iso',
+                          'fga': [10.0, 4.0, 2.0], 'fgm': [5.0, 1.0, 1.0], 'efg_pct': [0.5, np.nan, 1.6]})
+    result = FrameSchema.from_model(ShootingStats).validate(shots)
+    assert result.valid.to_dict('records') == [ShootingStats.model_validate(shots.iloc[0].to_dict()).model_dump()]
+    assert set(result.errors['row']) == {1, 2}   # NaN and 1.6 both fail efg_pct's bounds before the validator
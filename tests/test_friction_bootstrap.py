@@ -0,0 +1,82 @@
+"""
+Bootstrap friction coefficients: weighted replicates agree with the pandas
+derivation, runs are reproducible, and the artifact loads for projection.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.nba_data.utils.friction_bootstrap import (
+    ARCHETYPES, DeltaArrays, bootstrap_friction, friction_from_weights, resample_weights
+)
+from src.nba_data.utils.projection_utils import (
+    FRICTION_COEFFICIENTS, load_friction_coefficients, project_efficiency_frame
+)
+
+
+def make_deltas(n_players=300, seed=0):
+    """Rows shaped like calculate_yoy_deltas output (several deltas per player)."""
+    rng = np.random.default_rng(seed)
+    player = np.repeat(np.arange(n_players) * 11 + 5, rng.integers(1, 6, n_players))
+    n = len(player)
+    return pd.DataFrame({
+        'PLAYER_ID': player,
+        'PREV_SQ_DELTA': rng.normal(0.11, 0.04, n),
+        'DELTA_USG': rng.normal(0.01, 0.03, n),
+        'DELTA_TS': rng.normal(0.0, 0.03, n),
+    })
+
+
+def pandas_friction(deltas):
+    """The analyze_friction_by_archetype computation."""
+    df = deltas.copy()
+    low, high = df['PREV_SQ_DELTA'].quantile([0.1, 0.9])
+    df['ARCHETYPE'] = np.select([df['PREV_SQ_DELTA'] >= high, df['PREV_SQ_DELTA'] <= low],
+                                list(ARCHETYPES[:2]), default=ARCHETYPES[2])
+    grouped = df[df['DELTA_USG'] > 0.02].groupby('ARCHETYPE')[['DELTA_USG', 'DELTA_TS']].mean()
+    return (grouped['DELTA_TS'] / (grouped['DELTA_USG'] * 100)).to_dict(), low, high
+
+
+def test_weighted_replicates_match_pandas():
+    deltas = make_deltas()
+    arrays = DeltaArrays.from_deltas(deltas)
+    ordered = deltas.sort_values('PREV_SQ_DELTA', kind='stable')
+
+    weights = np.vstack([np.ones(len(ordered), dtype=np.int64),
+                         resample_weights(arrays, 3, np.random.default_rng(1))])
+    result = friction_from_weights(arrays, weights)
+
+    for i, row in enumerate(weights):
+        expected, low, high = pandas_friction(ordered.loc[ordered.index.repeat(row)])
+        assert np.isclose(result['LOW_SQ_THRESHOLD'][i], low)
+        assert np.isclose(result['HIGH_SQ_THRESHOLD'][i], high)
+        for archetype in ARCHETYPES:
+            assert np.isclose(result[archetype][i], expected[archetype])
+
+
+def test_bootstrap_is_reproducible_across_jobs():
+    deltas = make_deltas()
+    serial = bootstrap_friction(deltas, n_replicates=300, seed=7, jobs=1, chunk_size=64)
+    parallel = bootstrap_friction(deltas, n_replicates=300, seed=7, jobs=2, chunk_size=64)
+
+    assert len(serial.replicates) == 300
+    pd.testing.assert_frame_equal(serial.replicates, parallel.replicates)
+
+    summary = serial.summary()
+    assert (summary['CI_LOWER'] <= summary['CI_UPPER']).all()
+    assert summary.loc[ARCHETYPES[2], 'valid_replicates'] == 300
+
+
+def test_artifact_feeds_projection(tmp_path):
+    result = bootstrap_friction(make_deltas(), n_replicates=50)
+    path = result.save(tmp_path / 'friction.json')
+
+    coefficients, thresholds = load_friction_coefficients(path)
+    assert set(coefficients) == set(ARCHETYPES)
+    assert thresholds['low'] < thresholds['high']
+    assert load_friction_coefficients(tmp_path / 'missing.json')[0] == FRICTION_COEFFICIENTS
+
+    projected = project_efficiency_frame([0.20], [0.55], [thresholds['high'] + 0.01], 0.25,
+                                         coefficients, thresholds)
+    assert projected['archetype'][0] == ARCHETYPES[0]
+    assert np.isclose(projected['friction_coefficient'][0], coefficients[ARCHETYPES[0]])
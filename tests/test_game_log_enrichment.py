@@ -0,0 +1,116 @@
+"""
+Game log enrichment: the vectorized columns match the row-by-row parsers
+and tier lists they replaced, and unparseable matchups stay missing.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.nba_data.constants import ABBREV_TO_ID
+from src.nba_data.utils.game_log_enrichment import enrich_game_logs, parse_matchups
+
+STATS = ['PTS', 'FGM', 'FGA', 'FTA', 'FTM', 'OREB', 'DREB', 'STL', 'AST', 'BLK', 'PF', 'TOV']
+
+
+# Reference implementations: the row-by-row code the enrichment replaced.
+
+def legacy_parse_opponent(matchup, player_team_abbrev):
+    if ' vs. ' in matchup:
+        parts = matchup.split(' vs. ')
+    elif ' @ ' in matchup:
+        parts = matchup.split(' @ ')
+    else:
+        return None
+    parts = [p.strip() for p in parts]
+    player_team_abbrev = player_team_abbrev.strip()
+    if parts[0] == player_team_abbrev:
+        return parts[1]
+    else:
+        return parts[0]
+
+
+def legacy_game_score(row):
+    try:
+        return (row['PTS'] + 0.4 * row['FGM'] - 0.7 * row['FGA'] - 0.4 * (row['FTA'] - row['FTM'])
+                + 0.7 * row.get('OREB', 0) + 0.3 * row.get('DREB', 0) + row['STL'] + 0.7 * row['AST']
+                + 0.7 * row['BLK'] - 0.4 * row['PF'] - row['TOV'])
+    except KeyError:
+        return 0
+
+
+def legacy_tier_lists(df_def):
+    df_def = df_def.copy()
+    df_def['DEF_RANK'] = df_def['DEF_RATING'].rank(method='first', ascending=True)
+    return {
+        'IS_TOP_10_DEF': df_def[df_def['DEF_RANK'] <= 10]['TEAM_ID'].tolist(),
+        'IS_BOTTOM_10_DEF': df_def[df_def['DEF_RANK'] > 20]['TEAM_ID'].tolist(),
+        'IS_ELITE_DEF': df_def[df_def['def_context_score'] > 70]['TEAM_ID'].tolist(),
+        'IS_WEAK_DEF': df_def[df_def['def_context_score'] < 40]['TEAM_ID'].tolist(),
+    }
+
+
+def make_logs(seed=0, n=400):
+    rng = np.random.default_rng(seed)
+    abbrevs = np.array(sorted(ABBREV_TO_ID))
+    team = rng.choice(abbrevs, n)
+    other = np.array([rng.choice(abbrevs[abbrevs != t]) for t in team])
+    home = rng.random(n) < 0.5
+    # The player's team is listed first in real logs; put it second on some rows too
+    first = np.where(rng.random(n) < 0.8, team, other)
+    second = np.where(first == team, other, team)
+    matchup = np.where(home, [f"{a} vs. {b}" for a, b in zip(first, second)],
+                       [f"{a} @ {b}" for a, b in zip(first, second)])
+    logs = pd.DataFrame({'MATCHUP': matchup, 'TEAM_ABBREVIATION': team})
+    logs.loc[:4, 'MATCHUP'] = ['BOS - MIA', 'BOS', '', 'BOS vs. NOH', 'NJN @ BOS']
+    logs.loc[:4, 'TEAM_ABBREVIATION'] = 'BOS'
+    for col in STATS:
+        logs[col] = rng.integers(0, 15, n).astype(float)
+    def_context = pd.DataFrame({
+        'TEAM_ID': list(ABBREV_TO_ID.values()),
+        'DEF_RATING': rng.choice([108.0, 110.5, 112.0, 113.5, 115.0], len(ABBREV_TO_ID)),   # ties
+        'def_context_score': rng.uniform(20, 90, len(ABBREV_TO_ID)),
+    })
+    return logs, def_context
+
+
+def test_matches_row_by_row_implementation():
+    logs, def_context = make_logs()
+    enriched = enrich_game_logs(logs, def_context)
+
+    expected_opponent = [legacy_parse_opponent(m, t) for m, t in zip(logs['MATCHUP'], logs['TEAM_ABBREVIATION'])]
+    assert enriched['OPPONENT_ABBREV'].astype(object).where(enriched['OPPONENT_ABBREV'].notna(), None).tolist() \
+        == expected_opponent
+
+    np.testing.assert_allclose(enriched['GAME_SCORE'], logs.apply(legacy_game_score, axis=1))
+    without_rebounds = logs.drop(columns=['OREB', 'DREB'])
+    np.testing.assert_allclose(enrich_game_logs(without_rebounds)['GAME_SCORE'],
+                               without_rebounds.apply(legacy_game_score, axis=1))
+    assert (enrich_game_logs(logs.drop(columns='PF'))['GAME_SCORE'] == 0).all()
+
+    # Historical abbreviations resolve; everything else matches the canonical map
+    resolved = enriched['OPPONENT_TEAM_ID']
+    assert resolved.iloc[3] == ABBREV_TO_ID['NOP'] and resolved.iloc[4] == ABBREV_TO_ID['BKN']
+    expected_ids = pd.Series([ABBREV_TO_ID.get(o) if o else None for o in expected_opponent], dtype='Int64')
+    pd.testing.assert_series_equal(resolved.iloc[5:].reset_index(drop=True), expected_ids.iloc[5:].reset_index(drop=True),
+                                   check_names=False)
+
+    for col, team_ids in legacy_tier_lists(def_context).items():
+        expected = resolved.isin(team_ids).fillna(False).astype(bool)
+        pd.testing.assert_series_equal(enriched[col], expected, check_names=False)
+
+
+@pytest.mark.parametrize('matchup, team, opponent, is_home', [
+    ('BOS vs. MIA', 'BOS', 'MIA', True),
+    ('BOS @ MIA', 'BOS', 'MIA', False),
+    ('MIA vs. BOS', 'BOS', 'MIA', False),
+    ('MIA @ BOS', 'BOS', 'MIA', True),
+    ('BOS - MIA', 'BOS', pd.NA, pd.NA),
+    (None, 'BOS', pd.NA, pd.NA),
+])
+def test_parse_matchups(matchup, team, opponent, is_home):
+    parsed = parse_matchups(pd.Series([matchup], dtype=object), pd.Series([team]))
+    assert parsed['IS_HOME'].dtype == 'boolean'
+    row = parsed.iloc[0]
+    assert (row['OPPONENT_ABBREV'] is pd.NA) if opponent is pd.NA else row['OPPONENT_ABBREV'] == opponent
+    assert (row['IS_HOME'] is pd.NA) if is_home is pd.NA else row['IS_HOME'] == is_home
@@ -0,0 +1,90 @@
+"""
+Hyperparameter search: halving schedule, resumable trial log, registry
+round-trip and a budgeted end-to-end search on synthetic folds.
+"""
+
+import numpy as np
+import pytest
+
+from src.model.hyperparameter_search import (
+    TrialLog, hyperband_brackets, rung_rounds, run_search, sample_configs
+)
+from src.model.registry import register_hyperparameters, registered_hyperparameters
+from src.model.season_cv import build_fold_matrices
+
+
+def test_schedule():
+    assert rung_rounds(50, 800, 3) == [89, 267, 800]
+    assert rung_rounds(100, 100, 3) == [100]
+    assert hyperband_brackets(3, 3) == [(9, 0), (5, 1), (3, 2)]
+    assert sample_configs(4, seed=1) == sample_configs(4, seed=1)
+    assert all(2 <= c['max_depth'] <= 8 and 0.01 <= c['learning_rate'] <= 0.3 for c in sample_configs(20))
+
+
+def test_trial_log_resumes_same_study_only(tmp_path):
+    path = tmp_path / 'trials.jsonl'
+    record = {'config_id': 'b0_c1', 'rounds': 89, 'fold': 0, 'score': 0.9}
+    TrialLog(path, 'study-a').append(record)
+    assert TrialLog(path, 'study-a').get({'config_id': 'b0_c1', 'rounds': 89, 'fold': 0}) == record
+    assert TrialLog(path, 'study-b').records == {}
+    assert TrialLog(path, 'study-a').records == {}
+
+
+def test_registry_round_trip(tmp_path):
+    path = tmp_path / 'registry.json'
+    assert registered_hyperparameters('telescope_model', path=path) == {}
+    register_hyperparameters('telescope_model', {'max_depth': 3, 'tree_method': 'hist'}, 140, 0.0312, 'rmse',
+                             path=path)
+    assert registered_hyperparameters('telescope_model', path=path) == {
+        'max_depth': 3, 'tree_method': 'hist', 'n_estimators': 140}
+
+
+def test_run_search_resumes(tmp_path):
+    pytest.importorskip('xgboost')
+    rng = np.random.default_rng(0)
+    season_year = np.repeat(np.arange(2015, 2021), 60)
+    X = rng.normal(size=(len(season_year), 3))
+    y = X[:, 0] - 0.5 * X[:, 1] + rng.normal(0, 0.3, len(X))
+    folds = build_fold_matrices(X, y, season_year, ['a', 'b', 'c'], [], min_train_seasons=4, key='k')
+    path = folds.save(tmp_path / 'folds.npz')
+
+    kwargs = dict(mode='halving', n_configs=4, min_rounds=10, max_rounds=30, eta=3, early_stopping_rounds=5)
+    first = run_search(path, ['a', 'b', 'c'], tmp_path / 'trials.jsonl', **kwargs)
+    assert first.best['rounds'] == 30
+    assert first.best['folds'] == 2
+    # 4 configs x 2 folds at 10 rounds, then the best 2 x 2 folds at 30
+    assert len(first.trials) == 12
+
+    again = run_search(path, ['a', 'b', 'c'], tmp_path / 'trials.jsonl', **kwargs)
+    assert again.best['config_id'] == first.best['config_id']
+    assert len(again.trials) == 12
+
+
+def test_early_stopping_never_sees_the_test_season(tmp_path):
+    pytest.importorskip('xgboost')
+    from src.model import hyperparameter_search as hpo
+
+    rng = np.random.default_rng(1)
+    season_year = np.repeat(np.arange(2015, 2020), 80)
+    X = rng.normal(size=(len(season_year), 3))
+    y = (X[:, 0] + rng.normal(0, 1.0, len(X)) > 0).astype(int)
+    folds = build_fold_matrices(X, y, season_year, ['a', 'b', 'c'], ['no', 'yes'], min_train_seasons=3)
+    fit, valid = hpo.validation_split(folds, 0)
+    assert set(season_year[folds.train_rows[0][valid]]) == {2017}
+    assert set(season_year[folds.train_rows[0][fit]]) == {2015, 2016}
+
+    task = {'config_id': 'c', 'rung': 0, 'rounds': 200, 'fold': 0, 'early_stopping_rounds': 5,
+            'params': {'max_depth': 3, 'learning_rate': 0.3}}
+    records = []
+    for flip in (False, True):
+        labels = y.copy()
+        if flip:
+            labels[folds.test_rows[0]] = 1 - labels[folds.test_rows[0]]
+        path = build_fold_matrices(X, labels, season_year, ['a', 'b', 'c'], ['no', 'yes'],
+                                   min_train_seasons=3).save(tmp_path / f'folds_{flip}.npz')
+        hpo._init_search_worker(str(path), ['a', 'b', 'c'], 1)
+        records.append(hpo._fit_trial(task))
+    # Test labels change the score, never the stopping point
+    assert records[0]['best_iteration'] == records[1]['best_iteration'] < 199
+    assert records[0]['valid_score'] == records[1]['valid_score']
+    assert records[0]['score'] < records[1]['score']
@@ -0,0 +1,69 @@
+"""
+Migrations: the dry-run plan leaves the database untouched, and change-log
+triggers never outlive a table rebuild, even one whose process died.
+"""
+
+import sqlite3
+import subprocess
+import sys
+
+from src.nba_data.db.migrations import MigrationRunner, RebuildSpec, _claim_rebuild, _install_changelog, rebuild_tables
+from src.nba_data.db.schema import REBUILD_OWNER_TABLE, connect
+
+
+def triggers(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")]
+
+
+def test_dry_run_does_not_write(tmp_path):
+    db_path = tmp_path / "nba.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE games (game_id TEXT PRIMARY KEY)")
+    before = db_path.read_bytes()
+
+    plan = MigrationRunner(str(db_path)).plan()
+    assert [step["version"] for step in plan][0] == 1
+    assert db_path.read_bytes() == before
+    assert not (tmp_path / "nba.db-wal").exists()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'schema_version'").fetchone() is None
+
+
+def test_rebuild_drops_changelog_triggers_on_failure(tmp_path):
+    db_path = tmp_path / "nba.db"
+    conn = connect(db_path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, x TEXT)")
+    conn.execute("INSERT INTO t (x) VALUES ('a')")
+    conn.commit()
+    broken = RebuildSpec(table="t", create_sql="CREATE TABLE {name} (id INTEGER PRIMARY KEY, x TEXT)",
+                         columns=["id", "x"], select_exprs=["id", "no_such_column"], key_columns=["id"])
+    try:
+        rebuild_tables(conn, [broken])
+    except sqlite3.OperationalError:
+        pass
+    conn.close()
+    assert triggers(db_path) == []
+
+
+def test_connect_clears_abandoned_rebuild(tmp_path):
+    db_path = tmp_path / "nba.db"
+    conn = connect(db_path)
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, x TEXT)")
+    spec = RebuildSpec(table="t", create_sql="", columns=[], select_exprs=[], key_columns=["id"])
+    _claim_rebuild(conn)
+    _install_changelog(conn, spec)
+    conn.close()
+
+    # The owner is this (live) process: the rebuild is still running.
+    connect(db_path).close()
+    assert len(triggers(db_path)) == 3
+
+    # The owner died mid-rebuild.
+    finished = subprocess.Popen([sys.executable, "-c", ""])
+    finished.wait()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(f"UPDATE {REBUILD_OWNER_TABLE} SET pid = ?", (finished.pid,))
+    connect(db_path).close()
+    assert triggers(db_path) == []
@@ -0,0 +1,78 @@
+"""
+Portable model artifacts: predictions match the sklearn model, corrupt
+files are rejected, and the registry serves the artifact when registered.
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+xgb = pytest.importorskip('xgboost')
+from sklearn.preprocessing import LabelEncoder
+
+from src.model.artifact import ArtifactFormatError, export_artifact, load_artifact, read_header
+from src.model.registry import clear_cache, load_model, register_model
+
+
+def make_frame(seasons):
+    X, y, _ = seasons(first=2020, last=2020, per_season=300, n_features=4)
+    X = pd.DataFrame(X, columns=['USG_PCT', 'CREATION_TAX', 'LEVERAGE_TS_DELTA', 'AGE'])
+    return X, np.array(['Victim', 'Bulldozer', 'King'])[y]
+
+
+def test_classifier_round_trip(tmp_path, seasons):
+    X, labels = make_frame(seasons)
+    encoder = LabelEncoder().fit(labels)
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X, encoder.transform(labels))
+
+    path = export_artifact(model, tmp_path / 'm.xgbm', name='m', encoder=encoder,
+                           calibration={'risk_thresholds': {'performance_high': 0.7}})
+    artifact = load_artifact(path)
+
+    assert artifact.kind == 'classifier'
+    assert artifact.features == list(X.columns)
+    assert list(artifact.classes_) == list(encoder.classes_)
+    shuffled = X[list(reversed(X.columns))]  # columns are selected by name
+    np.testing.assert_allclose(artifact.predict_proba(shuffled), model.predict_proba(X), rtol=1e-6)
+    assert (artifact.predict(X) == model.predict(X)).all()
+    assert (artifact.predict_labels(X) == encoder.inverse_transform(model.predict(X))).all()
+    assert read_header(path)['calibration']['risk_thresholds']['performance_high'] == 0.7
+
+
+def test_regressor_and_corruption(tmp_path, seasons):
+    X, _ = make_frame(seasons)
+    y = X['USG_PCT'] * 2 + X['AGE']
+    model = xgb.XGBRegressor(n_estimators=20).fit(X, y)
+    path = export_artifact(model, tmp_path / 'r.xgbm', name='r')
+    np.testing.assert_allclose(load_artifact(path).predict(X.to_numpy()), model.predict(X), rtol=1e-6)
+
+    data = bytearray(path.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ArtifactFormatError):
+        load_artifact(path)
+
+
+def test_registry_prefers_artifact(tmp_path, seasons):
+    clear_cache()
+    X, labels = make_frame(seasons)
+    encoder = LabelEncoder().fit(labels)
+    model = xgb.XGBClassifier(n_estimators=10).fit(X, encoder.transform(labels))
+    joblib.dump(model, tmp_path / 'm.pkl')
+    joblib.dump(encoder, tmp_path / 'enc.pkl')
+    registry = tmp_path / 'registry.json'
+    register_model('m', tmp_path / 'm.pkl', role='archetype', encoder_path=tmp_path / 'enc.pkl',
+                   artifact_path=export_artifact(model, tmp_path / 'm.xgbm', name='m', encoder=encoder),
+                   status='production', registry_path=registry)
+
+    loaded = load_model('production', path=registry)
+    assert loaded.model.__class__.__name__ == 'ModelArtifact'
+    assert loaded.encoder.inverse_transform(loaded.model.predict(X[:5])).tolist() == \
+        encoder.inverse_transform(model.predict(X[:5])).tolist()
+
+    # Retraining the pickle without re-exporting drops the stale artifact
+    joblib.dump(xgb.XGBClassifier(n_estimators=5).fit(X, encoder.transform(labels)), tmp_path / 'm.pkl')
+    spec = register_model('m', tmp_path / 'm.pkl', role='archetype', registry_path=registry)
+    assert spec.artifact_path is None
+    clear_cache()
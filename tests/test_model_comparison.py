@@ -0,0 +1,94 @@
+"""
+Multi-model comparison: every model scored from one shared matrix with its
+own columns, and the agreement statistics across them.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.model.evaluation import agreement_statistics, compare_model_set, score_models
+
+CLASSES = ['Bulldozer (Fragile Star)', 'King (Resilient Star)', 'Victim (Fragile Role)']
+
+
+class ThresholdClassifier:
+    """Predicts King when `feature` > threshold, else Victim."""
+
+    classes_ = np.arange(3)
+
+    def __init__(self, feature, threshold):
+        self.feature_names_in_ = np.array([feature, 'AGE'])
+        self.threshold = threshold
+
+    def predict_proba(self, X):
+        assert list(X.columns) == list(self.feature_names_in_)
+        king = (X.iloc[:, 0].to_numpy() > self.threshold).astype(float)
+        return np.column_stack([np.zeros(len(X)), king, 1 - king])
+
+
+class SumRegressor:
+    feature_names_in_ = np.array(['usg_pct', 'age'])
+
+    def predict(self, X):
+        return X.sum(axis=1).to_numpy()
+
+
+class Encoder:
+    classes_ = np.array(CLASSES)
+
+
+def make_matrix():
+    return pd.DataFrame({'USG_PCT': [0.1, 0.2, 0.3, 0.4], 'CREATION_TAX': [0.4, 0.3, 0.2, 0.1],
+                         'AGE': [22, 25, 28, 31], 'usg_pct': [1.0, 2.0, 3.0, 4.0], 'age': [0.0, 1.0, 0.0, 1.0]},
+                        index=[10, 11, 12, 13])
+
+
+def test_score_models_selects_each_models_columns():
+    models = {'a': ThresholdClassifier('USG_PCT', 0.25), 'b': ThresholdClassifier('CREATION_TAX', 0.25),
+              'telescope': SumRegressor()}
+    scores = score_models(models, make_matrix(), encoders={'a': Encoder(), 'b': Encoder()}, jobs=2)
+
+    assert list(scores.index) == [10, 11, 12, 13]
+    assert scores['a__pred'].tolist() == ['Victim (Fragile Role)'] * 2 + ['King (Resilient Star)'] * 2
+    assert scores['b__star'].tolist() == [1.0, 1.0, 0.0, 0.0]
+    assert scores['telescope__pred'].tolist() == [1.0, 3.0, 3.0, 5.0]
+    assert 'telescope__star' not in scores
+
+
+def test_missing_features_score_as_nan():
+    models = {'a': ThresholdClassifier('USG_PCT', 0.25), 'c': ThresholdClassifier('NOT_IN_MATRIX', 0.5)}
+    scores = score_models(models, make_matrix(), encoders={'a': Encoder(), 'c': Encoder()})
+    # The model would predict Victim for the all-NaN column (NaN > threshold is False)
+    assert scores['c__pred'].isna().all() and scores['c__star'].isna().all()
+    assert scores[[f'c__p_{c}' for c in CLASSES]].isna().all().all()
+
+    y = pd.Series('King (Resilient Star)', index=[10, 11, 12, 13])
+    result = compare_model_set(models, make_matrix(), y_true=y, encoders={'a': Encoder(), 'c': Encoder()})
+    assert result['unscored'] == ['c']
+    assert result['accuracy'] == {'a': 0.5, 'consensus': 0.5}
+    assert result['pairwise'].empty
+    assert result['scores']['unanimous'].all()
+
+
+def test_agreement_statistics():
+    models = {'a': ThresholdClassifier('USG_PCT', 0.25), 'b': ThresholdClassifier('CREATION_TAX', 0.25),
+              'a2': ThresholdClassifier('USG_PCT', 0.15)}
+    encoders = {name: Encoder() for name in models}
+    y = pd.Series(['Victim (Fragile Role)', 'King (Resilient Star)', 'King (Resilient Star)',
+                   'King (Resilient Star)'], index=[10, 11, 12, 13])
+    result = compare_model_set(models, make_matrix(), y_true=y, encoders=encoders)
+
+    scores = result['scores']
+    assert scores['consensus_pred'].tolist() == ['Victim (Fragile Role)', 'King (Resilient Star)',
+                                                 'King (Resilient Star)', 'King (Resilient Star)']
+    np.testing.assert_allclose(scores['consensus_share'], [2 / 3, 2 / 3, 2 / 3, 2 / 3])
+    assert not scores['unanimous'].any()
+    assert result['accuracy'] == {'a': 0.75, 'b': 0.25, 'a2': 1.0, 'consensus': 1.0}
+
+    pairwise = result['pairwise'].set_index(['model_a', 'model_b'])
+    assert pairwise.loc[('a', 'b'), 'agreement'] == 0.0
+    assert pairwise.loc[('a', 'b'), 'kappa'] < 0
+    assert pairwise.loc[('a', 'a2'), 'agreement'] == 0.75
+
+    empty = agreement_statistics(scores, [])
+    assert empty['pairwise'].empty and empty['accuracy'] == {}
@@ -0,0 +1,57 @@
+"""
+Warm-start refresh: continue_boosting adds rounds without touching the
+original model, and the parity check compares it with a full retrain on
+every fold after the first.
+"""
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip('xgboost')
+
+from src.model.refresh import continue_boosting, summarize_parity, warm_start_parity
+from src.model.season_cv import build_fold_matrices
+
+
+def test_continue_boosting(seasons):
+    X, y, _ = seasons()
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X[:300], y[:300])
+    before = model.predict_proba(X)
+
+    refreshed = continue_boosting(model, X, y, extra_rounds=5)
+    assert refreshed.get_booster().num_boosted_rounds() == 25
+    assert refreshed.n_estimators == 25
+    assert model.get_booster().num_boosted_rounds() == 20
+    np.testing.assert_allclose(model.predict_proba(X), before)
+    assert not np.allclose(refreshed.predict_proba(X), before)
+
+
+def test_warm_start_parity(tmp_path, seasons):
+    X, y, season_year = seasons()
+    folds = build_fold_matrices(X, y, season_year, ['a', 'b', 'c'], ['low', 'mid', 'high'], min_train_seasons=3)
+    path = folds.save(tmp_path / 'folds.npz')
+    factory = partial(xgb.XGBClassifier, n_estimators=30, max_depth=3)
+
+    results = warm_start_parity(path, ['a', 'b', 'c'], factory, extra_rounds=5)
+    assert results['test_season'].tolist() == [2019, 2020]
+    assert (results['n_new'] == 80).all()
+    assert {'stale_accuracy', 'full_accuracy', 'warm_accuracy', 'warm_log_loss'} <= set(results.columns)
+
+    summary = summarize_parity(results)
+    assert summary['folds'] == 2
+    saved = results['full_seconds'].sum() - results['warm_seconds'].sum()
+    assert summary['time_saved_seconds'] == pytest.approx(saved, abs=5e-4)  # rounded to the millisecond
+    assert 'accuracy_delta' in summary and 'rmse_delta' not in summary
+
+
+def test_warm_start_parity_regression(tmp_path, seasons):
+    X, _, season_year = seasons()
+    y = X[:, 0] * 2 + X[:, 1]
+    folds = build_fold_matrices(X, y, season_year, ['a', 'b', 'c'], [], min_train_seasons=4)
+    path = folds.save(tmp_path / 'folds.npz')
+
+    results = warm_start_parity(path, ['a', 'b', 'c'], partial(xgb.XGBRegressor, n_estimators=30), extra_rounds=5)
+    assert len(results) == 1
+    assert summarize_parity(results)['warm_rmse'] > 0
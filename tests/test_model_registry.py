@@ -0,0 +1,57 @@
+"""
+Model registry: production resolution, version pins, checksum verification,
+per-process memoization and production promotion on registration.
+"""
+
+import joblib
+import pytest
+
+from src.model.registry import (
+    ModelRegistryError, clear_cache, load_model, load_registry, preload_models, register_model, resolve
+)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    clear_cache()
+    path = tmp_path / 'registry.json'
+    for name in ('model_a', 'model_b'):
+        joblib.dump({'name': name}, tmp_path / f'{name}.pkl')
+    joblib.dump(['King', 'Victim'], tmp_path / 'encoder.pkl')
+    register_model('model_a', tmp_path / 'model_a.pkl', role='archetype', encoder_path=tmp_path / 'encoder.pkl',
+                   status='production', version='1.0.0', registry_path=path)
+    register_model('model_b', tmp_path / 'model_b.pkl', role='archetype', version='2.0.0', registry_path=path)
+    yield path
+    clear_cache()
+
+
+def test_resolve(registry):
+    assert resolve('production', path=registry).name == 'model_a'
+    assert resolve('model_b@2.0.0', path=registry).status == 'staging'
+    with pytest.raises(ModelRegistryError):
+        resolve('model_b@1.0.0', path=registry)
+    with pytest.raises(ModelRegistryError):
+        resolve('production', role='telescope', path=registry)
+
+
+def test_load_is_verified_and_memoized(registry, tmp_path):
+    first = load_model('production', path=registry)
+    assert first.model == {'name': 'model_a'}
+    assert first.encoder == ['King', 'Victim']
+    assert load_model('model_a', path=registry) is first
+
+    preload_models(['model_b'], path=registry).join()
+    assert load_model('model_b', path=registry).model == {'name': 'model_b'}
+
+    joblib.dump({'name': 'tampered'}, tmp_path / 'model_b.pkl')
+    clear_cache()
+    with pytest.raises(ModelRegistryError, match='checksum'):
+        load_model('model_b', path=registry)
+
+
+def test_register_production_demotes_previous(registry, tmp_path):
+    register_model('model_b', tmp_path / 'model_b.pkl', role='archetype', status='production', registry_path=registry)
+    data = load_registry(registry)
+    assert data['production'] == {'archetype': 'model_b'}
+    assert data['models']['model_a']['status'] == 'staging'
+    assert load_model('production', path=registry).name == 'model_b'
@@ -0,0 +1,42 @@
+"""
+Query-plan regression checks for the SQL in src/nba_data.
+
+Builds a small synthetic database and fails if any discovered query scans a
+large table without an index. Run the full-size version (with timings) via
+`python -m src.nba_data.db.query_plans`.
+"""
+
+import pytest
+
+from src.nba_data.db.query_plans import build_synthetic_database, discover_queries, run_suite, scanned_table
+
+
+@pytest.fixture(scope="module")
+def synthetic_db(tmp_path_factory):
+    db_path = tmp_path_factory.mktemp("query_plans") / "synthetic.db"
+    build_synthetic_database(db_path, scale=0.01)
+    return db_path
+
+
+def test_discovers_project_queries():
+    queries, _ = discover_queries()
+    sources = {name for query in queries for name, _ in query.sources}
+    assert {"populate_game_logs.py", "populate_playbyplay_massive.py", "columnar_store.py"} <= sources
+
+
+def test_no_full_scans_of_large_tables(synthetic_db):
+    results, _ = run_suite(synthetic_db, repeat=1)
+    failures = {r.query_id: r.error or r.full_scans for r in results if r.failed}
+    assert not failures, failures
+
+
+@pytest.mark.parametrize("detail, table", [
+    ("SCAN p", "p"),
+    ("SCAN TABLE possessions AS p", "possessions"),
+    ("SCAN TABLE player_game_logs", "player_game_logs"),
+    ("SCAN possession_events USING COVERING INDEX idx_events_possession", "possession_events"),
+    ("SEARCH p USING INDEX idx_possessions_game_id (game_id=?)", None),
+    ("SEARCH TABLE possessions AS p USING INDEX idx_possessions_game_id (game_id=?)", None),
+])
+def test_scanned_table_reads_old_and_new_plan_text(detail, table):
+    assert scanned_table(detail) == table
@@ -0,0 +1,105 @@
+"""
+RFE feature sweep: a candidate scored from the shared training matrix gets
+the same predictions as RFEModelTrainer.fit for that feature count.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('xgboost')
+
+ARCHETYPES = ['King (Resilient Star)', 'Bulldozer (Fragile Star)', 'Sniper (Resilient Role)', 'Victim (Fragile Role)']
+
+
+def write_results(seed=0, players=40):
+    """Feature, label and RFE comparison CSVs for seasons 2015-16 to 2023-24 (train <= 2020)."""
+    rng = np.random.default_rng(seed)
+    seasons = [f"{y}-{str(y + 1)[2:]}" for y in range(2015, 2024)]
+    n = len(seasons) * players
+    features = pd.DataFrame({
+        'PLAYER_ID': np.tile(np.arange(players), len(seasons)),
+        'PLAYER_NAME': [f"Player {i}" for i in np.tile(np.arange(players), len(seasons))],
+        'SEASON': np.repeat(seasons, players),
+        'USG_PCT': rng.uniform(10, 35, n),
+        'CREATION_VOLUME_RATIO': rng.uniform(0, 0.9, n),
+        'CREATION_TAX': rng.normal(0, 0.05, n),
+        'EFG_ISO_WEIGHTED': rng.uniform(0.35, 0.6, n),
+        'LEVERAGE_USG_DELTA': rng.normal(0, 0.03, n),
+        'LEVERAGE_TS_DELTA': rng.normal(0, 0.05, n),
+        'RS_OPEN_SHOT_FREQUENCY': rng.uniform(0.1, 0.5, n),
+        'RS_PRESSURE_APPETITE': rng.uniform(0.2, 0.7, n),
+        'MEAN_OPPONENT_DCS': rng.uniform(40, 60, n),
+        'CLUTCH_MIN_TOTAL': rng.integers(0, 80, n).astype(float),
+        'PROJECTED_PLAYOFF_OUTPUT': rng.normal(15, 5, n),
+        'PROJECTED_PLAYOFF_PPS': rng.uniform(0.9, 1.3, n),
+        'FRICTION_COEFF_ISO': rng.uniform(0.8, 1.1, n),
+        'FRICTION_COEFF_0_DRIBBLE': rng.uniform(0.8, 1.1, n),
+        'SHOT_QUALITY_GENERATION_DELTA': rng.normal(0, 0.03, n),
+        'HELIO_ABOVE_REPLACEMENT_VALUE': rng.normal(0, 1, n),
+    })
+    for col in ['USG_PCT', 'RS_PRESSURE_APPETITE', 'PROJECTED_PLAYOFF_PPS']:
+        features.loc[rng.random(n) < 0.1, col] = np.nan
+
+    score = features['PROJECTED_PLAYOFF_OUTPUT'].fillna(15) / 5 + features['CREATION_VOLUME_RATIO'] * 3
+    labels = pd.DataFrame({
+        'player_name': features['PLAYER_NAME'],
+        'season': features['SEASON'],
+        'archetype': np.array(ARCHETYPES)[np.digitize(score + rng.normal(0, 1, n), [3.5, 4.5, 5.5])],
+        'resilience_quotient': rng.uniform(0.5, 1.5, n),
+        'dominance_score': rng.uniform(0, 1, n),
+        'po_minutes_total': np.where(rng.random(n) < 0.5, 0, rng.uniform(50, 600, n)),
+    })
+    rfe = pd.DataFrame({'n_features': [4], 'features': [str(
+        ['USG_PCT', 'USG_PCT_X_CREATION_VOLUME_RATIO', 'RS_PRESSURE_APPETITE', 'CREATION_VOLUME_RATIO'])]})
+
+    Path('results').mkdir()
+    features.to_csv('results/predictive_dataset.csv', index=False)
+    labels.to_csv('results/resilience_archetypes.csv', index=False)
+    rfe.to_csv('results/rfe_feature_count_comparison.csv', index=False)
+
+
+def test_sweep_reproduces_trainer_fit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # train_rfe_model logs to logs/train_rfe_model.log on import
+    Path('logs').mkdir()
+    from sklearn.metrics import accuracy_score, log_loss
+
+    from src.nba_data.scripts.sweep_rfe_features import candidate_feature_sets, load_or_build_matrix, run_sweep
+    from src.nba_data.scripts.train_rfe_model import RFEModelTrainer
+
+    write_results()
+    trainer = RFEModelTrainer()
+    model, encoder, X_test, y_test, feature_names = trainer.fit(n_features=4)
+    proba = model.predict_proba(X_test)
+
+    rfe_lists = {4: trainer.load_rfe_features(n_features=4)}
+    matrix_path = load_or_build_matrix(trainer, rfe_lists[4], False, cache_path=tmp_path / 'matrix.npz')
+    row = run_sweep(candidate_feature_sets(rfe_lists, ['base']), matrix_path).iloc[0]
+
+    assert row['features'] == feature_names
+    assert 'FRAGILITY_SCORE' in row['missing_features']
+    assert row['accuracy'] == accuracy_score(y_test, proba.argmax(axis=1))
+    assert row['log_loss'] == pytest.approx(log_loss(y_test, proba, labels=np.arange(len(encoder.classes_))), rel=1e-9)
+
+
+def test_rfe_path_lists_count_critical_features(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path('logs').mkdir()
+    from src.nba_data.scripts.sweep_rfe_features import load_matrix, load_or_build_matrix, rfe_path_lists
+    from src.nba_data.scripts.train_rfe_model import CRITICAL_FEATURES, RFEModelTrainer
+
+    write_results()
+    trainer = RFEModelTrainer()
+    pool = trainer.load_rfe_features(n_features=4)
+    matrix = load_matrix(load_or_build_matrix(trainer, pool, False, cache_path=tmp_path / 'matrix.npz'))
+    critical = [f for f in CRITICAL_FEATURES if f in matrix['columns']]
+    assert len(critical) == 6   # FRAGILITY_SCORE is not in the data
+
+    lists = rfe_path_lists(trainer, matrix, pool, [10, 8], threads=1)
+    assert {n: len(features) for n, features in lists.items()} == {8: 8, 10: 10}
+    assert set(critical) <= set(lists[8]) and set(lists[8]) <= set(lists[10])
+    with pytest.raises(ValueError):
+        rfe_path_lists(trainer, matrix, pool, [6], threads=1)
@@ -0,0 +1,58 @@
+"""
+Walk-forward season CV: folds never train on the test season or later,
+weights come from each fold's training rows, and parallel runs match serial.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.model.season_cv import (
+    FoldMatrices, build_fold_matrices, evaluate_folds, summarize_folds, walk_forward_folds
+)
+
+
+def make_model(n_jobs=None):
+    return LogisticRegression(max_iter=500)
+
+
+def test_walk_forward_folds():
+    season_year = np.array([2016, 2015, 2017, 2018, 2017, 2018])
+    folds = walk_forward_folds(season_year, min_train_seasons=2)
+    assert [f[0] for f in folds] == [2017, 2018]
+    for test_year, train, test in folds:
+        assert (season_year[train] < test_year).all()
+        assert (season_year[test] == test_year).all()
+    assert walk_forward_folds(season_year, min_train_seasons=2, test_years=[2018])[0][0] == 2018
+
+
+def test_fold_weights_and_parallel_evaluation(tmp_path, seasons):
+    X, y, season_year = seasons(last=2022, per_season=40, n_features=4, noise=0.5)
+    seen = []
+
+    def weights(train_rows):
+        seen.append(season_year[train_rows].max())
+        return 1.0 + (y[train_rows] == 2)
+
+    folds = build_fold_matrices(X, y, season_year, ['a', 'b', 'c', 'd'], ['low', 'mid', 'high'],
+                                weight_fn=weights, min_train_seasons=3, key='k')
+    assert folds.test_years == list(range(2018, 2023))
+    assert seen == [year - 1 for year in folds.test_years]
+
+    path = folds.save(tmp_path / 'folds.npz')
+    assert FoldMatrices.cached_key(path) == 'k'
+    assert FoldMatrices.cached_key(tmp_path / 'missing.npz') is None
+
+    variants = {'ab': ['a', 'b'], 'all': ['a', 'b', 'c', 'd'], 'noise': ['d', 'zz']}
+    serial = evaluate_folds(path, variants, make_model, jobs=1)
+    parallel = evaluate_folds(path, variants, make_model, jobs=2)
+    columns = ['variant', 'test_season', 'accuracy', 'log_loss', 'correct']
+    pd.testing.assert_frame_equal(serial[columns], parallel[columns])
+    assert serial.loc[serial['variant'] == 'noise', 'missing_features'].iloc[0] == ['zz']
+
+    summary = summarize_folds(serial, baseline='noise').set_index('variant')
+    assert summary.loc['all', 'folds'] == 5
+    assert summary.loc['all', 'delta_vs_baseline'] > 0
+    assert summary.loc['all', 'pooled_accuracy'] == (
+        serial.loc[serial['variant'] == 'all', 'correct'].sum() / 200)
+    assert np.isnan(summary.loc['noise', 'p_value_vs_baseline'])
@@ -0,0 +1,71 @@
+"""
+Season partitions: only seasons whose inputs changed are recomputed, and the
+combined output is the concatenation of the partitions.
+"""
+
+import pandas as pd
+
+from src.nba_data.utils.season_partitions import SeasonPartitions
+
+SEASONS = ['2022-23', '2023-24', '2024-25']
+
+
+def build(tmp_path, computed, refresh=()):
+    """One incremental run of a toy stage that reads data/logs_{season}.csv."""
+    code = tmp_path / 'stage.py'
+    store = SeasonPartitions('toy', code=[code], root=tmp_path / 'partitions')
+    fingerprints = {s: store.fingerprint(s, inputs=[tmp_path / f'logs_{s}.csv']) for s in SEASONS}
+    for season in store.stale(fingerprints, refresh=refresh):
+        computed.append(season)
+        logs = pd.read_csv(tmp_path / f'logs_{season}.csv')
+        store.write(season, logs.assign(SEASON=season, PTS2=logs['PTS'] * 2), fingerprints[season])
+    return store.concat(SEASONS)
+
+
+def test_only_changed_seasons_recompute(tmp_path):
+    (tmp_path / 'stage.py').write_text('VERSION = 1\n')
+    for i, season in enumerate(SEASONS):
+        pd.DataFrame({'PLAYER_ID': [1, 2], 'PTS': [10 + i, 20 + i]}).to_csv(tmp_path / f'logs_{season}.csv', index=False)
+
+    computed = []
+    first = build(tmp_path, computed)
+    assert computed == SEASONS
+    assert first['SEASON'].tolist() == [s for s in SEASONS for _ in range(2)]
+
+    computed.clear()
+    assert build(tmp_path, computed).equals(first)
+    assert computed == []
+
+    # A new day of games for the current season
+    pd.DataFrame({'PLAYER_ID': [1, 2, 3], 'PTS': [30, 40, 5]}).to_csv(tmp_path / 'logs_2024-25.csv', index=False)
+    computed.clear()
+    updated = build(tmp_path, computed)
+    assert computed == ['2024-25']
+    assert len(updated) == 7
+    assert updated[updated['SEASON'] != '2024-25'].equals(first[first['SEASON'] != '2024-25'])
+
+    computed.clear()
+    build(tmp_path, computed, refresh=['2023-24'])
+    assert computed == ['2023-24']
+
+    # Code changes invalidate every season
+    (tmp_path / 'stage.py').write_text('VERSION = 2\n')
+    computed.clear()
+    build(tmp_path, computed)
+    assert computed == SEASONS
+
+
+def test_frame_inputs_and_removal(tmp_path):
+    store = SeasonPartitions('toy', root=tmp_path)
+    rows = pd.DataFrame({'PLAYER_ID': [1, 2], 'SEASON': ['2023-24'] * 2, 'USG_PCT': [0.2, 0.3]})
+    fingerprint = store.fingerprint('2023-24', frames=[rows])
+
+    assert store.fingerprint('2023-24', frames=[rows.set_index('PLAYER_ID', drop=False)]) == fingerprint
+    assert store.fingerprint('2023-24', frames=[rows.assign(USG_PCT=[0.2, 0.31])]) != fingerprint
+
+    store.write('2023-24', rows, fingerprint)
+    assert SeasonPartitions('toy', root=tmp_path).is_current('2023-24', fingerprint)
+
+    store.remove('2023-24')
+    assert store.concat(['2023-24']).empty
+    assert not SeasonPartitions('toy', root=tmp_path).is_current('2023-24', fingerprint)
@@ -0,0 +1,187 @@
+"""
+Shot quality generation delta: the keyed-join version in both copies
+(src/features/creation.py and the calculate_shot_quality_generation
+script) matches the per-player loop it replaced, with each copy's own
+volume thresholds.
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CATEGORIES = ['6_PLUS', '4_6', '2_4', '0_2']
+
+# copy -> (tight FGA, wide-open FGA, overall FGA) minimums of its player-level fallbacks
+MODULES = {
+    'src/features/creation.py': (0, 0, 10),
+    'src/nba_data/scripts/calculate_shot_quality_generation.py': (25, 25, 100),
+}
+
+
+def load_copy(path, workdir):
+    """
+    Load a copy by path (src/features/__init__ pulls in the plotting code).
+    Both log to logs/shot_quality_generation.log on import; keep that out of the tree.
+    """
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        Path('logs').mkdir(exist_ok=True)
+        spec = importlib.util.spec_from_file_location(Path(path).stem, ROOT / path)
+        loaded = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(loaded)
+        loaded.thresholds = MODULES[path]
+        return loaded
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture(scope='module', params=list(MODULES))
+def module(request, tmp_path_factory):
+    return load_copy(request.param, tmp_path_factory.mktemp('run'))
+
+
+# Reference implementation: the row-by-row code the keyed join replaced.
+
+def legacy_player_qualities(player_data, shot_quality_data, thresholds):
+    tight_min, open_min, overall_min = thresholds
+    player_sq = None
+    player_id, season = player_data.get('PLAYER_ID'), player_data.get('SEASON')
+    if pd.notna(player_id) and pd.notna(season):
+        rows = shot_quality_data[
+            (shot_quality_data['PLAYER_ID'] == player_id) &
+            (shot_quality_data['SEASON'] == season) &
+            (shot_quality_data['SEASON_TYPE'].isin(['RS', 'Regular Season']))
+        ]
+        if not rows.empty:
+            player_sq = rows.iloc[0]
+
+    results = {'self_created_quality': np.nan, 'assisted_quality': np.nan, 'overall_quality': np.nan}
+    if 'EFG_ISO_WEIGHTED' in player_data.index and pd.notna(player_data['EFG_ISO_WEIGHTED']):
+        results['self_created_quality'] = player_data['EFG_ISO_WEIGHTED']
+    elif player_sq is not None:
+        tight_fga = (player_sq.get('FGA_0_2', 0) or 0) + (player_sq.get('FGA_2_4', 0) or 0)
+        if tight_fga > tight_min:
+            results['self_created_quality'] = (
+                (player_sq.get('EFG_0_2', 0) or 0) * (player_sq.get('FGA_0_2', 0) or 0) +
+                (player_sq.get('EFG_2_4', 0) or 0) * (player_sq.get('FGA_2_4', 0) or 0)
+            ) / tight_fga
+
+    if 'EFG_PCT_0_DRIBBLE' in player_data.index and pd.notna(player_data['EFG_PCT_0_DRIBBLE']):
+        results['assisted_quality'] = player_data['EFG_PCT_0_DRIBBLE']
+    elif player_sq is not None:
+        if (player_sq.get('FGA_6_PLUS', 0) or 0) > open_min:
+            results['assisted_quality'] = player_sq.get('EFG_6_PLUS', 0) or 0
+
+    if player_sq is not None:
+        total_fga = sum(player_sq.get(f'FGA_{cat}', 0) or 0 for cat in CATEGORIES)
+        if total_fga > overall_min:
+            results['overall_quality'] = sum(
+                (player_sq.get(f'EFG_{cat}', 0) or 0) * (player_sq.get(f'FGA_{cat}', 0) or 0) for cat in CATEGORIES
+            ) / total_fga
+    return results
+
+
+def legacy_delta(player_data, shot_quality_data, league_averages, thresholds):
+    qualities = legacy_player_qualities(player_data, shot_quality_data, thresholds)
+    ratio = player_data.get('CREATION_VOLUME_RATIO', 0.5)
+    if pd.isna(ratio):
+        ratio = 0.5
+    self_delta = qualities['self_created_quality'] - league_averages.get('self_created', np.nan)
+    assisted_delta = qualities['assisted_quality'] - league_averages.get('assisted', np.nan)
+    if pd.notna(self_delta) and pd.notna(assisted_delta):
+        return self_delta * ratio + assisted_delta * (1 - ratio)
+    if pd.notna(self_delta):
+        return self_delta * ratio
+    if pd.notna(assisted_delta):
+        return assisted_delta * (1 - ratio)
+    return qualities['overall_quality'] - league_averages.get('overall', np.nan)
+
+
+def legacy_league_overall(shot_quality_df):
+    rs_df = shot_quality_df[shot_quality_df['SEASON_TYPE'].isin(['RS', 'Regular Season'])].copy()
+    rs_df['TOTAL_FGA'] = sum(rs_df[f'FGA_{cat}'].fillna(0) for cat in CATEGORIES)
+    rs_df['WEIGHTED_EFG'] = np.nan
+    for idx in rs_df.index:
+        row = rs_df.loc[idx]
+        if row['TOTAL_FGA'] > 10:
+            rs_df.loc[idx, 'WEIGHTED_EFG'] = sum(
+                row[f'EFG_{cat}'] * row[f'FGA_{cat}'] for cat in CATEGORIES
+                if pd.notna(row[f'EFG_{cat}']) and pd.notna(row[f'FGA_{cat}'])
+            ) / row['TOTAL_FGA']
+    return rs_df['WEIGHTED_EFG'].dropna().mean()
+
+
+def make_season(seed=0, n=300):
+    """Players with and without shot quality rows, duplicate and playoff rows, and sparse columns."""
+    rng = np.random.default_rng(seed)
+    players = pd.DataFrame({
+        'PLAYER_ID': np.arange(n, dtype=float),
+        'PLAYER_NAME': [f"Player {i}" for i in range(n)],
+        'SEASON': '2023-24',
+        'EFG_ISO_WEIGHTED': np.where(rng.random(n) < 0.4, np.nan, rng.uniform(0.35, 0.6, n)),
+        'EFG_PCT_0_DRIBBLE': np.where(rng.random(n) < 0.4, np.nan, rng.uniform(0.4, 0.65, n)),
+        'CREATION_VOLUME_RATIO': np.where(rng.random(n) < 0.2, np.nan, rng.uniform(0, 0.8, n)),
+    })
+    players.loc[0, 'PLAYER_ID'] = np.nan
+
+    sq_ids = rng.choice(n, int(n * 0.8), replace=False)
+    shot_quality = pd.DataFrame({'PLAYER_ID': sq_ids.astype(float), 'SEASON': '2023-24', 'SEASON_TYPE': 'RS'})
+    for cat in CATEGORIES:
+        shot_quality[f'FGA_{cat}'] = np.where(rng.random(len(sq_ids)) < 0.1, np.nan,
+                                              rng.integers(0, 120, len(sq_ids)).astype(float))
+        shot_quality[f'EFG_{cat}'] = np.where(rng.random(len(sq_ids)) < 0.1, np.nan,
+                                              rng.uniform(0.3, 0.7, len(sq_ids)))
+    playoffs = shot_quality.iloc[:40].assign(SEASON_TYPE='Playoffs', EFG_6_PLUS=0.99)
+    duplicates = shot_quality.iloc[40:60].assign(EFG_0_2=0.01)   # the first RS row wins
+    shot_quality = pd.concat([playoffs, shot_quality, duplicates], ignore_index=True)
+    return players, shot_quality
+
+
+@pytest.mark.parametrize('drop', [[], ['EFG_ISO_WEIGHTED', 'EFG_PCT_0_DRIBBLE', 'CREATION_VOLUME_RATIO']])
+def test_delta_matches_per_player_loop(module, drop):
+    players, shot_quality = make_season()
+    players = players.drop(columns=drop)
+    league_averages = {'self_created': 0.47, 'assisted': 0.53, 'overall': 0.5}
+
+    actual = module.calculate_shot_quality_generation_delta(players, shot_quality, league_averages)
+    expected = [legacy_delta(row, shot_quality, league_averages, module.thresholds)
+                for _, row in players.iterrows()]
+    np.testing.assert_allclose(actual.to_numpy(dtype=float), np.array(expected, dtype=float))
+    assert actual.notna().sum() > len(players) // 2
+
+    # Without league averages for self-created/assisted, the overall fallback applies
+    overall_only = module.calculate_shot_quality_generation_delta(players, shot_quality, {'overall': 0.5})
+    expected = [legacy_delta(row, shot_quality, {'overall': 0.5}, module.thresholds)
+                for _, row in players.iterrows()]
+    np.testing.assert_allclose(overall_only.to_numpy(dtype=float), np.array(expected, dtype=float))
+
+
+def test_league_overall_matches_row_loop(module):
+    _, shot_quality = make_season(seed=1)
+    averages = module.calculate_league_average_shot_quality(shot_quality)
+    assert averages['overall'] == pytest.approx(legacy_league_overall(shot_quality))
+
+
+def test_fingerprint_ignores_written_back_delta(tmp_path, monkeypatch):
+    script = load_copy('src/nba_data/scripts/calculate_shot_quality_generation.py', tmp_path)
+    partitions = script.SeasonPartitions('shot_quality_generation', root=tmp_path / 'partitions')
+    monkeypatch.chdir(tmp_path)
+    Path('results').mkdir()
+    players, _ = make_season()
+    players = players.assign(USG_PCT=0.2)
+
+    def fingerprint(df):
+        df.to_csv('results/predictive_dataset.csv', index=False)
+        return script.season_fingerprints(partitions, ['2023-24'])['2023-24']
+
+    before = fingerprint(players)
+    # --merge writes the delta back; unrelated columns change too
+    assert fingerprint(players.assign(SHOT_QUALITY_GENERATION_DELTA=0.01, USG_PCT=0.3)) == before
+    assert fingerprint(players.assign(EFG_ISO_WEIGHTED=players['EFG_ISO_WEIGHTED'] + 0.01)) != before
@@ -0,0 +1,137 @@
+"""
+Split aggregation: the declared playoff-series and predictive-feature
+metrics match the groupby loops they replaced.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.nba_data.scripts.assemble_training_data import aggregate_playoff_series
+from src.nba_data.scripts.generate_predictive_features import FEATURE_METRICS
+from src.nba_data.utils.split_aggregation import aggregate_splits, std
+
+
+# Reference implementations: the groupby loops aggregate_splits replaced.
+
+def legacy_playoff_series(po_logs):
+    series_data = []
+    for name, group in po_logs.groupby(['PLAYER_ID', 'PLAYER_NAME', 'SEASON', 'OPPONENT_ABBREV']):
+        player_id, player_name, season, opp_abbrev = name
+        total_min = group['MIN'].sum()
+        total_pts = group['PTS'].sum()
+        total_poss = group['POSS'].sum()
+        total_fga = group['FGA'].sum()
+        total_fta = group['FTA'].sum()
+        if total_min > 0:
+            avg_ast_pct = (group['AST_PCT'] * group['MIN']).sum() / total_min
+            avg_usg_pct = (group['USG_PCT'] * group['MIN']).sum() / total_min
+        else:
+            avg_ast_pct = 0
+            avg_usg_pct = 0
+        if (total_fga + 0.44 * total_fta) > 0:
+            ts_pct = total_pts / (2 * (total_fga + 0.44 * total_fta))
+        else:
+            ts_pct = 0
+        ppg75 = (total_pts / total_poss) * 75 if total_poss > 0 else 0
+        series_data.append({
+            'PLAYER_ID': player_id, 'PLAYER_NAME': player_name, 'SEASON': season, 'OPPONENT_ABBREV': opp_abbrev,
+            'po_games_played': len(group), 'po_minutes_total': total_min, 'po_poss_total': total_poss,
+            'po_fga': total_fga, 'po_fta': total_fta, 'po_pts': total_pts, 'po_ts_pct': ts_pct,
+            'po_ppg_per75': ppg75, 'po_ast_pct': avg_ast_pct, 'po_usg_pct': avg_usg_pct,
+        })
+    return pd.DataFrame(series_data)
+
+
+def legacy_predictive_features(logs):
+    player_stats = []
+    for (player_id, player_name), group in logs.groupby(['PLAYER_ID', 'PLAYER_NAME']):
+        gmsc_std = group['GAME_SCORE'].std()
+        if pd.isna(gmsc_std):
+            gmsc_std = 0
+        vs_top10 = group[group['IS_TOP_10_DEF']]
+        if len(vs_top10) > 0:
+            t10_pts = vs_top10['PTS'].sum()
+            t10_fga = vs_top10['FGA'].sum()
+            t10_fta = vs_top10['FTA'].sum()
+            t10_poss = vs_top10['POSS'].sum()
+            ts_pct_top10 = t10_pts / (2 * (t10_fga + 0.44 * t10_fta)) if (t10_fga + 0.44 * t10_fta) > 0 else 0
+            ppg75_top10 = (t10_pts / t10_poss) * 75 if t10_poss > 0 else 0
+            t10_min = vs_top10['MIN'].sum()
+            if t10_min > 0:
+                ast_pct_top10 = (vs_top10['AST_PCT'] * vs_top10['MIN']).sum() / t10_min
+                usg_pct_top10 = (vs_top10['USG_PCT'] * vs_top10['MIN']).sum() / t10_min
+            else:
+                ast_pct_top10 = 0
+                usg_pct_top10 = 0
+            games_vs_top10 = len(vs_top10)
+        else:
+            ts_pct_top10 = ppg75_top10 = ast_pct_top10 = usg_pct_top10 = games_vs_top10 = 0
+        player_stats.append({
+            'PLAYER_ID': player_id, 'PLAYER_NAME': player_name, 'consistency_gmsc_std': gmsc_std,
+            'ts_pct_vs_top10': ts_pct_top10, 'ppg_per75_vs_top10': ppg75_top10,
+            'ast_pct_vs_top10': ast_pct_top10, 'usg_pct_vs_top10': usg_pct_top10,
+            'games_vs_top10': games_vs_top10,
+        })
+    return pd.DataFrame(player_stats)
+
+
+def make_logs(seed=0, n=600):
+    """Game logs with zero-minute, zero-attempt and single-game players and missing rates."""
+    rng = np.random.default_rng(seed)
+    player = rng.integers(1, 40, n)
+    logs = pd.DataFrame({
+        'PLAYER_ID': player,
+        'PLAYER_NAME': [f"Player {p}" for p in player],
+        'SEASON': rng.choice(['2022-23', '2023-24'], n),
+        'OPPONENT_ABBREV': rng.choice(['BOS', 'MIA', 'DEN', 'LAL'], n),
+        'MIN': rng.integers(0, 40, n).astype(float),
+        'PTS': rng.integers(0, 35, n).astype(float),
+        'FGA': rng.integers(0, 25, n).astype(float),
+        'FTA': rng.integers(0, 10, n).astype(float),
+        'POSS': rng.integers(0, 80, n).astype(float),
+        'AST_PCT': rng.uniform(0, 0.5, n),
+        'USG_PCT': rng.uniform(0.05, 0.4, n),
+        'GAME_SCORE': rng.normal(10, 6, n),
+        'IS_TOP_10_DEF': rng.random(n) < 0.3,
+    })
+    logs.loc[logs['PLAYER_ID'] == 1, ['MIN', 'FGA', 'FTA', 'POSS']] = 0
+    # Missing rates keep their minutes in the weighted means' denominators, as the loops did
+    logs.loc[rng.random(n) < 0.1, 'AST_PCT'] = np.nan
+    logs.loc[rng.random(n) < 0.1, 'GAME_SCORE'] = np.nan
+    logs = pd.concat([logs, logs.iloc[[0]].assign(PLAYER_ID=99, PLAYER_NAME='Player 99')], ignore_index=True)
+    return logs
+
+
+def test_playoff_series_match_groupby_loop():
+    logs = make_logs()
+    expected = legacy_playoff_series(logs)
+    actual = aggregate_playoff_series(logs.copy(), team_map=None)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+
+def test_predictive_features_match_groupby_loop():
+    logs = make_logs(seed=1)
+    expected = legacy_predictive_features(logs)
+    agg = aggregate_splits(logs, by=['PLAYER_ID', 'PLAYER_NAME'],
+                           splits={'all': None, 'vs_top10': logs['IS_TOP_10_DEF']},
+                           metrics=FEATURE_METRICS, nan_if_empty=False)
+    actual = pd.DataFrame({
+        'PLAYER_ID': agg['PLAYER_ID'], 'PLAYER_NAME': agg['PLAYER_NAME'],
+        'consistency_gmsc_std': agg['gmsc_std_all'],
+        **{f'{m}_vs_top10': agg[f'{m}_vs_top10'] for m in ['ts_pct', 'ppg_per75', 'ast_pct', 'usg_pct']},
+        'games_vs_top10': agg['games_vs_top10'],
+    })
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_std_of_large_low_variance_values():
+    rng = np.random.default_rng(2)
+    logs = pd.DataFrame({'PLAYER_ID': rng.integers(0, 5, 1000), 'X': 1e9 + rng.normal(0, 1e-3, 1000)})
+    logs.loc[3, 'PLAYER_ID'] = np.nan
+    top = rng.random(1000) < 0.5
+    agg = aggregate_splits(logs, by='PLAYER_ID', metrics={'x_std': std('X')}, splits={'all': None, 'top': top})
+
+    # Reference on the centered values, where cancellation cannot occur
+    centered = logs.assign(X=logs['X'] - 1e9)
+    np.testing.assert_allclose(agg['x_std_all'], centered.groupby('PLAYER_ID')['X'].std(), rtol=1e-6)
+    np.testing.assert_allclose(agg['x_std_top'], centered[top].groupby('PLAYER_ID')['X'].std(), rtol=1e-6)
@@ -0,0 +1,68 @@
+"""
+Training tables: dtypes survive the round trip, the stored table is reused
+until an input changes, and edits to a loaded frame never reach the store.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model.training_tables import TrainingTableError, load_or_build, read_table
+
+
+def make_frame():
+    return pd.DataFrame({
+        'PLAYER_ID': pd.array([1, 2, None], dtype='Int32'),
+        'PLAYER_NAME': ['A', np.nan, 'C'],
+        'SEASON': pd.Categorical(['2019-20', '2020-21', '2019-20'], categories=['2019-20', '2020-21'], ordered=True),
+        'ARCHETYPE': pd.Categorical(['King (Resilient Star)', 'Victim (Fragile Role)', 'King (Resilient Star)']),
+        'USG_PCT': np.array([0.2, np.nan, 0.3], dtype=np.float32),
+        'GAMES': np.array([10, 20, 30], dtype=np.int32),
+        'IS_STAR': [True, False, True],
+        'CRUCIBLE_WEIGHT': [1.5, np.nan, 4.0],
+    })
+
+
+def test_round_trip_preserves_values_and_dtypes(tmp_path):
+    df = make_frame()
+    table = load_or_build('t', build=make_frame, root=tmp_path, label='ARCHETYPE', weight='CRUCIBLE_WEIGHT')
+
+    assert table.rebuilt
+    pd.testing.assert_frame_equal(table.frame, df)
+    assert table.frame['SEASON'].max() == '2020-21'
+    assert table.labels.tolist() == df['ARCHETYPE'].tolist()
+    np.testing.assert_array_equal(table.weights.to_numpy(), df['CRUCIBLE_WEIGHT'].to_numpy())
+
+
+def test_reused_until_inputs_change(tmp_path):
+    source = tmp_path / 'features.csv'
+    make_frame().to_csv(source, index=False)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return pd.read_csv(source)
+
+    first = load_or_build('t', build=build, inputs=[source], root=tmp_path)
+    second = load_or_build('t', build=build, inputs=[source], root=tmp_path)
+    assert len(calls) == 1 and not second.rebuilt
+    assert second.fingerprint == first.fingerprint
+
+    load_or_build('t', build=build, inputs=[source], version=2, root=tmp_path)
+    source.write_text(source.read_text() + '4,D,2021-22,King (Resilient Star),0.1,5,False,1.0\n')
+    third = load_or_build('t', build=build, inputs=[source], version=2, root=tmp_path)
+    assert len(calls) == 3 and len(third.frame) == 4
+
+
+def test_loaded_frame_is_copy_on_write(tmp_path):
+    table = load_or_build('t', build=make_frame, root=tmp_path)
+    table.frame.loc[0, 'GAMES'] = 99
+    table.frame['NEW'] = 1.0
+    assert read_table('t', root=tmp_path).frame['GAMES'].tolist() == [10, 20, 30]
+
+
+def test_errors(tmp_path):
+    with pytest.raises(TrainingTableError, match='label'):
+        load_or_build('t', build=make_frame, root=tmp_path, label='MISSING')
+    with pytest.raises(TrainingTableError):
+        read_table('absent', root=tmp_path)
@@ -0,0 +1,62 @@
+"""
+Usage curves: fitting, artifact round trip and frame projection.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.nba_data.utils.projection_utils import project_efficiency, project_efficiency_frame
+from src.nba_data.utils.usage_projection import UsageCurves, project_to_usages
+
+
+def make_players(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    usage = rng.uniform(0.10, 0.38, n)
+    return pd.DataFrame({
+        'PLAYER_NAME': [f'player_{i}' for i in range(n)],
+        'USG_PCT': usage * 100,  # stored as percentages, like the feature dataset
+        'CREATION_VOLUME_RATIO': np.clip(2 * usage - 0.1 + rng.normal(0, 0.05, n), 0, 1),
+        'TS_PCT': rng.uniform(0.48, 0.64, n),
+        'SHOT_QUALITY_GENERATION_DELTA': rng.uniform(0.0, 0.25, n),
+    })
+
+
+def test_curves_follow_usage_and_round_trip(tmp_path):
+    curves = UsageCurves.fit(make_players(), ['CREATION_VOLUME_RATIO'])
+
+    medians = curves.values['CREATION_VOLUME_RATIO']
+    assert medians == sorted(medians)
+    assert '25-30%' in curves and '35%+' in curves
+
+    path = curves.save(tmp_path / 'curves.json')
+    assert UsageCurves.load(path).to_dict() == curves.to_dict()
+
+
+def test_projection_shapes_and_modes():
+    df = make_players()
+    curves = UsageCurves.fit(df, ['CREATION_VOLUME_RATIO'])
+    targets = [0.20, 0.30]
+
+    shifted = project_to_usages(df, targets, curves)
+    replaced = project_to_usages(df, targets, curves, mode='replace')
+
+    assert len(shifted) == len(df) * len(targets)
+    assert shifted['TARGET_USAGE'].tolist()[:2] == targets
+    assert (shifted['USG_PCT'] == shifted['TARGET_USAGE']).all()
+    # Moving up in usage raises creation volume for everyone
+    by_player = shifted['CREATION_VOLUME_RATIO'].to_numpy().reshape(len(df), 2)
+    assert (by_player[:, 1] >= by_player[:, 0]).all()
+    # 'replace' gives everyone the typical value at the target
+    assert replaced.groupby('TARGET_USAGE')['CREATION_VOLUME_RATIO'].nunique().eq(1).all()
+
+
+def test_vectorized_efficiency_matches_scalar():
+    df = make_players(50)
+    base = df['USG_PCT'].to_numpy() / 100
+
+    frame = project_efficiency_frame(base, df['TS_PCT'], df['SHOT_QUALITY_GENERATION_DELTA'], 0.30)
+
+    for i in range(len(df)):
+        expected = project_efficiency(base[i], df['TS_PCT'][i], df['SHOT_QUALITY_GENERATION_DELTA'][i], 0.30)
+        assert frame.loc[i, 'archetype'] == expected['archetype']
+        assert np.isclose(frame.loc[i, 'projected_ts'], expected['projected_ts'])